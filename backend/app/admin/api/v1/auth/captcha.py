@@ -1,6 +1,5 @@
 from uuid import uuid4
 
-from fast_captcha import img_captcha
 from fastapi import APIRouter, Depends
 from fastapi_limiter.depends import RateLimiter
 from starlette.concurrency import run_in_threadpool
@@ -9,6 +8,9 @@ from backend.app.admin.schema.captcha import GetCaptchaDetail
 from backend.common.response.response_schema import ResponseSchemaModel, response_base
 from backend.core.conf import settings
 from backend.database.redis import redis_client
+from backend.utils.import_parse import lazy_import
+
+fast_captcha = lazy_import('fast_captcha')
 
 router = APIRouter()
 
@@ -23,7 +25,7 @@ async def get_captcha() -> ResponseSchemaModel[GetCaptchaDetail]:
     此接口可能存在性能损耗，尽管是异步接口，但是验证码生成是IO密集型任务，使用线程池尽量减少性能损耗
     """
     img_type: str = 'base64'
-    img, code = await run_in_threadpool(img_captcha, img_byte=img_type)
+    img, code = await run_in_threadpool(fast_captcha.img_captcha, img_byte=img_type)
     uuid = str(uuid4())
     await redis_client.set(
         f'{settings.CAPTCHA_LOGIN_REDIS_PREFIX}:{uuid}',
@@ -1,9 +1,12 @@
+from datetime import datetime
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Request, Response
 
 from backend.app.admin.schema.opera_log import DeleteOperaLogParam, GetOperaLogDetail
+from backend.app.admin.service.export_service import opera_log_exporter
 from backend.app.admin.service.opera_log_service import opera_log_service
+from backend.common.enums import ExportFormatType
 from backend.common.pagination import DependsPagination, PageData
 from backend.common.response.response_schema import ResponseModel, ResponseSchemaModel, response_base
 from backend.common.security.jwt import DependsJwtAuth
@@ -26,13 +29,45 @@ async def get_opera_logs_paginated(
     db: CurrentSession,
     username: Annotated[str | None, Query(description='用户名')] = None,
     status: Annotated[int | None, Query(description='状态')] = None,
-    ip: Annotated[str | None, Query(description='IP 地址')] = None,
+    ip: Annotated[str | None, Query(description='IP 地址，支持 CIDR 与 IPv4 前缀')] = None,
+    start_time: Annotated[datetime | None, Query(description='开始时间')] = None,
+    end_time: Annotated[datetime | None, Query(description='结束时间')] = None,
+    exact: Annotated[bool, Query(description='用户名精确匹配')] = False,
 ) -> ResponseSchemaModel[PageData[GetOperaLogDetail]]:
-    page_data = await opera_log_service.get_list(db=db, username=username, status=status, ip=ip)
+    page_data = await opera_log_service.get_list(
+        db=db, username=username, status=status, ip=ip, start_time=start_time, end_time=end_time, exact=exact
+    )
 
     return response_base.success(data=page_data)
 
 
+@router.get(
+    '/export',
+    summary='导出操作日志',
+    description='行数超过阈值时转为后台任务导出并返回任务 ID，完成后通过 /tasks/exports/{task_id} 下载',
+    dependencies=[DependsJwtAuth],
+)
+async def export_opera_logs(
+    request: Request,
+    username: Annotated[str | None, Query(description='用户名')] = None,
+    status: Annotated[int | None, Query(description='状态')] = None,
+    ip: Annotated[str | None, Query(description='IP 地址，支持 CIDR 与 IPv4 前缀')] = None,
+    start_time: Annotated[datetime | None, Query(description='开始时间')] = None,
+    end_time: Annotated[datetime | None, Query(description='结束时间')] = None,
+    exact: Annotated[bool, Query(description='用户名精确匹配')] = False,
+    fmt: Annotated[ExportFormatType, Query(alias='format', description='导出格式')] = ExportFormatType.csv,
+) -> Response:
+    filters = {
+        'username': username,
+        'status': status,
+        'ip': ip,
+        'start_time': start_time,
+        'end_time': end_time,
+        'exact': exact,
+    }
+    return await opera_log_exporter.response(request, fmt, filters)
+
+
 @router.delete(
     '',
     summary='批量删除操作日志',
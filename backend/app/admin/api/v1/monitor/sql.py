@@ -0,0 +1,19 @@
+from fastapi import APIRouter
+
+from backend.common.response.response_schema import ResponseModel, response_base
+from backend.common.security.jwt import DependsJwtAuth, DependsSuperUser
+from backend.utils.sql_profiler import sql_profiler
+
+router = APIRouter()
+
+
+@router.get('', summary='SQL 性能分析', dependencies=[DependsJwtAuth])
+async def get_sql_profiles() -> ResponseModel:
+    data = await sql_profiler.get_history()
+    return response_base.success(data=data)
+
+
+@router.delete('', summary='清空 SQL 性能分析', dependencies=[DependsSuperUser])
+async def clear_sql_profiles() -> ResponseModel:
+    await sql_profiler.clear()
+    return response_base.success()
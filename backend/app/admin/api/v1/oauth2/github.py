@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
-from fastapi import APIRouter, BackgroundTasks, Depends, Request, Response
+from fastapi import APIRouter, Depends, Request, Response
 from fastapi_limiter.depends import RateLimiter
 from fastapi_oauth20 import FastAPIOAuth20, GitHubOAuth20
 from starlette.responses import RedirectResponse
@@ -31,7 +31,6 @@ async def github_auth2() -> ResponseSchemaModel[str]:
 async def github_login(
     request: Request,
     response: Response,
-    background_tasks: BackgroundTasks,
     oauth2: FastAPIOAuth20 = Depends(_github_oauth2),
 ):
     token, _state = oauth2
@@ -40,7 +39,6 @@ async def github_login(
     data = await oauth2_service.create_with_login(
         request=request,
         response=response,
-        background_tasks=background_tasks,
         user=user,
         social=UserSocialType.github,
     )
@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
-from fastapi import APIRouter, BackgroundTasks, Depends, Request, Response
+from fastapi import APIRouter, Depends, Request, Response
 from fastapi_limiter.depends import RateLimiter
 from fastapi_oauth20 import FastAPIOAuth20, LinuxDoOAuth20
 from starlette.responses import RedirectResponse
@@ -34,7 +34,6 @@ async def linux_do_auth2() -> ResponseSchemaModel[str]:
 async def linux_do_login(
     request: Request,
     response: Response,
-    background_tasks: BackgroundTasks,
     oauth2: FastAPIOAuth20 = Depends(_linux_do_oauth2),
 ):
     token, _state = oauth2
@@ -43,7 +42,6 @@ async def linux_do_login(
     data = await oauth2_service.create_with_login(
         request=request,
         response=response,
-        background_tasks=background_tasks,
         user=user,
         social=UserSocialType.linux_do,
     )
@@ -4,6 +4,7 @@ from fastapi import APIRouter, Depends, Path, Query, Request
 
 from backend.app.admin.schema.dept import CreateDeptParam, GetDeptDetail, GetDeptTree, UpdateDeptParam
 from backend.app.admin.service.dept_service import dept_service
+from backend.common.response.response_cache import response_cache
 from backend.common.response.response_schema import ResponseModel, ResponseSchemaModel, response_base
 from backend.common.security.jwt import DependsJwtAuth
 from backend.common.security.permission import RequestPermission
@@ -22,6 +23,7 @@ async def get_dept(
 
 
 @router.get('', summary='获取部门树', dependencies=[DependsJwtAuth])
+@response_cache('dept')
 async def get_dept_tree(
     db: CurrentSession,
     request: Request,
@@ -20,6 +20,6 @@ router = APIRouter()
     ],
 )
 async def upload_files(file: Annotated[UploadFile, File()]) -> ResponseSchemaModel[UploadUrl]:
-    upload_file_verify(file)
-    filename = await upload_file(file)
+    max_size = upload_file_verify(file)
+    filename = await upload_file(file, max_size)
     return response_base.success(data={'url': f'/static/upload/{filename}'})
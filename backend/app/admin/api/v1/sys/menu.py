@@ -4,6 +4,7 @@ from fastapi import APIRouter, Depends, Path, Query, Request
 
 from backend.app.admin.schema.menu import CreateMenuParam, GetMenuDetail, GetMenuTree, UpdateMenuParam
 from backend.app.admin.service.menu_service import menu_service
+from backend.common.response.response_cache import response_cache
 from backend.common.response.response_schema import ResponseModel, ResponseSchemaModel, response_base
 from backend.common.security.jwt import DependsJwtAuth
 from backend.common.security.permission import RequestPermission
@@ -14,6 +15,7 @@ router = APIRouter()
 
 
 @router.get('/sidebar', summary='获取用户菜单侧边栏', description='已适配 vben admin v5', dependencies=[DependsJwtAuth])
+@response_cache('menu', 'role')
 async def get_user_sidebar(db: CurrentSession, request: Request) -> ResponseSchemaModel[list[dict[str, Any] | None]]:
     menu = await menu_service.get_sidebar(db=db, request=request)
     return response_base.success(data=menu)
@@ -28,6 +30,7 @@ async def get_menu(
 
 
 @router.get('', summary='获取菜单树', dependencies=[DependsJwtAuth])
+@response_cache('menu')
 async def get_menu_tree(
     db: CurrentSession,
     title: Annotated[str | None, Query(description='菜单标题')] = None,
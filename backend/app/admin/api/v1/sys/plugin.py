@@ -6,6 +6,7 @@ from starlette.responses import StreamingResponse
 
 from backend.app.admin.service.plugin_service import plugin_service
 from backend.common.enums import PluginType
+from backend.common.response.response_cache import response_cache
 from backend.common.response.response_code import CustomResponse
 from backend.common.response.response_schema import ResponseModel, ResponseSchemaModel, response_base
 from backend.common.security.jwt import DependsJwtAuth
@@ -16,6 +17,7 @@ router = APIRouter()
 
 
 @router.get('', summary='获取所有插件', dependencies=[DependsJwtAuth])
+@response_cache('plugin')
 async def get_all_plugins() -> ResponseSchemaModel[list[dict[str, Any]]]:
     plugins = await plugin_service.get_all()
     return response_base.success(data=plugins)
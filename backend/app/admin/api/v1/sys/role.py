@@ -14,6 +14,7 @@ from backend.app.admin.schema.role import (
 )
 from backend.app.admin.service.role_service import role_service
 from backend.common.pagination import DependsPagination, PageData
+from backend.common.response.response_cache import response_cache
 from backend.common.response.response_schema import ResponseModel, ResponseSchemaModel, response_base
 from backend.common.security.jwt import DependsJwtAuth
 from backend.common.security.permission import RequestPermission
@@ -24,6 +25,7 @@ router = APIRouter()
 
 
 @router.get('/all', summary='获取所有角色', dependencies=[DependsJwtAuth])
+@response_cache('role')
 async def get_all_roles(db: CurrentSession) -> ResponseSchemaModel[list[GetRoleDetail]]:
     data = await role_service.get_all(db=db)
     return response_base.success(data=data)
@@ -1,6 +1,6 @@
 from typing import Annotated
 
-from fastapi import APIRouter, Body, Depends, Path, Query, Request
+from fastapi import APIRouter, Body, Depends, Path, Query, Request, Response
 
 from backend.app.admin.schema.role import GetRoleDetail
 from backend.app.admin.schema.user import (
@@ -10,8 +10,9 @@ from backend.app.admin.schema.user import (
     ResetPasswordParam,
     UpdateUserParam,
 )
+from backend.app.admin.service.export_service import user_exporter
 from backend.app.admin.service.user_service import user_service
-from backend.common.enums import UserPermissionType
+from backend.common.enums import ExportFormatType, UserPermissionType
 from backend.common.pagination import DependsPagination, PageData
 from backend.common.response.response_schema import ResponseModel, ResponseSchemaModel, response_base
 from backend.common.security.jwt import DependsJwtAuth, DependsSuperUser
@@ -28,6 +29,25 @@ async def get_current_user(request: Request) -> ResponseSchemaModel[GetCurrentUs
     return response_base.success(data=data)
 
 
+@router.get(
+    '/export',
+    summary='导出用户',
+    description='行数超过阈值时转为后台任务导出并返回任务 ID，完成后通过 /tasks/exports/{task_id} 下载',
+    dependencies=[DependsJwtAuth],
+)
+async def export_users(
+    request: Request,
+    dept: Annotated[int | None, Query(description='部门 ID')] = None,
+    username: Annotated[str | None, Query(description='用户名')] = None,
+    phone: Annotated[str | None, Query(description='手机号')] = None,
+    status: Annotated[int | None, Query(description='状态')] = None,
+    fmt: Annotated[ExportFormatType, Query(alias='format', description='导出格式')] = ExportFormatType.csv,
+) -> Response:
+    return await user_exporter.response(
+        request, fmt, {'dept': dept, 'username': username, 'phone': phone, 'status': status}
+    )
+
+
 @router.get('/{pk}', summary='获取用户信息', dependencies=[DependsJwtAuth])
 async def get_userinfo(
     db: CurrentSession,
@@ -1,34 +1,50 @@
-from sqlalchemy import Select
+from collections.abc import Sequence
+from datetime import datetime
+
+from sqlalchemy import Row, Select, select
 from sqlalchemy import delete as sa_delete
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy_crud_plus import CRUDPlus
 
 from backend.app.admin.model import LoginLog
 from backend.app.admin.schema.login_log import CreateLoginLogParam
+from backend.utils.log_search import log_search_clauses
 
 
 class CRUDLoginLog(CRUDPlus[LoginLog]):
     """登录日志数据库操作类"""
 
-    async def get_select(self, username: str | None, status: int | None, ip: str | None) -> Select:
+    async def get_select(
+        self,
+        username: str | None,
+        status: int | None,
+        ip: str | None,
+        start_time: datetime | None = None,
+        end_time: datetime | None = None,
+        *,
+        exact: bool = False,
+    ) -> Select:
         """
         获取登录日志列表查询表达式
 
         :param username: 用户名
         :param status: 登录状态
-        :param ip: IP 地址
+        :param ip: IP 地址、CIDR 或 IPv4 前缀
+        :param start_time: 开始时间
+        :param end_time: 结束时间
+        :param exact: 用户名是否精确匹配
         :return:
         """
-        filters = {}
-
-        if username is not None:
-            filters['username__like'] = f'%{username}%'
-        if status is not None:
-            filters['status'] = status
-        if ip is not None:
-            filters['ip__like'] = f'%{ip}%'
-
-        return await self.select_order('created_time', 'desc', **filters)
+        clauses = log_search_clauses(
+            self.model,
+            username=username,
+            status=status,
+            ip=ip,
+            start_time=start_time,
+            end_time=end_time,
+            exact=exact,
+        )
+        return select(self.model).where(*clauses).order_by(self.model.created_time.desc())
 
     async def create(self, db: AsyncSession, obj: CreateLoginLogParam) -> None:
         """
@@ -40,6 +56,16 @@ class CRUDLoginLog(CRUDPlus[LoginLog]):
         """
         await self.create_model(db, obj, commit=True)
 
+    async def bulk_create(self, db: AsyncSession, objs: list[CreateLoginLogParam]) -> None:
+        """
+        批量创建登录日志
+
+        :param db: 数据库会话
+        :param objs: 登录日志创建参数列表
+        :return:
+        """
+        await self.create_models(db, objs)
+
     async def delete(self, db: AsyncSession, pks: list[int]) -> int:
         """
         批量删除登录日志
@@ -50,6 +76,22 @@ class CRUDLoginLog(CRUDPlus[LoginLog]):
         """
         return await self.delete_model_by_column(db, allow_multiple=True, id__in=pks)
 
+    @staticmethod
+    async def get_pk_chunk(db: AsyncSession, after_pk: int, limit: int) -> Sequence[Row]:
+        """
+        按主键顺序获取一批日志的 ID 和创建时间
+
+        :param db: 数据库会话
+        :param after_pk: 起始 ID（不包含）
+        :param limit: 获取数量
+        :return:
+        """
+        stmt = (
+            select(LoginLog.id, LoginLog.created_time).where(LoginLog.id > after_pk).order_by(LoginLog.id).limit(limit)
+        )
+        result = await db.execute(stmt)
+        return result.all()
+
     @staticmethod
     async def delete_all(db: AsyncSession) -> None:
         """
@@ -1,34 +1,50 @@
-from sqlalchemy import Select
+from collections.abc import Sequence
+from datetime import datetime
+
+from sqlalchemy import Row, Select, select
 from sqlalchemy import delete as sa_delete
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy_crud_plus import CRUDPlus
 
 from backend.app.admin.model import OperaLog
 from backend.app.admin.schema.opera_log import CreateOperaLogParam
+from backend.utils.log_search import log_search_clauses
 
 
 class CRUDOperaLogDao(CRUDPlus[OperaLog]):
     """操作日志数据库操作类"""
 
-    async def get_select(self, username: str | None, status: int | None, ip: str | None) -> Select:
+    async def get_select(
+        self,
+        username: str | None,
+        status: int | None,
+        ip: str | None,
+        start_time: datetime | None = None,
+        end_time: datetime | None = None,
+        *,
+        exact: bool = False,
+    ) -> Select:
         """
         获取操作日志列表查询表达式
 
         :param username: 用户名
         :param status: 操作状态
-        :param ip: IP 地址
+        :param ip: IP 地址、CIDR 或 IPv4 前缀
+        :param start_time: 开始时间
+        :param end_time: 结束时间
+        :param exact: 用户名是否精确匹配
         :return:
         """
-        filters = {}
-
-        if username is not None:
-            filters['username__like'] = f'%{username}%'
-        if status is not None:
-            filters['status__eq'] = status
-        if ip is not None:
-            filters['ip__like'] = f'%{ip}%'
-
-        return await self.select_order('created_time', 'desc', **filters)
+        clauses = log_search_clauses(
+            self.model,
+            username=username,
+            status=status,
+            ip=ip,
+            start_time=start_time,
+            end_time=end_time,
+            exact=exact,
+        )
+        return select(self.model).where(*clauses).order_by(self.model.created_time.desc())
 
     async def create(self, db: AsyncSession, obj: CreateOperaLogParam) -> None:
         """
@@ -60,6 +76,22 @@ class CRUDOperaLogDao(CRUDPlus[OperaLog]):
         """
         return await self.delete_model_by_column(db, allow_multiple=True, id__in=pks)
 
+    @staticmethod
+    async def get_pk_chunk(db: AsyncSession, after_pk: int, limit: int) -> Sequence[Row]:
+        """
+        按主键顺序获取一批日志的 ID 和创建时间
+
+        :param db: 数据库会话
+        :param after_pk: 起始 ID（不包含）
+        :param limit: 获取数量
+        :return:
+        """
+        stmt = (
+            select(OperaLog.id, OperaLog.created_time).where(OperaLog.id > after_pk).order_by(OperaLog.id).limit(limit)
+        )
+        result = await db.execute(stmt)
+        return result.all()
+
     @staticmethod
     async def delete_all(db: AsyncSession) -> None:
         """
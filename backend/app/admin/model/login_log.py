@@ -4,7 +4,10 @@ import sqlalchemy as sa
 
 from sqlalchemy.orm import Mapped, mapped_column
 
-from backend.common.model import DataClassBase, TimeZone, UniversalText, id_key
+from backend.common.model import DataClassBase, PackedIP, TimeZone, UniversalText, id_key
+from backend.core.conf import settings
+from backend.utils.log_search import default_ip_bin, log_search_indexes, register_log_search
+from backend.utils.partition import partition_table_args, register_partition
 from backend.utils.timezone import timezone
 
 
@@ -12,12 +15,17 @@ class LoginLog(DataClassBase):
     """登录日志表"""
 
     __tablename__ = 'sys_login_log'
+    __table_args__ = (*log_search_indexes('sys_login_log'), {'comment': '登录日志表', **partition_table_args()})
 
-    id: Mapped[id_key] = mapped_column(init=False)
+    # 分区表的唯一约束必须包含分区键，此时主键为 (id, created_time)
+    id: Mapped[id_key] = mapped_column(init=False, unique=not settings.LOG_RETENTION_PARTITION_ENABLED)
     user_uuid: Mapped[str] = mapped_column(sa.String(64), comment='用户UUID')
     username: Mapped[str] = mapped_column(sa.String(64), comment='用户名')
     status: Mapped[int] = mapped_column(insert_default=0, comment='登录状态(0失败 1成功)')
     ip: Mapped[str] = mapped_column(sa.String(64), comment='登录IP地址')
+    ip_bin: Mapped[bytes | None] = mapped_column(
+        PackedIP, init=False, insert_default=default_ip_bin, comment='IP地址（16 字节二进制，用于范围检索）'
+    )
     country: Mapped[str | None] = mapped_column(sa.String(64), comment='国家')
     region: Mapped[str | None] = mapped_column(sa.String(64), comment='地区')
     city: Mapped[str | None] = mapped_column(sa.String(64), comment='城市')
@@ -31,5 +39,10 @@ class LoginLog(DataClassBase):
         TimeZone,
         init=False,
         default_factory=timezone.now,
+        primary_key=settings.LOG_RETENTION_PARTITION_ENABLED,
         comment='创建时间',
     )
+
+
+register_partition(LoginLog.__table__)
+register_log_search(LoginLog.__table__)
@@ -4,7 +4,10 @@ import sqlalchemy as sa
 
 from sqlalchemy.orm import Mapped, mapped_column
 
-from backend.common.model import DataClassBase, TimeZone, UniversalText, id_key
+from backend.common.model import DataClassBase, PackedIP, TimeZone, UniversalText, id_key
+from backend.core.conf import settings
+from backend.utils.log_search import default_ip_bin, log_search_indexes, register_log_search
+from backend.utils.partition import partition_table_args, register_partition
 from backend.utils.timezone import timezone
 
 
@@ -12,14 +15,19 @@ class OperaLog(DataClassBase):
     """操作日志表"""
 
     __tablename__ = 'sys_opera_log'
+    __table_args__ = (*log_search_indexes('sys_opera_log'), {'comment': '操作日志表', **partition_table_args()})
 
-    id: Mapped[id_key] = mapped_column(init=False)
+    # 分区表的唯一约束必须包含分区键，此时主键为 (id, created_time)
+    id: Mapped[id_key] = mapped_column(init=False, unique=not settings.LOG_RETENTION_PARTITION_ENABLED)
     trace_id: Mapped[str] = mapped_column(sa.String(32), comment='请求跟踪 ID')
     username: Mapped[str | None] = mapped_column(sa.String(64), comment='用户名')
     method: Mapped[str] = mapped_column(sa.String(32), comment='请求类型')
     title: Mapped[str] = mapped_column(sa.String(256), comment='操作模块')
     path: Mapped[str] = mapped_column(sa.String(512), comment='请求路径')
     ip: Mapped[str] = mapped_column(sa.String(64), comment='IP地址')
+    ip_bin: Mapped[bytes | None] = mapped_column(
+        PackedIP, init=False, insert_default=default_ip_bin, comment='IP地址（16 字节二进制，用于范围检索）'
+    )
     country: Mapped[str | None] = mapped_column(sa.String(64), comment='国家')
     region: Mapped[str | None] = mapped_column(sa.String(64), comment='地区')
     city: Mapped[str | None] = mapped_column(sa.String(64), comment='城市')
@@ -34,5 +42,13 @@ class OperaLog(DataClassBase):
     cost_time: Mapped[float] = mapped_column(insert_default=0.0, comment='请求耗时（ms）')
     opera_time: Mapped[datetime] = mapped_column(TimeZone, comment='操作时间')
     created_time: Mapped[datetime] = mapped_column(
-        TimeZone, init=False, default_factory=timezone.now, comment='创建时间'
+        TimeZone,
+        init=False,
+        default_factory=timezone.now,
+        primary_key=settings.LOG_RETENTION_PARTITION_ENABLED,
+        comment='创建时间',
     )
+
+
+register_partition(OperaLog.__table__)
+register_log_search(OperaLog.__table__)
@@ -1,7 +1,6 @@
 from fastapi import Request, Response
 from fastapi.security import HTTPBasicCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
-from starlette.background import BackgroundTask, BackgroundTasks
 
 from backend.app.admin.crud.crud_menu import menu_dao
 from backend.app.admin.crud.crud_user import user_dao
@@ -80,7 +79,6 @@ class AuthService:
         db: AsyncSession,
         response: Response,
         obj: AuthLoginParam,
-        background_tasks: BackgroundTasks,
     ) -> GetLoginToken:
         """
         用户登录
@@ -89,7 +87,6 @@ class AuthService:
         :param request: 请求对象
         :param response: 响应对象
         :param obj: 登录参数
-        :param background_tasks: 后台任务
         :return:
         """
         user = None
@@ -133,23 +130,19 @@ class AuthService:
         except (errors.RequestError, errors.CustomError) as e:
             if not user:
                 log.error('登陆错误: 用户密码有误')
-            task = BackgroundTask(
-                login_log_service.create,
-                db=db,
+            login_log_service.create(
                 user_uuid=user.uuid if user else uuid4_str(),
                 username=obj.username,
                 login_time=timezone.now(),
                 status=LoginLogStatusType.fail.value,
                 msg=e.msg,
             )
-            raise errors.RequestError(code=e.code, msg=e.msg, background=task)
+            raise errors.RequestError(code=e.code, msg=e.msg)
         except Exception as e:
             log.error(f'登陆错误: {e}')
             raise
         else:
-            background_tasks.add_task(
-                login_log_service.create,
-                db=db,
+            login_log_service.create(
                 user_uuid=user.uuid,
                 username=obj.username,
                 login_time=timezone.now(),
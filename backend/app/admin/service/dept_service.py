@@ -7,6 +7,7 @@ from backend.app.admin.model import Dept
 from backend.app.admin.schema.dept import CreateDeptParam, UpdateDeptParam
 from backend.app.admin.schema.user import GetUserInfoWithRelationDetail
 from backend.common.exception import errors
+from backend.common.response.response_cache import response_cache
 from backend.core.conf import settings
 from backend.database.redis import redis_client
 from backend.utils.build_tree import get_tree_data
@@ -73,6 +74,7 @@ class DeptService:
             if not parent_dept:
                 raise errors.NotFoundError(msg='父级部门不存在')
         await dept_dao.create(db, obj)
+        response_cache.invalidate_after_commit(db, 'dept')
 
     @staticmethod
     async def update(*, db: AsyncSession, pk: int, obj: UpdateDeptParam) -> int:
@@ -96,6 +98,7 @@ class DeptService:
         if obj.parent_id == dept.id:
             raise errors.ForbiddenError(msg='禁止关联自身为父级')
         count = await dept_dao.update(db, pk, obj)
+        response_cache.invalidate_after_commit(db, 'dept')
         return count
 
     @staticmethod
@@ -116,6 +119,7 @@ class DeptService:
         if children:
             raise errors.ConflictError(msg='部门下存在子部门，无法删除')
         count = await dept_dao.delete(db, pk)
+        response_cache.invalidate_after_commit(db, 'dept')
         for user in dept.users:
             await redis_client.delete(f'{settings.JWT_USER_REDIS_PREFIX}:{user.id}')
         return count
@@ -0,0 +1,143 @@
+from collections.abc import AsyncIterator, Sequence
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import Select
+from sqlalchemy.ext.asyncio import AsyncResult
+
+from backend.app.admin.crud.crud_login_log import login_log_dao
+from backend.app.admin.crud.crud_opera_log import opera_log_dao
+from backend.app.admin.crud.crud_user import user_dao
+from backend.utils.export import ExportColumn, Exporter
+
+
+class OperaLogExporter(Exporter):
+    """操作日志导出器"""
+
+    async def get_select(
+        self,
+        *,
+        username: str | None,
+        status: int | None,
+        ip: str | None,
+        start_time: datetime | None = None,
+        end_time: datetime | None = None,
+        exact: bool = False,
+    ) -> Select:
+        return await opera_log_dao.get_select(
+            username=username, status=status, ip=ip, start_time=start_time, end_time=end_time, exact=exact
+        )
+
+
+class LoginLogExporter(Exporter):
+    """登录日志导出器"""
+
+    async def get_select(
+        self,
+        *,
+        username: str | None,
+        status: int | None,
+        ip: str | None,
+        start_time: datetime | None = None,
+        end_time: datetime | None = None,
+        exact: bool = False,
+    ) -> Select:
+        return await login_log_dao.get_select(
+            username=username, status=status, ip=ip, start_time=start_time, end_time=end_time, exact=exact
+        )
+
+
+class UserExporter(Exporter):
+    """用户导出器"""
+
+    async def get_select(
+        self, *, dept: int | None, username: str | None, phone: str | None, status: int | None
+    ) -> Select:
+        return await user_dao.get_select(dept=dept, username=username, phone=phone, status=status)
+
+    async def iter_batches(self, result: AsyncResult) -> AsyncIterator[Sequence[Any]]:
+        """
+        将按用户 ID 排序的用户、部门、角色联表结果合并为每个用户一条记录
+
+        :param result: 流式查询结果
+        :return:
+        """
+        current = None
+        async for partition in result.partitions():
+            batch = []
+            for user, dept, role in partition:
+                if current is None or current[0].id != user.id:
+                    if current is not None:
+                        batch.append(current)
+                    current = (user, dept, [])
+                if role is not None:
+                    current[2].append(role.name)
+            if batch:
+                yield batch
+        if current is not None:
+            yield [current]
+
+
+opera_log_exporter: OperaLogExporter = OperaLogExporter(
+    'opera_log',
+    [
+        ExportColumn('ID', 'id'),
+        ExportColumn('跟踪 ID', 'trace_id'),
+        ExportColumn('用户名', 'username'),
+        ExportColumn('请求方法', 'method'),
+        ExportColumn('操作模块', 'title'),
+        ExportColumn('请求路径', 'path'),
+        ExportColumn('IP 地址', 'ip'),
+        ExportColumn('国家', 'country'),
+        ExportColumn('地区', 'region'),
+        ExportColumn('城市', 'city'),
+        ExportColumn('请求头', 'user_agent'),
+        ExportColumn('操作系统', 'os'),
+        ExportColumn('浏览器', 'browser'),
+        ExportColumn('设备', 'device'),
+        ExportColumn('请求参数', 'args'),
+        ExportColumn('操作状态', 'status'),
+        ExportColumn('状态码', 'code'),
+        ExportColumn('提示消息', 'msg'),
+        ExportColumn('请求耗时（ms）', 'cost_time'),
+        ExportColumn('操作时间', 'opera_time'),
+    ],
+)
+
+login_log_exporter: LoginLogExporter = LoginLogExporter(
+    'login_log',
+    [
+        ExportColumn('ID', 'id'),
+        ExportColumn('用户 UUID', 'user_uuid'),
+        ExportColumn('用户名', 'username'),
+        ExportColumn('登录状态', 'status'),
+        ExportColumn('IP 地址', 'ip'),
+        ExportColumn('国家', 'country'),
+        ExportColumn('地区', 'region'),
+        ExportColumn('城市', 'city'),
+        ExportColumn('请求头', 'user_agent'),
+        ExportColumn('操作系统', 'os'),
+        ExportColumn('浏览器', 'browser'),
+        ExportColumn('设备', 'device'),
+        ExportColumn('提示消息', 'msg'),
+        ExportColumn('登录时间', 'login_time'),
+    ],
+)
+
+user_exporter: UserExporter = UserExporter(
+    'user',
+    [
+        ExportColumn('ID', lambda record: record[0].id),
+        ExportColumn('用户名', lambda record: record[0].username),
+        ExportColumn('昵称', lambda record: record[0].nickname),
+        ExportColumn('邮箱', lambda record: record[0].email),
+        ExportColumn('手机号', lambda record: record[0].phone),
+        ExportColumn('部门', lambda record: record[1].name if record[1] else None),
+        ExportColumn('角色', lambda record: ','.join(record[2])),
+        ExportColumn('状态', lambda record: record[0].status),
+        ExportColumn('超级管理员', lambda record: record[0].is_superuser),
+        ExportColumn('后台管理', lambda record: record[0].is_staff),
+        ExportColumn('注册时间', lambda record: record[0].join_time),
+        ExportColumn('上次登录时间', lambda record: record[0].last_login_time),
+    ],
+)
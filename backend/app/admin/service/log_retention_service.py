@@ -0,0 +1,102 @@
+import asyncio
+
+from collections.abc import Callable
+from datetime import timedelta
+
+from backend.app.admin.crud.crud_login_log import CRUDLoginLog, login_log_dao
+from backend.app.admin.crud.crud_opera_log import CRUDOperaLogDao, opera_log_dao
+from backend.common.log import log
+from backend.core.conf import settings
+from backend.database.db import async_db_session
+from backend.utils.partition import create_partitions, drop_expired_partitions, get_partitions, partition_enabled
+from backend.utils.timezone import timezone
+
+
+class LogRetentionService:
+    """日志保留策略服务类"""
+
+    @staticmethod
+    async def _purge(
+        *,
+        dao: CRUDOperaLogDao | CRUDLoginLog,
+        keep_days: int,
+        progress: Callable[[dict], None] | None = None,
+    ) -> dict:
+        """
+        清理超出保留天数的日志
+
+        启用分区时优先删除整个过期分区，剩余数据按主键顺序分批删除，每批使用独立事务并在批次间休眠，避免长时间锁表
+
+        :param dao: 日志数据库操作类
+        :param keep_days: 保留天数
+        :param progress: 进度回调
+        :return:
+        """
+        table = dao.model.__tablename__
+        before = timezone.now() - timedelta(days=keep_days)
+        chunk_size = settings.LOG_RETENTION_CHUNK_SIZE
+        stats = {
+            'table': table,
+            'before': timezone.to_str(before),
+            'deleted': 0,
+            'dropped_partitions': [],
+            'created_partitions': [],
+        }
+
+        if partition_enabled():
+            async with async_db_session.begin() as db:
+                partitions = await get_partitions(db, table)
+                if partitions:
+                    stats['dropped_partitions'] = await drop_expired_partitions(db, table, partitions, before)
+                    stats['created_partitions'] = await create_partitions(db, table, partitions)
+            if progress:
+                progress(stats)
+
+        last_pk = 0
+        while True:
+            async with async_db_session.begin() as db:
+                rows = await dao.get_pk_chunk(db, last_pk, chunk_size)
+                expired = [row.id for row in rows if row.created_time < before]
+                if expired:
+                    await dao.delete(db, expired)
+            stats['deleted'] += len(expired)
+            if progress:
+                progress(stats)
+
+            # 主键与创建时间同序递增，出现未过期的数据即可结束
+            if len(rows) < chunk_size or len(expired) < len(rows):
+                break
+            last_pk = rows[-1].id
+            await asyncio.sleep(settings.LOG_RETENTION_CHUNK_SLEEP)
+
+        log.info(f'日志表 {table} 清理完成：{stats}')
+        return stats
+
+    async def purge_opera_log(self, *, progress: Callable[[dict], None] | None = None) -> dict:
+        """
+        清理过期操作日志
+
+        :param progress: 进度回调
+        :return:
+        """
+        return await self._purge(
+            dao=opera_log_dao,
+            keep_days=settings.LOG_RETENTION_OPERA_LOG_DAYS,
+            progress=progress,
+        )
+
+    async def purge_login_log(self, *, progress: Callable[[dict], None] | None = None) -> dict:
+        """
+        清理过期登录日志
+
+        :param progress: 进度回调
+        :return:
+        """
+        return await self._purge(
+            dao=login_log_dao,
+            keep_days=settings.LOG_RETENTION_LOGIN_LOG_DAYS,
+            progress=progress,
+        )
+
+
+log_retention_service: LogRetentionService = LogRetentionService()
@@ -8,29 +8,44 @@ from backend.app.admin.schema.login_log import CreateLoginLogParam, DeleteLoginL
 from backend.common.context import ctx
 from backend.common.log import log
 from backend.common.pagination import paging_data
+from backend.common.queue import BatchWriter
+from backend.core.conf import settings
 
 
 class LoginLogService:
     """登录日志服务类"""
 
     @staticmethod
-    async def get_list(*, db: AsyncSession, username: str | None, status: int | None, ip: str | None) -> dict[str, Any]:
+    async def get_list(
+        *,
+        db: AsyncSession,
+        username: str | None,
+        status: int | None,
+        ip: str | None,
+        start_time: datetime | None = None,
+        end_time: datetime | None = None,
+        exact: bool = False,
+    ) -> dict[str, Any]:
         """
         获取登录日志列表
 
         :param db: 数据库会话
         :param username: 用户名
         :param status: 状态
-        :param ip: IP 地址
+        :param ip: IP 地址、CIDR 或 IPv4 前缀
+        :param start_time: 开始时间
+        :param end_time: 结束时间
+        :param exact: 用户名是否精确匹配
         :return:
         """
-        log_select = await login_log_dao.get_select(username=username, status=status, ip=ip)
+        log_select = await login_log_dao.get_select(
+            username=username, status=status, ip=ip, start_time=start_time, end_time=end_time, exact=exact
+        )
         return await paging_data(db, log_select)
 
     @staticmethod
-    async def create(
+    def create(
         *,
-        db: AsyncSession,
         user_uuid: str,
         username: str,
         login_time: datetime,
@@ -38,9 +53,8 @@ class LoginLogService:
         msg: str,
     ) -> None:
         """
-        创建登录日志
+        创建登录日志，写入队列后由登录日志消费者批量写入
 
-        :param db: 数据库会话
         :param user_uuid: 用户 UUID
         :param username: 用户名
         :param login_time: 登录时间
@@ -64,10 +78,21 @@ class LoginLogService:
                 msg=msg,
                 login_time=login_time,
             )
-            await login_log_dao.create(db, obj)
+            login_log_writer.offer(obj)
         except Exception as e:
             log.error(f'登录日志创建失败: {e}')
 
+    @staticmethod
+    async def bulk_create(*, db: AsyncSession, objs: list[CreateLoginLogParam]) -> None:
+        """
+        批量创建登录日志
+
+        :param db: 数据库会话
+        :param objs: 登录日志创建参数列表
+        :return:
+        """
+        await login_log_dao.bulk_create(db, objs)
+
     @staticmethod
     async def delete(*, db: AsyncSession, obj: DeleteLoginLogParam) -> int:
         """
@@ -87,3 +112,11 @@ class LoginLogService:
 
 
 login_log_service: LoginLogService = LoginLogService()
+
+login_log_writer: BatchWriter[CreateLoginLogParam] = BatchWriter(
+    'login',
+    lambda db, objs: login_log_service.bulk_create(db=db, objs=objs),
+    maxsize=settings.LOGIN_LOG_QUEUE_MAXSIZE,
+    batch_size=settings.LOGIN_LOG_QUEUE_BATCH_CONSUME_SIZE,
+    timeout=settings.LOGIN_LOG_QUEUE_TIMEOUT,
+)
@@ -8,6 +8,7 @@ from backend.app.admin.model import Menu
 from backend.app.admin.schema.menu import CreateMenuParam, UpdateMenuParam
 from backend.app.admin.utils.cache import user_cache_manager
 from backend.common.exception import errors
+from backend.common.response.response_cache import response_cache
 from backend.utils.build_tree import get_tree_data, get_vben5_tree_data
 
 
@@ -87,6 +88,7 @@ class MenuService:
             if not parent_menu:
                 raise errors.NotFoundError(msg='父级菜单不存在')
         await menu_dao.create(db, obj)
+        response_cache.invalidate_after_commit(db, 'menu')
 
     @staticmethod
     async def update(*, db: AsyncSession, pk: int, obj: UpdateMenuParam) -> int:
@@ -111,6 +113,7 @@ class MenuService:
         if obj.parent_id == menu.id:
             raise errors.ForbiddenError(msg='禁止关联自身为父级')
         count = await menu_dao.update(db, pk, obj)
+        response_cache.invalidate_after_commit(db, 'menu')
         await user_cache_manager.clear_by_menu_id(db, [pk])
         return count
 
@@ -128,6 +131,7 @@ class MenuService:
         if children:
             raise errors.ConflictError(msg='菜单下存在子菜单，无法删除')
         count = await menu_dao.delete(db, pk)
+        response_cache.invalidate_after_commit(db, 'menu')
         if count:
             await user_cache_manager.clear_by_menu_id(db, [pk])
         return count
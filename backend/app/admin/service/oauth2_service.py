@@ -2,8 +2,7 @@
 # -*- coding: utf-8 -*-
 from typing import Any
 
-from fast_captcha import text_captcha
-from fastapi import BackgroundTasks, Request, Response
+from fastapi import Request, Response
 
 from backend.app.admin.conf import admin_settings
 from backend.app.admin.crud.crud_user import user_dao
@@ -18,8 +17,11 @@ from backend.common.security import jwt
 from backend.core.conf import settings
 from backend.database.db import async_db_session
 from backend.database.redis import redis_client
+from backend.utils.import_parse import lazy_import
 from backend.utils.timezone import timezone
 
+fast_captcha = lazy_import('fast_captcha')
+
 
 class OAuth2Service:
     """OAuth2 认证服务类"""
@@ -29,7 +31,6 @@ class OAuth2Service:
         *,
         request: Request,
         response: Response,
-        background_tasks: BackgroundTasks,
         user: dict[str, Any],
         social: UserSocialType,
     ) -> GetLoginToken | None:
@@ -38,7 +39,6 @@ class OAuth2Service:
 
         :param request: FastAPI 请求对象
         :param response: FastAPI 响应对象
-        :param background_tasks: FastAPI 后台任务
         :param user: OAuth2 用户信息
         :param social: 社交平台类型
         :return:
@@ -60,10 +60,10 @@ class OAuth2Service:
             if not sys_user:
                 sys_user = await user_dao.get_by_username(db, social_username)
                 if sys_user:
-                    social_username = f'{social_username}#{text_captcha(5)}'
+                    social_username = f'{social_username}#{fast_captcha.text_captcha(5)}'
                 sys_user = await user_dao.get_by_nickname(db, social_nickname)
                 if sys_user:
-                    social_username = f'{social_nickname}#{text_captcha(5)}'
+                    social_username = f'{social_nickname}#{fast_captcha.text_captcha(5)}'
                 new_sys_user = RegisterUserParam(
                     username=social_username, password=None, nickname=social_username, email=social_email
                 )
@@ -92,16 +92,13 @@ class OAuth2Service:
             refresh_token = await jwt.create_refresh_token(str(sys_user_id), multi_login=sys_user.is_multi_login)
             await user_dao.update_login_time(db, sys_user.username)
             await db.refresh(sys_user)
-            login_log = dict(
-                db=db,
-                request=request,
+            login_log_service.create(
                 user_uuid=sys_user.uuid,
                 username=sys_user.username,
                 login_time=timezone.now(),
                 status=LoginLogStatusType.success.value,
                 msg='登录成功（OAuth2）',
             )
-            background_tasks.add_task(login_log_service.create, **login_log)
             await redis_client.delete(f'{admin_settings.CAPTCHA_LOGIN_REDIS_PREFIX}:{request.state.ip}')
             response.set_cookie(
                 key=settings.COOKIE_REFRESH_TOKEN_KEY,
@@ -1,3 +1,4 @@
+from datetime import datetime
 from typing import Any
 
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -11,17 +12,31 @@ class OperaLogService:
     """操作日志服务类"""
 
     @staticmethod
-    async def get_list(*, db: AsyncSession, username: str | None, status: int | None, ip: str | None) -> dict[str, Any]:
+    async def get_list(
+        *,
+        db: AsyncSession,
+        username: str | None,
+        status: int | None,
+        ip: str | None,
+        start_time: datetime | None = None,
+        end_time: datetime | None = None,
+        exact: bool = False,
+    ) -> dict[str, Any]:
         """
         获取操作日志列表
 
         :param db: 数据库会话
         :param username: 用户名
         :param status: 状态
-        :param ip: IP 地址
+        :param ip: IP 地址、CIDR 或 IPv4 前缀
+        :param start_time: 开始时间
+        :param end_time: 结束时间
+        :param exact: 用户名是否精确匹配
         :return:
         """
-        log_select = await opera_log_dao.get_select(username=username, status=status, ip=ip)
+        log_select = await opera_log_dao.get_select(
+            username=username, status=status, ip=ip, start_time=start_time, end_time=end_time, exact=exact
+        )
         return await paging_data(db, log_select)
 
     @staticmethod
@@ -12,10 +12,12 @@ from fastapi import UploadFile
 
 from backend.common.enums import PluginType, StatusType
 from backend.common.exception import errors
+from backend.common.response.response_cache import response_cache
 from backend.core.conf import settings
 from backend.core.path_conf import PLUGIN_DIR
 from backend.database.redis import redis_client
 from backend.plugin.tools import uninstall_requirements_async
+from backend.utils.dynamic_config import has_config_plugin
 from backend.utils.file_ops import install_git_plugin, install_zip_plugin
 from backend.utils.timezone import timezone
 
@@ -70,8 +72,10 @@ class PluginService:
         await uninstall_requirements_async(plugin)
         bacup_dir = PLUGIN_DIR / f'{plugin}.{timezone.now().strftime("%Y%m%d%H%M%S")}.backup'
         shutil.move(plugin_dir, bacup_dir)
+        has_config_plugin.cache_clear()
         await redis_client.delete(f'{settings.PLUGIN_REDIS_PREFIX}:{plugin}')
         await redis_client.set(f'{settings.PLUGIN_REDIS_PREFIX}:changed', 'ture')
+        await response_cache.invalidate('plugin')
 
     @staticmethod
     async def update_status(*, plugin: str) -> None:
@@ -94,6 +98,7 @@ class PluginService:
         )
         plugin_info['plugin']['enable'] = new_status
         await redis_client.set(f'{settings.PLUGIN_REDIS_PREFIX}:{plugin}', json.dumps(plugin_info, ensure_ascii=False))
+        await response_cache.invalidate('plugin')
 
     @staticmethod
     async def build(*, plugin: str) -> io.BytesIO:
@@ -17,6 +17,7 @@ from backend.app.admin.schema.role import (
 from backend.app.admin.utils.cache import user_cache_manager
 from backend.common.exception import errors
 from backend.common.pagination import paging_data
+from backend.common.response.response_cache import response_cache
 from backend.utils.build_tree import get_tree_data
 
 
@@ -110,6 +111,7 @@ class RoleService:
         if role:
             raise errors.ConflictError(msg='角色已存在')
         await role_dao.create(db, obj)
+        response_cache.invalidate_after_commit(db, 'role')
 
     @staticmethod
     async def update(*, db: AsyncSession, pk: int, obj: UpdateRoleParam) -> int:
@@ -128,6 +130,7 @@ class RoleService:
         if role.name != obj.name and await role_dao.get_by_name(db, obj.name):
             raise errors.ConflictError(msg='角色已存在')
         count = await role_dao.update(db, pk, obj)
+        response_cache.invalidate_after_commit(db, 'role')
         await user_cache_manager.clear_by_role_id(db, [pk])
         return count
 
@@ -150,6 +153,7 @@ class RoleService:
             if not menu:
                 raise errors.NotFoundError(msg='菜单不存在')
         count = await role_dao.update_menus(db, pk, menu_ids)
+        response_cache.invalidate_after_commit(db, 'role')
         await user_cache_manager.clear_by_role_id(db, [pk])
         return count
 
@@ -186,6 +190,7 @@ class RoleService:
         """
 
         count = await role_dao.delete(db, obj.pks)
+        response_cache.invalidate_after_commit(db, 'role')
         await user_cache_manager.clear_by_role_id(db, obj.pks)
         return count
 
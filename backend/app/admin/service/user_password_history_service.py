@@ -9,7 +9,7 @@ from backend.app.admin.schema.user_password_history import CreateUserPasswordHis
 from backend.common.exception import errors
 from backend.core.conf import settings
 from backend.database.redis import redis_client
-from backend.utils.dynamic_config import load_user_security_config
+from backend.utils.dynamic_config import get_user_security_config
 from backend.utils.timezone import timezone
 
 
@@ -49,9 +49,9 @@ class UserPasswordHistoryService:
         :param user_id: 用户 ID
         :return:
         """
-        await load_user_security_config(db)
+        security_config = await get_user_security_config()
 
-        if settings.USER_LOCK_THRESHOLD == 0:
+        if security_config.lock_threshold == 0:
             return
 
         failure_count = await redis_client.get(f'{settings.LOGIN_FAILURE_PREFIX}:{user_id}')
@@ -59,8 +59,8 @@ class UserPasswordHistoryService:
         failure_count += 1
         await redis_client.set(f'{settings.LOGIN_FAILURE_PREFIX}:{user_id}', str(failure_count))
 
-        if failure_count >= settings.USER_LOCK_THRESHOLD:
-            locked_until = timezone.now() + timedelta(seconds=settings.USER_LOCK_SECONDS)
+        if failure_count >= security_config.lock_threshold:
+            locked_until = timezone.now() + timedelta(seconds=security_config.lock_seconds)
             await redis_client.set(f'{settings.USER_LOCK_REDIS_PREFIX}:{user_id}', timezone.to_str(locked_until))
             raise errors.AuthorizationError(msg='登录失败次数过多，账号已被锁定')
 
@@ -73,21 +73,21 @@ class UserPasswordHistoryService:
         :param password_changed_time: 密码修改时间
         :return:
         """
-        await load_user_security_config(db)
+        security_config = await get_user_security_config()
 
-        if settings.USER_PASSWORD_EXPIRY_DAYS == 0:
+        if security_config.password_expiry_days == 0:
             return None
 
         if not password_changed_time:
             raise errors.AuthorizationError(msg='密码已过期，请修改密码后重新登录')
 
-        expiry_time = password_changed_time + timedelta(days=settings.USER_PASSWORD_EXPIRY_DAYS)
+        expiry_time = password_changed_time + timedelta(days=security_config.password_expiry_days)
         days_remaining = (expiry_time - timezone.now()).days
 
         if days_remaining < 0:
             raise errors.AuthorizationError(msg='密码已过期，请修改密码后重新登录')
 
-        if days_remaining <= settings.USER_PASSWORD_REMINDER_DAYS:
+        if days_remaining <= security_config.password_reminder_days:
             return days_remaining
 
         return None
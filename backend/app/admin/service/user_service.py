@@ -92,9 +92,8 @@ class UserService:
             raise errors.RequestError(msg='密码不允许为空')
         if not await dept_dao.get(db, obj.dept_id):
             raise errors.NotFoundError(msg='部门不存在')
-        for role_id in obj.roles:
-            if not await role_dao.get(db, role_id):
-                raise errors.NotFoundError(msg='角色不存在')
+        if obj.roles and len(await role_dao.get_by_ids(db, obj.roles)) != len(set(obj.roles)):
+            raise errors.NotFoundError(msg='角色不存在')
         await user_dao.add(db, obj)
 
     @staticmethod
@@ -114,9 +113,8 @@ class UserService:
             raise errors.ConflictError(msg='用户名已注册')
         if obj.dept_id and obj.dept_id != user.dept_id and not await dept_dao.get(db, dept_id=obj.dept_id):
             raise errors.NotFoundError(msg='部门不存在')
-        for role_id in obj.roles:
-            if not await role_dao.get(db, role_id):
-                raise errors.NotFoundError(msg='角色不存在')
+        if obj.roles and len(await role_dao.get_by_ids(db, obj.roles)) != len(set(obj.roles)):
+            raise errors.NotFoundError(msg='角色不存在')
         count = await user_dao.update(db, user, obj)
         await redis_client.delete(f'{settings.JWT_USER_REDIS_PREFIX}:{user.id}')
         return count
@@ -4,8 +4,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.app.admin.crud.crud_user_password_history import user_password_history_dao
 from backend.common.exception import errors
-from backend.core.conf import settings
-from backend.utils.dynamic_config import load_user_security_config
+from backend.utils.dynamic_config import get_user_security_config
 from backend.utils.re_verify import is_has_letter, is_has_number, is_has_special_char
 
 password_hash = PasswordHash((BcryptHasher(),))
@@ -42,13 +41,13 @@ async def validate_new_password(db: AsyncSession, user_id: int, new_password: st
     :param new_password: 新密码
     :return:
     """
-    await load_user_security_config(db)
+    security_config = await get_user_security_config()
 
-    if len(new_password) < settings.USER_PASSWORD_MIN_LENGTH:
-        raise errors.RequestError(msg=f'密码长度不能少于 {settings.USER_PASSWORD_MIN_LENGTH} 个字符')
+    if len(new_password) < security_config.password_min_length:
+        raise errors.RequestError(msg=f'密码长度不能少于 {security_config.password_min_length} 个字符')
 
-    if len(new_password) > settings.USER_PASSWORD_MAX_LENGTH:
-        raise errors.RequestError(msg=f'密码长度不能超过 {settings.USER_PASSWORD_MAX_LENGTH} 个字符')
+    if len(new_password) > security_config.password_max_length:
+        raise errors.RequestError(msg=f'密码长度不能超过 {security_config.password_max_length} 个字符')
 
     if not is_has_number(new_password):
         raise errors.RequestError(msg='密码必须包含数字')
@@ -56,13 +55,13 @@ async def validate_new_password(db: AsyncSession, user_id: int, new_password: st
     if not is_has_letter(new_password):
         raise errors.RequestError(msg='密码必须包含字母')
 
-    if settings.USER_PASSWORD_REQUIRE_SPECIAL_CHAR and not is_has_special_char(new_password):
+    if security_config.password_require_special_char and not is_has_special_char(new_password):
         raise errors.RequestError(msg='密码必须包含特殊字符（如：!@#$%）')
 
     password_history = await user_password_history_dao.get_by_user_id(db, user_id)
 
-    for hist in password_history[: settings.USER_PASSWORD_HISTORY_CHECK_COUNT]:
+    for hist in password_history[: security_config.password_history_check_count]:
         if password_verify(new_password, hist.password):
             raise errors.RequestError(
-                msg=f'新密码不能与最近 {settings.USER_PASSWORD_HISTORY_CHECK_COUNT} 次使用的密码相同'
+                msg=f'新密码不能与最近 {security_config.password_history_check_count} 次使用的密码相同'
             )
@@ -1,11 +1,13 @@
 from starlette.concurrency import run_in_threadpool
 
-from backend.app.task.celery import celery_app
 from backend.common.socketio.server import sio
+from backend.utils.import_parse import lazy_import
+
+task_celery = lazy_import('backend.app.task.celery')
 
 
 @sio.event
 async def task_worker_status(sid, data) -> None:  # noqa: ANN001
     """任务 Worker 状态事件"""
-    worker = await run_in_threadpool(celery_app.control.ping)
+    worker = await run_in_threadpool(task_celery.celery_app.control.ping)
     await sio.emit('task_worker_status', worker, sid)
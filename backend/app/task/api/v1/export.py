@@ -0,0 +1,22 @@
+from typing import Annotated
+
+from fastapi import APIRouter, Path, Request
+from starlette.responses import FileResponse
+
+from backend.app.task.service.export_service import task_export_service
+from backend.common.security.jwt import DependsJwtAuth
+
+router = APIRouter()
+
+
+@router.get(
+    '/{task_id}',
+    summary='下载后台导出文件',
+    description='仅发起导出的用户可下载，文件过期后不可下载',
+    dependencies=[DependsJwtAuth],
+)
+async def download_export(
+    request: Request,
+    task_id: Annotated[str, Path(description='导出任务 ID')],
+) -> FileResponse:
+    return await task_export_service.download(request=request, task_id=task_id)
@@ -3,6 +3,8 @@ import os
 import celery
 import celery_aio_pool
 
+from celery.signals import beat_init, worker_init
+
 from backend.app.task.tasks.beat import LOCAL_BEAT_SCHEDULE
 from backend.core.conf import settings
 from backend.core.path_conf import BASE_PATH
@@ -18,6 +20,14 @@ def find_task_packages() -> list[str]:
     return packages
 
 
+def start_metrics(**kwargs) -> None:
+    """Celery worker / beat 启动时清理已退出进程的指标文件并启动指标接口"""
+    from backend.common.metrics import clean_dead_process_metrics, start_metrics_server
+
+    clean_dead_process_metrics()
+    start_metrics_server(settings.METRICS_CELERY_HOST, settings.METRICS_CELERY_PORT)
+
+
 def init_celery() -> celery.Celery:
     """初始化 Celery 应用"""
 
@@ -55,12 +65,20 @@ def init_celery() -> celery.Celery:
 
     # 在 Celery 中设置此参数无效
     # 参数：https://github.com/celery/celery/issues/7270
-    app.loader.override_backends = {'db': 'backend.app.task.database:DatabaseBackend'}
+    database_backend = 'DatabaseBackend'
+    if settings.CELERY_RESULT_BACKEND_BATCHED:
+        database_backend = 'BatchedDatabaseBackend'
+    app.loader.override_backends = {'db': f'backend.app.task.database:{database_backend}'}
 
     # 自动发现任务
     packages = find_task_packages()
     app.autodiscover_tasks(packages)
 
+    # 指标接口
+    if settings.METRICS_ENABLED:
+        worker_init.connect(start_metrics, weak=False)
+        beat_init.connect(start_metrics, weak=False)
+
     return app
 
 
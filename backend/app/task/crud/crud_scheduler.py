@@ -1,11 +1,14 @@
 from collections.abc import Sequence
 
-from sqlalchemy import Select
+import sqlalchemy as sa
+
+from sqlalchemy import Select, case, literal, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy_crud_plus import CRUDPlus
 
 from backend.app.task.model import TaskScheduler
 from backend.app.task.schema.scheduler import CreateTaskSchedulerParam, UpdateTaskSchedulerParam
+from backend.core.conf import settings
 
 
 class CRUDTaskScheduler(CRUDPlus[TaskScheduler]):
@@ -111,5 +114,54 @@ class CRUDTaskScheduler(CRUDPlus[TaskScheduler]):
         TaskScheduler.no_changes = False
         return 1
 
+    @staticmethod
+    async def bulk_update_run_state(db: AsyncSession, states: list[dict]) -> int:
+        """
+        批量更新任务调度运行状态
+
+        PostgreSQL 使用 UPDATE ... FROM (VALUES ...)，MySQL 使用 CASE 表达式，均为单条语句
+
+        :param db: 数据库会话
+        :param states: 运行状态列表，包含 id、last_run_time 和 total_run_count
+        :return:
+        """
+        if not states:
+            return 0
+
+        table = TaskScheduler.__table__
+        if settings.DATABASE_TYPE == 'postgresql':
+            run_state = sa.values(
+                sa.column('id', table.c.id.type),
+                sa.column('last_run_time', table.c.last_run_time.type),
+                sa.column('total_run_count', table.c.total_run_count.type),
+                name='run_state',
+            ).data([(state['id'], state['last_run_time'], state['total_run_count']) for state in states])
+            stmt = (
+                update(TaskScheduler)
+                .where(TaskScheduler.id == run_state.c.id)
+                .values(last_run_time=run_state.c.last_run_time, total_run_count=run_state.c.total_run_count)
+            )
+        else:
+            run_time_type = table.c.last_run_time.type
+            stmt = (
+                update(TaskScheduler)
+                .where(TaskScheduler.id.in_([state['id'] for state in states]))
+                .values(
+                    last_run_time=case(
+                        *[
+                            (TaskScheduler.id == state['id'], literal(state['last_run_time'], run_time_type))
+                            for state in states
+                        ],
+                        else_=TaskScheduler.last_run_time,
+                    ),
+                    total_run_count=case(
+                        *[(TaskScheduler.id == state['id'], state['total_run_count']) for state in states],
+                        else_=TaskScheduler.total_run_count,
+                    ),
+                )
+            )
+        result = await db.execute(stmt.execution_options(synchronize_session=False))
+        return result.rowcount
+
 
 task_scheduler_dao: CRUDTaskScheduler = CRUDTaskScheduler(TaskScheduler)
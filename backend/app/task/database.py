@@ -1,18 +1,32 @@
+import os
+import threading
+
+from multiprocessing.util import Finalize
+
 from celery import states
 from celery.backends.base import BaseBackend
 from celery.backends.database import retry, session_cleanup
 from celery.exceptions import ImproperlyConfigured
+from celery.utils.log import get_logger
 from celery.utils.time import maybe_timedelta
-from sqlalchemy import PickleType
+from msgspec import msgpack
+from redis import Redis
+from sqlalchemy import Insert, PickleType
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
 
 from backend.app.task.model.result import Task, TaskExtended, TaskSet
 from backend.app.task.session import SessionManager
+from backend.core.conf import settings
+from backend.utils.timezone import timezone
 
 """
 重写 from celery.backends.database 内部 DatabaseBackend 类，此类实现与模型配合不佳，导致 fba 创建表和 alembic 迁移困难
 """
 
+logger = get_logger('fba.result_backend')
+
 
 class DatabaseBackend(BaseBackend):
     """The database result backend."""
@@ -176,3 +190,168 @@ class DatabaseBackend(BaseBackend):
         kwargs = kwargs or {}
         kwargs.update({'dburi': self.url, 'expires': self.expires, 'engine_options': self.engine_options})
         return super().__reduce__(args, kwargs)
+
+
+class BatchedDatabaseBackend(DatabaseBackend):
+    """
+    批量写入的数据库结果后端
+
+    任务状态先写入进程内缓冲区，由后台线程按批次 upsert 到数据库；同一任务在刷新前的多次状态变更
+    （如 STARTED → SUCCESS）只写入最终状态。读取时依次查询缓冲区、Redis 快速通道和数据库，保证写后可读
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.batch_size = settings.CELERY_RESULT_BATCH_SIZE
+        self.flush_interval = settings.CELERY_RESULT_FLUSH_INTERVAL
+        self.fast_path_expire = settings.CELERY_RESULT_FAST_PATH_EXPIRE_SECONDS
+        self.buffer_max_size = self.batch_size * settings.CELERY_RESULT_BUFFER_MAX_BATCHES
+        self.columns = [column.name for column in self.task_cls.__table__.columns if column.name != 'id']
+
+        self._buffer: dict[str, dict] = {}
+        self._inflight: dict[str, dict] = {}
+        self._lock = threading.Lock()
+        self._flush_event = threading.Event()
+        self._flusher: threading.Thread | None = None
+        self._pid: int | None = None
+        self._redis = Redis(
+            host=settings.REDIS_HOST,
+            port=settings.REDIS_PORT,
+            password=settings.REDIS_PASSWORD,
+            db=settings.REDIS_DATABASE,
+            socket_timeout=settings.REDIS_TIMEOUT,
+            socket_connect_timeout=settings.REDIS_TIMEOUT,
+        )
+        self._finalize = Finalize(self, self.flush, exitpriority=5)
+
+    @staticmethod
+    def fast_path_key(task_id: str) -> str:
+        return f'{settings.CELERY_REDIS_PREFIX}:result:{task_id}'
+
+    def _ensure_flusher(self) -> None:
+        """确保当前进程的后台刷新线程已启动"""
+        pid = os.getpid()
+        if self._pid == pid and self._flusher and self._flusher.is_alive():
+            return
+        with self._lock:
+            if self._pid != pid:
+                # fork 后子进程不继承线程，丢弃父进程的缓冲区副本
+                self._buffer, self._inflight = {}, {}
+                self._pid = pid
+            if not self._flusher or not self._flusher.is_alive():
+                self._flusher = threading.Thread(target=self._flush_loop, daemon=True, name='fba-result-flusher')
+                self._flusher.start()
+
+    def _flush_loop(self) -> None:
+        while True:
+            self._flush_event.wait(self.flush_interval)
+            self._flush_event.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f'批量写入任务结果失败：{e}')
+
+    def _store_result(self, task_id, result, state, traceback=None, request=None, **kwargs) -> None:  # noqa: ANN001
+        """缓冲任务状态，同一任务的后续状态覆盖之前未刷新的状态"""
+        meta = self._get_result_meta(
+            result=result,
+            state=state,
+            traceback=traceback,
+            request=request,
+            format_date=False,
+            encode=True,
+        )
+        row = {column: meta.get(column) for column in self.columns}
+        row['task_id'] = task_id
+        row['date_done'] = row['date_done'] or timezone.now()
+
+        try:
+            self._redis.set(self.fast_path_key(task_id), msgpack.encode(row), ex=self.fast_path_expire)
+        except Exception as e:
+            logger.warning(f'写入任务结果快速通道失败：{e}')
+
+        self._ensure_flusher()
+        with self._lock:
+            self._buffer[task_id] = row
+            size = len(self._buffer)
+        if size >= self.batch_size:
+            self._flush_event.set()
+
+    def flush(self) -> None:
+        """将缓冲区中的任务状态批量 upsert 到数据库"""
+        with self._lock:
+            if not self._buffer:
+                return
+            self._inflight, self._buffer = self._buffer, {}
+            rows = list(self._inflight.values())
+
+        try:
+            session = self.result_session()
+            with session_cleanup(session):
+                for i in range(0, len(rows), self.batch_size):
+                    session.execute(self._upsert_stmt(session, rows[i : i + self.batch_size]))
+                session.commit()
+        except Exception:
+            with self._lock:
+                # 写入失败时放回缓冲区，但不覆盖刷新期间产生的更新状态
+                self._buffer = {**self._inflight, **self._buffer}
+                self._inflight = {}
+                dropped = len(self._buffer) - self.buffer_max_size
+                if dropped > 0:
+                    # 数据库持续不可用时丢弃最早的状态，避免内存无限增长
+                    for task_id in list(self._buffer)[:dropped]:
+                        del self._buffer[task_id]
+            if dropped > 0:
+                logger.warning(f'任务结果缓冲区已满，丢弃最早的 {dropped} 条任务状态')
+            raise
+
+        with self._lock:
+            self._inflight = {}
+
+    def _upsert_stmt(self, session: Session, rows: list[dict]) -> Insert:
+        table = self.task_cls.__table__
+        columns = [column for column in self.columns if column != 'task_id']
+        if session.get_bind().dialect.name == 'postgresql':
+            stmt = pg_insert(table).values(rows)
+            return stmt.on_conflict_do_update(
+                index_elements=[table.c.task_id],
+                set_={column: stmt.excluded[column] for column in columns},
+            )
+        stmt = mysql_insert(table).values(rows)
+        return stmt.on_duplicate_key_update({column: stmt.inserted[column] for column in columns})
+
+    def _pending_row(self, task_id: str) -> dict | None:
+        with self._lock:
+            return self._buffer.get(task_id) or self._inflight.get(task_id)
+
+    def _meta_from_row(self, row: dict) -> dict:
+        data = {'task_id': row['task_id'], **{column: row.get(column) for column in self.columns}}
+        if data.get('args', None) is not None:
+            data['args'] = self.decode(data['args'])
+        if data.get('kwargs', None) is not None:
+            data['kwargs'] = self.decode(data['kwargs'])
+        return self.meta_from_decoded(data)
+
+    def _get_task_meta_for(self, task_id: str):  # noqa: ANN202
+        """优先从缓冲区和 Redis 快速通道读取任务状态"""
+        row = self._pending_row(task_id)
+        if row is not None:
+            return self._meta_from_row(row)
+
+        try:
+            payload = self._redis.get(self.fast_path_key(task_id))
+            row = msgpack.decode(payload) if payload is not None else None
+        except Exception as e:
+            logger.warning(f'读取任务结果快速通道失败：{e}')
+            row = None
+        if row is not None:
+            return self._meta_from_row(row)
+
+        return super()._get_task_meta_for(task_id)
+
+    def _forget(self, task_id: str) -> None:
+        """Forget about result."""
+        with self._lock:
+            self._buffer.pop(task_id, None)
+        self._redis.delete(self.fast_path_key(task_id))
+        super()._forget(task_id)
@@ -16,3 +16,13 @@ class PeriodType(StrEnum):
     MINUTES = 'minutes'
     SECONDS = 'seconds'
     MICROSECONDS = 'microseconds'
+
+
+class TaskSchedulerEventType(StrEnum):
+    """任务调度变更事件类型"""
+
+    ADD = 'add'
+    UPDATE = 'update'
+    DELETE = 'delete'
+    ENABLE = 'enable'
+    DISABLE = 'disable'
@@ -1,17 +1,25 @@
+from __future__ import annotations
+
 import asyncio
 
 from datetime import datetime
 
 import sqlalchemy as sa
 
-from sqlalchemy import event
-from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Mapped, Session, mapped_column, object_session
 
+from backend.app.task.enums import TaskSchedulerEventType
 from backend.common.exception import errors
 from backend.common.model import Base, TimeZone, UniversalText, id_key
 from backend.core.conf import settings
 from backend.database.redis import redis_client
-from backend.utils.timezone import timezone
+
+# 任务调度变更事件流
+TASK_SCHEDULER_EVENT_STREAM = f'{settings.CELERY_REDIS_PREFIX}:scheduler:events'
+
+# 会话中待发布的变更事件
+_PENDING_EVENTS_KEY = 'task_scheduler_events'
 
 
 class TaskScheduler(Base):
@@ -49,22 +57,71 @@ class TaskScheduler(Base):
 
     @classmethod
     def changed(cls, mapper, connection, target) -> None:  # noqa: ANN001
-        if not target.no_changes:
-            cls.update_changed(mapper, connection, target)
+        if target.no_changes:
+            return
+        event_type = TaskSchedulerEventType.UPDATE
+        if inspect(target).attrs.enabled.history.has_changes():
+            event_type = TaskSchedulerEventType.ENABLE if target.enabled else TaskSchedulerEventType.DISABLE
+        cls.record_event(target, event_type)
 
     @classmethod
-    async def update_changed_async(cls) -> None:
-        now = timezone.now()
-        await redis_client.set(f'{settings.CELERY_REDIS_PREFIX}:last_update', timezone.to_str(now))
+    def inserted(cls, mapper, connection, target) -> None:  # noqa: ANN001
+        cls.record_event(target, TaskSchedulerEventType.ADD)
 
     @classmethod
-    def update_changed(cls, mapper, connection, target) -> None:  # noqa: ANN001
-        asyncio.create_task(cls.update_changed_async())
+    def deleted(cls, mapper, connection, target) -> None:  # noqa: ANN001
+        cls.record_event(target, TaskSchedulerEventType.DELETE)
+
+    @classmethod
+    def record_event(cls, target: TaskScheduler, event_type: TaskSchedulerEventType) -> None:
+        """
+        记录任务调度变更事件，事务提交后统一发布
+
+        :param target: 任务调度
+        :param event_type: 事件类型
+        :return:
+        """
+        data = {'type': event_type.value, 'id': str(target.id), 'name': target.name}
+        session = object_session(target)
+        if session is None:
+            asyncio.create_task(cls.publish_events([data]))
+            return
+        session.info.setdefault(_PENDING_EVENTS_KEY, []).append(data)
+
+    @staticmethod
+    async def publish_events(events: list[dict]) -> None:
+        """
+        发布任务调度变更事件
+
+        :param events: 事件列表
+        :return:
+        """
+        async with redis_client.pipeline(transaction=False) as pipe:
+            for data in events:
+                pipe.xadd(
+                    TASK_SCHEDULER_EVENT_STREAM,
+                    data,
+                    maxlen=settings.CELERY_SCHEDULER_EVENT_STREAM_MAXLEN,
+                    approximate=True,
+                )
+            await pipe.execute()
+
+
+def publish_pending_events(session: Session) -> None:
+    events = session.info.pop(_PENDING_EVENTS_KEY, None)
+    if events:
+        asyncio.create_task(TaskScheduler.publish_events(events))
+
+
+def discard_pending_events(session: Session) -> None:
+    session.info.pop(_PENDING_EVENTS_KEY, None)
 
 
 # 事件监听器
 event.listen(TaskScheduler, 'before_insert', TaskScheduler.before_insert_or_update)
 event.listen(TaskScheduler, 'before_update', TaskScheduler.before_insert_or_update)
-event.listen(TaskScheduler, 'after_insert', TaskScheduler.update_changed)
-event.listen(TaskScheduler, 'after_delete', TaskScheduler.update_changed)
+event.listen(TaskScheduler, 'after_insert', TaskScheduler.inserted)
+event.listen(TaskScheduler, 'after_delete', TaskScheduler.deleted)
 event.listen(TaskScheduler, 'after_update', TaskScheduler.changed)
+event.listen(Session, 'after_commit', publish_pending_events)
+event.listen(Session, 'after_rollback', discard_pending_events)
@@ -3,8 +3,10 @@ from typing import Any
 
 from pydantic import ConfigDict, Field, field_serializer
 
-from backend.app.task import celery_app
 from backend.common.schema import SchemaBase
+from backend.utils.import_parse import lazy_import
+
+task_celery = lazy_import('backend.app.task.celery')
 
 
 class TaskResultSchemaBase(SchemaBase):
@@ -38,4 +40,4 @@ class GetTaskResultDetail(TaskResultSchemaBase):
 
     @field_serializer('args', 'kwargs', when_used='unless-none')
     def serialize_params(self, value: bytes | None) -> Any:
-        return celery_app.backend.decode(value)
+        return task_celery.celery_app.backend.decode(value)
@@ -0,0 +1,40 @@
+from fastapi import Request
+from starlette.concurrency import run_in_threadpool
+from starlette.responses import FileResponse
+
+from backend.common.exception import errors
+from backend.utils.export import EXPORT_TASK_NAME, get_export_file
+from backend.utils.import_parse import lazy_import
+
+task_celery = lazy_import('backend.app.task.celery')
+celery_result = lazy_import('celery.result')
+celery_states = lazy_import('celery.states')
+
+
+class TaskExportService:
+    """后台导出文件服务类"""
+
+    @staticmethod
+    async def download(*, request: Request, task_id: str) -> FileResponse:
+        """
+        下载后台导出文件，仅发起导出的用户与超级管理员可下载
+
+        :param request: FastAPI 请求对象
+        :param task_id: 导出任务 ID
+        :return:
+        """
+        result = celery_result.AsyncResult(id=task_id, app=task_celery.celery_app)
+        name, state, data = await run_in_threadpool(lambda: (result.name, result.state, result.result))
+        if name != EXPORT_TASK_NAME:
+            raise errors.NotFoundError(msg='导出任务不存在')
+        if state != celery_states.SUCCESS:
+            raise errors.RequestError(msg=f'导出任务尚未完成，当前状态：{state}')
+        if data['user_id'] != request.user.id and not request.user.is_superuser:
+            raise errors.ForbiddenError(msg='无权下载该导出文件')
+        path = get_export_file(data['filename'])
+        if path is None:
+            raise errors.NotFoundError(msg='导出文件不存在或已过期')
+        return FileResponse(path, filename=data['download_name'])
+
+
+task_export_service: TaskExportService = TaskExportService()
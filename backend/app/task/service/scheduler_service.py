@@ -6,14 +6,17 @@ from typing import Any
 from sqlalchemy.ext.asyncio import AsyncSession
 from starlette.concurrency import run_in_threadpool
 
-from backend.app.task.celery import celery_app
 from backend.app.task.crud.crud_scheduler import task_scheduler_dao
 from backend.app.task.enums import TaskSchedulerType
 from backend.app.task.model import TaskScheduler
 from backend.app.task.schema.scheduler import CreateTaskSchedulerParam, UpdateTaskSchedulerParam
-from backend.app.task.utils.tzcrontab import crontab_verify
 from backend.common.exception import errors
 from backend.common.pagination import paging_data
+from backend.utils.import_parse import lazy_import
+
+# Celery 应用在首次调用调度接口时才初始化
+task_celery = lazy_import('backend.app.task.celery')
+tzcrontab = lazy_import('backend.app.task.utils.tzcrontab')
 
 
 class TaskSchedulerService:
@@ -73,7 +76,7 @@ class TaskSchedulerService:
         if task_scheduler:
             raise errors.ConflictError(msg='任务调度已存在')
         if obj.type == TaskSchedulerType.CRONTAB:
-            crontab_verify(obj.crontab)
+            tzcrontab.crontab_verify(obj.crontab)
         await task_scheduler_dao.create(db, obj)
 
     @staticmethod
@@ -93,7 +96,7 @@ class TaskSchedulerService:
         if task_scheduler.name != obj.name and await task_scheduler_dao.get_by_name(db, obj.name):
             raise errors.ConflictError(msg='任务调度已存在')
         if task_scheduler.type == TaskSchedulerType.CRONTAB:
-            crontab_verify(obj.crontab)
+            tzcrontab.crontab_verify(obj.crontab)
         count = await task_scheduler_dao.update(db, pk, obj)
         return count
 
@@ -139,7 +142,7 @@ class TaskSchedulerService:
         :return:
         """
 
-        workers = await run_in_threadpool(celery_app.control.ping, timeout=0.5)
+        workers = await run_in_threadpool(task_celery.celery_app.control.ping, timeout=0.5)
         if not workers:
             raise errors.ServerError(msg='Celery Worker 暂不可用，请稍后重试')
         task_scheduler = await task_scheduler_dao.get(db, pk)
@@ -151,7 +154,7 @@ class TaskSchedulerService:
         except (TypeError, json.JSONDecodeError):
             raise errors.RequestError(msg='执行失败，任务参数非法')
         else:
-            celery_app.send_task(name=task_scheduler.task, args=args, kwargs=kwargs)
+            task_celery.celery_app.send_task(name=task_scheduler.task, args=args, kwargs=kwargs)
 
 
 task_scheduler_service: TaskSchedulerService = TaskSchedulerService()
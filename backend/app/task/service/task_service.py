@@ -1,20 +1,23 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
-from celery.exceptions import NotRegistered
-from celery.result import AsyncResult
 from starlette.concurrency import run_in_threadpool
 
-from backend.app.task.celery import celery_app
 from backend.app.task.schema.task import RunParam, TaskResult
 from backend.common.exception import errors
 from backend.common.exception.errors import NotFoundError
+from backend.utils.import_parse import lazy_import
+
+# Celery 应用在首次调用任务接口时才初始化
+task_celery = lazy_import('backend.app.task.celery')
+celery_result = lazy_import('celery.result')
+celery_exceptions = lazy_import('celery.exceptions')
 
 
 class TaskService:
     @staticmethod
     async def get_list() -> list[str]:
         """获取所有已注册的 Celery 任务列表"""
-        registered_tasks = await run_in_threadpool(celery_app.control.inspect().registered)
+        registered_tasks = await run_in_threadpool(task_celery.celery_app.control.inspect().registered)
         if not registered_tasks:
             raise errors.ForbiddenError(msg='Celery 服务未启动')
         tasks = list(registered_tasks.values())[0]
@@ -29,8 +32,8 @@ class TaskService:
         :return:
         """
         try:
-            result = AsyncResult(id=tid, app=celery_app)
-        except NotRegistered:
+            result = celery_result.AsyncResult(id=tid, app=task_celery.celery_app)
+        except celery_exceptions.NotRegistered:
             raise NotFoundError(msg='任务不存在')
         return TaskResult(
             result=result.result,
@@ -53,8 +56,8 @@ class TaskService:
         :return:
         """
         try:
-            result = AsyncResult(id=tid, app=celery_app)
-        except NotRegistered:
+            result = celery_result.AsyncResult(id=tid, app=task_celery.celery_app)
+        except celery_exceptions.NotRegistered:
             raise NotFoundError(msg='任务不存在')
         result.revoke(terminate=True)
 
@@ -66,7 +69,7 @@ class TaskService:
         :param obj: 任务运行参数
         :return:
         """
-        task: AsyncResult = celery_app.send_task(name=obj.name, args=obj.args, kwargs=obj.kwargs)
+        task = task_celery.celery_app.send_task(name=obj.name, args=obj.args, kwargs=obj.kwargs)
         return task.task_id
 
 
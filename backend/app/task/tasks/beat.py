@@ -26,4 +26,8 @@ LOCAL_BEAT_SCHEDULE = {
         'task': 'backend.app.task.tasks.db_log.tasks.delete_db_login_log',
         'schedule': TzAwareCrontab('0', '0', day_of_month='15'),
     },
+    '清理过期导出文件': {
+        'task': 'backend.app.task.tasks.export.tasks.delete_expired_export_files',
+        'schedule': TzAwareCrontab('0'),
+    },
 }
@@ -1,21 +1,19 @@
-from celery import shared_task
+from celery import Task, shared_task
 
-from backend.app.admin.service.login_log_service import login_log_service
-from backend.app.admin.service.opera_log_service import opera_log_service
-from backend.database.db import async_db_session
+from backend.app.admin.service.log_retention_service import log_retention_service
 
 
-@shared_task
-async def delete_db_opera_log() -> str:
-    """自动删除数据库操作日志"""
-    async with async_db_session.begin() as db:
-        await opera_log_service.delete_all(db=db)
-        return 'Success'
+@shared_task(bind=True)
+async def delete_db_opera_log(self: Task) -> dict:
+    """按保留策略清理数据库操作日志"""
+    return await log_retention_service.purge_opera_log(
+        progress=lambda meta: self.update_state(state='PROGRESS', meta=dict(meta)),
+    )
 
 
-@shared_task
-async def delete_db_login_log() -> str:
-    """自动删除数据库登录日志"""
-    async with async_db_session.begin() as db:
-        await login_log_service.delete_all(db=db)
-        return 'Success'
+@shared_task(bind=True)
+async def delete_db_login_log(self: Task) -> dict:
+    """按保留策略清理数据库登录日志"""
+    return await log_retention_service.purge_login_log(
+        progress=lambda meta: self.update_state(state='PROGRESS', meta=dict(meta)),
+    )
@@ -0,0 +1,28 @@
+from typing import Any
+
+from celery import Task, shared_task
+
+from backend.common.enums import ExportFormatType
+from backend.utils.export import delete_expired_exports, export_registry
+from backend.utils.import_parse import import_module_cached
+
+
+@shared_task(bind=True)
+async def export_data(self: Task, module: str, name: str, fmt: str, filters: dict[str, Any], user_id: int) -> dict:
+    """导出数据到导出目录"""
+    import_module_cached(module)
+    exporter = export_registry[name]
+    export_fmt = ExportFormatType(fmt)
+    filename = await exporter.save(
+        self.request.id,
+        export_fmt,
+        filters,
+        progress=lambda meta: self.update_state(state='PROGRESS', meta=meta),
+    )
+    return {'filename': filename, 'download_name': exporter.download_name(export_fmt), 'user_id': user_id}
+
+
+@shared_task
+def delete_expired_export_files() -> int:
+    """清理过期的后台导出文件"""
+    return delete_expired_exports()
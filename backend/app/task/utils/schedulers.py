@@ -1,25 +1,30 @@
 from __future__ import annotations
 
 import asyncio
+import copy
+import heapq
 import json
 import math
+import time
 
 from datetime import datetime, timedelta
 from multiprocessing.util import Finalize
 from typing import TYPE_CHECKING
 
 from celery import current_app, schedules
-from celery.beat import ScheduleEntry, Scheduler
+from celery.beat import ScheduleEntry, Scheduler, event_t
 from celery.signals import beat_init
 from celery.utils.log import get_logger
 from sqlalchemy import select
 from sqlalchemy.exc import DatabaseError, InterfaceError
 
+from backend.app.task.crud.crud_scheduler import task_scheduler_dao
 from backend.app.task.enums import PeriodType, TaskSchedulerType
-from backend.app.task.model.scheduler import TaskScheduler
+from backend.app.task.model.scheduler import TASK_SCHEDULER_EVENT_STREAM, TaskScheduler
 from backend.app.task.schema.scheduler import CreateTaskSchedulerParam
 from backend.app.task.utils.tzcrontab import TzAwareCrontab, crontab_verify
 from backend.common.exception import errors
+from backend.common.metrics import CELERY_BEAT_TICK_LAG, mark_process_dead
 from backend.core.conf import settings
 from backend.database.db import async_db_session
 from backend.database.redis import redis_client
@@ -36,6 +41,9 @@ DEFAULT_MAX_INTERVAL = 5  # seconds
 # 计划锁时长，避免重复创建
 DEFAULT_MAX_LOCK_TIMEOUT = DEFAULT_MAX_INTERVAL * 5  # seconds
 
+# 任务调度状态持久化指标
+BEAT_SYNC_STATS_KEY = f'{settings.CELERY_REDIS_PREFIX}:beat:sync_stats'
+
 logger = get_logger('fba.schedulers')
 
 
@@ -274,17 +282,23 @@ class DatabaseScheduler(Scheduler):
     Entry = ModelEntry
 
     _schedule = None
-    _last_update = None
+    _schedule_ids = None
+    _last_event_id = '0-0'
     _initial_read = True
     _heap_invalidated = False
+    _next_tick_time: float | None = None
 
     lock: Lock | None = None
     lock_key = f'{settings.CELERY_REDIS_PREFIX}:beat_lock'
 
     def __init__(self, *args, **kwargs) -> None:
         self.app = kwargs['app']
-        self._dirty = set()
+        self._dirty = {}
+        self._schedule_ids = {}
+        self.sync_stats = {}
+        kwargs.setdefault('sync_every_tasks', settings.CELERY_BEAT_SYNC_BATCH_SIZE)
         super().__init__(*args, **kwargs)
+        self.sync_every = settings.CELERY_BEAT_SYNC_INTERVAL
         self._finalize = Finalize(self, self.sync, exitpriority=5)
         self.max_interval = kwargs.get('max_interval') or self.app.conf.beat_max_loop_interval or DEFAULT_MAX_INTERVAL
 
@@ -312,8 +326,8 @@ class DatabaseScheduler(Scheduler):
     def reserve(self, entry):  # noqa: ANN001, ANN201
         """重写父函数"""
         new_entry = next(entry)
-        # 需要按名称存储条目，因为条目可能会发生变化
-        self._dirty.add(new_entry.name)
+        # 需要按名称存储条目，因为条目可能会发生变化，同时记录首次变脏的时间用于统计同步延迟
+        self._dirty.setdefault(new_entry.name, time.monotonic())
         return new_entry
 
     def setup_schedule(self) -> None:
@@ -325,34 +339,75 @@ class DatabaseScheduler(Scheduler):
 
     def sync(self) -> None:
         """重写父函数"""
-        tried = set()
-        failed = set()
+        if not self._dirty:
+            return
+
+        dirty, self._dirty = self._dirty, {}
+        tasks = self._schedule or {}
+        models = []
+        for name in dirty:
+            entry = tasks.get(name)
+            if entry is None:
+                logger.warning(f'任务 {name} 不存在，跳过保存')
+                continue
+            models.append(entry.model)
+
+        now = time.monotonic()
+        stats = {
+            'last_sync_time': timezone.to_str(timezone.now()),
+            'count': len(models),
+            'max_lag': round(now - min(dirty.values()), 3),
+        }
         try:
-            while self._dirty:
-                name = self._dirty.pop()
-                try:
-                    tasks = self.schedule
-                    run_await(tasks[name].save)()
-                    logger.debug(f'保存任务 {name} 最新状态到数据库')
-                    tried.add(name)
-                except KeyError as e:
-                    logger.error(f'保存任务 {name} 最新状态失败：{e} ')
-                    failed.add(name)
-        except DatabaseError:
-            logger.exception('同步时出现数据库错误')
-        except InterfaceError as e:
-            logger.warning(f'DatabaseScheduler InterfaceError：{e!s}，等待下次调用时重试...')
-        finally:
-            # 请稍后重试（仅针对失败的）
-            self._dirty |= failed
+            run_await(self.save_run_states)(models, stats)
+        except (DatabaseError, InterfaceError) as e:
+            logger.warning(f'同步任务状态时出现数据库错误：{e!s}，等待下次调用时重试...')
+            # 请稍后重试，保留首次变脏的时间
+            for name, dirty_time in dirty.items():
+                self._dirty.setdefault(name, dirty_time)
+            return
+
+        logger.debug(f'保存 {stats["count"]} 个任务最新状态到数据库，耗时 {stats["duration"]}s')
+
+    async def save_run_states(self, models: list[TaskScheduler], stats: dict) -> None:
+        """
+        在单个事务中批量保存任务运行状态
+
+        :param models: 任务调度列表
+        :param stats: 同步指标
+        :return:
+        """
+        batch_size = settings.CELERY_BEAT_SYNC_BATCH_SIZE
+        states = [
+            {'id': model.id, 'last_run_time': model.last_run_time, 'total_run_count': model.total_run_count}
+            for model in models
+        ]
+        start = time.perf_counter()
+        async with async_db_session.begin() as db:
+            for i in range(0, len(states), batch_size):
+                await task_scheduler_dao.bulk_update_run_state(db, states[i : i + batch_size])
+        stats['duration'] = round(time.perf_counter() - start, 4)
+        self.sync_stats = stats
+
+        try:
+            await redis_client.hset(BEAT_SYNC_STATS_KEY, mapping=stats)
+        except Exception as e:
+            logger.warning(f'记录任务状态同步指标失败：{e}')
 
     def tick(self, **kwargs) -> float:
         """重写父函数"""
+        if settings.METRICS_ENABLED and self._next_tick_time is not None:
+            CELERY_BEAT_TICK_LAG.set(max(time.monotonic() - self._next_tick_time, 0))
+
         if self.lock:
             logger.debug('beat: Extending lock...')
             run_await(self.lock.extend)(DEFAULT_MAX_LOCK_TIMEOUT, replace_ttl=True)
 
-        return super().tick(**kwargs)
+        self.sync_schedule_changes()
+        interval = super().tick(**kwargs)
+        # 记录预期的下次唤醒时间，用于计算调度延迟
+        self._next_tick_time = time.monotonic() + interval
+        return interval
 
     def close(self) -> None:
         """重写父函数"""
@@ -362,6 +417,9 @@ class DatabaseScheduler(Scheduler):
                 run_await(self.lock.release)()
             self.lock = None
 
+        if settings.METRICS_ENABLED:
+            mark_process_dead()
+
         super().close()
 
     def update_from_dict(self, beat_dict: dict) -> None:
@@ -379,21 +437,90 @@ class DatabaseScheduler(Scheduler):
 
         tasks = self.schedule
         tasks.update(s)
+        self._schedule_ids.update({entry.model.id: name for name, entry in s.items()})
+
+    async def get_latest_event_id(self) -> str:
+        """获取任务调度变更事件流的最新事件 ID"""
+        events = await redis_client.xrevrange(TASK_SCHEDULER_EVENT_STREAM, count=1)
+        return events[0][0] if events else '0-0'
+
+    async def read_schedule_events(self) -> list[tuple[str, dict]]:
+        """读取未处理的任务调度变更事件"""
+        events = []
+        batch_size = settings.CELERY_SCHEDULER_EVENT_BATCH_SIZE
+        while len(events) < settings.CELERY_SCHEDULER_FULL_RELOAD_THRESHOLD:
+            result = await redis_client.xread({TASK_SCHEDULER_EVENT_STREAM: self._last_event_id}, count=batch_size)
+            if not result:
+                break
+            messages = result[0][1]
+            events.extend(messages)
+            self._last_event_id = messages[-1][0]
+            if len(messages) < batch_size:
+                break
+        return events
+
+    def sync_schedule_changes(self) -> None:
+        """同步任务调度变更事件，仅重载受影响的任务"""
+        if self._initial_read:
+            return
 
-    def schedule_changed(self) -> bool | None:
-        """任务调度变更状态"""
-        now = timezone.now()
-        last_update = run_await(redis_client.get)(f'{settings.CELERY_REDIS_PREFIX}:last_update')
-        if not last_update:
-            run_await(redis_client.set)(f'{settings.CELERY_REDIS_PREFIX}:last_update', timezone.to_str(now))
-            return False
-
-        last, ts = self._last_update, timezone.from_str(last_update)
         try:
-            if ts and ts > (last or ts):
-                return True
-        finally:
-            self._last_update = now
+            events = run_await(self.read_schedule_events)()
+        except Exception as e:
+            logger.warning(f'读取任务调度变更事件失败：{e}，等待下次调用时重试...')
+            return
+        if not events:
+            return
+
+        logger.info(f'DatabaseScheduler: Schedule changed, {len(events)} events.')
+        self.sync()
+
+        # 变更过多时，全量重载比逐个修补更快
+        if len(events) >= settings.CELERY_SCHEDULER_FULL_RELOAD_THRESHOLD:
+            self.load_schedule()
+            self._heap = []
+            self._heap_invalidated = True
+            return
+
+        pks = {int(fields['id']) for _, fields in events}
+        entries = run_await(self.get_task_schedulers)(pks)
+
+        # 先移除旧条目再添加新条目，避免任务改名后与同批次中被删除的任务同名时互相覆盖
+        changed = set()
+        for pk in pks:
+            name = self._schedule_ids.pop(pk, None)
+            if name is not None:
+                self._schedule.pop(name, None)
+                changed.add(name)
+        for pk, entry in entries.items():
+            self._schedule[entry.name] = entry
+            self._schedule_ids[pk] = entry.name
+            changed.add(entry.name)
+
+        self.patch_heap(changed)
+
+    def patch_heap(self, names: set[str]) -> None:
+        """
+        将变更的任务增量更新到调度堆
+
+        :param names: 变更的任务名称
+        :return:
+        """
+        if self._heap is None:
+            return
+
+        heap = [event for event in self._heap if event[2].name not in names]
+        for name in names:
+            entry = self._schedule.get(name)
+            if entry is None:
+                continue
+            is_due, next_call_delay = entry.is_due()
+            heap.append(event_t(self._when(entry, 0 if is_due else next_call_delay) or 0, 5, entry))
+        heapq.heapify(heap)
+        self._heap = heap
+
+        # 同步快照，避免 Scheduler.tick 判定调度不一致而重建整个堆
+        self.old_schedulers = copy.copy(self._schedule)
 
     async def get_all_task_schedulers(self) -> dict:
         """获取所有任务调度"""
@@ -407,32 +534,42 @@ class DatabaseScheduler(Scheduler):
                 s[scheduler.name] = self.Entry(scheduler, app=self.app)
             return s
 
+    async def get_task_schedulers(self, pks: set[int]) -> dict[int, ModelEntry]:
+        """
+        获取指定的已启用任务调度
+
+        :param pks: 任务调度 ID 集合
+        :return:
+        """
+        async with async_db_session() as db:
+            stmt = select(TaskScheduler).where(
+                TaskScheduler.id.in_(pks),
+                TaskScheduler.enabled == True,  # noqa: E712
+            )
+            query = await db.execute(stmt)
+            schedulers = query.scalars().all()
+            return {scheduler.id: self.Entry(scheduler, app=self.app) for scheduler in schedulers}
+
+    def load_schedule(self) -> None:
+        """全量加载任务调度"""
+        logger.debug('beat: Synchronizing schedule...')
+        # 先记录事件位置再加载，加载期间产生的事件会在下次 tick 时重放
+        self._last_event_id = run_await(self.get_latest_event_id)()
+        self._schedule = run_await(self.get_all_task_schedulers)()
+        self._schedule_ids = {entry.model.id: name for name, entry in self._schedule.items()}
+        logger.debug(
+            'Current schedule:\n%s',
+            '\n'.join(repr(entry) for entry in self._schedule.values()),
+        )
+
     @property
     def schedule(self) -> dict[str, ModelEntry]:
         """获取任务调度"""
-        initial = update = False
         if self._initial_read:
             logger.debug('DatabaseScheduler: initial read')
-            initial = update = True
             self._initial_read = False
-        elif self.schedule_changed():
-            logger.info('DatabaseScheduler: Schedule changed.')
-            update = True
-
-        if update:
-            logger.debug('beat: Synchronizing schedule...')
-            self.sync()
-            self._schedule = run_await(self.get_all_task_schedulers)()
-            # 计划已更改，使 Scheduler.tick 中的堆无效
-            if not initial:
-                self._heap = []
-                self._heap_invalidated = True
-            logger.debug(
-                'Current schedule:\n%s',
-                '\n'.join(repr(entry) for entry in self._schedule.values()),
-            )
+            self.load_schedule()
 
-        # logger.debug(self._schedule)
         return self._schedule
 
 
@@ -1,8 +1,12 @@
 import asyncio
+import os
 import subprocess
+import sys
+import time
 
+from collections.abc import Callable
 from dataclasses import dataclass
-from typing import Annotated, Literal
+from typing import Annotated, Any, Literal
 
 import cappa
 import granian
@@ -16,14 +20,23 @@ from sqlalchemy import text
 from watchfiles import PythonFilter
 
 from backend import __version__
+from backend.app import get_app_models
 from backend.common.enums import DataBaseType, PrimaryKeyType
 from backend.common.exception.errors import BaseExceptionError
+from backend.common.metrics import clean_dead_process_metrics
 from backend.core.conf import settings
-from backend.database.db import async_db_session
-from backend.plugin.code_generator.schema.code import ImportParam
+from backend.core.path_conf import BASE_PATH, PLUGIN_MANIFEST_FILE
+from backend.database.db import async_db_session, create_tables
+from backend.plugin.code_generator.schema.code import BulkImportParam, ImportParam
 from backend.plugin.code_generator.service.business_service import gen_business_service
 from backend.plugin.code_generator.service.code_service import gen_service
-from backend.plugin.tools import get_plugin_sql
+from backend.plugin.tools import (
+    build_plugin_manifest,
+    get_plugin_models,
+    get_plugin_sql,
+    install_requirements,
+    write_plugin_manifest,
+)
 from backend.utils._await import run_await
 from backend.utils.console import console
 from backend.utils.file_ops import install_git_plugin, install_zip_plugin, parse_sql_script
@@ -55,6 +68,8 @@ def run(host: str, port: int, reload: bool, workers: int) -> None:  # noqa: FBT0
         panel_content.append(f'\n📡 OpenAPI JSON: {openapi_url}', style='green')
 
     console.print(Panel(panel_content, title='fba 服务信息', border_style='purple', padding=(1, 2)))
+    if settings.METRICS_ENABLED:
+        clean_dead_process_metrics()
     granian.Granian(
         target='backend.main:app',
         interface='asgi',
@@ -111,7 +126,7 @@ async def install_plugin(
 
     try:
         if path:
-            plugin_name = await install_zip_plugin(file=path)
+            plugin_name = await install_zip_plugin(file=path, progress=_print_install_progress())
         if repo_url:
             plugin_name = await install_git_plugin(repo_url=repo_url)
 
@@ -126,6 +141,177 @@ async def install_plugin(
         raise cappa.Exit(e.msg if isinstance(e, BaseExceptionError) else str(e), code=1)
 
 
+def _print_install_progress() -> Callable[[dict[str, Any]], None]:
+    """插件安装进度输出，每个阶段只在开始和完成时输出"""
+    stages = {'validate': '校验插件压缩包', 'extract': '解压插件文件', 'requirements': '安装插件依赖'}
+    started = set()
+
+    def report(event: dict[str, Any]) -> None:
+        stage = event['stage']
+        if stage in stages and stage not in started:
+            started.add(stage)
+            console.print(Text(f'{stages[stage]}...', style='cyan'))
+        if stage == 'extract' and event['done'] >= event['total']:
+            console.print(Text(f'已解压 {event["done"]} 字节', style='cyan'))
+
+    return report
+
+
+async def bootstrap(benchmark: int) -> None:
+    timings = []
+
+    def record(name: str, started: float) -> None:
+        timings.append((name, time.perf_counter() - started))
+        console.print(Text(f'{name}完成', style='green'))
+
+    try:
+        console.print(Text('开始安装插件依赖...', style='bold cyan'))
+        started = time.perf_counter()
+        install_requirements(None)
+        record('安装插件依赖', started)
+
+        console.print(Text('开始创建数据库表...', style='bold cyan'))
+        started = time.perf_counter()
+        get_app_models()
+        get_plugin_models()
+        await create_tables()
+        record('创建数据库表', started)
+
+        console.print(Text('开始构建插件清单...', style='bold cyan'))
+        started = time.perf_counter()
+        manifest = build_plugin_manifest()
+        write_plugin_manifest(manifest)
+        record('构建插件清单', started)
+    except Exception as e:
+        raise cappa.Exit(str(e), code=1)
+
+    missing = {plugin: deps for plugin, deps in manifest['requirements'].items() if deps}
+    if missing:
+        console.print(Text(f'插件依赖仍有缺失，工作进程启动时将重新检测：{missing}', style='bold yellow'))
+
+    table = Table(show_header=True, header_style='bold magenta')
+    table.add_column('步骤', style='cyan')
+    table.add_column('耗时（秒）', style='green', justify='right')
+    for name, elapsed in timings:
+        table.add_row(name, f'{elapsed:.3f}')
+    console.print(table)
+    console.print(Text(f'插件清单已写入 {PLUGIN_MANIFEST_FILE}', style='bold green'))
+
+    if benchmark > 0:
+        startup_benchmark(benchmark)
+
+
+# 在子进程中分别统计导入应用与执行启动初始化（建表、Redis 等）的耗时
+_STARTUP_BENCHMARK_CODE = """
+import asyncio
+import time
+
+started = time.perf_counter()
+from backend.main import app
+
+imported = time.perf_counter()
+
+
+async def main() -> float:
+    lifespan = app.router.lifespan_context(app)
+    started = time.perf_counter()
+    await lifespan.__aenter__()
+    elapsed = time.perf_counter() - started
+    await lifespan.__aexit__(None, None, None)
+    return elapsed
+
+
+print(imported - started, asyncio.run(main()))
+"""
+
+
+def startup_benchmark(rounds: int) -> None:
+    """对比使用与不使用插件清单时工作进程导入应用与启动初始化的耗时"""
+    results = {}
+    for label, enabled in (('完整启动', 'false'), ('插件清单启动', 'true')):
+        console.print(Text(f'正在测试{label}耗时...', style='bold cyan'))
+        samples = []
+        for _ in range(rounds):
+            output = subprocess.run(
+                [sys.executable, '-c', _STARTUP_BENCHMARK_CODE],
+                cwd=BASE_PATH.parent,
+                env={**os.environ, 'PLUGIN_MANIFEST_ENABLED': enabled},
+                capture_output=True,
+                text=True,
+                check=True,
+            )
+            import_elapsed, init_elapsed = output.stdout.strip().splitlines()[-1].split()
+            samples.append((float(import_elapsed), float(init_elapsed)))
+        results[label] = samples
+
+    table = Table(show_header=True, header_style='bold magenta')
+    table.add_column('启动方式', style='cyan')
+    table.add_column('导入平均（秒）', style='green', justify='right')
+    table.add_column('初始化平均（秒）', style='green', justify='right')
+    table.add_column('合计平均（秒）', style='green', justify='right')
+    table.add_column('合计最小（秒）', style='green', justify='right')
+    table.add_column('合计最大（秒）', style='green', justify='right')
+    for label, samples in results.items():
+        totals = [import_elapsed + init_elapsed for import_elapsed, init_elapsed in samples]
+        table.add_row(
+            label,
+            f'{sum(s[0] for s in samples) / len(samples):.3f}',
+            f'{sum(s[1] for s in samples) / len(samples):.3f}',
+            f'{sum(totals) / len(totals):.3f}',
+            f'{min(totals):.3f}',
+            f'{max(totals):.3f}',
+        )
+    console.print(table)
+
+
+def import_time_report(module: str, top: int, output: str | None) -> None:
+    """使用 python -X importtime 分析模块导入耗时"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=BASE_PATH.parent,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise cappa.Exit(f'模块 {module} 导入失败：\n{result.stderr[-2000:]}', code=1)
+
+    records = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        head, cumulative, name = line.split('|', 2)
+        records.append((name.strip(), int(head.split(':')[1]), int(cumulative)))
+
+    if output:
+        with open(output, 'w', encoding='utf-8') as f:
+            f.write(result.stderr)
+
+    packages: dict[str, int] = {}
+    for name, self_us, _ in records:
+        root = name.split('.')[0]
+        packages[root] = packages.get(root, 0) + self_us
+
+    modules_table = Table(title='累计耗时最高的模块', show_header=True, header_style='bold magenta')
+    modules_table.add_column('模块', style='cyan')
+    modules_table.add_column('自身（毫秒）', style='yellow', justify='right')
+    modules_table.add_column('累计（毫秒）', style='green', justify='right')
+    for name, self_us, cumulative_us in sorted(records, key=lambda r: r[2], reverse=True)[:top]:
+        modules_table.add_row(name, f'{self_us / 1000:.1f}', f'{cumulative_us / 1000:.1f}')
+
+    packages_table = Table(title='自身耗时最高的顶层包', show_header=True, header_style='bold magenta')
+    packages_table.add_column('包', style='cyan')
+    packages_table.add_column('自身合计（毫秒）', style='green', justify='right')
+    for name, self_us in sorted(packages.items(), key=lambda p: p[1], reverse=True)[:top]:
+        packages_table.add_row(name, f'{self_us / 1000:.1f}')
+
+    console.print(modules_table)
+    console.print(packages_table)
+    total = sum(self_us for _, self_us, _ in records)
+    console.print(Text(f'共导入 {len(records)} 个模块，总耗时 {total / 1000:.1f} 毫秒', style='bold green'))
+    if output:
+        console.print(Text(f'原始导入耗时日志已写入 {output}', style='bold green'))
+
+
 async def execute_sql_scripts(sql_scripts: str) -> None:
     async with async_db_session.begin() as db:
         try:
@@ -151,6 +337,31 @@ async def import_table(
         raise cappa.Exit(e.msg if isinstance(e, BaseExceptionError) else str(e), code=1)
 
 
+async def bulk_import_tables(
+    app: str,
+    table_schema: str,
+    table_names: str | None,
+) -> None:
+    console.print(Text('开始批量导入代码生成业务...', style='bold cyan'))
+    stages = {'tables': '数据库表', 'columns': '数据库列', 'businesses': '写入业务', 'models': '写入模型列'}
+
+    def report(event: dict[str, Any]) -> None:
+        console.print(Text(f'{stages[event["stage"]]}：{event["done"]}/{event["total"]}', style='cyan'))
+
+    try:
+        obj = BulkImportParam(
+            app=app,
+            table_schema=table_schema,
+            table_names=[name.strip() for name in table_names.split(',') if name.strip()] if table_names else None,
+        )
+        async with async_db_session.begin() as db:
+            count = await gen_service.bulk_import_business_and_model(db=db, obj=obj, progress=report)
+    except Exception as e:
+        raise cappa.Exit(e.msg if isinstance(e, BaseExceptionError) else str(e), code=1)
+
+    console.print(Text(f'成功导入 {count} 个代码生成业务', style='bold green'))
+
+
 def generate() -> None:
     try:
         ids = []
@@ -213,6 +424,38 @@ class Run:
         run(host=self.host, port=self.port, reload=self.no_reload, workers=self.workers)
 
 
+@cappa.command(help='一次性初始化：安装插件依赖、创建数据库表并生成插件清单，供工作进程快速启动', default_long=True)
+@dataclass
+class Bootstrap:
+    benchmark: Annotated[
+        int,
+        cappa.Arg(default=0, help='对比使用与不使用插件清单时的应用导入与启动初始化耗时，指定每种方式的测试次数'),
+    ]
+
+    async def __call__(self) -> None:
+        await bootstrap(self.benchmark)
+
+
+@cappa.command(help='分析模块导入耗时，定位拖慢服务启动的依赖', default_long=True)
+@dataclass
+class ImportTime:
+    module: Annotated[
+        str,
+        cappa.Arg(default='backend.main', help='要分析的模块'),
+    ]
+    top: Annotated[
+        int,
+        cappa.Arg(default=30, help='展示耗时最高的条目数'),
+    ]
+    output: Annotated[
+        str | None,
+        cappa.Arg(default=None, help='原始导入耗时日志输出文件路径'),
+    ]
+
+    def __call__(self) -> None:
+        import_time_report(self.module, self.top, self.output)
+
+
 @cappa.command(help='从当前主机启动 Celery worker 服务', default_long=True)
 @dataclass
 class Worker:
@@ -307,10 +550,30 @@ class Import:
         await import_table(self.app, self.table_schema, self.table_name)
 
 
+@cappa.command(help='批量导入代码生成业务和模型列', default_long=True)
+@dataclass
+class BulkImport:
+    app: Annotated[
+        str,
+        cappa.Arg(help='应用名称，用于代码生成到指定 app'),
+    ]
+    table_schema: Annotated[
+        str,
+        cappa.Arg(short='tc', default='fba', help='数据库名'),
+    ]
+    table_names: Annotated[
+        str | None,
+        cappa.Arg(short='tn', default=None, help='数据库表名，多个以英文逗号分隔，为空时导入所有未导入的表'),
+    ]
+
+    async def __call__(self) -> None:
+        await bulk_import_tables(self.app, self.table_schema, self.table_names)
+
+
 @cappa.command(name='codegen', help='代码生成（体验完整功能，请自行部署 fba vben 前端工程）', default_long=True)
 @dataclass
 class CodeGenerate:
-    subcmd: cappa.Subcommands[Import | None] = None
+    subcmd: cappa.Subcommands[Import | BulkImport | None] = None
 
     def __call__(self) -> None:
         generate()
@@ -323,7 +586,7 @@ class FbaCli:
         str,
         cappa.Arg(value_name='PATH', default='', show_default=False, help='在事务中执行 SQL 脚本'),
     ]
-    subcmd: cappa.Subcommands[Run | Celery | Add | CodeGenerate | None] = None
+    subcmd: cappa.Subcommands[Run | Bootstrap | ImportTime | Celery | Add | CodeGenerate | None] = None
 
     async def __call__(self) -> None:
         if self.sql:
@@ -0,0 +1,140 @@
+import asyncio
+import time
+
+from abc import ABC, abstractmethod
+from typing import Any, Generic, TypeVar
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from backend.common.log import log
+from backend.common.metrics import record_cache
+from backend.database.redis import redis_client
+
+T = TypeVar('T')
+
+# 会话中待提交后失效的缓存
+_PENDING_INVALIDATIONS_KEY = 'pending_cache_invalidations'
+
+# 持有后台任务引用，避免被垃圾回收
+_background_tasks: set[asyncio.Task] = set()
+
+
+def _spawn(coro) -> None:  # noqa: ANN001
+    task = asyncio.create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+
+def invalidate_after_commit(db: AsyncSession, target: Any) -> None:
+    """
+    在当前事务提交后调用 ``target.invalidate()``，事务回滚时丢弃
+
+    :param db: 数据库会话
+    :param target: 可失效对象
+    :return:
+    """
+    db.info.setdefault(_PENDING_INVALIDATIONS_KEY, set()).add(target)
+
+
+class VersionedCache(ABC, Generic[T]):
+    """
+    进程内只读缓存
+
+    全局版本号保存在 Redis 中，数据变更后递增版本号并发布失效消息，各进程收到消息后在下次读取时重新加载；
+    订阅中断时按 ``check_interval`` 轮询版本号兜底。读取路径上只有内存访问，不访问数据库
+    """
+
+    def __init__(self, prefix: str, check_interval: int = 30) -> None:
+        """
+        初始化缓存
+
+        :param prefix: Redis 键前缀
+        :param check_interval: 版本号轮询间隔（秒）
+        """
+        self.name = prefix
+        self.version_key = f'{prefix}:version'
+        self.channel = f'{prefix}:invalidate'
+        self.check_interval = check_interval
+        self.version: int | None = None
+        self.data: T | None = None
+        self._remote_version = 0
+        self._checked_at = 0.0
+        self._lock = asyncio.Lock()
+        self._listener: asyncio.Task | None = None
+
+    @abstractmethod
+    async def load(self) -> T:
+        """从数据库加载缓存数据"""
+
+    @property
+    def stale(self) -> bool:
+        return (
+            self.data is None
+            or self._remote_version > (self.version or 0)
+            or time.monotonic() - self._checked_at >= self.check_interval
+        )
+
+    async def get(self) -> T:
+        """获取缓存数据，必要时重新加载"""
+        self._ensure_listener()
+        if not self.stale:
+            record_cache(self.name, hit=True)
+            return self.data
+        record_cache(self.name, hit=False)
+        async with self._lock:
+            if self.stale:
+                await self.refresh()
+        return self.data
+
+    async def refresh(self) -> None:
+        """按 Redis 中的版本号刷新缓存"""
+        version = int(await redis_client.get(self.version_key) or 0)
+        self._remote_version = max(self._remote_version, version)
+        if self.data is None or version != self.version:
+            self.data = await self.load()
+            self.version = version
+        self._checked_at = time.monotonic()
+
+    async def invalidate(self) -> None:
+        """递增全局版本号并通知所有进程"""
+        version = await redis_client.incr(self.version_key)
+        self._remote_version = max(self._remote_version, version)
+        await redis_client.publish(self.channel, version)
+
+    def invalidate_after_commit(self, db: AsyncSession) -> None:
+        """
+        在当前事务提交后失效缓存，避免其他进程在提交前重新加载到旧数据
+
+        :param db: 数据库会话
+        :return:
+        """
+        invalidate_after_commit(db, self)
+
+    def _ensure_listener(self) -> None:
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.create_task(self._listen())
+
+    async def _listen(self) -> None:
+        pubsub = redis_client.pubsub()
+        try:
+            await pubsub.subscribe(self.channel)
+            async for message in pubsub.listen():
+                if message['type'] == 'message':
+                    self._remote_version = max(self._remote_version, int(message['data']))
+        except Exception as e:
+            log.warning(f'缓存失效订阅 {self.channel} 中断：{e}')
+        finally:
+            await pubsub.aclose()
+
+
+@event.listens_for(Session, 'after_commit')
+def _invalidate_pending_caches(session: Session) -> None:
+    for cache in session.info.pop(_PENDING_INVALIDATIONS_KEY, ()):
+        _spawn(cache.invalidate())
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_pending_caches(session: Session) -> None:
+    session.info.pop(_PENDING_INVALIDATIONS_KEY, None)
@@ -110,6 +110,13 @@ class FileType(StrEnum):
     video = 'video'
 
 
+class ExportFormatType(StrEnum):
+    """数据导出格式"""
+
+    csv = 'csv'
+    xlsx = 'xlsx'
+
+
 class PluginType(StrEnum):
     """插件类型"""
 
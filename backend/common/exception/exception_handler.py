@@ -41,10 +41,15 @@ async def _validation_exception_handler(exc: RequestValidationError | Validation
     :return:
     """
     errors = []
+    # 非 en-US 语言下，使用自定义错误信息
+    translate = i18n.current_language != 'en-US'
+    messages: dict[str, str | None] = {}
     for error in exc.errors():
-        # 非 en-US 语言下，使用自定义错误信息
-        if i18n.current_language != 'en-US':
-            custom_message = t(f'pydantic.{error["type"]}')
+        if translate:
+            error_type = error['type']
+            if error_type not in messages:
+                messages[error_type] = t(f'pydantic.{error_type}')
+            custom_message = messages[error_type]
             if custom_message:
                 error_ctx = error.get('ctx')
                 if not error_ctx:
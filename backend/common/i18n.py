@@ -1,7 +1,9 @@
 import glob
 import json
 
+from contextvars import ContextVar, Token
 from pathlib import Path
+from string import Formatter
 from typing import Any
 
 import yaml
@@ -9,16 +11,79 @@ import yaml
 from backend.core.conf import settings
 from backend.core.path_conf import LOCALE_DIR
 
+# 编译后的文本：(文本, 是否包含变量参数)
+Message = tuple[Any, bool]
+
+# 当前请求的语言
+_current_language: ContextVar[str | None] = ContextVar('current_language', default=None)
+
+
+def _has_fields(text: Any) -> bool:
+    if not isinstance(text, str):
+        return False
+    try:
+        return any(field is not None for _, field, _, _ in Formatter().parse(text))
+    except ValueError:
+        return False
+
+
+def _flatten(data: dict[str, Any], prefix: str = '') -> dict[str, Message]:
+    """
+    将嵌套的语言文本展开为点分隔键的扁平目录
+
+    :param data: 语言文本
+    :param prefix: 键前缀
+    :return:
+    """
+    catalog = {}
+    for k, v in data.items():
+        key = f'{prefix}{k}'
+        if isinstance(v, dict):
+            catalog.update(_flatten(v, f'{key}.'))
+        else:
+            catalog[key] = (v, _has_fields(v))
+    return catalog
+
 
 class I18n:
     """国际化管理器"""
 
     def __init__(self) -> None:
         self.locales: dict[str, dict[str, Any]] = {}
-        self.current_language: str = settings.I18N_DEFAULT_LANGUAGE
+        self.catalogs: dict[str, dict[str, Message]] = {}
+        self._fallbacks: dict[str, tuple[dict[str, Message], ...]] = {}
+
+    @property
+    def current_language(self) -> str:
+        """当前请求的语言，未设置时为默认语言"""
+        return _current_language.get() or settings.I18N_DEFAULT_LANGUAGE
+
+    @current_language.setter
+    def current_language(self, language: str) -> None:
+        _current_language.set(language)
+
+    @staticmethod
+    def set_language(language: str | None) -> Token:
+        """
+        设置当前上下文的语言
+
+        :param language: 语言
+        :return:
+        """
+        return _current_language.set(language)
+
+    @staticmethod
+    def reset_language(token: Token) -> None:
+        """
+        恢复当前上下文的语言
+
+        :param token: 设置语言时返回的令牌
+        :return:
+        """
+        _current_language.reset(token)
 
     def load_locales(self) -> None:
-        """加载语言文本"""
+        """加载语言文本并编译为扁平目录"""
         patterns = [
             LOCALE_DIR / '*.json',
             LOCALE_DIR / '*.yaml',
@@ -40,6 +105,39 @@ class I18n:
                     case 'yaml' | 'yml':
                         self.locales[lang] = yaml.full_load(f.read())
 
+        self.catalogs = {lang: _flatten(data or {}) for lang, data in self.locales.items()}
+        self._fallbacks = {lang: self._build_fallbacks(lang) for lang in self.catalogs}
+
+    def _build_fallbacks(self, language: str) -> tuple[dict[str, Message], ...]:
+        """
+        预先计算语言的回退顺序：当前语言、同语种的其他地区、默认语言
+
+        :param language: 语言
+        :return:
+        """
+        base = language.split('-')[0].lower()
+        languages = [language]
+        languages.extend(lang for lang in sorted(self.catalogs) if lang.split('-')[0].lower() == base)
+        languages.append(settings.I18N_DEFAULT_LANGUAGE)
+        return tuple(self.catalogs[lang] for lang in dict.fromkeys(languages) if lang in self.catalogs)
+
+    def resolve_language(self, language: str) -> str:
+        """
+        将请求的语言解析为已加载的语言，无匹配时返回默认语言
+
+        :param language: 请求的语言，例如 'en'、'zh-cn'
+        :return:
+        """
+        language = language.strip().lower()
+        for lang in self.catalogs:
+            if lang.lower() == language:
+                return lang
+        base = language.split('-')[0]
+        for lang in sorted(self.catalogs):
+            if lang.split('-')[0].lower() == base:
+                return lang
+        return settings.I18N_DEFAULT_LANGUAGE
+
     def t(self, key: str, default: Any | None = None, **kwargs) -> str:
         """
         翻译函数
@@ -49,22 +147,19 @@ class I18n:
         :param kwargs: 目标文本中的变量参数
         :return:
         """
-        keys = key.split('.')
-
-        try:
-            translation = self.locales[self.current_language]
-        except KeyError:
-            keys = 'error.language_not_found'
-            translation = self.locales[settings.I18N_DEFAULT_LANGUAGE]
-
-        for k in keys:
-            if isinstance(translation, dict) and k in list(translation.keys()):
-                translation = translation[k]
-            else:
-                # Pydantic 兼容
-                translation = None if keys[0] == 'pydantic' else key
-
-        if translation and kwargs:
+        fallbacks = self._fallbacks.get(self.current_language) or self._fallbacks.get(
+            settings.I18N_DEFAULT_LANGUAGE, ()
+        )
+        for catalog in fallbacks:
+            message = catalog.get(key)
+            if message is not None:
+                break
+        else:
+            # Pydantic 兼容
+            return default if key.startswith('pydantic.') else key or default
+
+        translation, has_fields = message
+        if has_fields and kwargs:
             translation = translation.format(**kwargs)
 
         return translation or default
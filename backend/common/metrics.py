@@ -0,0 +1,375 @@
+"""
+Prometheus 指标
+
+启用后各进程的指标写入多进程目录下按进程号区分的 mmap 文件，抓取时由 MultiProcessCollector 汇总，
+因此 granian 多个工作进程的指标可以在任意工作进程的指标接口上完整获取。Celery worker 与 beat 在独立端口上
+提供同一目录下的汇总指标，进程启动时只清理已退出进程遗留的文件，不影响共用目录的其他运行中进程。
+缓存命中率等比例指标通过 PromQL 计算，例如：
+
+    sum by (cache) (rate(fba_cache_requests_total{result="hit"}[5m]))
+      / sum by (cache) (rate(fba_cache_requests_total[5m]))
+"""
+
+import ipaddress
+import os
+import secrets
+import threading
+import time
+
+from collections.abc import Callable, Iterable
+from contextlib import suppress
+from typing import Any
+from wsgiref.simple_server import WSGIRequestHandler, make_server
+
+from sqlalchemy import event, exc
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from starlette.responses import PlainTextResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from backend.common.log import log
+from backend.core.conf import settings
+from backend.core.path_conf import METRICS_DIR
+from backend.utils.import_parse import lazy_import
+
+# 多进程模式需在导入 prometheus_client 之前指定目录
+if settings.METRICS_ENABLED:
+    os.environ.setdefault('PROMETHEUS_MULTIPROC_DIR', str(METRICS_DIR))
+    os.makedirs(os.environ['PROMETHEUS_MULTIPROC_DIR'], exist_ok=True)
+
+from prometheus_client import (  # noqa: E402
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    make_asgi_app,
+    make_wsgi_app,
+    multiprocess,
+)
+
+psutil = lazy_import('psutil')
+
+# 毫秒级操作的耗时分桶
+FAST_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+HTTP_REQUESTS = Counter(
+    'fba_http_requests',
+    '接口请求数',
+    ['method', 'route', 'status'],
+)
+HTTP_REQUEST_DURATION = Histogram(
+    'fba_http_request_duration_seconds',
+    '接口请求耗时',
+    ['method', 'route'],
+)
+HTTP_REQUESTS_IN_PROGRESS = Gauge(
+    'fba_http_requests_in_progress',
+    '正在处理的接口请求数',
+    ['method', 'route'],
+    multiprocess_mode='livesum',
+)
+
+DB_POOL_CHECKOUTS = Counter(
+    'fba_db_pool_checkouts',
+    '数据库连接池签出次数',
+    ['engine'],
+)
+DB_POOL_WAIT = Histogram(
+    'fba_db_pool_wait_seconds',
+    '从数据库连接池获取连接的耗时，包含等待空闲连接与新建连接',
+    ['engine'],
+    buckets=(*FAST_BUCKETS, 2.5, 5.0, 10.0, 30.0),
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    'fba_db_pool_checked_out',
+    '数据库连接池已签出的连接数',
+    ['engine'],
+    multiprocess_mode='livesum',
+)
+DB_POOL_OVERFLOW = Gauge(
+    'fba_db_pool_overflow',
+    '数据库连接池超出 pool_size 的溢出连接数',
+    ['engine'],
+    multiprocess_mode='livesum',
+)
+DB_POOL_CONNECTS = Counter(
+    'fba_db_pool_connects',
+    '数据库连接池新建连接次数',
+    ['engine'],
+)
+DB_POOL_INVALIDATIONS = Counter(
+    'fba_db_pool_invalidations',
+    '数据库连接失效次数，soft 为标记在下次签出时回收',
+    ['engine', 'soft'],
+)
+DB_POOL_TIMEOUTS = Counter(
+    'fba_db_pool_timeouts',
+    '等待数据库连接池空闲连接超时次数',
+    ['engine'],
+)
+
+REDIS_COMMAND_DURATION = Histogram(
+    'fba_redis_command_duration_seconds',
+    'Redis 命令耗时',
+    ['command'],
+    buckets=FAST_BUCKETS,
+)
+
+LOG_QUEUE_SIZE = Gauge(
+    'fba_log_queue_size',
+    '日志队列中待写入的日志数',
+    ['log'],
+    multiprocess_mode='livesum',
+)
+LOG_FLUSH_DURATION = Histogram(
+    'fba_log_flush_duration_seconds',
+    '日志批量写入耗时',
+    ['log'],
+)
+LOG_FLUSHED = Counter(
+    'fba_log_flushed',
+    '已写入的日志数',
+    ['log'],
+)
+LOG_DROPPED = Counter(
+    'fba_log_dropped',
+    '日志队列已满时丢弃的日志数',
+    ['log'],
+)
+
+CELERY_BEAT_TICK_LAG = Gauge(
+    'fba_celery_beat_tick_lag_seconds',
+    'Celery beat 实际唤醒时间与预期唤醒时间之差',
+    multiprocess_mode='livemax',
+)
+
+CACHE_REQUESTS = Counter(
+    'fba_cache_requests',
+    '缓存读取次数',
+    ['cache', 'result'],
+)
+
+FUNCTION_DURATION = Histogram(
+    'fba_function_duration_seconds',
+    '使用 timer 装饰器的函数耗时',
+    ['function'],
+)
+
+
+def record_cache(cache: str, *, hit: bool) -> None:
+    """
+    记录一次缓存读取
+
+    :param cache: 缓存名称
+    :param hit: 是否命中
+    :return:
+    """
+    if settings.METRICS_ENABLED:
+        CACHE_REQUESTS.labels(cache, 'hit' if hit else 'miss').inc()
+
+
+def observe_redis_command(command: Any, elapsed: float) -> None:
+    """
+    记录 Redis 命令耗时
+
+    :param command: 命令名称
+    :param elapsed: 耗时（秒）
+    :return:
+    """
+    name = command.decode() if isinstance(command, bytes) else str(command)
+    REDIS_COMMAND_DURATION.labels(name.upper()).observe(elapsed)
+
+
+def instrument_route(app: ASGIApp, path: str) -> ASGIApp:
+    """
+    为单个路由记录请求数、耗时与并发数
+
+    :param app: 路由的 ASGI 应用
+    :param path: 路由路径模板，作为指标标签避免路径参数导致标签基数膨胀
+    :return:
+    """
+
+    async def wrapped(scope: Scope, receive: Receive, send: Send) -> None:
+        method = scope['method']
+        status = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message['type'] == 'http.response.start':
+                status = message['status']
+            await send(message)
+
+        in_progress = HTTP_REQUESTS_IN_PROGRESS.labels(method, path)
+        in_progress.inc()
+        start = time.perf_counter()
+        try:
+            await app(scope, receive, send_wrapper)
+        finally:
+            HTTP_REQUEST_DURATION.labels(method, path).observe(time.perf_counter() - start)
+            HTTP_REQUESTS.labels(method, path, str(status)).inc()
+            in_progress.dec()
+
+    return wrapped
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """记录获取连接耗时的连接池"""
+
+    metrics_name = 'default'
+
+    def _do_get(self) -> Any:
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            DB_POOL_TIMEOUTS.labels(self.metrics_name).inc()
+            raise
+        finally:
+            DB_POOL_WAIT.labels(self.metrics_name).observe(time.perf_counter() - start)
+
+    def recreate(self) -> 'InstrumentedQueuePool':
+        pool = super().recreate()
+        pool.metrics_name = self.metrics_name
+        return pool
+
+
+def instrument_engine(engine: AsyncEngine, name: str) -> None:
+    """
+    通过连接池事件记录数据库连接池指标
+
+    :param engine: 数据库引擎
+    :param name: 引擎名称
+    :return:
+    """
+    sync_engine = engine.sync_engine
+    if isinstance(sync_engine.pool, InstrumentedQueuePool):
+        sync_engine.pool.metrics_name = name
+
+    def update_gauges() -> None:
+        pool = sync_engine.pool
+        if isinstance(pool, AsyncAdaptedQueuePool):
+            DB_POOL_CHECKED_OUT.labels(name).set(pool.checkedout())
+            DB_POOL_OVERFLOW.labels(name).set(max(pool.overflow(), 0))
+
+    @event.listens_for(sync_engine, 'checkout')
+    def on_checkout(*args) -> None:  # noqa: ANN002
+        DB_POOL_CHECKOUTS.labels(name).inc()
+        update_gauges()
+
+    @event.listens_for(sync_engine, 'checkin')
+    def on_checkin(*args) -> None:  # noqa: ANN002
+        update_gauges()
+
+    @event.listens_for(sync_engine, 'connect')
+    def on_connect(*args) -> None:  # noqa: ANN002
+        DB_POOL_CONNECTS.labels(name).inc()
+
+    @event.listens_for(sync_engine, 'invalidate')
+    def on_invalidate(*args) -> None:  # noqa: ANN002
+        DB_POOL_INVALIDATIONS.labels(name, 'false').inc()
+
+    @event.listens_for(sync_engine, 'soft_invalidate')
+    def on_soft_invalidate(*args) -> None:  # noqa: ANN002
+        DB_POOL_INVALIDATIONS.labels(name, 'true').inc()
+
+
+def clean_dead_process_metrics() -> None:
+    """清理已退出进程遗留的指标文件，避免重启前或异常退出的进程持续计入汇总，运行中进程的文件不受影响"""
+    path = os.environ.get('PROMETHEUS_MULTIPROC_DIR')
+    if not path or not os.path.isdir(path):
+        return
+    for filename in os.listdir(path):
+        if not filename.endswith('.db'):
+            continue
+        try:
+            pid = int(filename[:-3].rsplit('_', 1)[1])
+        except (IndexError, ValueError):
+            continue
+        if pid == os.getpid() or psutil.pid_exists(pid):
+            continue
+        with suppress(FileNotFoundError):
+            os.remove(os.path.join(path, filename))
+
+
+def mark_process_dead() -> None:
+    """进程退出时移除当前进程的实时 Gauge 文件"""
+    path = os.environ.get('PROMETHEUS_MULTIPROC_DIR')
+    if path and os.path.isdir(path):
+        multiprocess.mark_process_dead(os.getpid(), path)
+
+
+def is_metrics_scrape_allowed(authorization: str, client_host: str | None) -> bool:
+    """
+    指标抓取请求是否允许，设置令牌时校验令牌，否则校验客户端地址
+
+    :param authorization: 请求头 Authorization
+    :param client_host: 客户端地址
+    :return:
+    """
+    if settings.METRICS_TOKEN:
+        return secrets.compare_digest(authorization, f'Bearer {settings.METRICS_TOKEN}')
+    if not client_host:
+        return False
+    try:
+        address = ipaddress.ip_address(client_host)
+    except ValueError:
+        return False
+    return any(address in ipaddress.ip_network(network, strict=False) for network in settings.METRICS_ALLOWED_IPS)
+
+
+def _create_registry() -> CollectorRegistry:
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return registry
+
+
+def create_metrics_app() -> Callable[..., Any]:
+    """创建汇总所有进程指标的 ASGI 应用，仅允许携带令牌或来自白名单地址的请求"""
+    metrics_app = make_asgi_app(_create_registry())
+    forbidden = PlainTextResponse('Forbidden', status_code=403)
+
+    async def app(scope: Scope, receive: Receive, send: Send) -> None:
+        if scope['type'] == 'http':
+            authorization = dict(scope.get('headers') or []).get(b'authorization', b'').decode('latin-1')
+            client = scope.get('client')
+            if not is_metrics_scrape_allowed(authorization, client[0] if client else None):
+                await forbidden(scope, receive, send)
+                return
+        await metrics_app(scope, receive, send)
+
+    return app
+
+
+def create_metrics_wsgi_app() -> Callable[..., Iterable[bytes]]:
+    """创建汇总所有进程指标的 WSGI 应用，用于 Celery 等非 ASGI 进程，访问控制与 ASGI 应用一致"""
+    metrics_app = make_wsgi_app(_create_registry())
+
+    def app(environ: dict[str, Any], start_response: Callable[..., Any]) -> Iterable[bytes]:
+        if not is_metrics_scrape_allowed(environ.get('HTTP_AUTHORIZATION', ''), environ.get('REMOTE_ADDR')):
+            start_response('403 Forbidden', [('Content-Type', 'text/plain; charset=utf-8')])
+            return [b'Forbidden']
+        return metrics_app(environ, start_response)
+
+    return app
+
+
+class _SilentRequestHandler(WSGIRequestHandler):
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+        pass
+
+
+def start_metrics_server(host: str, port: int) -> None:
+    """
+    在后台线程中启动指标接口，同一多进程目录的多个进程中只有第一个绑定端口成功的进程提供服务
+
+    :param host: 监听地址
+    :param port: 监听端口
+    :return:
+    """
+    try:
+        server = make_server(host, port, create_metrics_wsgi_app(), handler_class=_SilentRequestHandler)
+    except OSError as e:
+        log.info(f'指标接口 {host}:{port} 已由其他进程提供：{e}')
+        return
+    threading.Thread(target=server.serve_forever, daemon=True, name='fba-metrics-server').start()
+    log.info(f'指标接口已启动：http://{host}:{port}')
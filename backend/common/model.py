@@ -1,8 +1,8 @@
 from datetime import datetime
 from typing import Annotated
 
-from sqlalchemy import BigInteger, DateTime, Text, TypeDecorator
-from sqlalchemy.dialects.mysql import LONGTEXT
+from sqlalchemy import BigInteger, DateTime, LargeBinary, Text, TypeDecorator
+from sqlalchemy.dialects.mysql import LONGTEXT, VARBINARY
 from sqlalchemy.ext.asyncio import AsyncAttrs
 from sqlalchemy.orm import DeclarativeBase, Mapped, MappedAsDataclass, declared_attr, mapped_column
 
@@ -56,6 +56,13 @@ class UniversalText(TypeDecorator[str]):
         return value
 
 
+class PackedIP(TypeDecorator[bytes]):
+    """PostgreSQL、MySQL 兼容性 16 字节定长二进制 IP 类型"""
+
+    impl = VARBINARY(16) if settings.DATABASE_TYPE == 'mysql' else LargeBinary(16)
+    cache_ok = True
+
+
 class TimeZone(TypeDecorator[datetime]):
     """PostgreSQL、MySQL 兼容性时区感知类型"""
 
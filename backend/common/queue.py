@@ -1,18 +1,32 @@
 import asyncio
+import time
 
 from asyncio import Queue
+from collections.abc import Awaitable, Callable
+from typing import Generic, TypeVar
 
+from sqlalchemy.ext.asyncio import AsyncSession
 
-async def batch_dequeue(queue: Queue, max_items: int, timeout: float) -> list:
+from backend.common.log import log
+from backend.common.metrics import LOG_DROPPED, LOG_FLUSH_DURATION, LOG_FLUSHED, LOG_QUEUE_SIZE
+from backend.core.conf import settings
+from backend.database.db import async_db_session
+
+T = TypeVar('T')
+
+
+async def batch_dequeue(queue: Queue, max_items: int, timeout: float, items: list | None = None) -> list:
     """
     从异步队列中获取多个项目
 
     :param queue: 用于获取项目的 `asyncio.Queue` 队列
     :param max_items: 从队列中获取的最大项目数量
     :param timeout: 总的等待超时时间（秒）
+    :param items: 存放项目的列表，由调用方持有时任务被取消后仍可获取已取出的项目
     :return:
     """
-    items = []
+    if items is None:
+        items = []
 
     async def collector() -> None:
         while len(items) < max_items:
@@ -25,3 +39,99 @@ async def batch_dequeue(queue: Queue, max_items: int, timeout: float) -> list:
         pass
 
     return items
+
+
+class BatchWriter(Generic[T]):
+    """日志批量写入器，攒够一批或等待超时后使用独立会话以多行 INSERT 写入"""
+
+    def __init__(
+        self,
+        name: str,
+        writer: Callable[[AsyncSession, list[T]], Awaitable[None]],
+        *,
+        maxsize: int,
+        batch_size: int,
+        timeout: float,
+    ) -> None:
+        """
+        初始化批量写入器
+
+        :param name: 名称，作为指标标签
+        :param writer: 批量写入函数
+        :param maxsize: 队列容量
+        :param batch_size: 单批最大写入数量
+        :param timeout: 单批最长等待时间（秒）
+        :return:
+        """
+        self.name = name
+        self.writer = writer
+        self.batch_size = batch_size
+        self.timeout = timeout
+        self.queue: Queue[T] = Queue(maxsize=maxsize)
+
+    async def put(self, item: T) -> None:
+        """
+        写入队列，队列已满时等待
+
+        :param item: 待写入项目
+        :return:
+        """
+        await self.queue.put(item)
+
+    def offer(self, item: T) -> bool:
+        """
+        写入队列，队列已满时丢弃，避免突发流量阻塞请求
+
+        :param item: 待写入项目
+        :return:
+        """
+        try:
+            self.queue.put_nowait(item)
+        except asyncio.QueueFull:
+            if settings.METRICS_ENABLED:
+                LOG_DROPPED.labels(self.name).inc()
+            log.warning(f'{self.name} 日志队列已满，丢弃一条日志')
+            return False
+        return True
+
+    async def flush(self, items: list[T]) -> None:
+        """
+        批量写入
+
+        :param items: 待写入项目
+        :return:
+        """
+        if settings.DATABASE_ECHO:
+            log.info(f'自动执行【{self.name} 日志批量创建】任务...')
+        start = time.perf_counter()
+        try:
+            async with async_db_session.begin() as db:
+                await self.writer(db, items)
+        except Exception as e:
+            log.error(f'{self.name} 日志批量创建失败: {e}')
+            return
+        if settings.METRICS_ENABLED:
+            LOG_FLUSH_DURATION.labels(self.name).observe(time.perf_counter() - start)
+            LOG_FLUSHED.labels(self.name).inc(len(items))
+
+    async def consumer(self) -> None:
+        """批量写入消费者，被取消时写入已取出但尚未写入的项目"""
+        items: list[T] = []
+        try:
+            while True:
+                await batch_dequeue(self.queue, max_items=self.batch_size, timeout=self.timeout, items=items)
+                if settings.METRICS_ENABLED:
+                    LOG_QUEUE_SIZE.labels(self.name).set(self.queue.qsize())
+                if items:
+                    await self.flush(items)
+                    items = []
+        except asyncio.CancelledError:
+            if items:
+                await self.flush(items)
+            raise
+
+    async def drain(self) -> None:
+        """写入队列中剩余的项目，用于服务关闭前"""
+        while not self.queue.empty():
+            items = [self.queue.get_nowait() for _ in range(min(self.batch_size, self.queue.qsize()))]
+            await self.flush(items)
@@ -0,0 +1,284 @@
+"""
+接口响应缓存
+
+使用 ``response_cache`` 装饰 GET 接口后，响应体按路径、查询参数、用户角色与数据权限指纹以及标签版本缓存在
+进程内 LRU 和 Redis 中。命中时认证、RBAC 等依赖项照常执行，接口函数不再执行，直接返回预编码的 JSON；
+未命中时由路由包装器在响应发送前截获序列化后的响应体写入缓存，与 FastAPI 正常序列化的结果完全一致。
+数据变更后递增相关标签的版本号，旧缓存不再被命中并随过期时间清除
+
+示例::
+
+    @router.get('', summary='获取部门树', dependencies=[DependsJwtAuth])
+    @response_cache('dept')
+    async def get_dept_tree(...): ...
+
+
+    # 数据变更后
+    response_cache.invalidate_after_commit(db, 'dept')
+"""
+
+import functools
+import hashlib
+import inspect
+import time
+
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+from fastapi import FastAPI, Request, Response
+from fastapi.routing import APIRoute
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from backend.common.cache import invalidate_after_commit
+from backend.common.metrics import record_cache
+from backend.common.security.permission import get_data_permission_fingerprint
+from backend.core.conf import settings
+from backend.database.redis import redis_client
+
+# 接口未声明 Request 参数时注入的参数名
+_REQUEST_PARAM = '_response_cache_request'
+
+# 请求状态中待写入缓存的键
+_PENDING_STATE_KEY = 'response_cache'
+
+
+@dataclass(frozen=True, slots=True)
+class _TagInvalidation:
+    """事务提交后失效的缓存标签"""
+
+    tags: tuple[str, ...]
+
+    async def invalidate(self) -> None:
+        await response_cache.invalidate(*self.tags)
+
+
+class ResponseCache:
+    """接口响应缓存"""
+
+    def __init__(self, prefix: str, expire_seconds: int, local_size: int) -> None:
+        """
+        初始化响应缓存
+
+        :param prefix: Redis 键前缀
+        :param expire_seconds: 默认过期时间（秒）
+        :param local_size: 进程内缓存条目数量
+        :return:
+        """
+        self.tags_key = f'{prefix}:tags'
+        self.data_prefix = f'{prefix}:data'
+        self.expire_seconds = expire_seconds
+        self.local_size = local_size
+        self._local: OrderedDict[str, tuple[float, str, bytes]] = OrderedDict()
+
+    def __call__(self, *tags: str, expire_seconds: int | None = None, per_user: bool = False) -> Callable:
+        """
+        缓存接口响应
+
+        :param tags: 缓存标签，任一标签失效后缓存不再命中
+        :param expire_seconds: 过期时间（秒），为空时使用默认值
+        :param per_user: 是否按用户缓存，为否时角色与数据权限相同的用户共享缓存
+        :return:
+        """
+
+        def decorator(func: Callable) -> Callable:
+            signature = inspect.signature(func)
+            request_param = next((k for k, v in signature.parameters.items() if v.annotation is Request), None)
+
+            @functools.wraps(func)
+            async def wrapper(*args, **kwargs) -> Any:
+                request = kwargs[request_param] if request_param else kwargs.pop(_REQUEST_PARAM)
+                if not settings.RESPONSE_CACHE_ENABLED:
+                    return await func(*args, **kwargs)
+                key = await self.build_key(request, tags, per_user=per_user)
+                if key is None:
+                    return await func(*args, **kwargs)
+
+                ttl = expire_seconds or self.expire_seconds
+                cached = await self.get(key, ttl)
+                if cached is not None:
+                    return self.response(request, *cached)
+
+                request.state.response_cache = (key, ttl)
+                return await func(*args, **kwargs)
+
+            if request_param is None:
+                parameter = inspect.Parameter(_REQUEST_PARAM, inspect.Parameter.KEYWORD_ONLY, annotation=Request)
+                wrapper.__signature__ = signature.replace(parameters=[*signature.parameters.values(), parameter])
+            wrapper.__response_cache__ = tags
+            return wrapper
+
+        return decorator
+
+    async def build_key(self, request: Request, tags: tuple[str, ...], *, per_user: bool) -> str | None:
+        """
+        生成缓存键，未认证的请求不缓存
+
+        :param request: FastAPI 请求对象
+        :param tags: 缓存标签
+        :param per_user: 是否按用户缓存
+        :return:
+        """
+        user = request.scope.get('user')
+        if getattr(user, 'id', None) is None:
+            return None
+
+        if per_user:
+            scope = f'user:{user.id}'
+        elif user.is_superuser:
+            scope = 'superuser'
+        else:
+            role_ids = ','.join(str(role.id) for role in sorted(user.roles, key=lambda role: role.id))
+            scope = f'roles:{role_ids}:{get_data_permission_fingerprint(user)}'
+
+        versions = await redis_client.hmget(self.tags_key, list(tags)) if tags else []
+        query = '&'.join(sorted(f'{k}={v}' for k, v in request.query_params.multi_items()))
+        raw = f'{request.url.path}?{query}|{scope}|{",".join(v or "0" for v in versions)}'
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    async def get(self, key: str, expire_seconds: int) -> tuple[str, bytes] | None:
+        """
+        获取缓存，依次查找进程内缓存和 Redis
+
+        :param key: 缓存键
+        :param expire_seconds: 写入进程内缓存的过期时间（秒）
+        :return: ETag 与响应体
+        """
+        local = self._local.get(key)
+        if local is not None:
+            if local[0] > time.monotonic():
+                self._local.move_to_end(key)
+                record_cache('response:local', hit=True)
+                return local[1], local[2]
+            del self._local[key]
+        record_cache('response:local', hit=False)
+
+        value = await redis_client.get(f'{self.data_prefix}:{key}')
+        record_cache('response:redis', hit=value is not None)
+        if value is None:
+            return None
+        etag, _, body = value.partition(':')
+        self._set_local(key, etag, body.encode(), expire_seconds)
+        return etag, body.encode()
+
+    async def set(self, key: str, body: bytes, expire_seconds: int) -> str:
+        """
+        写入缓存
+
+        :param key: 缓存键
+        :param body: 响应体
+        :param expire_seconds: 过期时间（秒）
+        :return: ETag
+        """
+        etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+        await redis_client.set(f'{self.data_prefix}:{key}', f'{etag}:{body.decode()}', ex=expire_seconds)
+        self._set_local(key, etag, body, expire_seconds)
+        return etag
+
+    def _set_local(self, key: str, etag: str, body: bytes, expire_seconds: int) -> None:
+        self._local[key] = (time.monotonic() + expire_seconds, etag, body)
+        self._local.move_to_end(key)
+        while len(self._local) > self.local_size:
+            self._local.popitem(last=False)
+
+    @staticmethod
+    def response(request: Request, etag: str, body: bytes) -> Response:
+        """
+        生成缓存响应，客户端缓存未变化时返回 304
+
+        :param request: FastAPI 请求对象
+        :param etag: ETag
+        :param body: 响应体
+        :return:
+        """
+        headers = {'ETag': etag, 'Cache-Control': 'private, no-cache'}
+        if etag in request.headers.get('if-none-match', ''):
+            return Response(status_code=304, headers=headers)
+        return Response(body, media_type='application/json', headers=headers)
+
+    async def invalidate(self, *tags: str) -> None:
+        """
+        失效标签下的所有缓存
+
+        :param tags: 缓存标签
+        :return:
+        """
+        pipe = redis_client.pipeline(transaction=False)
+        for tag in tags:
+            pipe.hincrby(self.tags_key, tag, 1)
+        await pipe.execute()
+
+    @staticmethod
+    def invalidate_after_commit(db: AsyncSession, *tags: str) -> None:
+        """
+        在当前事务提交后失效标签下的所有缓存
+
+        :param db: 数据库会话
+        :param tags: 缓存标签
+        :return:
+        """
+        invalidate_after_commit(db, _TagInvalidation(tags))
+
+    def wrap_route(self, app: ASGIApp) -> ASGIApp:
+        """
+        包装路由，在响应发送前将未命中缓存的响应体写入缓存
+
+        :param app: 路由的 ASGI 应用
+        :return:
+        """
+
+        async def wrapped(scope: Scope, receive: Receive, send: Send) -> None:
+            start_message: Message | None = None
+            chunks: list[bytes] = []
+
+            async def send_wrapper(message: Message) -> None:
+                nonlocal start_message
+                pending = scope.get('state', {}).get(_PENDING_STATE_KEY)
+                if pending is None:
+                    await send(message)
+                elif message['type'] == 'http.response.start':
+                    if message['status'] == 200:
+                        start_message = message
+                    else:
+                        scope['state'].pop(_PENDING_STATE_KEY)
+                        await send(message)
+                elif message['type'] == 'http.response.body':
+                    chunks.append(message.get('body', b''))
+                    if message.get('more_body', False):
+                        return
+                    scope['state'].pop(_PENDING_STATE_KEY)
+                    key, expire_seconds = pending
+                    body = b''.join(chunks)
+                    etag = await self.set(key, body, expire_seconds)
+                    headers = MutableHeaders(scope=start_message)
+                    headers['ETag'] = etag
+                    headers['Cache-Control'] = 'private, no-cache'
+                    await send(start_message)
+                    await send({'type': 'http.response.body', 'body': body})
+                else:
+                    await send(message)
+
+            await app(scope, receive, send_wrapper)
+
+        return wrapped
+
+    def install(self, app: FastAPI) -> None:
+        """
+        为使用响应缓存的接口安装路由包装器
+
+        :param app: FastAPI 应用实例
+        :return:
+        """
+        for route in app.routes:
+            if isinstance(route, APIRoute) and hasattr(route.endpoint, '__response_cache__'):
+                route.app = self.wrap_route(route.app)
+
+
+response_cache: ResponseCache = ResponseCache(
+    settings.RESPONSE_CACHE_REDIS_PREFIX,
+    settings.RESPONSE_CACHE_EXPIRE_SECONDS,
+    settings.RESPONSE_CACHE_LOCAL_SIZE,
+)
@@ -19,6 +19,7 @@ from backend.app.admin.schema.user import GetUserInfoWithRelationDetail
 from backend.common.dataclasses import AccessToken, NewToken, RefreshToken, TokenPayload
 from backend.common.exception import errors
 from backend.common.exception.errors import TokenError
+from backend.common.metrics import record_cache
 from backend.core.conf import settings
 from backend.database.db import async_db_session
 from backend.database.redis import redis_client
@@ -293,6 +294,7 @@ async def jwt_authentication(token: str) -> GetUserInfoWithRelationDetail:
         raise errors.TokenError(msg='Token 已失效')
 
     cache_user = await redis_client.get(f'{settings.JWT_USER_REDIS_PREFIX}:{user_id}')
+    record_cache(settings.JWT_USER_REDIS_PREFIX, hit=bool(cache_user))
     if not cache_user:
         async with async_db_session() as db:
             current_user = await get_current_user(db, user_id)
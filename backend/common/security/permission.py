@@ -1,3 +1,7 @@
+import hashlib
+
+from typing import Any
+
 from fastapi import Request
 from sqlalchemy import ColumnElement, and_, or_
 
@@ -41,23 +45,20 @@ class RequestPermission:
             ctx.permission = self.value
 
 
-def filter_data_permission(request_user: GetUserInfoWithRelationDetail) -> ColumnElement[bool]:  # noqa: C901
+def get_data_rules(request_user: GetUserInfoWithRelationDetail) -> list[Any]:
     """
-    过滤数据权限，控制用户可见数据范围
-
-    使用场景：
-        - 控制用户能看到哪些数据
+    获取用户生效的数据规则
 
     :param request_user: 请求用户
-    :return:
+    :return: 数据规则列表，为空时不过滤数据
     """
     # 是否过滤数据权限
     if request_user.is_superuser:
-        return or_(1 == 1)
+        return []
 
     for role in request_user.roles:
         if not role.is_filter_scopes:
-            return or_(1 == 1)
+            return []
 
     # 获取数据规则
     data_rules = set()
@@ -66,14 +67,43 @@ def filter_data_permission(request_user: GetUserInfoWithRelationDetail) -> Colum
             if scope.status:
                 data_rules.update(scope.rules)
 
+    return list(data_rules)
+
+
+def get_data_permission_fingerprint(request_user: GetUserInfoWithRelationDetail) -> str:
+    """
+    获取用户数据权限指纹，生效数据规则相同的用户指纹相同
+
+    :param request_user: 请求用户
+    :return:
+    """
+    rules = sorted(
+        (rule.model, rule.column, rule.operator, rule.expression, str(rule.value))
+        for rule in get_data_rules(request_user)
+    )
+    return hashlib.sha256(repr(rules).encode()).hexdigest()[:16] if rules else 'all'
+
+
+def filter_data_permission(request_user: GetUserInfoWithRelationDetail) -> ColumnElement[bool]:
+    """
+    过滤数据权限，控制用户可见数据范围
+
+    使用场景：
+        - 控制用户能看到哪些数据
+
+    :param request_user: 请求用户
+    :return:
+    """
+    data_rules = get_data_rules(request_user)
+
     # 无规则用户不做过滤
-    if not list(data_rules):
+    if not data_rules:
         return or_(1 == 1)
 
     where_and_list = []
     where_or_list = []
 
-    for data_rule in list(data_rules):
+    for data_rule in data_rules:
         # 验证规则模型
         rule_model = data_rule.model
         if rule_model not in settings.DATA_PERMISSION_MODELS:
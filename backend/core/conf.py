@@ -42,6 +42,19 @@ class Settings(BaseSettings):
     DATABASE_POOL_ECHO: bool | Literal['debug'] = False
     DATABASE_SCHEMA: str = 'fba'
     DATABASE_CHARSET: str = 'utf8mb4'
+    DATABASE_POOL_PROFILE: Literal['low', 'medium', 'high'] = 'medium'  # 连接池预设，以下参数为空时使用预设值
+    DATABASE_POOL_SIZE: int | None = None
+    DATABASE_POOL_MAX_OVERFLOW: int | None = None
+    DATABASE_POOL_TIMEOUT: int | None = None  # 秒
+    DATABASE_POOL_RECYCLE: int | None = None  # 秒，需小于数据库服务端的空闲连接超时
+    DATABASE_POOL_PRE_PING: bool | None = None
+    DATABASE_POOL_USE_LIFO: bool | None = None
+    DATABASE_STATEMENT_CACHE_SIZE: int = 100  # PostgreSQL 预编译语句缓存数量
+    DATABASE_PREPARED_STATEMENTS: bool = True  # 通过 PgBouncer transaction 模式连接时需关闭
+    DATABASE_REPLICAS: list[str] = []  # 只读副本地址 host:port，与主库使用相同的账号和库名
+    DATABASE_REPLICA_HEALTH_CHECK_INTERVAL: int = 10  # 秒
+    DATABASE_REPLICA_STICKY_SECONDS: int = 5  # 用户写请求后只读会话仍使用主库的时长
+    DATABASE_REPLICA_REDIS_PREFIX: str = 'fba:db:replica'
 
     # .env Redis
     REDIS_HOST: str
@@ -84,6 +97,21 @@ class Settings(BaseSettings):
     COOKIE_REFRESH_TOKEN_KEY: str = 'fba_refresh_token'
     COOKIE_REFRESH_TOKEN_EXPIRE_SECONDS: int = 60 * 60 * 24 * 7  # 7 天
 
+    # 用户安全（可被参数配置插件动态覆盖）
+    USER_LOCK_REDIS_PREFIX: str = 'fba:user:lock'
+    USER_LOCK_THRESHOLD: int = 5  # 0 表示禁用锁定
+    USER_LOCK_SECONDS: int = 60 * 5  # 5 分钟
+    USER_PASSWORD_EXPIRY_DAYS: int = 365  # 0 表示永不过期
+    USER_PASSWORD_REMINDER_DAYS: int = 7
+    USER_PASSWORD_HISTORY_CHECK_COUNT: int = 3
+    USER_PASSWORD_MIN_LENGTH: int = 6
+    USER_PASSWORD_MAX_LENGTH: int = 32
+    USER_PASSWORD_REQUIRE_SPECIAL_CHAR: bool = False
+
+    # 登录（可被参数配置插件动态覆盖）
+    LOGIN_CAPTCHA_ENABLED: bool = True
+    LOGIN_FAILURE_PREFIX: str = 'fba:login:failure'
+
     # 验证码
     CAPTCHA_LOGIN_REDIS_PREFIX: str = 'fba:login:captcha'
     CAPTCHA_LOGIN_EXPIRE_SECONDS: int = 60 * 5  # 3 分钟
@@ -123,11 +151,14 @@ class Settings(BaseSettings):
     DATETIME_FORMAT: str = '%Y-%m-%d %H:%M:%S'
 
     # 文件上传
-    UPLOAD_READ_SIZE: int = 1024
+    UPLOAD_READ_SIZE: int = 64 * 1024  # 64 KB
+    UPLOAD_REDIS_PREFIX: str = 'fba:upload'
+    UPLOAD_CACHE_MAX_AGE: int = 60 * 60 * 24 * 365  # 1 年
     UPLOAD_IMAGE_EXT_INCLUDE: list[str] = ['jpg', 'jpeg', 'png', 'gif', 'webp']
     UPLOAD_IMAGE_SIZE_MAX: int = 5 * 1024 * 1024  # 5 MB
     UPLOAD_VIDEO_EXT_INCLUDE: list[str] = ['mp4', 'mov', 'avi', 'flv']
     UPLOAD_VIDEO_SIZE_MAX: int = 20 * 1024 * 1024  # 20 MB
+    UPLOAD_FILE_SIZE_MAX: int = 10 * 1024 * 1024  # 10 MB，图片和视频以外的文件
 
     # 演示模式配置
     DEMO_MODE: bool = False
@@ -183,18 +214,86 @@ class Settings(BaseSettings):
         'new_password',
         'confirm_password',
     ]
+    OPERA_LOG_QUEUE_MAXSIZE: int = 100000
     OPERA_LOG_QUEUE_BATCH_CONSUME_SIZE: int = 100
     OPERA_LOG_QUEUE_TIMEOUT: int = 60  # 1 分钟
 
+    # 登录日志
+    LOGIN_LOG_QUEUE_MAXSIZE: int = 100000  # 队列已满时丢弃新日志，避免撞库攻击阻塞登录请求
+    LOGIN_LOG_QUEUE_BATCH_CONSUME_SIZE: int = 500
+    LOGIN_LOG_QUEUE_TIMEOUT: int = 5  # 秒
+
+    # 日志保留策略
+    LOG_RETENTION_OPERA_LOG_DAYS: int = 30
+    LOG_RETENTION_LOGIN_LOG_DAYS: int = 90
+    LOG_RETENTION_CHUNK_SIZE: int = 5000
+    LOG_RETENTION_CHUNK_SLEEP: float = 0.2  # 秒
+    LOG_RETENTION_PARTITION_ENABLED: bool = False  # 需在建表前开启
+    LOG_RETENTION_PARTITION_AHEAD_MONTHS: int = 3
+
+    # 日志检索
+    LOG_SEARCH_DEFAULT_DAYS: int = 0  # 按用户名或 IP 检索且未指定时间范围时的默认检索天数，0 为不限制（默认）
+
+    # 服务器监控
+    SERVER_MONITOR_SAMPLE_INTERVAL: int = 5  # 秒
+    SERVER_MONITOR_DISK_SAMPLE_INTERVAL: int = 60  # 秒
+    SERVER_MONITOR_HISTORY_SIZE: int = 120  # 保留的采样点数量
+
+    # Redis 监控
+    REDIS_MONITOR_REDIS_PREFIX: str = 'fba:monitor:redis'
+    REDIS_MONITOR_SAMPLE_INTERVAL: int = 5  # 秒
+    REDIS_MONITOR_HISTORY_SIZE: int = 120  # 保留的采样点数量
+    REDIS_MONITOR_SLOWLOG_SIZE: int = 10
+
+    # 指标监控
+    METRICS_ENABLED: bool = False
+    METRICS_PATH: str = '/metrics'
+    METRICS_TOKEN: str | None = None  # 设置后抓取指标需携带 Authorization: Bearer <token>
+    METRICS_ALLOWED_IPS: list[str] = ['127.0.0.1', '::1']  # 未设置令牌时仅允许这些地址抓取指标，支持 CIDR
+    METRICS_CELERY_HOST: str = '0.0.0.0'  # Celery worker / beat 指标接口监听地址
+    METRICS_CELERY_PORT: int = 9808
+
+    # SQL 性能分析
+    SQL_PROFILER_ENABLED: bool = False
+    SQL_PROFILER_REDIS_PREFIX: str = 'fba:monitor:sql'
+    SQL_PROFILER_SAMPLE_RATE: float = 0.1  # 发现 N+1 查询的请求总是保存
+    SQL_PROFILER_HISTORY_SIZE: int = 200  # 保留的分析结果数量
+    SQL_PROFILER_SLOWEST_SIZE: int = 5
+    SQL_PROFILER_REPEAT_THRESHOLD: int = 5  # 相同语句在单个请求内执行的次数达到该值时视为 N+1 查询
+
+    # 数据导出
+    EXPORT_BATCH_SIZE: int = 1000  # 服务端游标每批读取的行数
+    EXPORT_ASYNC_THRESHOLD: int = 100_000  # 超过该行数时转为后台任务导出
+    EXPORT_FILE_EXPIRE_SECONDS: int = 86400  # 后台导出文件保留时间，过期后不可下载并由定时任务清理
+
+    # 接口响应缓存
+    RESPONSE_CACHE_ENABLED: bool = True
+    RESPONSE_CACHE_REDIS_PREFIX: str = 'fba:response_cache'
+    RESPONSE_CACHE_EXPIRE_SECONDS: int = 60 * 5
+    RESPONSE_CACHE_LOCAL_SIZE: int = 1000  # 每个进程内缓存的响应数量
+
     # Plugin 配置
     PLUGIN_PIP_CHINA: bool = True
     PLUGIN_PIP_INDEX_URL: str = 'https://mirrors.aliyun.com/pypi/simple/'
     PLUGIN_PIP_MAX_RETRY: int = 3
     PLUGIN_REDIS_PREFIX: str = 'fba:plugin'
+    PLUGIN_MANIFEST_ENABLED: bool = True
+    PLUGIN_ZIP_MAX_SIZE: int = 50 * 1024 * 1024  # 50 MB
+    PLUGIN_ZIP_MAX_UNCOMPRESSED_SIZE: int = 200 * 1024 * 1024  # 200 MB
+    PLUGIN_ZIP_MAX_ENTRIES: int = 5000
+    PLUGIN_ZIP_MAX_COMPRESSION_RATIO: int = 100
 
     # I18n 配置
     I18N_DEFAULT_LANGUAGE: str = 'zh-CN'
 
+    # 雪花算法配置
+    SNOWFLAKE_CLUSTER_ID: int | None = None  # 为空时从 Redis 租用
+    SNOWFLAKE_NODE_ID: int | None = None  # 为空时从 Redis 租用，指定后不再租用
+    SNOWFLAKE_REDIS_PREFIX: str = 'fba:snowflake'
+    SNOWFLAKE_LEASE_EXPIRE_SECONDS: int = 30
+    SNOWFLAKE_HEARTBEAT_INTERVAL_SECONDS: int = 10
+    SNOWFLAKE_MAX_CLOCK_DRIFT_MS: int = 5000
+
     ##################################################
     # [ App ] task
     ##################################################
@@ -214,10 +313,28 @@ class Settings(BaseSettings):
     CELERY_REDIS_PREFIX: str = 'fba:celery'
     CELERY_TASK_MAX_RETRIES: int = 5
 
+    # 任务调度变更事件
+    CELERY_SCHEDULER_EVENT_STREAM_MAXLEN: int = 10000
+    CELERY_SCHEDULER_EVENT_BATCH_SIZE: int = 500
+    CELERY_SCHEDULER_FULL_RELOAD_THRESHOLD: int = 1000
+
+    # 任务调度状态持久化
+    CELERY_BEAT_SYNC_INTERVAL: int = 10  # 秒
+    CELERY_BEAT_SYNC_BATCH_SIZE: int = 500
+
+    # 任务结果批量写入
+    CELERY_RESULT_BACKEND_BATCHED: bool = False
+    CELERY_RESULT_BATCH_SIZE: int = 200
+    CELERY_RESULT_FLUSH_INTERVAL: float = 1.0  # 秒
+    CELERY_RESULT_FAST_PATH_EXPIRE_SECONDS: int = 60 * 5  # 5 分钟
+    CELERY_RESULT_BUFFER_MAX_BATCHES: int = 10  # 数据库不可用时缓冲区最多保留的批次数
+
     ##################################################
     # [ Plugin ] code_generator
     ##################################################
     CODE_GENERATOR_DOWNLOAD_ZIP_FILENAME: str = 'fba_generator'
+    CODE_GENERATOR_RENDER_CACHE_SIZE: int = 512
+    CODE_GENERATOR_IMPORT_BATCH_SIZE: int = 500
 
     ##################################################
     # [ Plugin ] oauth2
@@ -236,6 +353,18 @@ class Settings(BaseSettings):
     OAUTH2_LINUX_DO_REDIRECT_URI: str = 'http://127.0.0.1:8000/api/v1/oauth2/linux-do/callback'
     OAUTH2_FRONTEND_REDIRECT_URI: str = 'http://localhost:5173/oauth2/callback'
 
+    ##################################################
+    # [ Plugin ] config
+    ##################################################
+    CONFIG_REDIS_PREFIX: str = 'fba:config'
+    CONFIG_CACHE_CHECK_INTERVAL: int = 30  # 秒
+
+    ##################################################
+    # [ Plugin ] dict
+    ##################################################
+    DICT_DATA_REDIS_PREFIX: str = 'fba:dict'
+    DICT_DATA_CACHE_CHECK_INTERVAL: int = 30  # 秒
+
     ##################################################
     # [ Plugin ] email
     ##################################################
@@ -250,6 +379,16 @@ class Settings(BaseSettings):
     EMAIL_CAPTCHA_REDIS_PREFIX: str = 'fba:email:captcha'
     EMAIL_CAPTCHA_EXPIRE_SECONDS: int = 60 * 3  # 3 分钟
 
+    # SMTP 连接池
+    EMAIL_SMTP_POOL_SIZE: int = 4
+    EMAIL_SMTP_KEEPALIVE_SECONDS: int = 30  # 空闲超过该时间的连接使用前先探测
+    EMAIL_SMTP_TIMEOUT: int = 30  # 秒
+
+    # 批量发送
+    EMAIL_BULK_QUEUE_MAXSIZE: int = 10000
+    EMAIL_BULK_BATCH_SIZE: int = 50  # 每封邮件的最大接收者数量
+    EMAIL_BULK_RATE_LIMIT: float = 20  # 每秒最大接收者数量，0 表示不限制
+
     @model_validator(mode='before')
     @classmethod
     def check_env(cls, values: Any) -> Any:
@@ -15,8 +15,17 @@ STATIC_DIR = BASE_PATH / 'static'
 # 上传文件目录
 UPLOAD_DIR = STATIC_DIR / 'upload'
 
+# 后台导出文件目录，不对外公开，通过鉴权的下载接口获取；由 Celery Worker 写入、API 服务读取，分开部署时需挂载为共享存储
+EXPORT_DIR = BASE_PATH / 'export'
+
 # 插件目录
 PLUGIN_DIR = BASE_PATH / 'plugin'
 
+# 插件清单文件路径
+PLUGIN_MANIFEST_FILE = PLUGIN_DIR / '.manifest.json'
+
+# 多进程指标目录
+METRICS_DIR = BASE_PATH / '.metrics'
+
 # 国际化文件目录
 LOCALE_DIR = BASE_PATH / 'locale'
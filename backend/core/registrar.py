@@ -1,12 +1,13 @@
 import os
 
-from asyncio import create_task
+from asyncio import create_task, gather
 from collections.abc import AsyncGenerator
 from contextlib import asynccontextmanager
 
 import socketio
 
 from fastapi import Depends, FastAPI
+from fastapi.routing import APIRoute
 from fastapi_limiter import FastAPILimiter
 from fastapi_pagination import add_pagination
 from starlette.middleware.authentication import AuthenticationMiddleware
@@ -17,23 +18,34 @@ from starlette_context.middleware import ContextMiddleware
 from starlette_context.plugins import RequestIdPlugin
 
 from backend import __version__
+from backend.app.admin.model import LoginLog, OperaLog
+from backend.app.admin.service.login_log_service import login_log_writer
 from backend.common.exception.exception_handler import register_exception
 from backend.common.log import set_custom_logfile, setup_logging
+from backend.common.metrics import clean_dead_process_metrics, create_metrics_app, instrument_route, mark_process_dead
+from backend.common.response.response_cache import response_cache
 from backend.common.response.response_code import StandardResponseCode
 from backend.core.conf import settings
 from backend.core.path_conf import STATIC_DIR, UPLOAD_DIR
-from backend.database.db import create_tables
+from backend.database.db import async_engine, create_tables, db_replicas
 from backend.database.redis import redis_client
 from backend.middleware.access_middleware import AccessMiddleware
 from backend.middleware.i18n_middleware import I18nMiddleware
 from backend.middleware.jwt_auth_middleware import JwtAuthMiddleware
 from backend.middleware.opera_log_middleware import OperaLogMiddleware
+from backend.middleware.sql_profiler_middleware import SQLProfilerMiddleware
 from backend.middleware.state_middleware import StateMiddleware
-from backend.plugin.tools import build_final_router
+from backend.plugin.tools import build_final_router, ensure_plugin_status, get_tables_hash, load_plugin_manifest
 from backend.utils.demo_site import demo_site
+from backend.utils.dynamic_config import init_dynamic_config
 from backend.utils.health_check import ensure_unique_route_names, http_limit_callback
+from backend.utils.log_search import check_log_search_columns
 from backend.utils.openapi import simplify_operation_ids
+from backend.utils.redis_info import redis_monitor
 from backend.utils.serializers import MsgSpecJSONResponse
+from backend.utils.server_info import server_monitor
+from backend.utils.sql_profiler import sql_profiler
+from backend.utils.upload_store import UploadStaticFiles
 
 
 @asynccontextmanager
@@ -44,12 +56,27 @@ async def register_init(app: FastAPI) -> AsyncGenerator[None, None]:
     :param app: FastAPI 应用实例
     :return:
     """
-    # 创建数据库表
-    await create_tables()
+    # 清理已退出进程的指标
+    if settings.METRICS_ENABLED:
+        clean_dead_process_metrics()
+
+    # 创建数据库表，插件清单有效且表结构与执行 fba bootstrap 时一致时跳过
+    manifest = load_plugin_manifest()
+    if not manifest or manifest.get('tables') != get_tables_hash():
+        await create_tables()
+
+    # 检查已有数据库是否已升级日志检索列
+    await check_log_search_columns(async_engine, OperaLog.__table__, LoginLog.__table__)
 
     # 初始化 redis
     await redis_client.open()
 
+    # 启动只读副本健康检查
+    db_replicas.start()
+
+    # 补全插件状态
+    await ensure_plugin_status()
+
     # 初始化 limiter
     await FastAPILimiter.init(
         redis=redis_client,
@@ -57,14 +84,32 @@ async def register_init(app: FastAPI) -> AsyncGenerator[None, None]:
         http_callback=http_limit_callback,
     )
 
-    # 创建操作日志任务
-    create_task(OperaLogMiddleware.consumer())
+    # 预加载动态配置
+    await init_dynamic_config()
+
+    # 创建操作日志、登录日志批量写入任务
+    log_consumers = [create_task(OperaLogMiddleware.consumer()), create_task(login_log_writer.consumer())]
+
+    # 启动服务器监控采样
+    server_monitor.start()
+    redis_monitor.start()
 
     yield
 
+    # 停止日志批量写入任务，已取出的日志在取消时写入，再写入队列中剩余的日志
+    for task in log_consumers:
+        task.cancel()
+    await gather(*log_consumers, return_exceptions=True)
+    await OperaLogMiddleware.opera_log_writer.drain()
+    await login_log_writer.drain()
+
     # 关闭 redis 连接
     await redis_client.aclose()
 
+    # 移除当前进程的实时指标
+    if settings.METRICS_ENABLED:
+        mark_process_dead()
+
 
 def register_app() -> FastAPI:
     """注册 FastAPI 应用"""
@@ -101,6 +146,7 @@ def register_app() -> FastAPI:
     register_static_file(app)
     register_middleware(app)
     register_router(app)
+    register_metrics(app)
     register_page(app)
     register_exception(app)
 
@@ -123,7 +169,7 @@ def register_static_file(app: FastAPI) -> None:
     # 上传静态资源
     if not os.path.exists(UPLOAD_DIR):
         os.makedirs(UPLOAD_DIR)
-    app.mount('/static/upload', StaticFiles(directory=UPLOAD_DIR), name='upload')
+    app.mount('/static/upload', UploadStaticFiles(directory=UPLOAD_DIR), name='upload')
 
     # 固有静态资源
     if settings.FASTAPI_STATIC_FILES:
@@ -153,6 +199,12 @@ def register_middleware(app: FastAPI) -> None:
     # I18n
     app.add_middleware(I18nMiddleware)
 
+    # SQL profiler
+    if settings.SQL_PROFILER_ENABLED:
+        for engine in (async_engine, *db_replicas.engines):
+            sql_profiler.instrument(engine)
+        app.add_middleware(SQLProfilerMiddleware)
+
     # Access log
     app.add_middleware(AccessMiddleware)
 
@@ -183,6 +235,24 @@ def register_router(app: FastAPI) -> None:
     # Extra
     ensure_unique_route_names(app)
     simplify_operation_ids(app)
+    response_cache.install(app)
+
+
+def register_metrics(app: FastAPI) -> None:
+    """
+    注册指标监控
+
+    :param app: FastAPI 应用实例
+    :return:
+    """
+    if not settings.METRICS_ENABLED:
+        return
+
+    for route in app.routes:
+        if isinstance(route, APIRoute):
+            route.app = instrument_route(route.app, route.path)
+
+    app.mount(settings.METRICS_PATH, create_metrics_app(), name='metrics')
 
 
 def register_page(app: FastAPI) -> None:
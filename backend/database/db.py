@@ -1,36 +1,43 @@
+import asyncio
+import itertools
 import sys
 
 from collections.abc import AsyncGenerator
-from typing import Annotated
+from typing import Annotated, Any
 from uuid import uuid4
 
-from fastapi import Depends
-from sqlalchemy import URL
+from fastapi import Depends, Request
+from sqlalchemy import URL, text
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
     AsyncSession,
     async_sessionmaker,
     create_async_engine,
 )
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from backend.common.log import log
+from backend.common.metrics import InstrumentedQueuePool, instrument_engine
 from backend.common.model import MappedBase
 from backend.core.conf import settings
+from backend.database.redis import redis_client
 
 
-def create_database_url(*, unittest: bool = False) -> URL:
+def create_database_url(*, unittest: bool = False, host: str | None = None, port: int | None = None) -> URL:
     """
     创建数据库链接
 
     :param unittest: 是否用于单元测试
+    :param host: 数据库地址，为空时使用主库地址
+    :param port: 数据库端口，为空时使用主库端口
     :return:
     """
     url = URL.create(
         drivername='mysql+asyncmy' if settings.DATABASE_TYPE == 'mysql' else 'postgresql+asyncpg',
         username=settings.DATABASE_USER,
         password=settings.DATABASE_PASSWORD,
-        host=settings.DATABASE_HOST,
-        port=settings.DATABASE_PORT,
+        host=host or settings.DATABASE_HOST,
+        port=port or settings.DATABASE_PORT,
         database=settings.DATABASE_SCHEMA if not unittest else f'{settings.DATABASE_SCHEMA}_test',
     )
     if settings.DATABASE_TYPE == 'mysql':
@@ -38,11 +45,80 @@ def create_database_url(*, unittest: bool = False) -> URL:
     return url
 
 
-def create_async_engine_and_session(url: str | URL) -> tuple[AsyncEngine, async_sessionmaker[AsyncSession]]:
+# 连接池预设
+DATABASE_POOL_PROFILES: dict[str, dict[str, Any]] = {
+    # 低并发：连接少，等待时间长，签出前检测连接可用性
+    'low': {
+        'pool_size': 5,
+        'max_overflow': 10,
+        'pool_timeout': 60,
+        'pool_recycle': 3600,
+        'pool_pre_ping': True,
+        'pool_use_lifo': False,
+    },
+    # 中等并发
+    'medium': {
+        'pool_size': 10,
+        'max_overflow': 20,
+        'pool_timeout': 30,
+        'pool_recycle': 3600,
+        'pool_pre_ping': True,
+        'pool_use_lifo': False,
+    },
+    # 高并发：LIFO 复用最近使用的连接，空闲连接自然过期回收；不做签出前检测以省去每次签出的额外往返，
+    # 缩短回收时间，使连接在数据库服务端超时断开之前被回收
+    'high': {
+        'pool_size': 30,
+        'max_overflow': 50,
+        'pool_timeout': 10,
+        'pool_recycle': 1800,
+        'pool_pre_ping': False,
+        'pool_use_lifo': True,
+    },
+}
+
+
+def get_pool_options() -> dict[str, Any]:
+    """获取连接池参数，单独配置的参数覆盖预设值"""
+    options = dict(DATABASE_POOL_PROFILES[settings.DATABASE_POOL_PROFILE])
+    overrides = {
+        'pool_size': settings.DATABASE_POOL_SIZE,
+        'max_overflow': settings.DATABASE_POOL_MAX_OVERFLOW,
+        'pool_timeout': settings.DATABASE_POOL_TIMEOUT,
+        'pool_recycle': settings.DATABASE_POOL_RECYCLE,
+        'pool_pre_ping': settings.DATABASE_POOL_PRE_PING,
+        'pool_use_lifo': settings.DATABASE_POOL_USE_LIFO,
+    }
+    options.update({key: value for key, value in overrides.items() if value is not None})
+    return options
+
+
+def get_connect_args() -> dict[str, Any]:
+    """获取数据库驱动连接参数"""
+    if settings.DATABASE_TYPE != 'postgresql':
+        return {}
+    if not settings.DATABASE_PREPARED_STATEMENTS:
+        # 使用 PgBouncer 等 transaction 模式的连接池时，预编译语句不能跨事务复用
+        return {
+            'statement_cache_size': 0,
+            'prepared_statement_cache_size': 0,
+            'prepared_statement_name_func': lambda: f'__asyncpg_{uuid4()}__',
+        }
+    return {
+        'statement_cache_size': settings.DATABASE_STATEMENT_CACHE_SIZE,
+        'prepared_statement_cache_size': settings.DATABASE_STATEMENT_CACHE_SIZE,
+    }
+
+
+def create_async_engine_and_session(
+    url: str | URL,
+    name: str = 'primary',
+) -> tuple[AsyncEngine, async_sessionmaker[AsyncSession]]:
     """
     创建数据库引擎和 Session
 
     :param url: 数据库连接 URL
+    :param name: 引擎名称，用于连接池指标
     :return:
     """
     try:
@@ -52,18 +128,16 @@ def create_async_engine_and_session(url: str | URL) -> tuple[AsyncEngine, async_
             echo=settings.DATABASE_ECHO,
             echo_pool=settings.DATABASE_POOL_ECHO,
             future=True,
-            # 中等并发
-            pool_size=10,  # 低：- 高：+
-            max_overflow=20,  # 低：- 高：+
-            pool_timeout=30,  # 低：+ 高：-
-            pool_recycle=3600,  # 低：+ 高：-
-            pool_pre_ping=True,  # 低：False 高：True
-            pool_use_lifo=False,  # 低：False 高：True
+            poolclass=InstrumentedQueuePool if settings.METRICS_ENABLED else AsyncAdaptedQueuePool,
+            connect_args=get_connect_args(),
+            **get_pool_options(),
         )
     except Exception as e:
         log.error('❌ 数据库链接失败 {}', e)
         sys.exit()
     else:
+        if settings.METRICS_ENABLED:
+            instrument_engine(engine, name)
         db_session = async_sessionmaker(
             bind=engine,
             class_=AsyncSession,
@@ -73,14 +147,129 @@ def create_async_engine_and_session(url: str | URL) -> tuple[AsyncEngine, async_
         return engine, db_session
 
 
-async def get_db() -> AsyncGenerator[AsyncSession, None]:
-    """获取数据库会话"""
-    async with async_db_session() as session:
+def create_replica_engines_and_sessions() -> list[tuple[AsyncEngine, async_sessionmaker[AsyncSession]]]:
+    """创建只读副本引擎和 Session"""
+    replicas = []
+    for index, address in enumerate(settings.DATABASE_REPLICAS):
+        host, _, port = address.partition(':')
+        url = create_database_url(host=host, port=int(port) if port else None)
+        replicas.append(create_async_engine_and_session(url, name=f'replica-{index}'))
+    return replicas
+
+
+class DatabaseReplicas:
+    """
+    数据库只读副本
+
+    只读会话按轮询使用健康的副本，后台定期检查副本连通性，没有可用副本时回退到主库。
+    用户发起写请求后的一小段时间内，其只读会话仍使用主库，避免因复制延迟读不到刚写入的数据
+    """
+
+    def __init__(
+        self,
+        replicas: list[tuple[AsyncEngine, async_sessionmaker[AsyncSession]]],
+        interval: int,
+        sticky_seconds: int,
+    ) -> None:
+        """
+        初始化只读副本
+
+        :param replicas: 副本引擎和会话列表
+        :param interval: 健康检查间隔（秒）
+        :param sticky_seconds: 写请求后使用主库的时长（秒）
+        :return:
+        """
+        self.engines = [engine for engine, _ in replicas]
+        self.sessions = [session for _, session in replicas]
+        self.healthy = list(range(len(replicas)))
+        self.interval = interval
+        self.sticky_seconds = sticky_seconds
+        self.sticky_prefix = f'{settings.DATABASE_REPLICA_REDIS_PREFIX}:sticky'
+        self._counter = itertools.count()
+        self._task: asyncio.Task | None = None
+
+    def __bool__(self) -> bool:
+        return bool(self.sessions)
+
+    async def stick(self, user_id: int | None) -> None:
+        """
+        标记用户发起了写请求
+
+        :param user_id: 用户 ID
+        :return:
+        """
+        if self and user_id is not None:
+            await redis_client.set(f'{self.sticky_prefix}:{user_id}', 1, ex=self.sticky_seconds)
+
+    async def route(self, user_id: int | None = None) -> async_sessionmaker[AsyncSession]:
+        """
+        选择只读会话
+
+        :param user_id: 用户 ID
+        :return:
+        """
+        healthy = self.healthy
+        if not healthy:
+            return async_db_session
+        if user_id is not None and await redis_client.exists(f'{self.sticky_prefix}:{user_id}'):
+            return async_db_session
+        return self.sessions[healthy[next(self._counter) % len(healthy)]]
+
+    async def _ping(self, index: int) -> bool:
+        try:
+            async with self.sessions[index]() as session:
+                await asyncio.wait_for(session.execute(text('SELECT 1')), timeout=self.interval)
+        except Exception as e:
+            log.warning(f'数据库只读副本 {index} 不可用：{e}')
+            return False
+        return True
+
+    async def check(self) -> None:
+        """检查所有副本的连通性"""
+        results = await asyncio.gather(*[self._ping(i) for i in range(len(self.sessions))])
+        self.healthy = [i for i, ok in enumerate(results) if ok]
+
+    async def run(self) -> None:
+        """后台健康检查任务"""
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.check()
+            except Exception as e:
+                log.error(f'数据库只读副本健康检查失败：{e}')
+
+    def start(self) -> None:
+        """启动后台健康检查任务"""
+        if self and (self._task is None or self._task.done()):
+            self._task = asyncio.create_task(self.run())
+
+
+def _get_user_id(request: Request) -> int | None:
+    """获取认证中间件解析的用户 ID"""
+    return getattr(request.scope.get('user'), 'id', None)
+
+
+async def get_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """获取数据库会话，只读请求（GET）优先使用只读副本"""
+    if request.method in {'GET', 'HEAD'}:
+        session_maker = await db_replicas.route(_get_user_id(request))
+    else:
+        session_maker = async_db_session
+        await db_replicas.stick(_get_user_id(request))
+    async with session_maker() as session:
+        yield session
+
+
+async def get_db_read_only(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """获取只读数据库会话，与请求方法无关，优先使用只读副本"""
+    session_maker = await db_replicas.route(_get_user_id(request))
+    async with session_maker() as session:
         yield session
 
 
-async def get_db_transaction() -> AsyncGenerator[AsyncSession, None]:
+async def get_db_transaction(request: Request) -> AsyncGenerator[AsyncSession, None]:
     """获取带有事务的数据库会话"""
+    await db_replicas.stick(_get_user_id(request))
     async with async_db_session.begin() as session:
         yield session
 
@@ -102,6 +291,14 @@ SQLALCHEMY_DATABASE_URL = create_database_url()
 # SALA 异步引擎和会话
 async_engine, async_db_session = create_async_engine_and_session(SQLALCHEMY_DATABASE_URL)
 
+# 只读副本
+db_replicas: DatabaseReplicas = DatabaseReplicas(
+    create_replica_engines_and_sessions(),
+    settings.DATABASE_REPLICA_HEALTH_CHECK_INTERVAL,
+    settings.DATABASE_REPLICA_STICKY_SECONDS,
+)
+
 # Session Annotated
 CurrentSession = Annotated[AsyncSession, Depends(get_db)]
+CurrentSessionReadOnly = Annotated[AsyncSession, Depends(get_db_read_only)]
 CurrentSessionTransaction = Annotated[AsyncSession, Depends(get_db_transaction)]
@@ -1,9 +1,13 @@
 import sys
+import time
+
+from typing import Any
 
 from redis.asyncio import Redis
 from redis.exceptions import AuthenticationError, TimeoutError
 
 from backend.common.log import log
+from backend.common.metrics import observe_redis_command
 from backend.core.conf import settings
 
 
@@ -38,6 +42,16 @@ class RedisCli(Redis):
             log.error('❌ 数据库 redis 连接异常 {}', e)
             sys.exit()
 
+    async def execute_command(self, *args, **options) -> Any:
+        """执行命令，启用指标监控时记录命令耗时"""
+        if not settings.METRICS_ENABLED:
+            return await super().execute_command(*args, **options)
+        start = time.perf_counter()
+        try:
+            return await super().execute_command(*args, **options)
+        finally:
+            observe_redis_command(args[0], time.perf_counter() - start)
+
     async def delete_prefix(self, prefix: str, exclude: str | list[str] | None = None, batch_size: int = 1000) -> None:
         """
         删除指定前缀的所有 key
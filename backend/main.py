@@ -2,14 +2,20 @@ from rich.progress import Progress, SpinnerColumn, TextColumn, TimeElapsedColumn
 from rich.text import Text
 
 from backend.core.registrar import register_app
-from backend.plugin.tools import get_plugins, install_requirements
+from backend.plugin.tools import get_plugins, install_requirements, load_plugin_manifest
 from backend.utils.console import console
 from backend.utils.timezone import timezone
 
 _log_prefix = f'{timezone.to_str(timezone.now(), "%Y-%m-%d %H:%M:%S.%M0")} | {"INFO": <8} | - | '
-console.print(Text(f'{_log_prefix}检测插件依赖...', style='bold cyan'))
 
-_plugins = get_plugins()
+# 插件清单有效且依赖已满足时跳过依赖检测
+_manifest = load_plugin_manifest()
+if _manifest and not any(_manifest['requirements'].values()):
+    console.print(Text(f'{_log_prefix}已加载插件清单，跳过插件依赖检测', style='bold cyan'))
+    _plugins = []
+else:
+    console.print(Text(f'{_log_prefix}检测插件依赖...', style='bold cyan'))
+    _plugins = get_plugins()
 
 with Progress(
     SpinnerColumn(finished_text=f'[bold green]{_log_prefix}插件准备就绪[/]'),
@@ -7,31 +7,19 @@ from starlette.middleware.base import BaseHTTPMiddleware
 from backend.common.i18n import i18n
 
 
-@lru_cache
-def get_current_language(request: Request) -> str | None:
+@lru_cache(maxsize=256)
+def get_current_language(accept_language: str) -> str | None:
     """
-    获取当前请求的语言偏好
+    获取请求的语言偏好
 
-    :param request: FastAPI 请求对象
+    :param accept_language: 请求头 Accept-Language
     :return:
     """
-    accept_language = request.headers.get('Accept-Language', '')
     if not accept_language:
         return None
 
-    languages = [lang.split(';')[0] for lang in accept_language.split(',')]
-    lang = languages[0].lower().strip()
-
-    # 语言映射
-    lang_mapping = {
-        'zh': 'zh-CN',
-        'zh-cn': 'zh-CN',
-        'zh-hans': 'zh-CN',
-        'en': 'en-US',
-        'en-us': 'en-US',
-    }
-
-    return lang_mapping.get(lang, lang)
+    lang = accept_language.split(',')[0].split(';')[0]
+    return i18n.resolve_language(lang) if lang.strip() else None
 
 
 class I18nMiddleware(BaseHTTPMiddleware):
@@ -45,12 +33,13 @@ class I18nMiddleware(BaseHTTPMiddleware):
         :param call_next: 下一个中间件或路由处理函数
         :return:
         """
-        language = get_current_language(request)
-
-        # 设置国际化语言
-        if language and i18n.current_language != language:
-            i18n.current_language = language
-
-        response = await call_next(request)
+        language = get_current_language(request.headers.get('Accept-Language', ''))
+
+        # 设置当前请求的国际化语言
+        token = i18n.set_language(language)
+        try:
+            response = await call_next(request)
+        finally:
+            i18n.reset_language(token)
 
         return response
@@ -1,6 +1,5 @@
 import time
 
-from asyncio import Queue
 from typing import Any
 
 from asgiref.sync import sync_to_async
@@ -14,10 +13,9 @@ from backend.app.admin.service.opera_log_service import opera_log_service
 from backend.common.context import ctx
 from backend.common.enums import OperaLogCipherType, StatusType
 from backend.common.log import log
-from backend.common.queue import batch_dequeue
+from backend.common.queue import BatchWriter
 from backend.common.response.response_code import StandardResponseCode
 from backend.core.conf import settings
-from backend.database.db import async_db_session
 from backend.utils.encrypt import AESCipher, ItsDCipher, Md5Cipher
 from backend.utils.trace_id import get_request_trace_id
 
@@ -25,7 +23,13 @@ from backend.utils.trace_id import get_request_trace_id
 class OperaLogMiddleware(BaseHTTPMiddleware):
     """操作日志中间件"""
 
-    opera_log_queue: Queue = Queue(maxsize=100000)
+    opera_log_writer: BatchWriter[CreateOperaLogParam] = BatchWriter(
+        'opera',
+        lambda db, objs: opera_log_service.bulk_create(db=db, objs=objs),
+        maxsize=settings.OPERA_LOG_QUEUE_MAXSIZE,
+        batch_size=settings.OPERA_LOG_QUEUE_BATCH_CONSUME_SIZE,
+        timeout=settings.OPERA_LOG_QUEUE_TIMEOUT,
+    )
 
     async def dispatch(self, request: Request, call_next: Any) -> Response:
         """
@@ -112,7 +116,7 @@ class OperaLogMiddleware(BaseHTTPMiddleware):
                 cost_time=elapsed,  # 可能和日志存在微小差异（可忽略）
                 opera_time=ctx.start_time,
             )
-            await self.opera_log_queue.put(opera_log_in)
+            await self.opera_log_writer.put(opera_log_in)
 
             # 错误抛出
             if error:
@@ -196,18 +200,4 @@ class OperaLogMiddleware(BaseHTTPMiddleware):
     @classmethod
     async def consumer(cls) -> None:
         """操作日志消费者"""
-        while True:
-            logs = await batch_dequeue(
-                cls.opera_log_queue,
-                max_items=settings.OPERA_LOG_QUEUE_BATCH_CONSUME_SIZE,
-                timeout=settings.OPERA_LOG_QUEUE_TIMEOUT,
-            )
-            if logs:
-                try:
-                    if settings.DATABASE_ECHO:
-                        log.info('自动执行【操作日志批量创建】任务...')
-                    async with async_db_session.begin() as db:
-                        await opera_log_service.bulk_create(db=db, objs=logs)
-                finally:
-                    if not cls.opera_log_queue.empty():
-                        cls.opera_log_queue.task_done()
+        await cls.opera_log_writer.consumer()
@@ -0,0 +1,28 @@
+from fastapi import Request, Response
+from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
+
+from backend.utils.sql_profiler import SQLProfile, sql_profiler
+
+
+class SQLProfilerMiddleware(BaseHTTPMiddleware):
+    """SQL 性能分析中间件"""
+
+    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
+        """
+        统计请求内执行的 SQL 并写入响应头
+
+        :param request: FastAPI 请求对象
+        :param call_next: 下一个中间件或路由处理函数
+        :return:
+        """
+        profile = SQLProfile()
+        token = sql_profiler.current.set(profile)
+        try:
+            response = await call_next(request)
+        finally:
+            sql_profiler.current.reset(token)
+
+        response.headers.append('Server-Timing', profile.server_timing())
+        await sql_profiler.save(request.method, request.url.path, response.status_code, profile)
+
+        return response
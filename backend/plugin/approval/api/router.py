@@ -1,8 +1,9 @@
 """审批流路由"""
 
-from fastapi import APIRouter, Depends, Query, Request
+from fastapi import APIRouter, Depends, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from backend.common.enums import ExportFormatType
 from backend.common.pagination import DependsPagination, PageData
 from backend.common.response.response_schema import ResponseModel, ResponseSchemaModel, response_base
 from backend.common.security.jwt import DependsJwtAuth
@@ -22,6 +23,7 @@ from backend.plugin.approval.schema.instance import (
     InstanceQuery,
     ProcessInstanceParam,
 )
+from backend.plugin.approval.service.export_service import instance_exporter
 from backend.plugin.approval.service.flow_service import flow_service
 from backend.plugin.approval.service.instance_service import instance_service
 
@@ -153,6 +155,34 @@ async def get_instance_list(
     return response_base.success(data=data)
 
 
+@instance_router.get(
+    '/export',
+    summary='导出流程实例',
+    description='行数超过阈值时转为后台任务导出并返回任务 ID，完成后通过 /tasks/exports/{task_id} 下载',
+    dependencies=[DependsJwtAuth],
+)
+async def export_instances(
+    request: Request,
+    flow_id: int | None = Query(default=None, description='流程ID'),
+    applicant_id: int | None = Query(default=None, description='申请人ID'),
+    status: str | None = Query(default=None, description='实例状态'),
+    urgency: str | None = Query(default=None, description='紧急程度'),
+    business_type: str | None = Query(default=None, description='业务类型'),
+    title: str | None = Query(default=None, description='标题'),
+    fmt: ExportFormatType = Query(default=ExportFormatType.csv, alias='format', description='导出格式'),
+) -> Response:
+    """导出流程实例"""
+    filters = {
+        'flow_id': flow_id,
+        'applicant_id': applicant_id,
+        'status': status,
+        'urgency': urgency,
+        'business_type': business_type,
+        'title': title,
+    }
+    return await instance_exporter.response(request, fmt, filters)
+
+
 @instance_router.get('/{instance_id}', summary='获取流程实例详情', dependencies=[DependsJwtAuth])
 async def get_instance(
     instance_id: int,
@@ -23,11 +23,8 @@ class InstanceDao:
         return result.scalar_one_or_none()
 
     @staticmethod
-    async def get_list(
-        db: AsyncSession,
-        query: InstanceQuery | None = None,
-    ) -> PageData[Instance]:
-        """获取流程实例列表（分页）"""
+    def get_select(query: InstanceQuery | None = None) -> Select:
+        """获取流程实例列表查询表达式"""
         stmt = Select(Instance).order_by(Instance.created_time.desc())
 
         if query:
@@ -51,7 +48,15 @@ class InstanceDao:
             if filters:
                 stmt = stmt.where(and_(*filters))
 
-        return await paging_data(db, stmt)
+        return stmt
+
+    async def get_list(
+        self,
+        db: AsyncSession,
+        query: InstanceQuery | None = None,
+    ) -> PageData[Instance]:
+        """获取流程实例列表（分页）"""
+        return await paging_data(db, self.get_select(query))
 
     @staticmethod
     async def get_by_applicant(
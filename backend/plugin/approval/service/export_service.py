@@ -0,0 +1,37 @@
+"""流程实例导出"""
+
+from sqlalchemy import Select
+
+from backend.plugin.approval.crud.instance import instance_dao
+from backend.plugin.approval.schema.instance import InstanceQuery
+from backend.utils.export import ExportColumn, Exporter
+
+
+class InstanceExporter(Exporter):
+    """流程实例导出器"""
+
+    async def get_select(self, **filters: str | int | None) -> Select:
+        return instance_dao.get_select(InstanceQuery(**filters))
+
+
+instance_exporter: InstanceExporter = InstanceExporter(
+    'approval_instance',
+    [
+        ExportColumn('ID', 'id'),
+        ExportColumn('实例编号', 'instance_no'),
+        ExportColumn('流程 ID', 'flow_id'),
+        ExportColumn('流程版本', 'flow_version'),
+        ExportColumn('申请人 ID', 'applicant_id'),
+        ExportColumn('标题', 'title'),
+        ExportColumn('状态', 'status'),
+        ExportColumn('当前节点 ID', 'current_node_id'),
+        ExportColumn('业务关联键', 'business_key'),
+        ExportColumn('业务类型', 'business_type'),
+        ExportColumn('紧急程度', 'urgency'),
+        ExportColumn('表单数据', 'form_data'),
+        ExportColumn('开始时间', 'started_at'),
+        ExportColumn('结束时间', 'ended_at'),
+        ExportColumn('耗时（秒）', 'duration'),
+        ExportColumn('创建时间', 'created_time'),
+    ],
+)
@@ -9,7 +9,7 @@ from backend.common.security.permission import RequestPermission
 from backend.common.security.rbac import DependsRBAC
 from backend.core.conf import settings
 from backend.database.db import CurrentSession, CurrentSessionTransaction
-from backend.plugin.code_generator.schema.code import ImportParam
+from backend.plugin.code_generator.schema.code import BulkImportParam, GenerateParam, ImportParam
 from backend.plugin.code_generator.service.code_service import gen_service
 
 router = APIRouter()
@@ -37,6 +37,19 @@ async def import_table(db: CurrentSessionTransaction, obj: ImportParam) -> Respo
     return response_base.success()
 
 
+@router.post(
+    '/bulk-imports',
+    summary='批量导入代码生成业务和模型列',
+    dependencies=[
+        Depends(RequestPermission('codegen:table:import')),
+        DependsRBAC,
+    ],
+)
+async def bulk_import_tables(db: CurrentSessionTransaction, obj: BulkImportParam) -> ResponseSchemaModel[int]:
+    count = await gen_service.bulk_import_business_and_model(db=db, obj=obj)
+    return response_base.success(data=count)
+
+
 @router.get('/{pk}/previews', summary='代码生成预览', dependencies=[DependsJwtAuth])
 async def preview_code(
     db: CurrentSession, pk: Annotated[int, Path(description='业务 ID')]
@@ -67,11 +80,25 @@ async def generate_code(db: CurrentSession, pk: Annotated[int, Path(description=
     return response_base.success()
 
 
+@router.post(
+    '/generation',
+    summary='批量代码生成',
+    description='文件磁盘写入，请谨慎操作',
+    dependencies=[
+        Depends(RequestPermission('codegen:local:write')),
+        DependsRBAC,
+    ],
+)
+async def batch_generate_code(db: CurrentSession, obj: GenerateParam) -> ResponseSchemaModel[int]:
+    count = await gen_service.batch_generate(db=db, pks=obj.pks)
+    return response_base.success(data=count)
+
+
 @router.get('/{pk}', summary='下载代码', dependencies=[DependsJwtAuth])
 async def download_code(db: CurrentSession, pk: Annotated[int, Path(description='业务 ID')]):  # noqa: ANN201
-    bio = await gen_service.download(db=db, pk=pk)
+    content = await gen_service.download(db=db, pk=pk)
     return StreamingResponse(
-        bio,
+        content,
         media_type='application/x-zip-compressed',
         headers={'Content-Disposition': f'attachment; filename={settings.CODE_GENERATOR_DOWNLOAD_ZIP_FILENAME}.zip'},
     )
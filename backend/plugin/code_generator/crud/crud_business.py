@@ -1,6 +1,7 @@
 from collections.abc import Sequence
+from typing import Any
 
-from sqlalchemy import Select
+from sqlalchemy import Select, insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy_crud_plus import CRUDPlus
 
@@ -40,6 +41,26 @@ class CRUDGenBusiness(CRUDPlus[GenBusiness]):
         """
         return await self.select_models(db)
 
+    async def get_all_by_ids(self, db: AsyncSession, pks: list[int]) -> Sequence[GenBusiness]:
+        """
+        通过 ID 列表获取代码生成业务
+
+        :param db: 数据库会话
+        :param pks: 代码生成业务 ID 列表
+        :return:
+        """
+        return await self.select_models(db, id__in=pks)
+
+    async def get_all_by_table_names(self, db: AsyncSession, table_names: list[str]) -> Sequence[GenBusiness]:
+        """
+        通过表名列表获取代码生成业务
+
+        :param db: 数据库会话
+        :param table_names: 表名列表
+        :return:
+        """
+        return await self.select_models(db, table_name__in=table_names)
+
     async def get_select(self, table_name: str | None) -> Select:
         """
         获取所有代码生成业务查询表达式
@@ -64,6 +85,16 @@ class CRUDGenBusiness(CRUDPlus[GenBusiness]):
         """
         await self.create_model(db, obj)
 
+    async def bulk_create(self, db: AsyncSession, objs: list[dict[str, Any]]) -> None:
+        """
+        使用多行 INSERT 批量创建代码生成业务
+
+        :param db: 数据库会话
+        :param objs: 代码生成业务数据列表
+        :return:
+        """
+        await db.execute(insert(self.model).values(objs))
+
     async def update(self, db: AsyncSession, pk: int, obj: UpdateGenBusinessParam) -> int:
         """
         更新代码生成业务
@@ -1,6 +1,6 @@
 from collections.abc import Sequence
 
-from sqlalchemy import Row, RowMapping, text
+from sqlalchemy import Row, RowMapping, bindparam, text
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.core.conf import settings
@@ -130,5 +130,91 @@ class CRUDGen:
         result = await db.execute(stmt)
         return result.fetchall()
 
+    @staticmethod
+    async def get_tables(db: AsyncSession, table_schema: str, table_names: list[str]) -> Sequence[RowMapping]:
+        """
+        批量获取表信息
+
+        :param db: 数据库会话
+        :param table_schema: 数据库 schema 名称
+        :param table_names: 表名列表
+        :return:
+        """
+        if settings.DATABASE_TYPE == 'mysql':
+            sql = """
+            SELECT table_name AS table_name, table_comment AS table_comment
+            FROM information_schema.tables
+            WHERE table_name NOT LIKE 'sys_gen_%'
+            AND table_schema = :table_schema
+            AND table_name IN :table_names;
+            """
+            stmt = text(sql).bindparams(bindparam('table_names', expanding=True), table_schema=table_schema)
+        else:
+            sql = """
+            SELECT c.relname AS table_name, obj_description(c.oid) AS table_comment
+            FROM pg_class c
+            LEFT JOIN pg_namespace n ON n.oid = c.relnamespace
+            WHERE c.relkind = 'r'
+            AND n.nspname = 'public' -- schema 通常是 'public'
+            AND c.relname IN :table_names
+            AND c.relname NOT LIKE 'sys_gen_%';
+            """
+            stmt = text(sql).bindparams(bindparam('table_names', expanding=True))
+        result = await db.execute(stmt, {'table_names': table_names})
+        return result.mappings().all()
+
+    @staticmethod
+    async def get_all_columns_by_tables(
+        db: AsyncSession, table_schema: str, table_names: list[str]
+    ) -> Sequence[RowMapping]:
+        """
+        批量获取多个表的所有列信息
+
+        :param db: 数据库会话
+        :param table_schema: 数据库 schema 名称
+        :param table_names: 表名列表
+        :return:
+        """
+        if settings.DATABASE_TYPE == 'mysql':
+            sql = """
+            SELECT table_name AS table_name, column_name AS column_name,
+            CASE WHEN column_key = 'PRI' THEN 1 ELSE 0 END AS is_pk,
+            CASE WHEN is_nullable = 'NO' OR column_key = 'PRI' THEN 0 ELSE 1 END AS is_nullable,
+            ordinal_position AS sort, column_comment AS column_comment,
+            column_type AS column_type FROM information_schema.columns
+            WHERE table_schema = :table_schema
+            AND table_name IN :table_names
+            AND column_name <> 'id'
+            AND column_name <> 'created_time'
+            AND column_name <> 'updated_time'
+            ORDER BY table_name, sort;
+            """
+            stmt = text(sql).bindparams(bindparam('table_names', expanding=True), table_schema=table_schema)
+        else:
+            sql = """
+            SELECT t.relname AS table_name, a.attname AS column_name,
+            CASE WHEN pk.conkey IS NOT NULL AND a.attnum = ANY(pk.conkey) THEN 1 ELSE 0 END AS is_pk,
+            CASE WHEN a.attnotnull OR (pk.conkey IS NOT NULL AND a.attnum = ANY(pk.conkey))
+            THEN 0 ELSE 1 END AS is_nullable,
+            a.attnum AS sort,
+            col_description(t.oid, a.attnum) AS column_comment,
+            pg_catalog.format_type(a.atttypid, a.atttypmod) AS column_type
+            FROM pg_attribute a
+            JOIN pg_class t ON a.attrelid = t.oid
+            JOIN pg_namespace n ON n.oid = t.relnamespace
+            LEFT JOIN pg_constraint pk ON pk.conrelid = t.oid AND pk.contype = 'p'
+            WHERE n.nspname = 'public'  -- 根据你的实际情况修改 schema 名称，通常是 'public'
+            AND t.relname IN :table_names
+            AND a.attnum > 0
+            AND NOT a.attisdropped
+            AND a.attname <> 'id'
+            AND a.attname <> 'created_time'
+            AND a.attname <> 'updated_time'
+            ORDER BY table_name, sort;
+            """
+            stmt = text(sql).bindparams(bindparam('table_names', expanding=True))
+        result = await db.execute(stmt, {'table_names': table_names})
+        return result.mappings().all()
+
 
 gen_dao: CRUDGen = CRUDGen()
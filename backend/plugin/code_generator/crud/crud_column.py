@@ -1,5 +1,7 @@
 from collections.abc import Sequence
+from typing import Any
 
+from sqlalchemy import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy_crud_plus import CRUDPlus
 
@@ -30,6 +32,16 @@ class CRUDGenColumn(CRUDPlus[GenColumn]):
         """
         return await self.select_models_order(db, sort_columns='sort', gen_business_id=business_id)
 
+    async def get_all_by_businesses(self, db: AsyncSession, business_ids: list[int]) -> Sequence[GenColumn]:
+        """
+        获取多个业务的所有代码生成模型列
+
+        :param db: 数据库会话
+        :param business_ids: 业务 ID 列表
+        :return:
+        """
+        return await self.select_models_order(db, sort_columns='sort', gen_business_id__in=business_ids)
+
     async def create(self, db: AsyncSession, obj: CreateGenColumnParam, pd_type: str | None) -> None:
         """
         创建代码生成模型列
@@ -41,6 +53,16 @@ class CRUDGenColumn(CRUDPlus[GenColumn]):
         """
         await self.create_model(db, obj, pd_type=pd_type)
 
+    async def bulk_create(self, db: AsyncSession, objs: list[dict[str, Any]]) -> None:
+        """
+        使用多行 INSERT 批量创建代码生成模型列
+
+        :param db: 数据库会话
+        :param objs: 代码生成模型列数据列表
+        :return:
+        """
+        await db.execute(insert(self.model).values(objs))
+
     async def update(self, db: AsyncSession, pk: int, obj: UpdateGenColumnParam, pd_type: str | None) -> int:
         """
         更新代码生成模型列
@@ -9,3 +9,17 @@ class ImportParam(SchemaBase):
     app: str = Field(description='应用名称，用于代码生成到指定 app')
     table_schema: str = Field(description='数据库名')
     table_name: str = Field(description='数据库表名')
+
+
+class BulkImportParam(SchemaBase):
+    """批量导入参数"""
+
+    app: str = Field(description='应用名称，用于代码生成到指定 app')
+    table_schema: str = Field(description='数据库名')
+    table_names: list[str] | None = Field(None, description='数据库表名列表，为空时导入所有未导入的表')
+
+
+class GenerateParam(SchemaBase):
+    """批量代码生成参数"""
+
+    pks: list[int] = Field(description='业务 ID 列表')
@@ -1,28 +1,32 @@
-import io
+import asyncio
 import os
-import zipfile
+import posixpath
 
-from collections.abc import Sequence
+from collections import defaultdict
+from collections.abc import Callable, Iterator, Mapping, Sequence
+from typing import Any
 
 import anyio
 
-from anyio import open_file
 from pydantic.alias_generators import to_pascal
 from sqlalchemy import RowMapping
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.common.exception import errors
+from backend.core.conf import settings
 from backend.core.path_conf import BASE_PATH
 from backend.plugin.code_generator.crud.crud_business import gen_business_dao
 from backend.plugin.code_generator.crud.crud_code import gen_dao
 from backend.plugin.code_generator.crud.crud_column import gen_column_dao
 from backend.plugin.code_generator.model import GenBusiness
 from backend.plugin.code_generator.schema.business import CreateGenBusinessParam
-from backend.plugin.code_generator.schema.code import ImportParam
+from backend.plugin.code_generator.schema.code import BulkImportParam, ImportParam
 from backend.plugin.code_generator.schema.column import CreateGenColumnParam
 from backend.plugin.code_generator.service.column_service import gen_column_service
 from backend.plugin.code_generator.utils.code_template import gen_template
-from backend.plugin.code_generator.utils.type_conversion import sql_type_to_pydantic
+from backend.plugin.code_generator.utils.type_conversion import sql_type_mapping, sql_type_to_pydantic
+from backend.plugin.code_generator.utils.zip_stream import iter_zip
+from backend.utils.timezone import timezone
 
 
 class GenService:
@@ -92,6 +96,102 @@ class GenService:
                 pd_type=pd_type,
             )
 
+    @staticmethod
+    def parse_column(column: Mapping[str, Any]) -> dict[str, Any]:
+        """
+        解析数据库列信息为模型列数据
+
+        :param column: 数据库列信息
+        :return:
+        """
+        column_type = column['column_type'].split('(')[0].upper()
+        sqla_type, pd_type = sql_type_mapping(column_type)
+        return {
+            'name': column['column_name'],
+            'comment': column['column_comment'],
+            'type': sqla_type,
+            'pd_type': pd_type,
+            'sort': column['sort'],
+            'length': int(column['column_type'].split('(')[1][:-1])
+            if pd_type == 'str' and '(' in column['column_type']
+            else 0,
+            'is_pk': bool(column['is_pk']),
+            'is_nullable': bool(column['is_nullable']),
+        }
+
+    async def bulk_import_business_and_model(
+        self,
+        *,
+        db: AsyncSession,
+        obj: BulkImportParam,
+        progress: Callable[[dict[str, Any]], None] | None = None,
+    ) -> int:
+        """
+        批量导入业务和模型列数据
+
+        所有表与列信息各只查询一次，业务与模型列使用多行 INSERT 分批写入，需在同一事务中调用
+
+        :param db: 数据库会话
+        :param obj: 批量导入参数
+        :param progress: 导入进度回调，参数包含阶段 stage、已处理量 done 与总量 total
+        :return: 导入的业务数量
+        """
+        report = progress or (lambda _: None)
+        if obj.table_names:
+            tables = await gen_dao.get_tables(db, obj.table_schema, list(dict.fromkeys(obj.table_names)))
+            missing = set(obj.table_names) - {table['table_name'] for table in tables}
+            if missing:
+                raise errors.NotFoundError(msg=f'数据库表不存在：{", ".join(sorted(missing))}')
+        else:
+            tables = await gen_dao.get_all_tables(db, obj.table_schema)
+
+        table_names = [table['table_name'] for table in tables]
+        existing = {business.table_name for business in await gen_business_dao.get_all_by_table_names(db, table_names)}
+        if obj.table_names and existing:
+            raise errors.ConflictError(msg=f'已存在相同数据库表业务：{", ".join(sorted(existing))}')
+        tables = [table for table in tables if table['table_name'] not in existing]
+        if not tables:
+            return 0
+        table_names = [table['table_name'] for table in tables]
+        report({'stage': 'tables', 'done': len(tables), 'total': len(tables)})
+
+        columns = await gen_dao.get_all_columns_by_tables(db, obj.table_schema, table_names)
+        report({'stage': 'columns', 'done': len(columns), 'total': len(columns)})
+
+        batch_size = settings.CODE_GENERATOR_IMPORT_BATCH_SIZE
+        now = timezone.now()
+        businesses = [
+            {
+                **CreateGenBusinessParam(
+                    app_name=obj.app,
+                    table_name=table['table_name'],
+                    doc_comment=table['table_comment'] or table['table_name'].split('_')[-1],
+                    table_comment=table['table_comment'],
+                    class_name=to_pascal(table['table_name']),
+                    schema_name=to_pascal(table['table_name']),
+                    filename=table['table_name'],
+                ).model_dump(),
+                'created_time': now,
+            }
+            for table in tables
+        ]
+        for i in range(0, len(businesses), batch_size):
+            await gen_business_dao.bulk_create(db, businesses[i : i + batch_size])
+            report({'stage': 'businesses', 'done': min(i + batch_size, len(businesses)), 'total': len(businesses)})
+
+        business_ids = {
+            business.table_name: business.id
+            for business in await gen_business_dao.get_all_by_table_names(db, table_names)
+        }
+        gen_columns = [
+            {**self.parse_column(column), 'gen_business_id': business_ids[column['table_name']]} for column in columns
+        ]
+        for i in range(0, len(gen_columns), batch_size):
+            await gen_column_dao.bulk_create(db, gen_columns[i : i + batch_size])
+            report({'stage': 'models', 'done': min(i + batch_size, len(gen_columns)), 'total': len(gen_columns)})
+
+        return len(tables)
+
     @staticmethod
     async def render_tpl_code(*, db: AsyncSession, business: GenBusiness) -> dict[str, str]:
         """
@@ -105,11 +205,82 @@ class GenService:
         if not gen_models:
             raise errors.NotFoundError(msg='代码生成模型表为空')
 
-        gen_vars = gen_template.get_vars(business, gen_models)
-        return {
-            tpl_path: await gen_template.get_template(tpl_path).render_async(**gen_vars)
-            for tpl_path in gen_template.get_template_files()
-        }
+        return await gen_template.render(business, gen_models)
+
+    @staticmethod
+    def get_code_files(business: GenBusiness, tpl_code_map: dict[str, str]) -> dict[str, str]:
+        """
+        获取待生成的代码文件，包含各级目录的 __init__.py
+
+        :param business: 业务对象
+        :param tpl_code_map: 模板渲染结果
+        :return: 相对路径与文件内容的映射
+        """
+        files = {}
+        for tpl_path, code in tpl_code_map.items():
+            code_filepath = gen_template.get_code_gen_path(tpl_path, business)
+            code_dir, _ = posixpath.split(code_filepath)
+            parts = code_dir.split('/')
+
+            # 写入 init 文件
+            init_content = gen_template.init_content
+            if parts[-1] == 'model':
+                init_content += (
+                    f'from backend.app.{business.app_name}.model.{business.table_name} '
+                    f'import {to_pascal(business.table_name)}\n'
+                )
+            files[f'{code_dir}/__init__.py'] = init_content
+
+            # api __init__.py 与 app __init__.py
+            if parts[1] == 'api' or parts[-1] == 'service':
+                files[f'{posixpath.dirname(code_dir)}/__init__.py'] = gen_template.init_content
+
+            # 写入代码文件
+            files[code_filepath] = code
+
+        return files
+
+    @staticmethod
+    def merge_init_content(existing: str, content: str) -> str:
+        """
+        合并 __init__.py 内容，仅追加缺失的行
+
+        :param existing: 已有内容
+        :param content: 新内容
+        :return:
+        """
+        lines = existing.splitlines()
+        missing = [line for line in content.splitlines() if line and line not in lines]
+        if not missing:
+            return existing
+        if existing and not existing.endswith('\n'):
+            existing += '\n'
+        return existing + ''.join(f'{line}\n' for line in missing)
+
+    async def write_code_files(self, gen_path: str | os.PathLike[str], files: dict[str, str]) -> None:
+        """
+        并发写入代码文件，已存在的 __init__.py 保留原有内容
+
+        :param gen_path: 代码生成路径
+        :param files: 相对路径与文件内容的映射
+        :return:
+        """
+        targets = {path: anyio.Path(gen_path, *path.split('/')) for path in files}
+        for folder in sorted({target.parent for target in targets.values()}):
+            await folder.mkdir(parents=True, exist_ok=True)
+
+        async def write(path: str, content: str) -> None:
+            target = targets[path]
+            if target.name == '__init__.py' and await target.exists():
+                existing = await target.read_text(encoding='utf-8')
+                content = self.merge_init_content(existing, content)
+                if content == existing:
+                    return
+            await target.write_text(content, encoding='utf-8')
+
+        async with anyio.create_task_group() as tg:
+            for path, content in files.items():
+                tg.start_soon(write, path, content)
 
     async def preview(self, *, db: AsyncSession, pk: int) -> dict[str, bytes]:
         """
@@ -183,95 +354,61 @@ class GenService:
 
         tpl_code_map = await self.render_tpl_code(db=db, business=business)
         gen_path = business.gen_path or BASE_PATH / 'app'
+        await self.write_code_files(gen_path, self.get_code_files(business, tpl_code_map))
 
-        for tpl_path, code in tpl_code_map.items():
-            code_filepath = os.path.join(
-                gen_path,
-                *gen_template.get_code_gen_path(tpl_path, business).split('/'),
-            )
+        return gen_path
 
-            # 写入 init 文件
-            code_folder = anyio.Path(code_filepath).parent
-            await code_folder.mkdir(parents=True, exist_ok=True)
-
-            init_filepath = code_folder.joinpath('__init__.py')
-            if not await init_filepath.exists():
-                async with await open_file(init_filepath, 'w', encoding='utf-8') as f:
-                    await f.write(gen_template.init_content)
-
-            # api __init__.py
-            if 'api' in code_filepath:
-                api_init_filepath = code_folder.parent.joinpath('__init__.py')
-                async with await open_file(api_init_filepath, 'w', encoding='utf-8') as f:
-                    await f.write(gen_template.init_content)
-
-            # app __init__.py
-            if 'service' in code_filepath:
-                app_init_filepath = code_folder.parent.joinpath('__init__.py')
-                async with await open_file(app_init_filepath, 'w', encoding='utf-8') as f:
-                    await f.write(gen_template.init_content)
-
-            # model init 文件补充
-            if code_folder.name == 'model':
-                async with await open_file(init_filepath, 'a', encoding='utf-8') as f:
-                    await f.write(
-                        f'from backend.app.{business.app_name}.model.{business.table_name} '
-                        f'import {to_pascal(business.table_name)}\n',
-                    )
+    async def batch_generate(self, *, db: AsyncSession, pks: list[int]) -> int:
+        """
+        批量生成代码文件
 
-            # 写入代码文件
-            async with await open_file(code_filepath, 'w', encoding='utf-8') as f:
-                await f.write(code)
+        :param db: 数据库会话
+        :param pks: 业务 ID 列表
+        :return: 生成的业务数量
+        """
 
-        return gen_path
+        businesses = await gen_business_dao.get_all_by_ids(db, pks)
+        if len(businesses) != len(set(pks)):
+            raise errors.NotFoundError(msg='业务不存在')
 
-    async def download(self, *, db: AsyncSession, pk: int) -> io.BytesIO:
+        gen_models = defaultdict(list)
+        for column in await gen_column_dao.get_all_by_businesses(db, pks):
+            gen_models[column.gen_business_id].append(column)
+        for business in businesses:
+            if not gen_models[business.id]:
+                raise errors.NotFoundError(msg=f'代码生成模型表为空：{business.table_name}')
+
+        tpl_code_maps = await asyncio.gather(*[
+            gen_template.render(business, gen_models[business.id]) for business in businesses
+        ])
+
+        # 按生成路径合并文件，同一目录下的 __init__.py 只写入一次
+        grouped: dict[str, dict[str, str]] = defaultdict(dict)
+        for business, tpl_code_map in zip(businesses, tpl_code_maps):
+            files = grouped[str(business.gen_path or BASE_PATH / 'app')]
+            for path, content in self.get_code_files(business, tpl_code_map).items():
+                files[path] = self.merge_init_content(files[path], content) if path in files else content
+
+        for gen_path, files in grouped.items():
+            await self.write_code_files(gen_path, files)
+
+        return len(businesses)
+
+    async def download(self, *, db: AsyncSession, pk: int) -> Iterator[bytes]:
         """
         下载生成的代码
 
         :param db: 数据库会话
         :param pk: 业务 ID
-        :return:
+        :return: 流式生成的 ZIP 压缩包
         """
 
         business = await gen_business_dao.get(db, pk)
         if not business:
             raise errors.NotFoundError(msg='业务不存在')
 
-        bio = io.BytesIO()
-        with zipfile.ZipFile(bio, 'w') as zf:
-            tpl_code_map = await self.render_tpl_code(db=db, business=business)
-            for tpl_path, code in tpl_code_map.items():
-                code_filepath = gen_template.get_code_gen_path(tpl_path, business)
-
-                # 写入 init 文件
-                code_dir = os.path.dirname(code_filepath)
-                init_filepath = os.path.join(code_dir, '__init__.py')
-                if 'model' not in code_filepath.split('/'):
-                    zf.writestr(init_filepath, gen_template.init_content)
-                else:
-                    zf.writestr(
-                        init_filepath,
-                        f'{gen_template.init_content}'
-                        f'from backend.app.{business.app_name}.model.{business.table_name} '
-                        f'import {to_pascal(business.table_name)}\n',
-                    )
-
-                # api __init__.py
-                if 'api' in code_dir:
-                    api_init_filepath = os.path.join(os.path.dirname(code_dir), '__init__.py')
-                    zf.writestr(api_init_filepath, gen_template.init_content)
-
-                # app __init__.py
-                if 'service' in code_dir:
-                    app_init_filepath = os.path.join(os.path.dirname(code_dir), '__init__.py')
-                    zf.writestr(app_init_filepath, gen_template.init_content)
-
-                # 写入代码文件
-                zf.writestr(code_filepath, code)
-
-        bio.seek(0)
-        return bio
+        tpl_code_map = await self.render_tpl_code(db=db, business=business)
+        return iter_zip(self.get_code_files(business, tpl_code_map))
 
 
 gen_service: GenService = GenService()
@@ -1,26 +1,42 @@
+import asyncio
+import hashlib
+
+from collections import OrderedDict
 from collections.abc import Sequence
+from functools import cached_property
 
-from jinja2 import Environment, FileSystemLoader, Template, select_autoescape
+from msgspec import json
 
+from backend.common.metrics import record_cache
 from backend.core.conf import settings
 from backend.plugin.code_generator.model import GenBusiness, GenColumn
 from backend.plugin.code_generator.path_conf import JINJA2_TEMPLATE_DIR
+from backend.utils.import_parse import lazy_import
+
+jinja2 = lazy_import('jinja2')
 
 
 class GenTemplate:
     def __init__(self) -> None:
         """初始化模板生成器"""
-        self.env = Environment(
-            loader=FileSystemLoader(JINJA2_TEMPLATE_DIR),
-            autoescape=select_autoescape(enabled_extensions=['jinja']),
+        self.init_content = ''
+        self._render_cache: OrderedDict[tuple[int, str], dict[str, str]] = OrderedDict()
+
+    @cached_property
+    def env(self) -> 'jinja2.Environment':
+        """模板环境，首次使用时创建"""
+        return jinja2.Environment(
+            loader=jinja2.FileSystemLoader(JINJA2_TEMPLATE_DIR),
+            autoescape=jinja2.select_autoescape(enabled_extensions=['jinja']),
             trim_blocks=True,
             lstrip_blocks=True,
             keep_trailing_newline=True,
             enable_async=True,
+            auto_reload=False,
+            bytecode_cache=jinja2.FileSystemBytecodeCache(),
         )
-        self.init_content = ''
 
-    def get_template(self, jinja_file: str) -> Template:
+    def get_template(self, jinja_file: str) -> 'jinja2.Template':
         """
         获取模板文件
 
@@ -96,5 +112,47 @@ class GenTemplate:
             'model_types': [model.type for model in models],
         }
 
+    @staticmethod
+    def get_version(business: GenBusiness, models: Sequence[GenColumn]) -> str:
+        """
+        获取业务与模型列的版本，任意影响渲染结果的字段变化都会产生新版本
+
+        :param business: 代码生成业务对象
+        :param models: 代码生成模型对象列表
+        :return:
+        """
+        column_names = GenColumn.__table__.columns.keys()
+        payload = (
+            [getattr(business, name) for name in GenBusiness.__table__.columns.keys() if not name.endswith('_time')],
+            [[getattr(model, name) for name in column_names] for model in models],
+            settings.DATABASE_TYPE,
+        )
+        return hashlib.sha256(json.encode(payload)).hexdigest()
+
+    async def render(self, business: GenBusiness, models: Sequence[GenColumn]) -> dict[str, str]:
+        """
+        并发渲染所有模板，结果按（业务 ID，模型列版本）缓存
+
+        :param business: 代码生成业务对象
+        :param models: 代码生成模型对象列表
+        :return:
+        """
+        key = (business.id, self.get_version(business, models))
+        cached = self._render_cache.get(key)
+        record_cache('code_generator:render', hit=cached is not None)
+        if cached is not None:
+            self._render_cache.move_to_end(key)
+            return cached
+
+        gen_vars = self.get_vars(business, models)
+        tpl_files = self.get_template_files()
+        codes = await asyncio.gather(*[self.get_template(tpl).render_async(**gen_vars) for tpl in tpl_files])
+        rendered = dict(zip(tpl_files, codes))
+
+        self._render_cache[key] = rendered
+        while len(self._render_cache) > settings.CODE_GENERATOR_RENDER_CACHE_SIZE:
+            self._render_cache.popitem(last=False)
+        return rendered
+
 
 gen_template: GenTemplate = GenTemplate()
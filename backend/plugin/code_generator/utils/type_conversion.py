@@ -1,3 +1,5 @@
+from functools import cache
+
 from backend.core.conf import settings
 from backend.plugin.code_generator.enums import GenMySQLColumnType, GenPostgreSQLColumnType
 
@@ -33,3 +35,14 @@ def sql_type_to_pydantic(typing: str) -> str:
         return GenPostgreSQLColumnType[typing].value
     except KeyError:
         return 'str'
+
+
+@cache
+def sql_type_mapping(typing: str) -> tuple[str, str]:
+    """
+    将 SQL 类型同时转换为 SQLAlchemy 类型与 Pydantic 类型，相同类型只转换一次
+
+    :param typing: SQL 类型字符串
+    :return:
+    """
+    return sql_type_to_sqlalchemy(typing), sql_type_to_pydantic(typing)
@@ -0,0 +1,39 @@
+import zipfile
+
+from collections.abc import Iterator, Mapping
+
+
+class _ZipBuffer:
+    """只追加的压缩包输出缓冲区，每写完一个文件即取出已生成的字节"""
+
+    def __init__(self) -> None:
+        self._chunks: list[bytes] = []
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def iter_zip(files: Mapping[str, str | bytes]) -> Iterator[bytes]:
+    """
+    流式生成 ZIP 压缩包，内存中只保留当前文件的压缩数据
+
+    :param files: 压缩包内文件路径与内容的映射
+    :return:
+    """
+    buffer = _ZipBuffer()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as zf:  # type: ignore[arg-type]
+        for path, content in files.items():
+            zf.writestr(path, content)
+            if data := buffer.drain():
+                yield data
+    if data := buffer.drain():
+        yield data
@@ -3,6 +3,7 @@ from typing import Annotated
 from fastapi import APIRouter, Body, Depends, Path, Query
 
 from backend.common.pagination import DependsPagination, PageData
+from backend.common.response.response_cache import response_cache
 from backend.common.response.response_schema import ResponseModel, ResponseSchemaModel, response_base
 from backend.common.security.jwt import DependsJwtAuth
 from backend.common.security.permission import RequestPermission
@@ -20,6 +21,7 @@ router = APIRouter()
 
 
 @router.get('/all', summary='获取所有参数配置', dependencies=[DependsJwtAuth])
+@response_cache('config')
 async def get_all_configs(
     db: CurrentSession,
     type: Annotated[str | None, Query(description='参数配置类型')] = None,
@@ -31,6 +31,15 @@ class CRUDConfig(CRUDPlus[Config]):
         """
         return await self.select_models(db, type=type)
 
+    async def get_all_types(self, db: AsyncSession) -> Sequence[Config]:
+        """
+        获取所有类型的参数配置
+
+        :param db: 数据库会话
+        :return:
+        """
+        return await self.select_models(db)
+
     async def get_by_key(self, db: AsyncSession, key: str) -> Config | None:
         """
         通过键名获取参数配置
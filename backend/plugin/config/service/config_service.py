@@ -5,6 +5,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.common.exception import errors
 from backend.common.pagination import paging_data
+from backend.common.response.response_cache import response_cache
 from backend.plugin.config.crud.crud_config import config_dao
 from backend.plugin.config.model import Config
 from backend.plugin.config.schema.config import (
@@ -12,6 +13,7 @@ from backend.plugin.config.schema.config import (
     UpdateConfigParam,
     UpdateConfigsParam,
 )
+from backend.plugin.config.utils.store import config_store
 
 
 class ConfigService:
@@ -71,6 +73,8 @@ class ConfigService:
         if config:
             raise errors.ConflictError(msg=f'参数配置 {obj.key} 已存在')
         await config_dao.create(db, obj)
+        config_store.invalidate_after_commit(db)
+        response_cache.invalidate_after_commit(db, 'config')
 
     @staticmethod
     async def update(*, db: AsyncSession, pk: int, obj: UpdateConfigParam) -> int:
@@ -91,6 +95,8 @@ class ConfigService:
             if config:
                 raise errors.ConflictError(msg=f'参数配置 {obj.key} 已存在')
         count = await config_dao.update(db, pk, obj)
+        config_store.invalidate_after_commit(db)
+        response_cache.invalidate_after_commit(db, 'config')
         return count
 
     @staticmethod
@@ -113,6 +119,8 @@ class ConfigService:
                     if config:
                         raise errors.ConflictError(msg=f'参数配置 {obj.key} 已存在')
         count = await config_dao.bulk_update(db, objs)
+        config_store.invalidate_after_commit(db)
+        response_cache.invalidate_after_commit(db, 'config')
         return count
 
     @staticmethod
@@ -126,6 +134,8 @@ class ConfigService:
         """
 
         count = await config_dao.delete(db, pks)
+        config_store.invalidate_after_commit(db)
+        response_cache.invalidate_after_commit(db, 'config')
         return count
 
 
@@ -0,0 +1,85 @@
+from dataclasses import dataclass
+from types import MappingProxyType
+
+from backend.common.cache import VersionedCache
+from backend.core.conf import settings
+from backend.database.db import async_db_session
+from backend.plugin.config.crud.crud_config import config_dao
+
+
+@dataclass(frozen=True, slots=True)
+class ConfigSnapshot:
+    """参数配置快照，加载后只读"""
+
+    # 键名到键值的映射
+    values: MappingProxyType[str, str]
+    # 参数配置类型到键名映射的映射
+    types: MappingProxyType[str, MappingProxyType[str, str]]
+
+    def get_type(self, type: str) -> MappingProxyType[str, str]:
+        """
+        获取指定类型的所有参数配置
+
+        :param type: 参数配置类型
+        :return:
+        """
+        return self.types.get(type, MappingProxyType({}))
+
+    def get_str(self, key: str, default: str | None = None) -> str | None:
+        """
+        获取字符串参数配置
+
+        :param key: 参数配置键名
+        :param default: 默认值
+        :return:
+        """
+        value = self.values.get(key)
+        return default if value is None or value == '' else value
+
+    def get_int(self, key: str, default: int | None = None) -> int | None:
+        """
+        获取整数参数配置，无法解析时返回默认值
+
+        :param key: 参数配置键名
+        :param default: 默认值
+        :return:
+        """
+        try:
+            return int(self.values[key])
+        except (KeyError, TypeError, ValueError):
+            return default
+
+    def get_bool(self, key: str, default: bool | None = None) -> bool | None:
+        """
+        获取布尔参数配置，``true`` 和 ``1`` 视为真
+
+        :param key: 参数配置键名
+        :param default: 默认值
+        :return:
+        """
+        value = self.values.get(key)
+        if value is None or value == '':
+            return default
+        return value.strip().lower() in ('true', '1')
+
+
+class ConfigStore(VersionedCache[ConfigSnapshot]):
+    """参数配置存储"""
+
+    async def load(self) -> ConfigSnapshot:
+        async with async_db_session() as db:
+            configs = await config_dao.get_all_types(db)
+
+        types: dict[str, dict[str, str]] = {}
+        for config in configs:
+            types.setdefault(config.type or '', {})[config.key] = config.value
+        return ConfigSnapshot(
+            values=MappingProxyType({config.key: config.value for config in configs}),
+            types=MappingProxyType({type: MappingProxyType(values) for type, values in types.items()}),
+        )
+
+
+config_store: ConfigStore = ConfigStore(
+    settings.CONFIG_REDIS_PREFIX,
+    check_interval=settings.CONFIG_CACHE_CHECK_INTERVAL,
+)
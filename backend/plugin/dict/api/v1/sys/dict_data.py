@@ -1,8 +1,10 @@
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, Path, Query
+from fastapi import APIRouter, Depends, Path, Query, Request, Response
+from msgspec import json
 
 from backend.common.pagination import DependsPagination, PageData
+from backend.common.response.response_code import CustomResponseCode
 from backend.common.response.response_schema import ResponseModel, ResponseSchemaModel, response_base
 from backend.common.security.jwt import DependsJwtAuth
 from backend.common.security.permission import RequestPermission
@@ -20,11 +22,26 @@ router = APIRouter()
 
 
 @router.get('/all', summary='获取所有字典数据', dependencies=[DependsJwtAuth])
-async def get_all_dict_datas(db: CurrentSession) -> ResponseSchemaModel[list[GetDictDataDetail]]:
-    data = await dict_data_service.get_all(db=db)
+async def get_all_dict_datas() -> ResponseSchemaModel[list[GetDictDataDetail]]:
+    data = await dict_data_service.get_all()
     return response_base.success(data=data)
 
 
+@router.get('/type-codes', summary='批量获取字典数据列表', dependencies=[DependsJwtAuth])
+async def get_dict_data_by_type_codes(
+    request: Request,
+    codes: Annotated[list[str], Query(description='字典类型编码列表')],
+) -> Response:
+    data, etag = await dict_data_service.get_by_type_codes(codes=codes)
+    etag = f'"{etag}"'
+    headers = {'ETag': etag, 'Cache-Control': 'no-cache'}
+    if request.headers.get('If-None-Match') == etag:
+        return Response(status_code=304, headers=headers)
+    res = CustomResponseCode.HTTP_200
+    content = b'{"code":%d,"msg":%s,"data":%s}' % (res.code, json.encode(res.msg), data)
+    return Response(content, media_type='application/json', headers=headers)
+
+
 @router.get('/{pk}', summary='获取字典数据详情', dependencies=[DependsJwtAuth])
 async def get_dict_data(
     db: CurrentSession,
@@ -36,10 +53,9 @@ async def get_dict_data(
 
 @router.get('/type-codes/{code}', summary='获取字典数据列表', dependencies=[DependsJwtAuth])
 async def get_dict_data_by_type_code(
-    db: CurrentSession,
     code: Annotated[str, Path(description='字典类型编码')],
 ) -> ResponseSchemaModel[list[GetDictDataDetail]]:
-    data = await dict_data_service.get_by_type_code(db=db, code=code)
+    data = await dict_data_service.get_by_type_code(code=code)
     return response_base.success(data=data)
 
 
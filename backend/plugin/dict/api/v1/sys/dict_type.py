@@ -3,6 +3,7 @@ from typing import Annotated
 from fastapi import APIRouter, Depends, Path, Query
 
 from backend.common.pagination import DependsPagination, PageData
+from backend.common.response.response_cache import response_cache
 from backend.common.response.response_schema import ResponseModel, ResponseSchemaModel, response_base
 from backend.common.security.jwt import DependsJwtAuth
 from backend.common.security.permission import RequestPermission
@@ -20,6 +21,7 @@ router = APIRouter()
 
 
 @router.get('/all', summary='获取所有字典数据', dependencies=[DependsJwtAuth])
+@response_cache('dict_type')
 async def get_all_dict_types(db: CurrentSession) -> ResponseSchemaModel[list[GetDictTypeDetail]]:
     data = await dict_type_service.get_all(db=db)
     return response_base.success(data=data)
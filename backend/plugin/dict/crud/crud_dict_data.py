@@ -45,6 +45,15 @@ class CRUDDictData(CRUDPlus[DictData]):
         """
         return await self.select_models(db)
 
+    async def get_all_sorted(self, db: AsyncSession) -> Sequence[DictData]:
+        """
+        获取按排序倒序排列的所有字典数据
+
+        :param db: 数据库会话
+        :return:
+        """
+        return await self.select_models_order(db, sort_columns='sort', sort_orders='desc')
+
     async def get_select(
         self,
         type_code: str | None,
@@ -1,6 +1,9 @@
+import hashlib
+
 from collections.abc import Sequence
 from typing import Any
 
+from msgspec import json
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.common.exception import errors
@@ -9,6 +12,7 @@ from backend.plugin.dict.crud.crud_dict_data import dict_data_dao
 from backend.plugin.dict.crud.crud_dict_type import dict_type_dao
 from backend.plugin.dict.model import DictData
 from backend.plugin.dict.schema.dict_data import CreateDictDataParam, DeleteDictDataParam, UpdateDictDataParam
+from backend.plugin.dict.utils.cache import dict_data_cache
 
 
 class DictDataService:
@@ -30,30 +34,42 @@ class DictDataService:
         return dict_data
 
     @staticmethod
-    async def get_by_type_code(*, db: AsyncSession, code: str) -> Sequence[DictData]:
+    async def get_by_type_code(*, code: str) -> Sequence[dict[str, Any]]:
         """
-        获取字典数据详情
+        通过字典类型编码获取启用的字典数据
 
-        :param db: 数据库会话
         :param code: 字典类型编码
         :return:
         """
-
-        dict_datas = await dict_data_dao.get_by_type_code(db, code)
+        snapshot = await dict_data_cache.get()
+        dict_datas = snapshot.by_code.get(code)
         if not dict_datas:
             raise errors.NotFoundError(msg='字典数据不存在')
         return dict_datas
 
     @staticmethod
-    async def get_all(*, db: AsyncSession) -> Sequence[DictData]:
+    async def get_by_type_codes(*, codes: list[str]) -> tuple[bytes, str]:
+        """
+        批量获取字典类型编码对应的启用字典数据
+
+        :param codes: 字典类型编码列表
+        :return: 预编码的 JSON 对象及其 ETag
+        """
+        snapshot = await dict_data_cache.get()
+        codes = list(dict.fromkeys(codes))
+        items = [b'%s:%s' % (json.encode(code), snapshot.encoded.get(code, b'[]')) for code in codes]
+        digest = ','.join(f'{code}:{snapshot.digests.get(code, "")}' for code in codes)
+        return b'{%s}' % b','.join(items), hashlib.md5(digest.encode()).hexdigest()
+
+    @staticmethod
+    async def get_all() -> Sequence[dict[str, Any]]:
         """
         获取所有字典数据
 
-        :param db: 数据库会话
         :return:
         """
-        dict_datas = await dict_data_dao.get_all(db)
-        return dict_datas
+        snapshot = await dict_data_cache.get()
+        return snapshot.all
 
     @staticmethod
     async def get_list(
@@ -101,6 +117,7 @@ class DictDataService:
         if dict_data:
             raise errors.ConflictError(msg='字典数据已存在')
         await dict_data_dao.create(db, obj, dict_type.code)
+        dict_data_cache.invalidate_after_commit(db)
 
     @staticmethod
     async def update(*, db: AsyncSession, pk: int, obj: UpdateDictDataParam) -> int:
@@ -124,6 +141,7 @@ class DictDataService:
         ):
             raise errors.ConflictError(msg='字典数据已存在')
         count = await dict_data_dao.update(db, pk, obj, dict_type.code)
+        dict_data_cache.invalidate_after_commit(db)
         return count
 
     @staticmethod
@@ -137,6 +155,7 @@ class DictDataService:
         """
 
         count = await dict_data_dao.delete(db, obj.pks)
+        dict_data_cache.invalidate_after_commit(db)
         return count
 
 
@@ -5,9 +5,11 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.common.exception import errors
 from backend.common.pagination import paging_data
+from backend.common.response.response_cache import response_cache
 from backend.plugin.dict.crud.crud_dict_type import dict_type_dao
 from backend.plugin.dict.model import DictType
 from backend.plugin.dict.schema.dict_type import CreateDictTypeParam, DeleteDictTypeParam, UpdateDictTypeParam
+from backend.plugin.dict.utils.cache import dict_data_cache
 
 
 class DictTypeService:
@@ -66,6 +68,7 @@ class DictTypeService:
         if dict_type:
             raise errors.ConflictError(msg='字典类型已存在')
         await dict_type_dao.create(db, obj)
+        response_cache.invalidate_after_commit(db, 'dict_type')
 
     @staticmethod
     async def update(*, db: AsyncSession, pk: int, obj: UpdateDictTypeParam) -> int:
@@ -84,6 +87,8 @@ class DictTypeService:
         if dict_type.code != obj.code and await dict_type_dao.get_by_code(db, obj.code):
             raise errors.ConflictError(msg='字典类型已存在')
         count = await dict_type_dao.update(db, pk, obj)
+        response_cache.invalidate_after_commit(db, 'dict_type')
+        dict_data_cache.invalidate_after_commit(db)
         return count
 
     @staticmethod
@@ -97,6 +102,8 @@ class DictTypeService:
         """
 
         count = await dict_type_dao.delete(db, obj.pks)
+        response_cache.invalidate_after_commit(db, 'dict_type')
+        dict_data_cache.invalidate_after_commit(db)
         return count
 
 
@@ -0,0 +1,70 @@
+import hashlib
+
+from dataclasses import dataclass
+from datetime import datetime
+from types import MappingProxyType
+from typing import Any
+
+from msgspec import json
+
+from backend.common.cache import VersionedCache
+from backend.common.enums import StatusType
+from backend.core.conf import settings
+from backend.database.db import async_db_session
+from backend.plugin.dict.crud.crud_dict_data import dict_data_dao
+from backend.utils.serializers import select_columns_serialize
+from backend.utils.timezone import timezone
+
+
+@dataclass(frozen=True, slots=True)
+class DictDataSnapshot:
+    """字典数据快照，加载后只读"""
+
+    # 所有字典数据
+    all: tuple[dict[str, Any], ...]
+    # 按字典类型编码分组的启用字典数据
+    by_code: MappingProxyType[str, tuple[dict[str, Any], ...]]
+    # 按字典类型编码预编码的 JSON
+    encoded: MappingProxyType[str, bytes]
+    # 按字典类型编码的内容摘要
+    digests: MappingProxyType[str, str]
+
+
+def _encode_row(row: dict[str, Any]) -> dict[str, Any]:
+    """与 SchemaBase 的时间序列化格式保持一致"""
+    result = {}
+    for key, value in row.items():
+        if isinstance(value, datetime):
+            if value.tzinfo is not None and value.tzinfo != timezone.tz_info:
+                value = timezone.from_datetime(value)
+            value = timezone.to_str(value)
+        result[key] = value
+    return result
+
+
+class DictDataCache(VersionedCache[DictDataSnapshot]):
+    """字典数据缓存"""
+
+    async def load(self) -> DictDataSnapshot:
+        async with async_db_session() as db:
+            dict_datas = await dict_data_dao.get_all_sorted(db)
+
+        rows = tuple(select_columns_serialize(dict_data) for dict_data in dict_datas)
+        grouped: dict[str, list[dict[str, Any]]] = {}
+        for row in rows:
+            if row['status'] == StatusType.enable:
+                grouped.setdefault(row['type_code'], []).append(row)
+
+        encoded = {code: json.encode([_encode_row(row) for row in items]) for code, items in grouped.items()}
+        return DictDataSnapshot(
+            all=rows,
+            by_code=MappingProxyType({code: tuple(items) for code, items in grouped.items()}),
+            encoded=MappingProxyType(encoded),
+            digests=MappingProxyType({code: hashlib.md5(data).hexdigest() for code, data in encoded.items()}),
+        )
+
+
+dict_data_cache: DictDataCache = DictDataCache(
+    settings.DICT_DATA_REDIS_PREFIX,
+    check_interval=settings.DICT_DATA_CACHE_CHECK_INTERVAL,
+)
@@ -1,22 +1,49 @@
+import asyncio
+import time
+
+from asyncio import Queue
+from dataclasses import dataclass
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
+from functools import cache
 
-from aiosmtplib import SMTP
-from anyio import open_file
-from jinja2 import Template
-from sqlalchemy import inspect
-from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
-
-from backend.common.enums import StatusType
-from backend.common.exception import errors
 from backend.common.log import log
 from backend.core.conf import settings
 from backend.core.path_conf import PLUGIN_DIR
-from backend.database.db import async_engine
-from backend.plugin.config.crud.crud_config import config_dao
-from backend.utils.serializers import select_list_serialize
+from backend.plugin.email.utils.smtp import smtp_pool
+from backend.utils.dynamic_config import EmailConfig, get_email_config
+from backend.utils.import_parse import lazy_import
 from backend.utils.timezone import timezone
 
+jinja2 = lazy_import('jinja2')
+
+
+@cache
+def get_template_env() -> 'jinja2.Environment':
+    """获取邮件模板环境，首次使用时创建，模板编译后常驻缓存"""
+    return jinja2.Environment(
+        loader=jinja2.FileSystemLoader(PLUGIN_DIR / 'email' / 'templates'),
+        autoescape=jinja2.select_autoescape(enabled_extensions=['html']),
+        auto_reload=False,
+        enable_async=True,
+    )
+
+
+@dataclass(frozen=True, slots=True)
+class EmailJob:
+    """批量邮件发送任务"""
+
+    config: EmailConfig
+    recipients: tuple[str, ...]
+    message: bytes
+
+
+# 批量邮件队列
+email_queue: Queue[EmailJob] = Queue(maxsize=settings.EMAIL_BULK_QUEUE_MAXSIZE)
+
+# 批量邮件发送者
+_workers: set[asyncio.Task] = set()
+
 
 async def render_message(subject: str, from_header: str, content: str | dict, template: str | None) -> bytes:
     """
@@ -34,8 +61,7 @@ async def render_message(subject: str, from_header: str, content: str | dict, te
     message['date'] = timezone.now().strftime('%a, %d %b %Y %H:%M:%S %z')
 
     if template:
-        async with await open_file(PLUGIN_DIR / 'email' / 'templates' / template, encoding='utf-8') as f:
-            html = Template(await f.read(), enable_async=True)
+        html = get_template_env().get_template(template)
         mail_body = MIMEText(await html.render_async(**content), 'html', 'utf-8')
     else:
         mail_body = MIMEText(content, 'plain', 'utf-8')
@@ -46,7 +72,6 @@ async def render_message(subject: str, from_header: str, content: str | dict, te
 
 
 async def send_email(
-    db: AsyncSession,
     recipients: str | list[str],
     subject: str,
     content: str | dict,
@@ -55,59 +80,89 @@ async def send_email(
     """
     发送电子邮件
 
-    :param db: 数据库会话
     :param recipients: 邮件接收者
     :param subject: 邮件内容主题
     :param content: 邮件内容
     :param template: 邮件内容模板
     :return:
     """
-    # 本地配置
-    email_host = settings.EMAIL_HOST
-    email_port = settings.EMAIL_PORT
-    email_ssl = settings.EMAIL_SSL
-    email_username = settings.EMAIL_USERNAME
-    email_password = settings.EMAIL_PASSWORD
-
-    # 动态配置
-    dynamic_config = None
-
-    def get_config_table(conn: AsyncConnection) -> bool:
-        inspector = inspect(conn)
-        return inspector.has_table('sys_config', schema=None)
-
-    async with async_engine.begin() as coon:
-        exists = await coon.run_sync(get_config_table)
-        if exists:
-            dynamic_config = await config_dao.get_all(db, 'EMAIL')
-
-    if dynamic_config:
-        status_key = 'EMAIL_STATUS'
-        host_key = 'EMAIL_HOST'
-        port_key = 'EMAIL_PORT'
-        ssl_key = 'EMAIL_SSL'
-        username_key = 'EMAIL_USERNAME'
-        password_key = 'EMAIL_PASSWORD'
-
-        configs = {d['key']: d['value'] for d in select_list_serialize(dynamic_config)}
-        if configs.get(status_key):
-            if len(dynamic_config) < 6:
-                raise errors.NotFoundError(msg='缺少邮件动态配置，请检查系统参数配置-邮件配置')
-            email_host = configs.get(host_key)
-            email_port = int(configs.get(port_key, 0))
-            email_ssl = configs.get(ssl_key, '') == str(StatusType.enable.value)
-            email_username = configs.get(username_key)
-            email_password = configs.get(password_key)
+    email_config = await get_email_config()
 
     try:
-        message = await render_message(subject, email_username, content, template)
-        smtp_client = SMTP(
-            hostname=email_host,
-            port=email_port,
-            use_tls=email_ssl,
-        )
-        async with smtp_client:
-            await smtp_client.login(email_username, email_password)
-            await smtp_client.sendmail(email_username, recipients, message)
+        message = await render_message(subject, email_config.username, content, template)
+        await smtp_pool.sendmail(email_config, recipients, message)
     except Exception as e:
         log.error(f'电子邮件发送失败：{e}')
+
+
+async def send_bulk_email(
+    recipients: list[str],
+    subject: str,
+    content: str | dict,
+    template: str | None = None,
+) -> int:
+    """
+    批量发送电子邮件
+
+    邮件内容只渲染一次，接收者按批次放入队列后立即返回，由后台发送者复用 SMTP 连接并按速率限制发送
+
+    :param recipients: 邮件接收者
+    :param subject: 邮件内容主题
+    :param content: 邮件内容
+    :param template: 邮件内容模板
+    :return: 入队的批次数
+    """
+    email_config = await get_email_config()
+    message = await render_message(subject, email_config.username, content, template)
+    recipients = list(dict.fromkeys(recipients))
+    batch_size = settings.EMAIL_BULK_BATCH_SIZE
+
+    _ensure_workers()
+    batches = 0
+    for i in range(0, len(recipients), batch_size):
+        await email_queue.put(EmailJob(email_config, tuple(recipients[i : i + batch_size]), message))
+        batches += 1
+    return batches
+
+
+class _RateLimiter:
+    """按接收者数量限速，多个发送者共享"""
+
+    def __init__(self, rate: float) -> None:
+        self.rate = rate
+        self._next = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self, count: int) -> None:
+        if self.rate <= 0:
+            return
+        async with self._lock:
+            now = time.monotonic()
+            delay = self._next - now
+            self._next = max(self._next, now) + count / self.rate
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+_rate_limiter = _RateLimiter(settings.EMAIL_BULK_RATE_LIMIT)
+
+
+async def _consumer() -> None:
+    """批量邮件发送者"""
+    while True:
+        job = await email_queue.get()
+        try:
+            await _rate_limiter.wait(len(job.recipients))
+            await smtp_pool.sendmail(job.config, list(job.recipients), job.message)
+        except Exception as e:
+            log.error(f'批量电子邮件发送失败，接收者：{", ".join(job.recipients)}，错误：{e}')
+        finally:
+            email_queue.task_done()
+
+
+def _ensure_workers() -> None:
+    """按连接池大小启动批量邮件发送者"""
+    for _ in range(settings.EMAIL_SMTP_POOL_SIZE - len(_workers)):
+        task = asyncio.create_task(_consumer())
+        _workers.add(task)
+        task.add_done_callback(_workers.discard)
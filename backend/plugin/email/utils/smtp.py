@@ -0,0 +1,117 @@
+import asyncio
+import time
+
+from collections.abc import AsyncGenerator
+from contextlib import asynccontextmanager
+
+from aiosmtplib import SMTP, SMTPException, SMTPServerDisconnected
+
+from backend.common.log import log
+from backend.core.conf import settings
+from backend.utils.dynamic_config import EmailConfig
+
+
+class SMTPPool:
+    """
+    SMTP 连接池
+
+    复用已登录的连接以避免每封邮件重复握手 TLS 与登录；空闲超过保活时间的连接在使用前通过 NOOP 探测，
+    失效则重连。邮件配置变更后旧连接会被全部关闭
+    """
+
+    def __init__(self, size: int, keepalive: int) -> None:
+        """
+        初始化连接池
+
+        :param size: 最大连接数
+        :param keepalive: 空闲连接免探测时间（秒）
+        """
+        self.size = size
+        self.keepalive = keepalive
+        self._config: EmailConfig | None = None
+        self._idle: list[tuple[SMTP, float]] = []
+        self._semaphore = asyncio.Semaphore(size)
+
+    async def _connect(self, config: EmailConfig) -> SMTP:
+        client = SMTP(
+            hostname=config.host,
+            port=config.port,
+            use_tls=config.ssl,
+            timeout=settings.EMAIL_SMTP_TIMEOUT,
+        )
+        await client.connect()
+        await client.login(config.username, config.password)
+        return client
+
+    @staticmethod
+    async def _close(client: SMTP) -> None:
+        try:
+            await client.quit()
+        except Exception:
+            client.close()
+
+    async def _checkout(self, config: EmailConfig) -> SMTP:
+        if config != self._config:
+            await self.close()
+            self._config = config
+        while self._idle:
+            client, last_used = self._idle.pop()
+            if not client.is_connected:
+                continue
+            if time.monotonic() - last_used < self.keepalive:
+                return client
+            try:
+                await client.noop()
+            except SMTPException:
+                client.close()
+                continue
+            return client
+        return await self._connect(config)
+
+    @asynccontextmanager
+    async def acquire(self, config: EmailConfig) -> AsyncGenerator[SMTP, None]:
+        """
+        获取已登录的 SMTP 连接，使用完毕后归还
+
+        :param config: 邮箱配置
+        :return:
+        """
+        async with self._semaphore:
+            client = await self._checkout(config)
+            try:
+                yield client
+            except Exception:
+                client.close()
+                raise
+            if client.is_connected and config == self._config:
+                self._idle.append((client, time.monotonic()))
+            else:
+                await self._close(client)
+
+    async def sendmail(self, config: EmailConfig, recipients: str | list[str], message: bytes) -> None:
+        """
+        发送邮件，连接中途失效时重连重试一次
+
+        :param config: 邮箱配置
+        :param recipients: 邮件接收者
+        :param message: 邮件内容
+        :return:
+        """
+        for attempt in range(2):
+            try:
+                async with self.acquire(config) as client:
+                    await client.sendmail(config.username, recipients, message)
+                return
+            except (SMTPServerDisconnected, ConnectionError) as e:
+                if attempt:
+                    raise
+                log.warning(f'SMTP 连接失效，正在重连：{e}')
+
+    async def close(self) -> None:
+        """关闭所有空闲连接"""
+        idle, self._idle = self._idle, []
+        for client, _ in idle:
+            await self._close(client)
+
+
+smtp_pool: SMTPPool = SMTPPool(settings.EMAIL_SMTP_POOL_SIZE, settings.EMAIL_SMTP_KEEPALIVE_SECONDS)
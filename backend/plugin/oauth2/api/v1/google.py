@@ -1,6 +1,6 @@
 from typing import Annotated
 
-from fastapi import APIRouter, BackgroundTasks, Depends, Response
+from fastapi import APIRouter, Depends, Response
 from fastapi_limiter.depends import RateLimiter
 from fastapi_oauth20 import FastAPIOAuth20, GoogleOAuth20
 from starlette.responses import RedirectResponse
@@ -31,7 +31,6 @@ async def get_google_oauth2_url() -> ResponseSchemaModel[str]:
 async def google_oauth2_callback(  # noqa: ANN201
     db: CurrentSessionTransaction,
     response: Response,
-    background_tasks: BackgroundTasks,
     oauth2: Annotated[
         FastAPIOAuth20,
         Depends(FastAPIOAuth20(google_client, redirect_uri=settings.OAUTH2_GOOGLE_REDIRECT_URI)),
@@ -43,7 +42,6 @@ async def google_oauth2_callback(  # noqa: ANN201
     data = await oauth2_service.create_with_login(
         db=db,
         response=response,
-        background_tasks=background_tasks,
         user=user,
         social=UserSocialType.google,
     )
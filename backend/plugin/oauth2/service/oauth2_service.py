@@ -1,7 +1,6 @@
 from typing import Any
 
-from fast_captcha import text_captcha
-from fastapi import BackgroundTasks, Response
+from fastapi import Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.app.admin.crud.crud_user import user_dao
@@ -17,8 +16,11 @@ from backend.database.redis import redis_client
 from backend.plugin.oauth2.crud.crud_user_social import user_social_dao
 from backend.plugin.oauth2.enums import UserSocialType
 from backend.plugin.oauth2.schema.user_social import CreateUserSocialParam
+from backend.utils.import_parse import lazy_import
 from backend.utils.timezone import timezone
 
+fast_captcha = lazy_import('fast_captcha')
+
 
 class OAuth2Service:
     """OAuth2 认证服务类"""
@@ -28,7 +30,6 @@ class OAuth2Service:
         *,
         db: AsyncSession,
         response: Response,
-        background_tasks: BackgroundTasks,
         user: dict[str, Any],
         social: UserSocialType,
     ) -> GetLoginToken | None:
@@ -37,7 +38,6 @@ class OAuth2Service:
 
         :param db: 数据库会话
         :param response: FastAPI 响应对象
-        :param background_tasks: FastAPI 后台任务
         :param user: OAuth2 用户信息
         :param social: 社交平台类型
         :return:
@@ -79,7 +79,7 @@ class OAuth2Service:
             # 创建系统用户
             if not sys_user:
                 while await user_dao.get_by_username(db, username):
-                    username = f'{username}_{text_captcha(5)}'
+                    username = f'{username}_{fast_captcha.text_captcha(5)}'
                 new_sys_user = AddOAuth2UserParam(
                     username=username,
                     password=None,
@@ -101,7 +101,7 @@ class OAuth2Service:
             multi_login=sys_user.is_multi_login,
             # extra info
             username=sys_user.username,
-            nickname=sys_user.nickname or f'#{text_captcha(5)}',
+            nickname=sys_user.nickname or f'#{fast_captcha.text_captcha(5)}',
             last_login_time=timezone.to_str(timezone.now()),
             ip=ctx.ip,
             os=ctx.os,
@@ -115,9 +115,7 @@ class OAuth2Service:
         )
         await user_dao.update_login_time(db, sys_user.username)
         await db.refresh(sys_user)
-        background_tasks.add_task(
-            login_log_service.create,
-            db=db,
+        login_log_service.create(
             user_uuid=sys_user.uuid,
             username=sys_user.username,
             login_time=timezone.now(),
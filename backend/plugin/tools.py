@@ -1,3 +1,4 @@
+import hashlib
 import json
 import os
 import subprocess
@@ -19,10 +20,11 @@ from backend.common.enums import DataBaseType, PrimaryKeyType, StatusType
 from backend.common.exception import errors
 from backend.common.log import log
 from backend.core.conf import settings
-from backend.core.path_conf import PLUGIN_DIR
+from backend.core.path_conf import PLUGIN_DIR, PLUGIN_MANIFEST_FILE
 from backend.database.redis import RedisCli, redis_client
 from backend.utils._await import run_await
 from backend.utils.import_parse import get_model_objects, import_module_cached
+from backend.utils.timezone import timezone
 
 
 class PluginConfigError(Exception):
@@ -59,8 +61,9 @@ def get_plugin_models() -> list[type]:
     """获取插件所有模型类"""
     objs = []
 
-    for plugin in get_plugins():
-        module_path = f'backend.plugin.{plugin}.model'
+    manifest = load_plugin_manifest()
+    module_paths = manifest['models'] if manifest else [f'backend.plugin.{plugin}.model' for plugin in get_plugins()]
+    for module_path in module_paths:
         obj = get_model_objects(module_path)
         if obj:
             objs.extend(obj)
@@ -112,8 +115,43 @@ def load_plugin_config(plugin: str) -> dict[str, Any]:
         return rtoml.load(f)
 
 
-def parse_plugin_config() -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
-    """解析插件配置"""
+def validate_plugin_config(plugin: str, data: dict[str, Any]) -> bool:
+    """
+    校验插件配置
+
+    :param plugin: 插件名称
+    :param data: 插件配置
+    :return: 是否为扩展级插件
+    """
+    plugin_info = data.get('plugin')
+    if not plugin_info:
+        raise PluginConfigError(f'插件 {plugin} 配置文件缺少 plugin 配置')
+
+    required_fields = ['summary', 'version', 'description', 'author']
+    missing_fields = [field for field in required_fields if field not in plugin_info]
+    if missing_fields:
+        raise PluginConfigError(f'插件 {plugin} 配置文件缺少必要字段: {", ".join(missing_fields)}')
+
+    if data.get('api'):
+        if not data.get('app', {}).get('extend'):
+            raise PluginConfigError(f'扩展级插件 {plugin} 配置文件缺少 app.extend 配置')
+        return True
+
+    if not data.get('app', {}).get('router'):
+        raise PluginConfigError(f'应用级插件 {plugin} 配置文件缺少 app.router 配置')
+    return False
+
+
+def parse_plugin_config(*, use_manifest: bool = True) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+    """
+    解析插件配置
+
+    :param use_manifest: 存在有效的插件清单时直接使用清单中的配置，跳过 Redis 插件信息重写
+    :return:
+    """
+    manifest = load_plugin_manifest() if use_manifest else None
+    if manifest:
+        return manifest['extend_plugins'], manifest['app_plugins']
 
     extend_plugins = []
     app_plugins = []
@@ -131,23 +169,9 @@ def parse_plugin_config() -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
 
     for plugin in plugins:
         data = load_plugin_config(plugin)
-
-        plugin_info = data.get('plugin')
-        if not plugin_info:
-            raise PluginConfigError(f'插件 {plugin} 配置文件缺少 plugin 配置')
-
-        required_fields = ['summary', 'version', 'description', 'author']
-        missing_fields = [field for field in required_fields if field not in plugin_info]
-        if missing_fields:
-            raise PluginConfigError(f'插件 {plugin} 配置文件缺少必要字段: {", ".join(missing_fields)}')
-
-        if data.get('api'):
-            if not data.get('app', {}).get('extend'):
-                raise PluginConfigError(f'扩展级插件 {plugin} 配置文件缺少 app.extend 配置')
+        if validate_plugin_config(plugin, data):
             extend_plugins.append(data)
         else:
-            if not data.get('app', {}).get('router'):
-                raise PluginConfigError(f'应用级插件 {plugin} 配置文件缺少 app.router 配置')
             app_plugins.append(data)
 
         # 补充插件信息
@@ -167,17 +191,137 @@ def parse_plugin_config() -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
     # 重置插件变更状态
     run_await(current_redis_client.delete)(f'{settings.PLUGIN_REDIS_PREFIX}:changed')
 
+    # 失效插件列表接口缓存
+    run_await(current_redis_client.hincrby)(f'{settings.RESPONSE_CACHE_REDIS_PREFIX}:tags', 'plugin', 1)
+
     # 关闭连接
     run_await(current_redis_client.aclose)()
 
     return extend_plugins, app_plugins
 
 
-def inject_extend_router(plugin: dict[str, Any]) -> None:
+def get_plugin_hash() -> str:
+    """计算插件目录哈希，插件文件的新增、删除与修改都会产生新的哈希"""
+    sha256 = hashlib.sha256()
+    for root, dirs, files in os.walk(PLUGIN_DIR):
+        dirs[:] = sorted(d for d in dirs if d != '__pycache__' and not d.startswith('.'))
+        for file in sorted(files):
+            if file.startswith('.') or file.endswith('.pyc'):
+                continue
+            path = os.path.join(root, file)
+            stat = os.stat(path)
+            sha256.update(f'{os.path.relpath(path, PLUGIN_DIR)}:{stat.st_size}:{stat.st_mtime_ns}\n'.encode())
+    return sha256.hexdigest()
+
+
+def get_tables_hash() -> str:
+    """计算应用与插件模型的表结构哈希，表、列、索引与约束的新增、删除与修改都会产生新的哈希"""
+    from backend.app import get_app_models
+    from backend.common.model import MappedBase
+
+    get_app_models()
+    get_plugin_models()
+
+    sha256 = hashlib.sha256()
+    for table in sorted(MappedBase.metadata.tables.values(), key=lambda t: t.fullname):
+        sha256.update(f'table:{table.fullname}\n'.encode())
+        for column in table.columns:
+            server_default = getattr(column.server_default, 'arg', None)
+            sha256.update(
+                f'column:{column.name}:{column.type!r}:{column.nullable}:{column.primary_key}:'
+                f'{column.autoincrement}:{server_default}\n'.encode()
+            )
+        for index in sorted(table.indexes, key=lambda i: i.name or ''):
+            columns = ','.join(str(expr) for expr in index.expressions)
+            sha256.update(
+                f'index:{index.name}:{columns}:{index.unique}:{sorted(index.dialect_kwargs.items())}\n'.encode()
+            )
+        for constraint in sorted(table.constraints, key=lambda c: f'{type(c).__name__}:{c.name}'):
+            columns = ','.join(column.name for column in getattr(constraint, 'columns', []))
+            sha256.update(f'constraint:{type(constraint).__name__}:{constraint.name}:{columns}\n'.encode())
+    return sha256.hexdigest()
+
+
+def build_plugin_manifest() -> dict[str, Any]:
     """
-    扩展级插件路由注入
+    构建插件清单
 
-    :param plugin: 插件名称
+    需在依赖安装、插件配置解析与建表完成后调用，清单包含插件配置、路由与模型模块列表、表结构哈希及依赖检查结果
+
+    :return:
+    """
+    extend_plugins, app_plugins = parse_plugin_config(use_manifest=False)
+    return {
+        'hash': get_plugin_hash(),
+        'tables': get_tables_hash(),
+        'created_time': timezone.to_str(timezone.now()),
+        'extend_plugins': extend_plugins,
+        'app_plugins': app_plugins,
+        'routers': {plugin['plugin']['name']: get_extend_routers(plugin) for plugin in extend_plugins},
+        'models': [
+            f'backend.plugin.{plugin}.model'
+            for plugin in get_plugins()
+            if os.path.exists(PLUGIN_DIR / plugin / 'model')
+        ],
+        'requirements': {plugin: check_requirements(plugin) for plugin in get_plugins()},
+    }
+
+
+def write_plugin_manifest(manifest: dict[str, Any]) -> None:
+    """
+    写入插件清单
+
+    :param manifest: 插件清单
+    :return:
+    """
+    temp_file = PLUGIN_MANIFEST_FILE.with_suffix('.tmp')
+    with open(temp_file, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    os.replace(temp_file, PLUGIN_MANIFEST_FILE)
+    load_plugin_manifest.cache_clear()
+
+
+@lru_cache
+def load_plugin_manifest() -> dict[str, Any] | None:
+    """加载插件清单，清单不存在、已禁用或与当前插件目录不一致时返回 None"""
+    if not settings.PLUGIN_MANIFEST_ENABLED or not os.path.exists(PLUGIN_MANIFEST_FILE):
+        return None
+
+    try:
+        with open(PLUGIN_MANIFEST_FILE, encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError) as e:
+        log.warning(f'插件清单读取失败，将执行完整启动流程：{e}')
+        return None
+
+    if manifest.get('hash') != get_plugin_hash():
+        log.warning('插件目录已变更，插件清单失效，将执行完整启动流程，请重新执行 fba bootstrap')
+        return None
+
+    return manifest
+
+
+async def ensure_plugin_status() -> None:
+    """使用插件清单启动时，补全 Redis 中缺失的插件状态，不覆盖已有状态"""
+    manifest = load_plugin_manifest()
+    if not manifest:
+        return
+
+    pipe = redis_client.pipeline(transaction=False)
+    for plugin in manifest['extend_plugins'] + manifest['app_plugins']:
+        pipe.set(
+            f'{settings.PLUGIN_REDIS_PREFIX}:{plugin["plugin"]["name"]}',
+            json.dumps(plugin, ensure_ascii=False),
+            nx=True,
+        )
+    await pipe.execute()
+
+
+def get_extend_routers(plugin: dict[str, Any]) -> list[dict[str, Any]]:
+    """
+    获取扩展级插件路由模块列表
+
+    :param plugin: 插件配置
     :return:
     """
     plugin_name: str = plugin['plugin']['name']
@@ -185,6 +329,7 @@ def inject_extend_router(plugin: dict[str, Any]) -> None:
     if not os.path.exists(plugin_api_path):
         raise PluginConfigError(f'插件 {plugin} 缺少 api 目录，请检查插件文件是否完整')
 
+    routers = []
     for root, _, api_files in os.walk(plugin_api_path):
         for file in api_files:
             if not (file.endswith('.py') and file != '__init__.py'):
@@ -192,45 +337,69 @@ def inject_extend_router(plugin: dict[str, Any]) -> None:
 
             # 解析插件路由配置
             file_config = plugin['api'][file[:-3]]
-            prefix = file_config['prefix']
-            tags = file_config['tags']
 
             # 获取插件路由模块
             file_path = os.path.join(root, file)
             path_to_module_str = os.path.relpath(file_path, PLUGIN_DIR).replace(os.sep, '.')[:-3]
-            module_path = f'backend.plugin.{path_to_module_str}'
 
-            try:
-                module = import_module_cached(module_path)
-                plugin_router = getattr(module, 'router', None)
-                if not plugin_router:
-                    warnings.warn(
-                        f'扩展级插件 {plugin_name} 模块 {module_path} 中没有有效的 router，请检查插件文件是否完整',
-                        FutureWarning,
-                    )
-                    continue
+            # 获取目标 app 路由模块
+            relative_path = os.path.relpath(root, plugin_api_path)
+            app_name = plugin.get('app', {}).get('extend')
+
+            routers.append({
+                'module': f'backend.plugin.{path_to_module_str}',
+                'target': f'backend.app.{app_name}.api.{relative_path.replace(os.sep, ".")}',
+                'prefix': file_config['prefix'],
+                'tags': file_config['tags'],
+            })
+
+    return routers
+
+
+def inject_extend_router(plugin: dict[str, Any]) -> None:
+    """
+    扩展级插件路由注入
+
+    :param plugin: 插件名称
+    :return:
+    """
+    plugin_name: str = plugin['plugin']['name']
+    manifest = load_plugin_manifest()
+    routers = manifest['routers'][plugin_name] if manifest else get_extend_routers(plugin)
 
-                # 获取目标 app 路由
-                relative_path = os.path.relpath(root, plugin_api_path)
-                app_name = plugin.get('app', {}).get('extend')
-                target_module_path = f'backend.app.{app_name}.api.{relative_path.replace(os.sep, ".")}'
-                target_module = import_module_cached(target_module_path)
-                target_router = getattr(target_module, 'router', None)
-
-                if not target_router or not isinstance(target_router, APIRouter):
-                    raise PluginInjectError(
-                        f'扩展级插件 {plugin_name} 模块 {module_path} 中没有有效的 router，请检查插件文件是否完整',
-                    )
-
-                # 将插件路由注入到目标路由中
-                target_router.include_router(
-                    router=plugin_router,
-                    prefix=prefix,
-                    tags=[tags] if tags else [],
-                    dependencies=[Depends(PluginStatusChecker(plugin_name))],
+    for router in routers:
+        module_path = router['module']
+        prefix = router['prefix']
+        tags = router['tags']
+
+        try:
+            module = import_module_cached(module_path)
+            plugin_router = getattr(module, 'router', None)
+            if not plugin_router:
+                warnings.warn(
+                    f'扩展级插件 {plugin_name} 模块 {module_path} 中没有有效的 router，请检查插件文件是否完整',
+                    FutureWarning,
+                )
+                continue
+
+            # 获取目标 app 路由
+            target_module = import_module_cached(router['target'])
+            target_router = getattr(target_module, 'router', None)
+
+            if not target_router or not isinstance(target_router, APIRouter):
+                raise PluginInjectError(
+                    f'扩展级插件 {plugin_name} 模块 {module_path} 中没有有效的 router，请检查插件文件是否完整',
                 )
-            except Exception as e:
-                raise PluginInjectError(f'扩展级插件 {plugin_name} 路由注入失败：{e!s}') from e
+
+            # 将插件路由注入到目标路由中
+            target_router.include_router(
+                router=plugin_router,
+                prefix=prefix,
+                tags=[tags] if tags else [],
+                dependencies=[Depends(PluginStatusChecker(plugin_name))],
+            )
+        except Exception as e:
+            raise PluginInjectError(f'扩展级插件 {plugin_name} 路由注入失败：{e!s}') from e
 
 
 def inject_app_router(plugin: dict[str, Any], target_router: APIRouter) -> None:
@@ -333,7 +502,34 @@ def _ensure_pip_available() -> bool:
     return False
 
 
-def install_requirements(plugin: str | None) -> None:  # noqa: C901
+def check_requirements(plugin: str) -> list[str]:
+    """
+    检查插件依赖
+
+    :param plugin: 插件名称
+    :return: 缺失的依赖列表
+    """
+    requirements_file = PLUGIN_DIR / plugin / 'requirements.txt'
+    missing = []
+    if os.path.exists(requirements_file):
+        with open(requirements_file, encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line or line.startswith('#'):
+                    continue
+                try:
+                    req = Requirement(line)
+                    dependency = req.name.lower()
+                except Exception as e:
+                    raise PluginInstallError(f'插件 {plugin} 依赖 {line} 格式错误: {e!s}') from e
+                try:
+                    distribution(dependency)
+                except PackageNotFoundError:
+                    missing.append(dependency)
+    return missing
+
+
+def install_requirements(plugin: str | None) -> None:
     """
     安装插件依赖
 
@@ -344,22 +540,7 @@ def install_requirements(plugin: str | None) -> None:  # noqa: C901
 
     for plugin in plugins:
         requirements_file = PLUGIN_DIR / plugin / 'requirements.txt'
-        missing_dependencies = False
-        if os.path.exists(requirements_file):
-            with open(requirements_file, encoding='utf-8') as f:
-                for line in f:
-                    line = line.strip()
-                    if not line or line.startswith('#'):
-                        continue
-                    try:
-                        req = Requirement(line)
-                        dependency = req.name.lower()
-                    except Exception as e:
-                        raise PluginInstallError(f'插件 {plugin} 依赖 {line} 格式错误: {e!s}') from e
-                    try:
-                        distribution(dependency)
-                    except PackageNotFoundError:
-                        missing_dependencies = True
+        missing_dependencies = bool(check_requirements(plugin))
 
         if missing_dependencies:
             try:
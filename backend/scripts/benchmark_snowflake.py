@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# ruff: noqa: I001
+import sys
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+
+from backend.utils.snowflake import Snowflake
+
+DURATION = 3  # seconds
+BATCH_SIZE = 1000
+THREADS = 4
+
+
+def bench(name: str, func, per_call: int) -> None:  # noqa: ANN001
+    count = 0
+    start = time.perf_counter()
+    while (elapsed := time.perf_counter() - start) < DURATION:
+        func()
+        count += per_call
+    print(f'{name:<32}{count / elapsed:>16,.0f} IDs/sec')
+
+
+def bench_threads(snowflake: Snowflake) -> None:
+    def worker() -> int:
+        count = 0
+        deadline = time.perf_counter() + DURATION
+        while time.perf_counter() < deadline:
+            snowflake.generate()
+            count += 1
+        return count
+
+    with ThreadPoolExecutor(THREADS) as executor:
+        start = time.perf_counter()
+        ids = sum(executor.map(lambda _: worker(), range(THREADS)))
+        elapsed = time.perf_counter() - start
+    print(f'{f"generate() x {THREADS} threads":<32}{ids / elapsed:>16,.0f} IDs/sec')
+
+
+def check_unique(snowflake: Snowflake) -> None:
+    ids = snowflake.generate_batch(100_000) + [snowflake.generate() for _ in range(100_000)]
+    assert len(ids) == len(set(ids)), 'duplicate snowflake id'
+    assert ids == sorted(ids), 'snowflake ids are not monotonic'
+
+
+if __name__ == '__main__':
+    # 使用固定节点，无需连接 Redis
+    snowflake = Snowflake(cluster_id=1, node_id=int(sys.argv[1]) if len(sys.argv) > 1 else 0)
+    check_unique(snowflake)
+    bench('generate()', snowflake.generate, 1)
+    bench(f'generate_batch({BATCH_SIZE})', lambda: snowflake.generate_batch(BATCH_SIZE), BATCH_SIZE)
+    bench_threads(snowflake)
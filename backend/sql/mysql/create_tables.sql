@@ -196,6 +196,7 @@ create table sys_login_log
     username     varchar(20)  not null comment '用户名',
     status       int          not null comment '登录状态(0失败 1成功)',
     ip           varchar(50)  not null comment '登录IP地址',
+    ip_bin       varbinary(16) null comment 'IP地址（16 字节二进制，用于范围检索）',
     country      varchar(50)  null comment '国家',
     region       varchar(50)  null comment '地区',
     city         varchar(50)  null comment '城市',
@@ -211,6 +212,18 @@ create table sys_login_log
 create index ix_sys_login_log_id
     on sys_login_log (id);
 
+create index ix_sys_login_log_created_time
+    on sys_login_log (created_time);
+
+create index ix_sys_login_log_username_created_time
+    on sys_login_log (username, created_time);
+
+create index ix_sys_login_log_ip_bin
+    on sys_login_log (ip_bin);
+
+create fulltext index ix_sys_login_log_username_ngram
+    on sys_login_log (username) with parser ngram;
+
 create table sys_menu
 (
     id           int auto_increment comment '主键id'
@@ -251,6 +264,7 @@ create table sys_opera_log
     title        varchar(255) not null comment '操作模块',
     path         varchar(500) not null comment '请求路径',
     ip           varchar(50)  not null comment 'IP地址',
+    ip_bin       varbinary(16) null comment 'IP地址（16 字节二进制，用于范围检索）',
     country      varchar(50)  null comment '国家',
     region       varchar(50)  null comment '地区',
     city         varchar(50)  null comment '城市',
@@ -270,6 +284,18 @@ create table sys_opera_log
 create index ix_sys_opera_log_id
     on sys_opera_log (id);
 
+create index ix_sys_opera_log_created_time
+    on sys_opera_log (created_time);
+
+create index ix_sys_opera_log_username_created_time
+    on sys_opera_log (username, created_time);
+
+create index ix_sys_opera_log_ip_bin
+    on sys_opera_log (ip_bin);
+
+create fulltext index ix_sys_opera_log_username_ngram
+    on sys_opera_log (username) with parser ngram;
+
 create table sys_role
 (
     id           int auto_increment comment '主键id'
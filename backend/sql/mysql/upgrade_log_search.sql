@@ -0,0 +1,40 @@
+-- 已有数据库升级日志检索：新增二进制 IP 列、回填历史数据并创建检索索引
+-- 开启日志分区（LOG_RETENTION_PARTITION_ENABLED）时分区表不支持全文索引，请跳过末尾的 fulltext 索引
+
+alter table sys_opera_log
+    add column ip_bin varbinary(16) null comment 'IP地址（16 字节二进制，用于范围检索）' after ip;
+
+alter table sys_login_log
+    add column ip_bin varbinary(16) null comment 'IP地址（16 字节二进制，用于范围检索）' after ip;
+
+update sys_opera_log
+set ip_bin = if(is_ipv4(ip), concat(unhex('00000000000000000000ffff'), inet6_aton(ip)), inet6_aton(ip))
+where ip_bin is null;
+
+update sys_login_log
+set ip_bin = if(is_ipv4(ip), concat(unhex('00000000000000000000ffff'), inet6_aton(ip)), inet6_aton(ip))
+where ip_bin is null;
+
+create index ix_sys_opera_log_created_time
+    on sys_opera_log (created_time);
+
+create index ix_sys_opera_log_username_created_time
+    on sys_opera_log (username, created_time);
+
+create index ix_sys_opera_log_ip_bin
+    on sys_opera_log (ip_bin);
+
+create index ix_sys_login_log_created_time
+    on sys_login_log (created_time);
+
+create index ix_sys_login_log_username_created_time
+    on sys_login_log (username, created_time);
+
+create index ix_sys_login_log_ip_bin
+    on sys_login_log (ip_bin);
+
+create fulltext index ix_sys_opera_log_username_ngram
+    on sys_opera_log (username) with parser ngram;
+
+create fulltext index ix_sys_login_log_username_ngram
+    on sys_login_log (username) with parser ngram;
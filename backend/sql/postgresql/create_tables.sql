@@ -1,3 +1,5 @@
+create extension if not exists pg_trgm;
+
 create table sys_api
 (
     id           serial
@@ -211,6 +213,7 @@ create table sys_login_log
     username     varchar(20)              not null,
     status       integer                  not null,
     ip           varchar(50)              not null,
+    ip_bin       bytea,
     country      varchar(50),
     region       varchar(50),
     city         varchar(50),
@@ -233,6 +236,8 @@ comment on column sys_login_log.status is '登录状态(0失败 1成功)';
 
 comment on column sys_login_log.ip is '登录IP地址';
 
+comment on column sys_login_log.ip_bin is 'IP地址（16 字节二进制，用于范围检索）';
+
 comment on column sys_login_log.country is '国家';
 
 comment on column sys_login_log.region is '地区';
@@ -256,6 +261,18 @@ comment on column sys_login_log.created_time is '创建时间';
 create index ix_sys_login_log_id
     on sys_login_log (id);
 
+create index ix_sys_login_log_created_time
+    on sys_login_log (created_time);
+
+create index ix_sys_login_log_username_created_time
+    on sys_login_log (username varchar_pattern_ops, created_time);
+
+create index ix_sys_login_log_ip_bin
+    on sys_login_log (ip_bin);
+
+create index ix_sys_login_log_username_trgm
+    on sys_login_log using gin (username gin_trgm_ops);
+
 create table sys_menu
 (
     id           serial
@@ -327,6 +344,7 @@ create table sys_opera_log
     title        varchar(255)             not null,
     path         varchar(500)             not null,
     ip           varchar(50)              not null,
+    ip_bin       bytea,
     country      varchar(50),
     region       varchar(50),
     city         varchar(50),
@@ -357,6 +375,8 @@ comment on column sys_opera_log.path is '请求路径';
 
 comment on column sys_opera_log.ip is 'IP地址';
 
+comment on column sys_opera_log.ip_bin is 'IP地址（16 字节二进制，用于范围检索）';
+
 comment on column sys_opera_log.country is '国家';
 
 comment on column sys_opera_log.region is '地区';
@@ -388,6 +408,18 @@ comment on column sys_opera_log.created_time is '创建时间';
 create index ix_sys_opera_log_id
     on sys_opera_log (id);
 
+create index ix_sys_opera_log_created_time
+    on sys_opera_log (created_time);
+
+create index ix_sys_opera_log_username_created_time
+    on sys_opera_log (username varchar_pattern_ops, created_time);
+
+create index ix_sys_opera_log_ip_bin
+    on sys_opera_log (ip_bin);
+
+create index ix_sys_opera_log_username_trgm
+    on sys_opera_log using gin (username gin_trgm_ops);
+
 create table sys_role
 (
     id           serial
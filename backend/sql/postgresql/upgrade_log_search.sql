@@ -0,0 +1,66 @@
+-- 已有数据库升级日志检索：新增二进制 IP 列、回填历史数据并创建检索索引
+-- 需在事务块之外执行（psql -f），回填按主键分批提交；IPv6 历史数据无法在 SQL 中转换，回填后保持为空
+
+create extension if not exists pg_trgm;
+
+alter table sys_opera_log
+    add column if not exists ip_bin bytea;
+
+comment on column sys_opera_log.ip_bin is 'IP地址（16 字节二进制，用于范围检索）';
+
+alter table sys_login_log
+    add column if not exists ip_bin bytea;
+
+comment on column sys_login_log.ip_bin is 'IP地址（16 字节二进制，用于范围检索）';
+
+do
+$$
+    declare
+        log_table  text;
+        last_id    bigint;
+        chunk_size integer := 5000;
+    begin
+        foreach log_table in array array ['sys_opera_log', 'sys_login_log']
+            loop
+                last_id := 0;
+                loop
+                    execute format(
+                            'with chunk as (select id, ip from %1$I where id > $1 order by id limit $2),
+                                  updated as (update %1$I t
+                                              set ip_bin = decode(''00000000000000000000ffff'', ''hex'')
+                                                  || substring(int8send(chunk.ip::inet - ''0.0.0.0''::inet) from 5 for 4)
+                                              from chunk
+                                              where t.id = chunk.id
+                                                and chunk.ip ~ ''^\d{1,3}(\.\d{1,3}){3}$'')
+                             select max(id) from chunk', log_table)
+                        into last_id using last_id, chunk_size;
+                    exit when last_id is null;
+                    commit;
+                end loop;
+            end loop;
+    end
+$$;
+
+create index if not exists ix_sys_opera_log_created_time
+    on sys_opera_log (created_time);
+
+create index if not exists ix_sys_opera_log_username_created_time
+    on sys_opera_log (username varchar_pattern_ops, created_time);
+
+create index if not exists ix_sys_opera_log_ip_bin
+    on sys_opera_log (ip_bin);
+
+create index if not exists ix_sys_opera_log_username_trgm
+    on sys_opera_log using gin (username gin_trgm_ops);
+
+create index if not exists ix_sys_login_log_created_time
+    on sys_login_log (created_time);
+
+create index if not exists ix_sys_login_log_username_created_time
+    on sys_login_log (username varchar_pattern_ops, created_time);
+
+create index if not exists ix_sys_login_log_ip_bin
+    on sys_login_log (ip_bin);
+
+create index if not exists ix_sys_login_log_username_trgm
+    on sys_login_log using gin (username gin_trgm_ops);
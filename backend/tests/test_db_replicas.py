@@ -0,0 +1,95 @@
+import asyncio
+
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+from backend.database import db
+from backend.database.db import DatabaseReplicas
+
+
+class FakeRedis:
+    def __init__(self) -> None:
+        self.data: dict[str, Any] = {}
+
+    async def set(self, key: str, value: Any, ex: int | None = None) -> None:
+        await asyncio.sleep(0)
+        self.data[key] = (value, ex)
+
+    async def exists(self, key: str) -> int:
+        await asyncio.sleep(0)
+        return int(key in self.data)
+
+
+def _session_maker(name: str):  # noqa: ANN202
+    @asynccontextmanager
+    async def maker():  # noqa: ANN202
+        yield name
+
+    return maker
+
+
+@pytest.fixture
+def replicas(monkeypatch: pytest.MonkeyPatch) -> DatabaseReplicas:
+    monkeypatch.setattr(db, 'redis_client', FakeRedis())
+    monkeypatch.setattr(db, 'async_db_session', _session_maker('primary'))
+    instance = DatabaseReplicas([(None, _session_maker('replica-0')), (None, _session_maker('replica-1'))], 5, 10)
+    monkeypatch.setattr(db, 'db_replicas', instance)
+    return instance
+
+
+def _request(method: str, user_id: int | None = None) -> Any:
+    return SimpleNamespace(method=method, scope={'user': SimpleNamespace(id=user_id)})
+
+
+async def _session(dependency: Any, request: Any) -> str:
+    generator = dependency(request)
+    session = await anext(generator)
+    await generator.aclose()
+    return session
+
+
+def test_route_round_robin(replicas: DatabaseReplicas) -> None:
+    async def run() -> list[str]:
+        return [await _session(db.get_db, _request('GET')) for _ in range(3)]
+
+    assert asyncio.run(run()) == ['replica-0', 'replica-1', 'replica-0']
+
+
+def test_route_without_healthy_replica(replicas: DatabaseReplicas) -> None:
+    replicas.healthy = []
+    assert asyncio.run(_session(db.get_db_read_only, _request('POST'))) == 'primary'
+
+
+def test_write_request_uses_primary_and_sticks(replicas: DatabaseReplicas) -> None:
+    async def run() -> list[str]:
+        return [
+            await _session(db.get_db, _request('POST', 1)),
+            await _session(db.get_db, _request('GET', 1)),
+            await _session(db.get_db, _request('GET', 2)),
+        ]
+
+    assert asyncio.run(run()) == ['primary', 'primary', 'replica-0']
+    assert db.redis_client.data[f'{replicas.sticky_prefix}:1'] == (1, 10)
+
+
+def test_check_drops_unhealthy_replica(replicas: DatabaseReplicas, monkeypatch: pytest.MonkeyPatch) -> None:
+    async def ping(index: int) -> bool:
+        await asyncio.sleep(0)
+        return index == 1
+
+    monkeypatch.setattr(replicas, '_ping', ping)
+    asyncio.run(replicas.check())
+    assert replicas.healthy == [1]
+    assert asyncio.run(_session(db.get_db, _request('GET'))) == 'replica-1'
+
+
+def test_no_replicas_configured(monkeypatch: pytest.MonkeyPatch) -> None:
+    redis = FakeRedis()
+    monkeypatch.setattr(db, 'redis_client', redis)
+    instance = DatabaseReplicas([], 5, 10)
+    asyncio.run(instance.stick(1))
+    assert not instance
+    assert redis.data == {}
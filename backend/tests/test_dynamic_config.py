@@ -0,0 +1,51 @@
+import asyncio
+
+from collections.abc import Iterator
+from pathlib import Path
+from unittest.mock import AsyncMock
+
+import pytest
+
+from backend.app.admin.service import plugin_service
+from backend.utils import dynamic_config
+
+
+@pytest.fixture
+def plugin_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Iterator[Path]:
+    monkeypatch.setattr(dynamic_config, 'PLUGIN_DIR', tmp_path)
+    dynamic_config.has_config_plugin.cache_clear()
+    yield tmp_path
+    dynamic_config.has_config_plugin.cache_clear()
+
+
+def _install_config_plugin(plugin_dir: Path) -> None:
+    (plugin_dir / 'config').mkdir()
+    (plugin_dir / 'config' / '__init__.py').touch()
+
+
+def test_config_snapshot_without_plugin(plugin_dir: Path) -> None:
+    assert asyncio.run(dynamic_config.get_config_snapshot()) is None
+    assert (
+        asyncio.run(dynamic_config.get_login_config()).captcha_enabled == dynamic_config.settings.LOGIN_CAPTCHA_ENABLED
+    )
+
+
+def test_config_plugin_check_cached(plugin_dir: Path) -> None:
+    assert not dynamic_config.has_config_plugin()
+    _install_config_plugin(plugin_dir)
+    assert not dynamic_config.has_config_plugin()
+    dynamic_config.has_config_plugin.cache_clear()
+    assert dynamic_config.has_config_plugin()
+    assert dynamic_config.has_config_plugin.cache_info().hits == 0
+
+
+def test_uninstall_clears_config_plugin_cache(plugin_dir: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    _install_config_plugin(plugin_dir)
+    assert dynamic_config.has_config_plugin()
+    monkeypatch.setattr(plugin_service, 'PLUGIN_DIR', plugin_dir)
+    monkeypatch.setattr(plugin_service, 'uninstall_requirements_async', AsyncMock())
+    monkeypatch.setattr(plugin_service, 'redis_client', AsyncMock())
+    monkeypatch.setattr(plugin_service, 'response_cache', AsyncMock())
+
+    asyncio.run(plugin_service.plugin_service.uninstall(plugin='config'))
+    assert not dynamic_config.has_config_plugin()
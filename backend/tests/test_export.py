@@ -0,0 +1,111 @@
+import asyncio
+import csv
+import io
+import os
+import time
+import zipfile
+
+from collections.abc import AsyncIterator
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+from unittest.mock import MagicMock
+
+import pytest
+
+from backend.app.task.service import export_service
+from backend.common.enums import ExportFormatType
+from backend.common.exception import errors
+from backend.utils import export
+from backend.utils.export import CSVWriter, ExportColumn, Exporter, XLSXWriter
+
+COLUMNS = [ExportColumn('ID', 'id'), ExportColumn('名称', 'name')]
+RECORDS = [SimpleNamespace(id=1, name='=cmd'), SimpleNamespace(id=2, name='张三')]
+TASK_ID = '3f2b8c1e-6d4a-4f8e-9b7a-2c5d1e0f9a8b'
+
+
+class DummyExporter(Exporter):
+    async def get_select(self, **filters: Any) -> None:
+        return None
+
+    async def iter_chunks(
+        self, fmt: ExportFormatType, filters: dict[str, Any], progress: Any = None
+    ) -> AsyncIterator[bytes]:
+        writer = CSVWriter(self.columns)
+        yield writer.begin()
+        yield writer.write(RECORDS)
+        yield writer.end()
+
+
+@pytest.fixture
+def export_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    monkeypatch.setattr(export, 'EXPORT_DIR', tmp_path)
+    return tmp_path
+
+
+def test_csv_writer_escapes_formula() -> None:
+    writer = CSVWriter(COLUMNS)
+    data = writer.begin() + writer.write(RECORDS) + writer.end()
+    assert data.startswith('﻿'.encode())
+    rows = list(csv.reader(io.StringIO(data.decode().lstrip('﻿'))))
+    assert rows == [['ID', '名称'], ['1', "'=cmd"], ['2', '张三']]
+
+
+def test_xlsx_writer_produces_workbook() -> None:
+    writer = XLSXWriter(COLUMNS)
+    data = writer.begin() + writer.write(RECORDS) + writer.end()
+    with zipfile.ZipFile(io.BytesIO(data)) as workbook:
+        assert workbook.testzip() is None
+        sheet = workbook.read('xl/worksheets/sheet1.xml').decode()
+    assert '张三' in sheet
+    assert sheet.count('<row>') == 3
+
+
+def test_save_writes_outside_upload_dir(export_dir: Path) -> None:
+    exporter = DummyExporter('dummy_save', COLUMNS)
+    filename = asyncio.run(exporter.save(TASK_ID, ExportFormatType.csv, {}))
+    assert filename == f'{TASK_ID}.csv'
+    assert export.get_export_file(filename) == export_dir / filename
+    assert [path.name for path in export_dir.iterdir()] == [filename]
+
+
+def test_expired_export_is_hidden_and_deleted(export_dir: Path) -> None:
+    path = export_dir / f'{TASK_ID}.csv'
+    path.write_bytes(b'id\n')
+    expired = time.time() - export.settings.EXPORT_FILE_EXPIRE_SECONDS - 1
+    os.utime(path, (expired, expired))
+    assert export.get_export_file(path.name) is None
+    assert export.delete_expired_exports() == 1
+    assert not path.exists()
+
+
+def test_get_export_file_rejects_path_traversal(export_dir: Path) -> None:
+    assert export.get_export_file('../.env') is None
+
+
+def _download(monkeypatch: pytest.MonkeyPatch, user: SimpleNamespace, **result: Any) -> Any:
+    async_result = SimpleNamespace(name=export.EXPORT_TASK_NAME, state='SUCCESS', result=None)
+    async_result.__dict__.update(result)
+    monkeypatch.setattr(export_service, 'celery_result', SimpleNamespace(AsyncResult=lambda **_: async_result))
+    monkeypatch.setattr(export_service, 'task_celery', MagicMock())
+    request = SimpleNamespace(user=user)
+    return asyncio.run(export_service.task_export_service.download(request=request, task_id=TASK_ID))
+
+
+def test_download_by_owner(export_dir: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    (export_dir / f'{TASK_ID}.csv').write_bytes(b'id\n')
+    data = {'filename': f'{TASK_ID}.csv', 'download_name': 'dummy.csv', 'user_id': 1}
+    response = _download(monkeypatch, SimpleNamespace(id=1, is_superuser=False), result=data)
+    assert response.path == export_dir / f'{TASK_ID}.csv'
+
+
+def test_download_by_other_user_is_forbidden(export_dir: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    (export_dir / f'{TASK_ID}.csv').write_bytes(b'id\n')
+    data = {'filename': f'{TASK_ID}.csv', 'download_name': 'dummy.csv', 'user_id': 1}
+    with pytest.raises(errors.ForbiddenError):
+        _download(monkeypatch, SimpleNamespace(id=2, is_superuser=False), result=data)
+
+
+def test_download_other_task_is_not_found(monkeypatch: pytest.MonkeyPatch) -> None:
+    with pytest.raises(errors.NotFoundError):
+        _download(monkeypatch, SimpleNamespace(id=1, is_superuser=True), name='task_demo')
@@ -0,0 +1,95 @@
+import zipfile
+
+from io import BytesIO
+from pathlib import Path
+
+import pytest
+
+from fastapi import UploadFile
+
+from backend.common.exception import errors
+from backend.utils import file_ops
+from backend.utils.file_ops import _extract_zip_plugin
+
+
+@pytest.fixture
+def plugin_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    path = tmp_path / 'plugin'
+    path.mkdir()
+    monkeypatch.setattr(file_ops, 'PLUGIN_DIR', path)
+    return path
+
+
+def _make_zip(path: Path, files: dict[str, bytes]) -> str:
+    zip_path = path / 'plugin.zip'
+    with zipfile.ZipFile(zip_path, 'w', compression=zipfile.ZIP_DEFLATED) as zf:
+        for name, content in files.items():
+            zf.writestr(name, content)
+    return str(zip_path)
+
+
+def _plugin_files(**extra: bytes) -> dict[str, bytes]:
+    return {
+        'demo/plugin.toml': b'[plugin]',
+        'demo/README.md': b'# demo',
+        'demo/__init__.py': b'',
+        'demo/api/router.py': b'router = None',
+        **{f'demo/{name}': content for name, content in extra.items()},
+    }
+
+
+def test_extract_zip_plugin(tmp_path: Path, plugin_dir: Path) -> None:
+    progress = []
+    zip_path = _make_zip(tmp_path, _plugin_files())
+    assert _extract_zip_plugin(zip_path, 'demo', progress.append) == 'demo'
+    assert (plugin_dir / 'demo' / 'api' / 'router.py').read_bytes() == b'router = None'
+    assert not any((plugin_dir / '.tmp').iterdir())
+    assert progress[0]['stage'] == 'validate'
+    assert progress[-1]['stage'] == 'extract'
+
+
+def test_extract_zip_plugin_conflict(tmp_path: Path, plugin_dir: Path) -> None:
+    (plugin_dir / 'demo').mkdir()
+    with pytest.raises(errors.ConflictError):
+        _extract_zip_plugin(_make_zip(tmp_path, _plugin_files()), 'demo', lambda _: None)
+    assert not any((plugin_dir / '.tmp').iterdir())
+
+
+@pytest.mark.parametrize(
+    ('files', 'msg'),
+    [
+        ({'demo/plugin.toml': b'', 'demo/__init__.py': b''}, '插件压缩包内缺少必要文件'),
+        (_plugin_files(**{'../escape.py': b''}), '插件压缩包内文件路径非法'),
+        (_plugin_files(bomb=b'0' * 1024 * 1024), '插件压缩包压缩比异常'),
+    ],
+)
+def test_extract_zip_plugin_rejected(tmp_path: Path, plugin_dir: Path, files: dict[str, bytes], msg: str) -> None:
+    with pytest.raises(errors.RequestError) as exc_info:
+        _extract_zip_plugin(_make_zip(tmp_path, files), 'demo', lambda _: None)
+    assert exc_info.value.msg == msg
+    assert not (plugin_dir / 'demo').exists()
+
+
+def test_extract_zip_plugin_too_many_entries(tmp_path: Path, plugin_dir: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(file_ops.settings, 'PLUGIN_ZIP_MAX_ENTRIES', 3)
+    with pytest.raises(errors.RequestError) as exc_info:
+        _extract_zip_plugin(_make_zip(tmp_path, _plugin_files()), 'demo', lambda _: None)
+    assert exc_info.value.msg == '插件压缩包文件数量超出限制'
+
+
+@pytest.mark.parametrize(
+    ('filename', 'setting'),
+    [
+        ('a.PNG', 'UPLOAD_IMAGE_SIZE_MAX'),
+        ('a.mp4', 'UPLOAD_VIDEO_SIZE_MAX'),
+        ('a.pdf', 'UPLOAD_FILE_SIZE_MAX'),
+    ],
+)
+def test_upload_file_verify_size_limit(filename: str, setting: str) -> None:
+    file = UploadFile(BytesIO(), filename=filename)
+    assert file_ops.upload_file_verify(file) == getattr(file_ops.settings, setting)
+
+
+def test_upload_file_verify_unknown_type() -> None:
+    with pytest.raises(errors.RequestError):
+        file_ops.upload_file_verify(UploadFile(BytesIO(), filename='noext'))
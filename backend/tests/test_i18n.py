@@ -0,0 +1,47 @@
+import json
+
+from pathlib import Path
+
+import pytest
+
+from backend.common import i18n as i18n_module
+from backend.common.i18n import I18n
+
+
+@pytest.fixture
+def i18n(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> I18n:
+    zh_cn = 'response:\n  success: 请求成功\n  hello: 你好，{name}\nonly_zh: 中文\n'
+    (tmp_path / 'zh-CN.yml').write_text(zh_cn, 'utf-8')
+    (tmp_path / 'en-US.json').write_text(json.dumps({'response': {'success': 'Success', 'hello': 'Hi, {name}'}}))
+    monkeypatch.setattr(i18n_module, 'LOCALE_DIR', tmp_path)
+    monkeypatch.setattr(i18n_module.settings, 'I18N_DEFAULT_LANGUAGE', 'zh-CN')
+    instance = I18n()
+    instance.load_locales()
+    return instance
+
+
+def test_catalog_flattened(i18n: I18n) -> None:
+    assert i18n.catalogs['en-US']['response.success'] == ('Success', False)
+    assert i18n.catalogs['en-US']['response.hello'] == ('Hi, {name}', True)
+
+
+@pytest.mark.parametrize(
+    ('language', 'expected'),
+    [('en-US', 'en-US'), ('en-us', 'en-US'), ('en', 'en-US'), ('en-GB', 'en-US'), ('fr', 'zh-CN')],
+)
+def test_resolve_language(i18n: I18n, language: str, expected: str) -> None:
+    assert i18n.resolve_language(language) == expected
+
+
+def test_translate_per_context(i18n: I18n) -> None:
+    assert i18n.t('response.success') == '请求成功'
+    token = i18n.set_language('en-US')
+    try:
+        assert i18n.t('response.success') == 'Success'
+        assert i18n.t('response.hello', name='fba') == 'Hi, fba'
+        assert i18n.t('only_zh') == '中文'
+        assert i18n.t('missing.key') == 'missing.key'
+        assert i18n.t('pydantic.missing', default='Field required') == 'Field required'
+    finally:
+        i18n.reset_language(token)
+    assert i18n.current_language == 'zh-CN'
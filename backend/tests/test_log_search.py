@@ -0,0 +1,121 @@
+import asyncio
+import ipaddress
+
+from contextlib import asynccontextmanager
+from datetime import timedelta
+from types import SimpleNamespace
+from typing import Any
+from unittest.mock import AsyncMock
+
+import pytest
+
+from sqlalchemy.dialects import mysql, postgresql
+from sqlalchemy.exc import DBAPIError
+
+from backend.app.admin.model import LoginLog, OperaLog
+from backend.utils import log_search
+from backend.utils.log_search import (
+    check_log_search_columns,
+    log_search_clauses,
+    pack_ip,
+    parse_ip_range,
+    username_clause,
+)
+from backend.utils.timezone import timezone
+
+
+def _bounds(low: str, high: str) -> tuple[bytes, bytes]:
+    return pack_ip(low), pack_ip(high)
+
+
+def test_pack_ip_maps_ipv4() -> None:
+    assert pack_ip('10.0.0.1') == ipaddress.IPv6Address('::ffff:10.0.0.1').packed
+    assert len(pack_ip('2001:db8::1')) == 16
+    assert pack_ip('not-an-ip') is None
+    assert pack_ip(None) is None
+
+
+@pytest.mark.parametrize(
+    ('value', 'expected'),
+    [
+        ('192.168.1.10', _bounds('192.168.1.10', '192.168.1.10')),
+        ('192.168.', _bounds('192.168.0.0', '192.168.255.255')),
+        ('10', _bounds('10.0.0.0', '10.255.255.255')),
+        ('10.1.2.3/24', _bounds('10.1.2.0', '10.1.2.255')),
+        ('2001:db8::/32', _bounds('2001:db8::', '2001:db8:ffff:ffff:ffff:ffff:ffff:ffff')),
+        ('300.1', None),
+        ('abc', None),
+    ],
+)
+def test_parse_ip_range(value: str, expected: tuple[bytes, bytes] | None) -> None:
+    assert parse_ip_range(value) == expected
+
+
+def test_username_clause_postgresql(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(log_search.settings, 'DATABASE_TYPE', 'postgresql')
+    dialect = postgresql.dialect()
+    assert 'LIKE' in str(username_clause(LoginLog.username, 'adm').compile(dialect=dialect))
+    short = username_clause(LoginLog.username, 'ad').compile(dialect=dialect)
+    assert short.params['username_1'] == 'ad'
+    assert '||' in str(short)
+    assert '=' in str(username_clause(LoginLog.username, 'ad', exact=True).compile(dialect=dialect))
+
+
+def test_username_clause_mysql(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(log_search.settings, 'DATABASE_TYPE', 'mysql')
+    monkeypatch.setattr(log_search.settings, 'LOG_RETENTION_PARTITION_ENABLED', False)
+    assert 'MATCH' in str(username_clause(LoginLog.username, 'adm').compile(dialect=mysql.dialect()))
+    monkeypatch.setattr(log_search.settings, 'LOG_RETENTION_PARTITION_ENABLED', True)
+    assert 'LIKE' in str(username_clause(LoginLog.username, 'adm').compile(dialect=mysql.dialect()))
+
+
+def _kwargs(**kwargs) -> dict:  # noqa: ANN003
+    return {'username': None, 'status': None, 'ip': None, 'start_time': None, 'end_time': None, **kwargs}
+
+
+def test_no_default_window(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(log_search.settings, 'LOG_SEARCH_DEFAULT_DAYS', 0)
+    clauses = log_search_clauses(LoginLog, **_kwargs(username='admin', ip='10.0.0.1'))
+    assert len(clauses) == 2
+    assert all('created_time' not in str(clause) for clause in clauses)
+
+
+def test_default_window_opt_in(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(log_search.settings, 'LOG_SEARCH_DEFAULT_DAYS', 7)
+    clauses = log_search_clauses(LoginLog, **_kwargs(username='admin'))
+    assert 'created_time' in str(clauses[0])
+    start_time = clauses[0].right.value
+    assert timedelta(days=7) <= timezone.now() - start_time < timedelta(days=7, minutes=1)
+    assert log_search_clauses(LoginLog, **_kwargs(status=1)) != []
+    assert all('created_time' not in str(clause) for clause in log_search_clauses(LoginLog, **_kwargs(status=1)))
+
+
+class FakeConnection:
+    def __init__(self, missing: set[str]) -> None:
+        self.missing = missing
+        self.rollback = AsyncMock()
+
+    async def execute(self, statement: Any) -> None:
+        await asyncio.sleep(0)
+        if statement.get_final_froms()[0].name in self.missing:
+            raise DBAPIError('SELECT', None, Exception('unknown column ip_bin'))
+
+
+def _engine(connection: FakeConnection) -> Any:
+    @asynccontextmanager
+    async def connect():  # noqa: ANN202
+        yield connection
+
+    return SimpleNamespace(connect=connect)
+
+
+def test_check_log_search_columns() -> None:
+    connection = FakeConnection(set())
+    asyncio.run(check_log_search_columns(_engine(connection), OperaLog.__table__, LoginLog.__table__))
+    connection.rollback.assert_not_awaited()
+
+
+def test_check_log_search_columns_missing() -> None:
+    connection = FakeConnection({'sys_login_log'})
+    with pytest.raises(RuntimeError, match='sys_login_log'):
+        asyncio.run(check_log_search_columns(_engine(connection), OperaLog.__table__, LoginLog.__table__))
@@ -0,0 +1,24 @@
+import subprocess
+import sys
+
+from fastapi import FastAPI
+
+from backend.core.path_conf import BASE_PATH
+
+
+def test_import_main() -> None:
+    from backend.main import app
+
+    assert isinstance(app, FastAPI)
+
+
+def test_import_main_defers_celery() -> None:
+    code = (
+        'import sys, backend.main\n'
+        "module = sys.modules.get('backend.app.task.celery')\n"
+        "assert module is None or type(module).__name__ == '_LazyModule', type(module)\n"
+    )
+    result = subprocess.run(
+        [sys.executable, '-c', code], cwd=BASE_PATH.parent, capture_output=True, text=True, timeout=120
+    )
+    assert result.returncode == 0, result.stderr
@@ -0,0 +1,100 @@
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import urllib.error
+import urllib.request
+
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from backend.common import metrics
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def _scope(client: str = '127.0.0.1', authorization: str | None = None) -> dict[str, Any]:
+    headers = [(b'authorization', authorization.encode())] if authorization else []
+    return {
+        'type': 'http',
+        'method': 'GET',
+        'path': '/',
+        'query_string': b'',
+        'headers': headers,
+        'client': (client, 1),
+    }
+
+
+def test_metrics_disabled_by_default() -> None:
+    assert type(metrics.settings).model_fields['METRICS_ENABLED'].default is False
+
+
+@pytest.mark.parametrize(('client', 'allowed'), [('127.0.0.1', True), ('10.0.0.8', True), ('203.0.113.7', False)])
+def test_scrape_allowed_by_ip(client: str, allowed: bool, monkeypatch: pytest.MonkeyPatch) -> None:  # noqa: FBT001
+    monkeypatch.setattr(metrics.settings, 'METRICS_TOKEN', None)
+    monkeypatch.setattr(metrics.settings, 'METRICS_ALLOWED_IPS', ['127.0.0.1', '10.0.0.0/8'])
+    assert metrics.is_metrics_scrape_allowed('', client) is allowed
+
+
+def test_scrape_requires_token(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(metrics.settings, 'METRICS_TOKEN', 'secret')
+    assert metrics.is_metrics_scrape_allowed('Bearer secret', '203.0.113.7')
+    assert not metrics.is_metrics_scrape_allowed('', '127.0.0.1')
+    assert not metrics.is_metrics_scrape_allowed('Bearer wrong', '127.0.0.1')
+
+
+def test_metrics_app_rejects_unauthorized(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv('PROMETHEUS_MULTIPROC_DIR', str(tmp_path))
+    monkeypatch.setattr(metrics.settings, 'METRICS_TOKEN', 'secret')
+    app = metrics.create_metrics_app()
+    messages = []
+
+    async def receive() -> dict[str, Any]:
+        await asyncio.sleep(0)
+        return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+    async def send(message: dict[str, Any]) -> None:
+        await asyncio.sleep(0)
+        messages.append(message)
+
+    asyncio.run(app(_scope(), receive, send))
+    assert messages[0]['status'] == 403
+
+
+def test_clean_dead_process_metrics(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    process = subprocess.Popen([sys.executable, '-c', 'pass'])
+    process.wait()
+    live, dead = os.getppid(), process.pid
+    for name in ('counter', 'histogram', 'gauge_livesum', 'gauge_all'):
+        (tmp_path / f'{name}_{live}.db').write_bytes(b'')
+        (tmp_path / f'{name}_{dead}.db').write_bytes(b'')
+    monkeypatch.setenv('PROMETHEUS_MULTIPROC_DIR', str(tmp_path))
+    metrics.clean_dead_process_metrics()
+    assert sorted(path.name for path in tmp_path.iterdir()) == sorted(
+        f'{name}_{live}.db' for name in ('counter', 'histogram', 'gauge_livesum', 'gauge_all')
+    )
+
+
+def test_metrics_server(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv('PROMETHEUS_MULTIPROC_DIR', str(tmp_path))
+    monkeypatch.setattr(metrics.settings, 'METRICS_TOKEN', None)
+    monkeypatch.setattr(metrics.settings, 'METRICS_ALLOWED_IPS', ['127.0.0.1'])
+    port = _free_port()
+    metrics.start_metrics_server('127.0.0.1', port)
+    # 端口已被占用时不启动，也不抛出异常
+    metrics.start_metrics_server('127.0.0.1', port)
+
+    with urllib.request.urlopen(f'http://127.0.0.1:{port}/metrics', timeout=5) as response:
+        assert response.status == 200
+
+    monkeypatch.setattr(metrics.settings, 'METRICS_ALLOWED_IPS', ['10.0.0.0/8'])
+    with pytest.raises(urllib.error.HTTPError) as exc_info:
+        urllib.request.urlopen(f'http://127.0.0.1:{port}/metrics', timeout=5)
+    assert exc_info.value.code == 403
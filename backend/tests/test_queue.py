@@ -0,0 +1,79 @@
+import asyncio
+
+from contextlib import asynccontextmanager
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from backend.common import queue
+from backend.common.queue import BatchWriter, batch_dequeue
+
+
+@pytest.fixture
+def written(monkeypatch: pytest.MonkeyPatch) -> list[list[Any]]:
+    """替换数据库会话，记录每批写入的项目"""
+
+    @asynccontextmanager
+    async def begin():  # noqa: ANN202
+        yield MagicMock()
+
+    monkeypatch.setattr(queue, 'async_db_session', MagicMock(begin=begin))
+    monkeypatch.setattr(queue.settings, 'METRICS_ENABLED', False)
+    return []
+
+
+def _writer(written: list[list[Any]], **kwargs) -> BatchWriter[int]:  # noqa: ANN003
+    async def write(_db: Any, items: list[int]) -> None:
+        await asyncio.sleep(0)
+        written.append(list(items))
+
+    return BatchWriter('test', write, **{'maxsize': 10, 'batch_size': 3, 'timeout': 60, **kwargs})
+
+
+def test_batch_dequeue_timeout() -> None:
+    async def run() -> list[int]:
+        q: asyncio.Queue[int] = asyncio.Queue()
+        q.put_nowait(1)
+        return await batch_dequeue(q, max_items=3, timeout=0.01)
+
+    assert asyncio.run(run()) == [1]
+
+
+def test_offer_drops_when_full(written: list[list[Any]]) -> None:
+    writer = _writer(written, maxsize=2)
+    assert writer.offer(1)
+    assert writer.offer(2)
+    assert not writer.offer(3)
+    assert writer.queue.qsize() == 2
+
+
+def test_drain(written: list[list[Any]]) -> None:
+    writer = _writer(written)
+    for i in range(5):
+        writer.offer(i)
+    asyncio.run(writer.drain())
+    assert written == [[0, 1, 2], [3, 4]]
+    assert writer.queue.empty()
+
+
+def test_flush_error_is_logged(written: list[list[Any]]) -> None:
+    writer = BatchWriter('test', AsyncMock(side_effect=RuntimeError), maxsize=10, batch_size=3, timeout=60)
+    asyncio.run(writer.flush([1]))
+
+
+def test_cancel_consumer_flushes_partial_batch(written: list[list[Any]]) -> None:
+    writer = _writer(written)
+
+    async def run() -> None:
+        for i in range(4):
+            writer.offer(i)
+        task = asyncio.create_task(writer.consumer())
+        while not writer.queue.empty() or len(written) < 1:
+            await asyncio.sleep(0)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(run())
+    assert written == [[0, 1, 2], [3]]
@@ -0,0 +1,115 @@
+import asyncio
+
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from fastapi import FastAPI
+
+from backend.core import registrar
+
+
+@pytest.fixture
+def startup(monkeypatch: pytest.MonkeyPatch) -> MagicMock:
+    """替换启动流程中依赖外部服务的步骤"""
+    mocks = MagicMock()
+    mocks.create_tables = AsyncMock()
+    mocks.redis_client.open = AsyncMock()
+    mocks.redis_client.aclose = AsyncMock()
+    mocks.ensure_plugin_status = AsyncMock()
+    mocks.limiter_init = AsyncMock()
+    mocks.init_dynamic_config = AsyncMock()
+    mocks.check_log_search_columns = AsyncMock()
+    for name in (
+        'create_tables',
+        'redis_client',
+        'db_replicas',
+        'ensure_plugin_status',
+        'init_dynamic_config',
+        'check_log_search_columns',
+        'server_monitor',
+        'redis_monitor',
+    ):
+        monkeypatch.setattr(registrar, name, getattr(mocks, name))
+    monkeypatch.setattr(registrar.FastAPILimiter, 'init', mocks.limiter_init)
+    monkeypatch.setattr(registrar.settings, 'METRICS_ENABLED', False)
+    return mocks
+
+
+async def _run_lifespan() -> None:
+    async with registrar.register_init(FastAPI()):
+        pass
+
+
+@pytest.mark.parametrize(
+    ('manifest', 'created'),
+    [
+        ({'hash': 'valid', 'tables': 'tables'}, False),
+        ({'hash': 'valid', 'tables': 'changed'}, True),
+        ({'hash': 'valid'}, True),
+        (None, True),
+    ],
+)
+def test_create_tables_gated_by_manifest(
+    startup: MagicMock,
+    monkeypatch: pytest.MonkeyPatch,
+    manifest: dict | None,
+    created: bool,  # noqa: FBT001
+) -> None:
+    monkeypatch.setattr(registrar, 'load_plugin_manifest', lambda: manifest)
+    monkeypatch.setattr(registrar, 'get_tables_hash', lambda: 'tables')
+    asyncio.run(_run_lifespan())
+    assert startup.create_tables.await_count == int(created)
+
+
+def test_tables_hash_tracks_schema() -> None:
+    from sqlalchemy import Column, Integer, String, Table
+
+    from backend.common.model import MappedBase
+    from backend.plugin.tools import get_tables_hash
+
+    original = get_tables_hash()
+    assert get_tables_hash() == original
+    table = Table('test_tables_hash', MappedBase.metadata, Column('id', Integer, primary_key=True))
+    try:
+        added = get_tables_hash()
+        assert added != original
+        table.append_column(Column('name', String(32)))
+        assert get_tables_hash() not in {original, added}
+    finally:
+        MappedBase.metadata.remove(table)
+    assert get_tables_hash() == original
+
+
+def test_shutdown_flushes_dequeued_logs(startup: MagicMock, monkeypatch: pytest.MonkeyPatch) -> None:
+    opera_log_writer = registrar.OperaLogMiddleware.opera_log_writer
+    monkeypatch.setattr(opera_log_writer, 'flush', AsyncMock())
+    monkeypatch.setattr(registrar.login_log_writer, 'flush', AsyncMock())
+
+    async def run() -> None:
+        async with registrar.register_init(FastAPI()):
+            registrar.login_log_writer.offer('login')
+            while not registrar.login_log_writer.queue.empty():
+                await asyncio.sleep(0)
+            opera_log_writer.offer('opera')
+
+    asyncio.run(run())
+    registrar.login_log_writer.flush.assert_awaited_once_with(['login'])
+    opera_log_writer.flush.assert_awaited_once_with(['opera'])
+
+
+def test_write_plugin_manifest_clears_cache(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    from backend.plugin import tools
+
+    monkeypatch.setattr(tools, 'PLUGIN_MANIFEST_FILE', tmp_path / 'manifest.json')
+    monkeypatch.setattr(tools, 'get_plugin_hash', lambda: 'hash')
+    monkeypatch.setattr(tools.settings, 'PLUGIN_MANIFEST_ENABLED', True)
+    tools.load_plugin_manifest.cache_clear()
+    try:
+        tools.write_plugin_manifest({'hash': 'hash', 'version': 1})
+        assert tools.load_plugin_manifest()['version'] == 1
+        tools.write_plugin_manifest({'hash': 'hash', 'version': 2})
+        assert tools.load_plugin_manifest()['version'] == 2
+    finally:
+        tools.load_plugin_manifest.cache_clear()
@@ -0,0 +1,105 @@
+import asyncio
+
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from backend.common.response import response_cache as response_cache_module
+from backend.common.response.response_cache import ResponseCache
+
+
+class FakePipeline:
+    def __init__(self, redis: 'FakeRedis') -> None:
+        self.redis = redis
+        self.commands: list[tuple[str, str, int]] = []
+
+    def hincrby(self, name: str, key: str, amount: int) -> None:
+        self.commands.append((name, key, amount))
+
+    async def execute(self) -> None:
+        for name, key, amount in self.commands:
+            await self.redis.hincrby(name, key, amount)
+
+
+class FakeRedis:
+    def __init__(self) -> None:
+        self.data: dict[str, Any] = {}
+
+    async def get(self, key: str) -> Any:
+        return self.data.get(key)
+
+    async def set(self, key: str, value: Any, ex: int | None = None) -> None:  # noqa: ARG002
+        self.data[key] = value
+
+    async def hmget(self, name: str, keys: list[str]) -> list[str | None]:
+        return [self.data.get(name, {}).get(key) for key in keys]
+
+    async def hincrby(self, name: str, key: str, amount: int) -> None:
+        values = self.data.setdefault(name, {})
+        values[key] = str(int(values.get(key, 0)) + amount)
+
+    def pipeline(self, transaction: bool = True) -> FakePipeline:  # noqa: ARG002, FBT001, FBT002
+        return FakePipeline(self)
+
+
+@pytest.fixture
+def cache(monkeypatch: pytest.MonkeyPatch) -> ResponseCache:
+    monkeypatch.setattr(response_cache_module, 'redis_client', FakeRedis())
+    monkeypatch.setattr(response_cache_module.settings, 'RESPONSE_CACHE_ENABLED', True)
+    return ResponseCache('test', 60, 10)
+
+
+def _client(cache: ResponseCache, calls: list[str]) -> TestClient:
+    app = FastAPI()
+
+    @app.middleware('http')
+    async def auth(request: Request, call_next):  # noqa: ANN001, ANN202
+        user_id = request.headers.get('x-user')
+        if user_id:
+            request.scope['user'] = SimpleNamespace(id=int(user_id), is_superuser=True, roles=[])
+        return await call_next(request)
+
+    @app.get('/depts')
+    @cache('dept')
+    async def get_depts(name: str | None = None) -> dict[str, Any]:
+        calls.append(name)
+        return {'data': len(calls)}
+
+    cache.install(app)
+    return TestClient(app)
+
+
+def test_cache_hit_and_etag(cache: ResponseCache) -> None:
+    calls = []
+    client = _client(cache, calls)
+    first = client.get('/depts', headers={'x-user': '1'})
+    second = client.get('/depts', headers={'x-user': '1'})
+    assert first.json() == second.json() == {'data': 1}
+    assert first.headers['etag'] == second.headers['etag']
+    assert len(calls) == 1
+
+    not_modified = client.get('/depts', headers={'x-user': '1', 'if-none-match': first.headers['etag']})
+    assert not_modified.status_code == 304
+    client.get('/depts', params={'name': 'a'}, headers={'x-user': '1'})
+    assert calls == [None, 'a']
+
+
+def test_invalidate_tag(cache: ResponseCache) -> None:
+    calls = []
+    client = _client(cache, calls)
+    client.get('/depts', headers={'x-user': '1'})
+    asyncio.run(cache.invalidate('dept'))
+    assert client.get('/depts', headers={'x-user': '1'}).json() == {'data': 2}
+    assert client.get('/depts', headers={'x-user': '1'}).json() == {'data': 2}
+
+
+def test_anonymous_not_cached(cache: ResponseCache) -> None:
+    calls = []
+    client = _client(cache, calls)
+    client.get('/depts')
+    client.get('/depts')
+    assert len(calls) == 2
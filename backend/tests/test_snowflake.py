@@ -0,0 +1,90 @@
+import os
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from backend.common.exception import errors
+from backend.utils import snowflake as snowflake_module
+from backend.utils.snowflake import Snowflake, SnowflakeConfig, SnowflakeNodeLease
+
+_NOW = 1_700_000_000_000
+
+
+class FakeLease:
+    def __init__(self) -> None:
+        self.cluster_id = None
+        self.expired = False
+        self.acquired = 0
+
+    def acquire(self) -> tuple[int, int]:
+        self.acquired += 1
+        return 3, 7
+
+
+@pytest.fixture
+def frozen(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(Snowflake, '_current_millis', staticmethod(lambda: _NOW))
+
+
+def test_generate_batch_borrows_next_millis(frozen: None) -> None:
+    generator = Snowflake(cluster_id=1, node_id=2)
+    ids = generator.generate_batch(SnowflakeConfig.SEQUENCE_MASK + 11)
+    assert ids == sorted(set(ids))
+    first, last = Snowflake.parse_id(ids[0]), Snowflake.parse_id(ids[-1])
+    assert (first.timestamp, first.sequence) == (_NOW, 0)
+    assert (last.timestamp, last.sequence) == (_NOW + 1, 9)
+    assert generator.generate() > ids[-1]
+
+
+def test_clock_drift_limit(frozen: None, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(snowflake_module.settings, 'SNOWFLAKE_MAX_CLOCK_DRIFT_MS', 1)
+    generator = Snowflake()
+    generator.generate_batch((SnowflakeConfig.SEQUENCE_MASK + 1) * 2)
+    with pytest.raises(errors.ServerError):
+        generator.generate()
+
+
+def test_parse_id() -> None:
+    generator = Snowflake(cluster_id=5, node_id=9)
+    info = Snowflake.parse_id(generator.generate())
+    assert (info.cluster_id, info.node_id, info.sequence) == (5, 9, 0)
+
+
+def test_leased_node(frozen: None) -> None:
+    lease = FakeLease()
+    generator = Snowflake(lease=lease)
+    info = Snowflake.parse_id(generator.generate_batch(3)[-1])
+    generator.generate()
+    assert (info.cluster_id, info.node_id, info.sequence) == (3, 7, 2)
+    assert lease.acquired == 1
+
+    lease.expired = True
+    generator.generate()
+    assert lease.acquired == 2
+
+
+def test_invalid_node_id() -> None:
+    with pytest.raises(errors.RequestError):
+        Snowflake(node_id=SnowflakeConfig.MAX_WORKER_ID + 1)
+
+
+def test_lease_release_only_in_owner_process(monkeypatch: pytest.MonkeyPatch) -> None:
+    lease = SnowflakeNodeLease()
+    client = MagicMock()
+    client.eval.return_value = [1, 2]
+    lease._client = client
+    lease._heartbeat_thread = MagicMock()
+    lease.acquire()
+    owner = os.getpid()
+
+    # fork 出的子进程退出时执行继承的 atexit 处理函数
+    monkeypatch.setattr(snowflake_module.os, 'getpid', lambda: owner + 1)
+    lease.release()
+    assert client.eval.call_count == 1
+    assert lease.key is not None
+
+    monkeypatch.setattr(snowflake_module.os, 'getpid', lambda: owner)
+    lease.release()
+    assert client.eval.call_count == 2
+    assert lease.key is None
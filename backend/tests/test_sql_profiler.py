@@ -0,0 +1,40 @@
+import pytest
+
+from backend.utils import sql_profiler
+from backend.utils.sql_profiler import SQLProfile, normalize_statement
+
+
+@pytest.mark.parametrize(
+    'statement',
+    [
+        'SELECT * FROM sys_role WHERE id IN ($1, $2, $3)',
+        'SELECT *  FROM sys_role\nWHERE id IN (%s, %s)',
+        'SELECT * FROM sys_role WHERE id IN (%(id_1)s)',
+        'SELECT * FROM sys_role WHERE id IN (?, ?)',
+    ],
+)
+def test_normalize_statement(statement: str) -> None:
+    assert normalize_statement(statement) == 'SELECT * FROM sys_role WHERE id IN (?)'
+
+
+def test_profile_detects_repeated(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(sql_profiler.settings, 'SQL_PROFILER_REPEAT_THRESHOLD', 3)
+    monkeypatch.setattr(sql_profiler.settings, 'SQL_PROFILER_SLOWEST_SIZE', 2)
+    profile = SQLProfile()
+    profile.record('SELECT * FROM sys_user', 0.005)
+    for i in range(3):
+        profile.record(f'SELECT * FROM sys_dept WHERE id = ${i + 1}', 0.001 * (i + 1))
+
+    assert profile.count == 4
+    assert profile.duration == pytest.approx(0.011)
+    assert profile.repeated == [{'statement': 'SELECT * FROM sys_dept WHERE id = ?', 'count': 3, 'duration': 6.0}]
+    assert [shape for _, shape in profile.slowest] == ['SELECT * FROM sys_user', 'SELECT * FROM sys_dept WHERE id = ?']
+    assert profile.server_timing() == 'db;dur=11.000;desc="4 queries"'
+
+
+def test_profile_below_threshold(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(sql_profiler.settings, 'SQL_PROFILER_REPEAT_THRESHOLD', 3)
+    profile = SQLProfile()
+    profile.record('SELECT 1', 0.001)
+    profile.record('SELECT 1', 0.001)
+    assert profile.to_dict()['repeated'] == []
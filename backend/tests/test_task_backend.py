@@ -0,0 +1,69 @@
+import pickle
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from celery import Celery, states
+from celery.app.task import Context
+
+from backend.app.task import database
+from backend.app.task.database import BatchedDatabaseBackend
+
+
+class FakeRedis:
+    def __init__(self) -> None:
+        self.data: dict[str, bytes] = {}
+
+    def set(self, key: str, value: bytes, ex: int | None = None) -> None:
+        self.data[key] = value
+
+    def get(self, key: str) -> bytes | None:
+        return self.data.get(key)
+
+
+@pytest.fixture
+def backend(monkeypatch: pytest.MonkeyPatch) -> BatchedDatabaseBackend:
+    monkeypatch.setattr(database.settings, 'CELERY_RESULT_BATCH_SIZE', 2)
+    monkeypatch.setattr(database.settings, 'CELERY_RESULT_BUFFER_MAX_BATCHES', 2)
+    app = Celery(set_as_current=False)
+    app.conf.result_extended = True
+    backend = BatchedDatabaseBackend(app=app, url='sqlite://')
+    backend._redis = FakeRedis()
+    backend._finalize.cancel()
+    monkeypatch.setattr(backend, '_ensure_flusher', lambda: None)
+    return backend
+
+
+def test_fast_path_round_trip(backend: BatchedDatabaseBackend) -> None:
+    request = Context(
+        args=[1, 2], kwargs={'a': 'b'}, task='demo', hostname='w1', retries=0, delivery_info={'routing_key': 'q'}
+    )
+    backend._store_result('t1', {'ok': True}, states.SUCCESS, request=request)
+    backend._buffer.clear()
+
+    meta = backend._get_task_meta_for('t1')
+    assert meta['status'] == states.SUCCESS
+    assert meta['result'] == {'ok': True}
+    assert meta['args'] == [1, 2]
+    assert meta['kwargs'] == {'a': 'b'}
+    assert meta['date_done'] is not None
+
+
+def test_fast_path_ignores_pickle(backend: BatchedDatabaseBackend, monkeypatch: pytest.MonkeyPatch) -> None:
+    backend._redis.data[backend.fast_path_key('t1')] = pickle.dumps({'task_id': 't1'})
+    fallback = MagicMock(return_value={'status': states.PENDING})
+    monkeypatch.setattr(database.DatabaseBackend, '_get_task_meta_for', fallback)
+    assert backend._get_task_meta_for('t1') == {'status': states.PENDING}
+    fallback.assert_called_once()
+
+
+def test_flush_failure_caps_buffer(backend: BatchedDatabaseBackend, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(backend, 'result_session', MagicMock(side_effect=ConnectionError))
+    for i in range(6):
+        backend._store_result(f't{i}', i, states.SUCCESS)
+
+    with pytest.raises(ConnectionError):
+        backend.flush()
+    assert list(backend._buffer) == ['t2', 't3', 't4', 't5']
+    assert backend._inflight == {}
@@ -1,132 +1,131 @@
-from functools import lru_cache
+"""
+动态配置
+
+优先读取参数配置插件中启用的配置，未安装插件或配置未启用时使用本地配置。
+参数配置在进程内缓存，插件写入配置后通过 Redis 通知各进程刷新，读取时不访问数据库
+"""
 
-from sqlalchemy import inspect
-from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+import os
+
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import TYPE_CHECKING
 
+from backend.common.exception import errors
 from backend.core.conf import settings
-from backend.database.db import async_engine
-from backend.utils.serializers import select_list_serialize
+from backend.core.path_conf import PLUGIN_DIR
+
+if TYPE_CHECKING:
+    from backend.plugin.config.utils.store import ConfigSnapshot
+
+_EMAIL_CONFIG_KEYS = ('EMAIL_HOST', 'EMAIL_PORT', 'EMAIL_SSL', 'EMAIL_USERNAME', 'EMAIL_PASSWORD')
+
+
+@dataclass(frozen=True, slots=True)
+class UserSecurityConfig:
+    """用户安全配置"""
+
+    lock_threshold: int
+    lock_seconds: int
+    password_expiry_days: int
+    password_reminder_days: int
+    password_history_check_count: int
+    password_min_length: int
+    password_max_length: int
+    password_require_special_char: bool
+
+
+@dataclass(frozen=True, slots=True)
+class LoginConfig:
+    """登录配置"""
+
+    captcha_enabled: bool
+
+
+@dataclass(frozen=True, slots=True)
+class EmailConfig:
+    """邮箱配置"""
+
+    host: str
+    port: int
+    ssl: bool
+    username: str
+    password: str
 
 
 @lru_cache
-def get_sys_config_table(conn: AsyncConnection) -> bool:
-    """
-    获取参数配置表
-
-    :param conn: 数据库连接
-    :return:
-    """
-    inspector = inspect(conn)
-    return inspector.has_table('sys_config', schema=None)
-
-
-async def load_user_security_config(db: AsyncSession) -> None:  # noqa: C901
-    """
-    获取用户安全配置
-
-    :param db: 数据库会话
-    :return:
-    """
-    dynamic_config = None
-
-    async with async_engine.begin() as conn:
-        exists = await conn.run_sync(get_sys_config_table)
-        if exists:
-            from backend.plugin.config.crud.crud_config import config_dao
-            from backend.plugin.config.enums import ConfigType
-
-            dynamic_config = await config_dao.get_all(db, ConfigType.user_security)
-
-    if dynamic_config:
-        security_config_status_key = 'USER_SECURITY_CONFIG_STATUS'
-        lock_threshold_key = 'USER_LOCK_THRESHOLD'
-        lock_seconds_key = 'USER_LOCK_SECONDS'
-        password_expiry_days_key = 'USER_PASSWORD_EXPIRY_DAYS'
-        password_reminder_days_key = 'USER_PASSWORD_REMINDER_DAYS'
-        password_history_check_count_key = 'USER_PASSWORD_HISTORY_CHECK_COUNT'
-        password_min_length_key = 'USER_PASSWORD_MIN_LENGTH'
-        password_max_length_key = 'USER_PASSWORD_MAX_LENGTH'
-        password_require_special_char_key = 'USER_PASSWORD_REQUIRE_SPECIAL_CHAR'
-
-        configs = {dc['key']: dc['value'] for dc in select_list_serialize(dynamic_config)}
-        if int(configs.get(security_config_status_key)):
-            if lock_threshold_key in configs:
-                settings.USER_LOCK_THRESHOLD = int(configs[lock_threshold_key])
-            if lock_seconds_key in configs:
-                settings.USER_LOCK_SECONDS = int(configs[lock_seconds_key])
-            if password_expiry_days_key in configs:
-                settings.USER_PASSWORD_EXPIRY_DAYS = int(configs[password_expiry_days_key])
-            if password_reminder_days_key in configs:
-                settings.USER_PASSWORD_REMINDER_DAYS = int(configs[password_reminder_days_key])
-            if password_history_check_count_key in configs:
-                settings.USER_PASSWORD_HISTORY_CHECK_COUNT = int(configs[password_history_check_count_key])
-            if password_min_length_key in configs:
-                settings.USER_PASSWORD_MIN_LENGTH = int(configs[password_min_length_key])
-            if password_max_length_key in configs:
-                settings.USER_PASSWORD_MAX_LENGTH = int(configs[password_max_length_key])
-            if password_require_special_char_key in configs:
-                settings.USER_PASSWORD_REQUIRE_SPECIAL_CHAR = configs[password_require_special_char_key] == 'true'
-
-
-async def load_login_config(db: AsyncSession) -> None:
-    """
-    获取登录配置
-
-    :param db: 数据库会话
-    :return:
-    """
-    dynamic_config = None
-
-    async with async_engine.begin() as conn:
-        exists = await conn.run_sync(get_sys_config_table)
-        if exists:
-            from backend.plugin.config.crud.crud_config import config_dao
-            from backend.plugin.config.enums import ConfigType
-
-            dynamic_config = await config_dao.get_all(db, ConfigType.login)
-
-    if dynamic_config:
-        login_config_status_key = 'LOGIN_CONFIG_STATUS'
-        login_captcha_enabled_key = 'LOGIN_CAPTCHA_ENABLED'
-
-        configs = {dc['key']: dc['value'] for dc in select_list_serialize(dynamic_config)}
-        if int(configs.get(login_config_status_key)) and login_captcha_enabled_key in configs:
-            settings.LOGIN_CAPTCHA_ENABLED = configs[login_captcha_enabled_key] == 'true'
-
-
-async def load_email_config(db: AsyncSession) -> None:
-    """
-    获取邮箱配置
-
-    :param db: 数据库会话
-    :return:
-    """
-    dynamic_config = None
-
-    async with async_engine.begin() as conn:
-        exists = await conn.run_sync(get_sys_config_table)
-        if exists:
-            from backend.plugin.config.crud.crud_config import config_dao
-            from backend.plugin.config.enums import ConfigType
-
-            dynamic_config = await config_dao.get_all(db, ConfigType.email)
-
-    if dynamic_config:
-        email_config_status_key = 'EMAIL_CONFIG_STATUS'
-        host_key = 'EMAIL_HOST'
-        port_key = 'EMAIL_PORT'
-        ssl_key = 'EMAIL_SSL'
-        username_key = 'EMAIL_USERNAME'
-        password_key = 'EMAIL_PASSWORD'
-
-        configs = {dc['key']: dc['value'] for dc in select_list_serialize(dynamic_config)}
-        if int(configs.get(email_config_status_key)):
-            settings.EMAIL_HOST = str(configs[host_key])
-        if configs.get(port_key):
-            settings.EMAIL_PORT = int(configs[port_key])
-        if configs.get(ssl_key):
-            settings.EMAIL_SSL = configs[ssl_key] == 'true'
-        if configs.get(username_key):
-            settings.EMAIL_USERNAME = str(configs[username_key])
-        if configs.get(password_key):
-            settings.EMAIL_PASSWORD = str(configs[password_key])
+def has_config_plugin() -> bool:
+    """是否已安装参数配置插件，结果在进程内缓存，插件变更后需调用 has_config_plugin.cache_clear()"""
+    return os.path.isfile(PLUGIN_DIR / 'config' / '__init__.py')
+
+
+async def get_config_snapshot() -> 'ConfigSnapshot | None':
+    """获取参数配置快照，未安装参数配置插件时返回 None"""
+    if not has_config_plugin():
+        return None
+
+    from backend.plugin.config.utils.store import config_store
+
+    return await config_store.get()
+
+
+async def init_dynamic_config() -> None:
+    """启动时预加载参数配置"""
+    await get_config_snapshot()
+
+
+async def get_user_security_config() -> UserSecurityConfig:
+    """获取用户安全配置"""
+    snapshot = await get_config_snapshot()
+    if not snapshot or not snapshot.get_bool('USER_SECURITY_CONFIG_STATUS', False):
+        snapshot = None
+
+    def get_int(key: str) -> int:
+        default = getattr(settings, key)
+        return snapshot.get_int(key, default) if snapshot else default
+
+    def get_bool(key: str) -> bool:
+        default = getattr(settings, key)
+        return snapshot.get_bool(key, default) if snapshot else default
+
+    return UserSecurityConfig(
+        lock_threshold=get_int('USER_LOCK_THRESHOLD'),
+        lock_seconds=get_int('USER_LOCK_SECONDS'),
+        password_expiry_days=get_int('USER_PASSWORD_EXPIRY_DAYS'),
+        password_reminder_days=get_int('USER_PASSWORD_REMINDER_DAYS'),
+        password_history_check_count=get_int('USER_PASSWORD_HISTORY_CHECK_COUNT'),
+        password_min_length=get_int('USER_PASSWORD_MIN_LENGTH'),
+        password_max_length=get_int('USER_PASSWORD_MAX_LENGTH'),
+        password_require_special_char=get_bool('USER_PASSWORD_REQUIRE_SPECIAL_CHAR'),
+    )
+
+
+async def get_login_config() -> LoginConfig:
+    """获取登录配置"""
+    snapshot = await get_config_snapshot()
+    captcha_enabled = settings.LOGIN_CAPTCHA_ENABLED
+    if snapshot and snapshot.get_bool('LOGIN_CONFIG_STATUS', False):
+        captcha_enabled = snapshot.get_bool('LOGIN_CAPTCHA_ENABLED', captcha_enabled)
+    return LoginConfig(captcha_enabled=captcha_enabled)
+
+
+async def get_email_config() -> EmailConfig:
+    """获取邮箱配置"""
+    snapshot = await get_config_snapshot()
+    if not snapshot or not snapshot.get_bool('EMAIL_STATUS', False):
+        return EmailConfig(
+            host=settings.EMAIL_HOST,
+            port=settings.EMAIL_PORT,
+            ssl=settings.EMAIL_SSL,
+            username=settings.EMAIL_USERNAME,
+            password=settings.EMAIL_PASSWORD,
+        )
+    if any(key not in snapshot.values for key in _EMAIL_CONFIG_KEYS):
+        raise errors.NotFoundError(msg='缺少邮件动态配置，请检查系统参数配置-邮件配置')
+    return EmailConfig(
+        host=snapshot.get_str('EMAIL_HOST', settings.EMAIL_HOST),
+        port=snapshot.get_int('EMAIL_PORT', settings.EMAIL_PORT),
+        ssl=snapshot.get_bool('EMAIL_SSL', settings.EMAIL_SSL),
+        username=snapshot.get_str('EMAIL_USERNAME', settings.EMAIL_USERNAME),
+        password=snapshot.get_str('EMAIL_PASSWORD', settings.EMAIL_PASSWORD),
+    )
@@ -0,0 +1,489 @@
+"""
+数据导出
+
+使用服务端游标按批读取查询结果，逐批编码为 CSV 或 XLSX 后以流式响应返回，内存占用只与批大小有关。
+XLSX 由 ZipFile 以数据描述符方式写入只追加的缓冲区，单元格使用内联字符串，无需共享字符串表，
+超过单个工作表行数上限时自动切换到新的工作表。行数超过阈值的导出转为 Celery 后台任务，写入不对外公开的导出目录，
+仅发起导出的用户可通过下载接口获取，过期后由定时任务清理
+"""
+
+import csv
+import io
+import math
+import os
+import re
+import time
+import zipfile
+
+from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator, Callable, Sequence
+from dataclasses import dataclass
+from datetime import date, datetime
+from enum import Enum
+from pathlib import Path
+from typing import Any
+from uuid import uuid4
+from xml.sax.saxutils import escape
+
+import anyio
+
+from anyio import open_file
+from fastapi import Request, Response
+from msgspec import json
+from sqlalchemy import Select, func, select
+from sqlalchemy.ext.asyncio import AsyncResult
+from starlette.responses import StreamingResponse
+
+from backend.common.enums import ExportFormatType
+from backend.common.response.response_schema import response_base
+from backend.core.conf import settings
+from backend.core.path_conf import EXPORT_DIR
+from backend.database.db import db_replicas
+from backend.utils.import_parse import lazy_import
+from backend.utils.timezone import timezone
+
+task_celery = lazy_import('backend.app.task.celery')
+
+# 后台导出任务名称
+EXPORT_TASK_NAME = 'backend.app.task.tasks.export.tasks.export_data'
+
+# 单个工作表最大行数
+_XLSX_MAX_ROWS = 1_048_576
+
+# Excel 数字精度为 15 位，超出的整数按文本写入
+_XLSX_MAX_NUMBER = 10**15
+
+# XML 1.0 不允许的控制字符
+_XML_ILLEGAL_CHARS = re.compile(r'[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+# 以这些字符开头的文本会被电子表格软件当作公式执行
+_CSV_FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+# 后台导出文件名
+_EXPORT_FILENAME = re.compile(r'^[0-9a-f-]{36}\.(csv|xlsx)$')
+
+# 已注册的导出器
+export_registry: dict[str, 'Exporter'] = {}
+
+
+@dataclass(frozen=True, slots=True)
+class ExportColumn:
+    """导出列"""
+
+    title: str
+    field: str | Callable[[Any], Any]
+
+    def get(self, record: Any) -> Any:
+        """
+        获取记录中的列值
+
+        :param record: 导出记录
+        :return:
+        """
+        if callable(self.field):
+            return self.field(record)
+        return getattr(record, self.field)
+
+
+def format_value(value: Any) -> Any:
+    """
+    转换为可写入文件的值
+
+    :param value: 列值
+    :return:
+    """
+    if value is None:
+        return ''
+    if isinstance(value, datetime):
+        return timezone.to_str(timezone.from_datetime(value))
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, dict | list):
+        return json.encode(value).decode()
+    return value
+
+
+class CSVWriter:
+    """CSV 编码器"""
+
+    media_type = 'text/csv; charset=utf-8'
+
+    def __init__(self, columns: Sequence[ExportColumn]) -> None:
+        self.columns = columns
+        self._buffer = io.StringIO()
+        self._writer = csv.writer(self._buffer)
+
+    def _drain(self) -> bytes:
+        data = self._buffer.getvalue().encode()
+        self._buffer.seek(0)
+        self._buffer.truncate()
+        return data
+
+    @staticmethod
+    def _cell(value: Any) -> Any:
+        value = format_value(value)
+        if isinstance(value, str) and value.startswith(_CSV_FORMULA_PREFIXES):
+            return f"'{value}"
+        return value
+
+    def begin(self) -> bytes:
+        """写入 BOM 与表头，便于 Excel 识别 UTF-8 编码"""
+        self._writer.writerow([column.title for column in self.columns])
+        return '\ufeff'.encode() + self._drain()
+
+    def write(self, records: Sequence[Any]) -> bytes:
+        """
+        写入一批记录
+
+        :param records: 导出记录
+        :return:
+        """
+        self._writer.writerows([self._cell(column.get(record)) for column in self.columns] for record in records)
+        return self._drain()
+
+    def end(self) -> bytes:
+        """结束写入"""
+        return b''
+
+
+class _AppendOnlyBuffer:
+    """只追加的缓冲区，ZipFile 无法定位时以数据描述符方式流式写入"""
+
+    def __init__(self) -> None:
+        self._chunks: list[bytes] = []
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+class XLSXWriter:
+    """XLSX 流式编码器"""
+
+    media_type = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+
+    def __init__(self, columns: Sequence[ExportColumn]) -> None:
+        self.columns = columns
+        self._buffer = _AppendOnlyBuffer()
+        self._zip = zipfile.ZipFile(self._buffer, mode='w', compression=zipfile.ZIP_DEFLATED)
+        self._sheet: Any = None
+        self._sheets = 0
+        self._rows = 0
+
+    @staticmethod
+    def _cell(value: Any) -> str:
+        value = format_value(value)
+        if isinstance(value, bool):
+            return f'<c t="b"><v>{int(value)}</v></c>'
+        if isinstance(value, int | float) and math.isfinite(value) and abs(value) < _XLSX_MAX_NUMBER:
+            return f'<c><v>{value}</v></c>'
+        text = escape(_XML_ILLEGAL_CHARS.sub('', str(value)))
+        return f'<c t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>'
+
+    def _row(self, values: Sequence[Any]) -> str:
+        return f'<row>{"".join(self._cell(value) for value in values)}</row>'
+
+    def _open_sheet(self) -> None:
+        self._sheets += 1
+        self._sheet = self._zip.open(f'xl/worksheets/sheet{self._sheets}.xml', mode='w', force_zip64=True)
+        self._sheet.write(
+            b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            b'<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'
+        )
+        self._sheet.write(self._row([column.title for column in self.columns]).encode())
+        self._rows = 1
+
+    def _close_sheet(self) -> None:
+        self._sheet.write(b'</sheetData></worksheet>')
+        self._sheet.close()
+
+    def begin(self) -> bytes:
+        """写入第一个工作表的表头"""
+        self._open_sheet()
+        return self._buffer.drain()
+
+    def write(self, records: Sequence[Any]) -> bytes:
+        """
+        写入一批记录
+
+        :param records: 导出记录
+        :return:
+        """
+        rows = []
+        for record in records:
+            if self._rows >= _XLSX_MAX_ROWS:
+                self._sheet.write(''.join(rows).encode())
+                rows.clear()
+                self._close_sheet()
+                self._open_sheet()
+            rows.append(self._row([column.get(record) for column in self.columns]))
+            self._rows += 1
+        self._sheet.write(''.join(rows).encode())
+        return self._buffer.drain()
+
+    def end(self) -> bytes:
+        """写入工作簿结构并结束写入"""
+        self._close_sheet()
+        sheets = range(1, self._sheets + 1)
+        self._zip.writestr(
+            '[Content_Types].xml',
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+            '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+            '<Default Extension="xml" ContentType="application/xml"/>'
+            '<Override PartName="/xl/workbook.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+            '<Override PartName="/xl/styles.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+            + ''.join(
+                f'<Override PartName="/xl/worksheets/sheet{i}.xml" '
+                'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+                for i in sheets
+            )
+            + '</Types>',
+        )
+        self._zip.writestr(
+            '_rels/.rels',
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            '<Relationship Id="rId1" '
+            'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+            'Target="xl/workbook.xml"/>'
+            '</Relationships>',
+        )
+        self._zip.writestr(
+            'xl/workbook.xml',
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+            'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships"><sheets>'
+            + ''.join(f'<sheet name="Sheet{i}" sheetId="{i}" r:id="rId{i}"/>' for i in sheets)
+            + '</sheets></workbook>',
+        )
+        self._zip.writestr(
+            'xl/_rels/workbook.xml.rels',
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            + ''.join(
+                f'<Relationship Id="rId{i}" '
+                'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+                f'Target="worksheets/sheet{i}.xml"/>'
+                for i in sheets
+            )
+            + f'<Relationship Id="rId{self._sheets + 1}" '
+            'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" '
+            'Target="styles.xml"/>'
+            '</Relationships>',
+        )
+        self._zip.writestr(
+            'xl/styles.xml',
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            '<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+            '<fonts count="1"><font><sz val="11"/><name val="Calibri"/></font></fonts>'
+            '<fills count="2"><fill><patternFill patternType="none"/></fill>'
+            '<fill><patternFill patternType="gray125"/></fill></fills>'
+            '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+            '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+            '<cellXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/></cellXfs>'
+            '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+            '</styleSheet>',
+        )
+        self._zip.close()
+        return self._buffer.drain()
+
+
+_WRITERS: dict[ExportFormatType, type[CSVWriter | XLSXWriter]] = {
+    ExportFormatType.csv: CSVWriter,
+    ExportFormatType.xlsx: XLSXWriter,
+}
+
+
+class Exporter(ABC):
+    """
+    数据导出器
+
+    子类提供与列表接口相同的查询表达式，实例化时按名称注册，供后台任务在 Celery 进程中查找
+    """
+
+    def __init__(self, name: str, columns: Sequence[ExportColumn]) -> None:
+        """
+        初始化导出器
+
+        :param name: 导出器名称，同时作为导出文件名前缀
+        :param columns: 导出列
+        :return:
+        """
+        self.name = name
+        self.columns = tuple(columns)
+        export_registry[name] = self
+
+    @abstractmethod
+    async def get_select(self, **filters: Any) -> Select:
+        """
+        获取导出查询表达式
+
+        :param filters: 过滤条件
+        :return:
+        """
+
+    async def iter_batches(self, result: AsyncResult) -> AsyncIterator[Sequence[Any]]:
+        """
+        按批获取导出记录
+
+        :param result: 流式查询结果
+        :return:
+        """
+        async for batch in result.scalars().partitions():
+            yield batch
+
+    async def iter_chunks(
+        self,
+        fmt: ExportFormatType,
+        filters: dict[str, Any],
+        progress: Callable[[dict[str, Any]], None] | None = None,
+    ) -> AsyncIterator[bytes]:
+        """
+        流式生成导出文件内容
+
+        :param fmt: 导出格式
+        :param filters: 过滤条件
+        :param progress: 进度回调，每批写入后调用
+        :return:
+        """
+        writer = _WRITERS[fmt](self.columns)
+        yield writer.begin()
+        rows = 0
+        stmt = (await self.get_select(**filters)).execution_options(yield_per=settings.EXPORT_BATCH_SIZE)
+        async with (await db_replicas.route())() as db:
+            result = await db.stream(stmt)
+            async for batch in self.iter_batches(result):
+                rows += len(batch)
+                yield writer.write(batch)
+                if progress is not None:
+                    progress({'rows': rows})
+        yield writer.end()
+
+    async def exceeds(self, filters: dict[str, Any], threshold: int) -> bool:
+        """
+        导出行数是否超过阈值，最多扫描阈值加一行
+
+        :param filters: 过滤条件
+        :param threshold: 行数阈值
+        :return:
+        """
+        stmt = await self.get_select(**filters)
+        count_stmt = select(func.count()).select_from(stmt.order_by(None).limit(threshold + 1).subquery())
+        async with (await db_replicas.route())() as db:
+            return await db.scalar(count_stmt) > threshold
+
+    async def response(self, request: Request, fmt: ExportFormatType, filters: dict[str, Any]) -> Response:
+        """
+        导出数据，行数超过阈值时转为后台任务并返回任务 ID
+
+        :param request: FastAPI 请求对象
+        :param fmt: 导出格式
+        :param filters: 过滤条件
+        :return:
+        """
+        if await self.exceeds(filters, settings.EXPORT_ASYNC_THRESHOLD):
+            task = task_celery.celery_app.send_task(
+                name=EXPORT_TASK_NAME,
+                kwargs={
+                    'module': type(self).__module__,
+                    'name': self.name,
+                    'fmt': fmt.value,
+                    'filters': filters,
+                    'user_id': request.user.id,
+                },
+            )
+            return response_base.fast_success(data={'task_id': task.task_id})
+
+        return StreamingResponse(
+            self.iter_chunks(fmt, filters),
+            media_type=_WRITERS[fmt].media_type,
+            headers={'Content-Disposition': f'attachment; filename={self.download_name(fmt)}'},
+        )
+
+    def download_name(self, fmt: ExportFormatType) -> str:
+        """
+        获取下载文件名
+
+        :param fmt: 导出格式
+        :return:
+        """
+        return f'{self.name}_{timezone.now().strftime("%Y%m%d%H%M%S")}.{fmt.value}'
+
+    async def save(
+        self,
+        task_id: str,
+        fmt: ExportFormatType,
+        filters: dict[str, Any],
+        progress: Callable[[dict[str, Any]], None] | None = None,
+    ) -> str:
+        """
+        导出数据到导出目录，写入临时文件后原子重命名，下载接口不会读到未写完的文件
+
+        :param task_id: 任务 ID，作为文件名
+        :param fmt: 导出格式
+        :param filters: 过滤条件
+        :param progress: 进度回调，每批写入后调用
+        :return: 文件名
+        """
+        filename = f'{task_id}.{fmt.value}'
+        await anyio.Path(EXPORT_DIR).mkdir(parents=True, exist_ok=True)
+        temp_path = EXPORT_DIR / f'.{uuid4().hex}'
+        try:
+            async with await open_file(temp_path, mode='wb') as fb:
+                async for chunk in self.iter_chunks(fmt, filters, progress):
+                    await fb.write(chunk)
+            await anyio.Path(temp_path).replace(EXPORT_DIR / filename)
+        except BaseException:
+            await anyio.Path(temp_path).unlink(missing_ok=True)
+            raise
+        return filename
+
+
+def get_export_file(filename: str) -> Path | None:
+    """
+    获取未过期的后台导出文件路径
+
+    :param filename: 文件名
+    :return:
+    """
+    if not _EXPORT_FILENAME.match(filename):
+        return None
+    path = EXPORT_DIR / filename
+    try:
+        modified = path.stat().st_mtime
+    except FileNotFoundError:
+        return None
+    if time.time() - modified > settings.EXPORT_FILE_EXPIRE_SECONDS:
+        return None
+    return path
+
+
+def delete_expired_exports() -> int:
+    """
+    删除过期的后台导出文件与残留的临时文件
+
+    :return: 删除的文件数量
+    """
+    if not EXPORT_DIR.exists():
+        return 0
+    deadline = time.time() - settings.EXPORT_FILE_EXPIRE_SECONDS
+    count = 0
+    with os.scandir(EXPORT_DIR) as entries:
+        for entry in entries:
+            if entry.is_file() and entry.stat().st_mtime < deadline:
+                os.unlink(entry.path)
+                count += 1
+    return count
@@ -1,140 +1,203 @@
-import io
 import os
 import re
+import shutil
+import tempfile
 import zipfile
 
+from collections.abc import Callable
+from typing import Any
+from uuid import uuid4
+
 import anyio
 
 from anyio import open_file
-from dulwich import porcelain
 from fastapi import UploadFile
-from sqlparse import split
+from starlette.concurrency import run_in_threadpool
 
-from backend.common.enums import FileType
 from backend.common.exception import errors
 from backend.common.log import log
 from backend.core.conf import settings
-from backend.core.path_conf import PLUGIN_DIR, UPLOAD_DIR
+from backend.core.path_conf import PLUGIN_DIR
 from backend.database.redis import redis_client
 from backend.plugin.tools import install_requirements_async
+from backend.utils.import_parse import lazy_import
 from backend.utils.re_verify import is_git_url
-from backend.utils.timezone import timezone
-
+from backend.utils.upload_store import upload_store
 
-def build_filename(file: UploadFile) -> str:
-    """
-    构建文件名
-
-    :param file: FastAPI 上传文件对象
-    :return:
-    """
-    timestamp = int(timezone.now().timestamp())
-    filename = file.filename
-    file_ext = filename.split('.')[-1].lower()
-    new_filename = f'{filename.replace(f".{file_ext}", f"_{timestamp}")}.{file_ext}'
-    return new_filename
+porcelain = lazy_import('dulwich.porcelain')
+sqlparse = lazy_import('sqlparse')
 
 
-def upload_file_verify(file: UploadFile) -> None:
+def upload_file_verify(file: UploadFile) -> int:
     """
     文件验证
 
+    文件大小在上传过程中增量校验，不信任客户端声明的大小
+
     :param file: FastAPI 上传文件对象
-    :return:
+    :return: 允许的最大字节数
     """
-    filename = file.filename
-    file_ext = filename.split('.')[-1].lower()
+    filename = file.filename or ''
+    file_ext = filename.split('.')[-1].lower() if '.' in filename else ''
     if not file_ext:
         raise errors.RequestError(msg='未知的文件类型')
 
-    if file_ext == FileType.image:
-        if file_ext not in settings.UPLOAD_IMAGE_EXT_INCLUDE:
-            raise errors.RequestError(msg='此图片格式暂不支持')
-        if file.size > settings.UPLOAD_IMAGE_SIZE_MAX:
-            raise errors.RequestError(msg='图片超出最大限制，请重新选择')
-    elif file_ext == FileType.video:
-        if file_ext not in settings.UPLOAD_VIDEO_EXT_INCLUDE:
-            raise errors.RequestError(msg='此视频格式暂不支持')
-        if file.size > settings.UPLOAD_VIDEO_SIZE_MAX:
-            raise errors.RequestError(msg='视频超出最大限制，请重新选择')
+    if file_ext in settings.UPLOAD_IMAGE_EXT_INCLUDE:
+        return settings.UPLOAD_IMAGE_SIZE_MAX
+    if file_ext in settings.UPLOAD_VIDEO_EXT_INCLUDE:
+        return settings.UPLOAD_VIDEO_SIZE_MAX
+    return settings.UPLOAD_FILE_SIZE_MAX
 
 
-async def upload_file(file: UploadFile) -> str:
+async def upload_file(file: UploadFile, max_size: int | None = None) -> str:
     """
     上传文件
 
     :param file: FastAPI 上传文件对象
+    :param max_size: 最大字节数，为空时不限制
     :return:
     """
-    filename = build_filename(file)
-    try:
-        async with await open_file(UPLOAD_DIR / filename, mode='wb') as fb:
-            while True:
-                content = await file.read(settings.UPLOAD_READ_SIZE)
-                if not content:
-                    break
-                await fb.write(content)
-    except Exception as e:
-        log.error(f'上传文件 {filename} 失败：{e!s}')
-        raise errors.RequestError(msg='上传文件失败')
-    await file.close()
-    return filename
+    return await upload_store.save(file, max_size)
 
 
-async def install_zip_plugin(file: UploadFile | str) -> str:
+async def install_zip_plugin(file: UploadFile | str, progress: Callable[[dict[str, Any]], None] | None = None) -> str:
     """
     安装 ZIP 插件
 
+    上传的压缩包分块写入临时文件，不会整体读入内存；校验中央目录中的条目数与解压总大小，防止压缩炸弹，
+    校验与逐条流式解压在线程池中执行，不阻塞事件循环
+
     :param file: FastAPI 上传文件对象或文件完整路径
+    :param progress: 安装进度回调，参数包含阶段 stage、已处理量 done 与总量 total
     :return:
     """
-    if isinstance(file, str):
-        async with await open_file(file, mode='rb') as fb:
-            contents = await fb.read()
-    else:
-        contents = await file.read()
-    file_bytes = io.BytesIO(contents)
-    if not zipfile.is_zipfile(file_bytes):
+    filename = file.split(os.sep)[-1] if isinstance(file, str) else file.filename or ''
+    match = re.match(r'^([a-zA-Z0-9_]+)', filename.split('.')[0].strip())
+    if not match:
+        raise errors.RequestError(msg='插件压缩包名称非法')
+    plugin_name = match.group()
+    full_plugin_path = anyio.Path(PLUGIN_DIR / plugin_name)
+    if await full_plugin_path.exists():
+        raise errors.ConflictError(msg='此插件已安装')
+
+    report = progress or (lambda _: None)
+    temp_path = None
+    try:
+        if isinstance(file, str):
+            zip_path = file
+        else:
+            temp_path = await _spool_upload(file, report)
+            zip_path = temp_path
+        plugin_dir_name = await run_in_threadpool(_extract_zip_plugin, zip_path, plugin_name, report)
+    finally:
+        if temp_path:
+            await anyio.Path(temp_path).unlink(missing_ok=True)
+
+    report({'stage': 'requirements', 'done': 0, 'total': 1})
+    await install_requirements_async(plugin_dir_name)
+    await redis_client.set(f'{settings.PLUGIN_REDIS_PREFIX}:changed', 'ture')
+    report({'stage': 'done', 'done': 1, 'total': 1})
+
+    return plugin_name
+
+
+async def _spool_upload(file: UploadFile, report: Callable[[dict[str, Any]], None]) -> str:
+    """
+    将上传的插件压缩包分块写入临时文件
+
+    :param file: FastAPI 上传文件对象
+    :param report: 安装进度回调
+    :return: 临时文件路径
+    """
+    fd, temp_path = tempfile.mkstemp(prefix='fba_plugin_', suffix='.zip')
+    os.close(fd)
+    size = 0
+    try:
+        async with await open_file(temp_path, mode='wb') as fb:
+            while content := await file.read(settings.UPLOAD_READ_SIZE):
+                size += len(content)
+                if size > settings.PLUGIN_ZIP_MAX_SIZE:
+                    raise errors.RequestError(msg='插件压缩包超出最大限制')
+                await fb.write(content)
+                report({'stage': 'upload', 'done': size, 'total': file.size or 0})
+    except BaseException:
+        await anyio.Path(temp_path).unlink(missing_ok=True)
+        raise
+    finally:
+        await file.close()
+    return temp_path
+
+
+def _extract_zip_plugin(zip_path: str, plugin_name: str, report: Callable[[dict[str, Any]], None]) -> str:
+    """
+    校验并解压插件压缩包，先解压到临时目录，完成后重命名为插件目录
+
+    :param zip_path: 压缩包路径
+    :param plugin_name: 插件名称
+    :param report: 安装进度回调
+    :return: 压缩包内的插件目录名
+    """
+    if not zipfile.is_zipfile(zip_path):
         raise errors.RequestError(msg='插件压缩包格式非法')
-    with zipfile.ZipFile(file_bytes) as zf:
-        # 校验压缩包
-        plugin_namelist = zf.namelist()
-        plugin_dir_name = plugin_namelist[0].split('/')[0]
-        if not plugin_namelist:
+
+    with zipfile.ZipFile(zip_path) as zf:
+        # 校验中央目录，不解压任何内容
+        infolist = zf.infolist()
+        if not infolist:
             raise errors.RequestError(msg='插件压缩包内容非法')
+        if len(infolist) > settings.PLUGIN_ZIP_MAX_ENTRIES:
+            raise errors.RequestError(msg='插件压缩包文件数量超出限制')
+        plugin_dir_name = infolist[0].filename.split('/')[0]
+        plugin_namelist = {info.filename for info in infolist}
         if (
-            len(plugin_namelist) <= 3
+            len(infolist) <= 3
             or f'{plugin_dir_name}/plugin.toml' not in plugin_namelist
             or f'{plugin_dir_name}/README.md' not in plugin_namelist
         ):
             raise errors.RequestError(msg='插件压缩包内缺少必要文件')
 
-        # 插件是否可安装
-        plugin_name = re.match(
-            r'^([a-zA-Z0-9_]+)',
-            file.split(os.sep)[-1].split('.')[0].strip()
-            if isinstance(file, str)
-            else file.filename.split('.')[0].strip(),
-        ).group()
-        full_plugin_path = anyio.Path(PLUGIN_DIR / plugin_name)
-        if await full_plugin_path.exists():
-            raise errors.ConflictError(msg='此插件已安装')
-        await full_plugin_path.mkdir(parents=True, exist_ok=True)
-
-        # 解压（安装）
-        members = []
-        for member in zf.infolist():
-            if member.filename.startswith(plugin_dir_name):
-                new_filename = member.filename.replace(plugin_dir_name, '')
-                if new_filename:
-                    member.filename = new_filename
-                    members.append(member)
-        zf.extractall(full_plugin_path, members)
-
-    await install_requirements_async(plugin_dir_name)
-    await redis_client.set(f'{settings.PLUGIN_REDIS_PREFIX}:changed', 'ture')
-
-    return plugin_name
+        members: list[tuple[zipfile.ZipInfo, str]] = []
+        total_size = 0
+        for info in infolist:
+            if not info.filename.startswith(f'{plugin_dir_name}/'):
+                continue
+            relative = info.filename[len(plugin_dir_name) + 1 :]
+            if not relative:
+                continue
+            parts = relative.replace('\\', '/').split('/')
+            if relative.startswith('/') or '..' in parts or ':' in parts[0]:
+                raise errors.RequestError(msg='插件压缩包内文件路径非法')
+            if info.compress_size and info.file_size / info.compress_size > settings.PLUGIN_ZIP_MAX_COMPRESSION_RATIO:
+                raise errors.RequestError(msg='插件压缩包压缩比异常')
+            total_size += info.file_size
+            if total_size > settings.PLUGIN_ZIP_MAX_UNCOMPRESSED_SIZE:
+                raise errors.RequestError(msg='插件压缩包解压后大小超出限制')
+            members.append((info, relative))
+        report({'stage': 'validate', 'done': len(members), 'total': len(infolist)})
+
+        # 逐条流式解压（安装）
+        target = PLUGIN_DIR / plugin_name
+        staging = PLUGIN_DIR / '.tmp' / uuid4().hex
+        try:
+            extracted = 0
+            for info, relative in members:
+                path = staging / relative
+                if info.is_dir():
+                    path.mkdir(parents=True, exist_ok=True)
+                    continue
+                path.parent.mkdir(parents=True, exist_ok=True)
+                with zf.open(info) as src, open(path, 'wb') as dst:  # noqa: PTH123
+                    shutil.copyfileobj(src, dst, settings.UPLOAD_READ_SIZE)
+                extracted += info.file_size
+                report({'stage': 'extract', 'done': extracted, 'total': total_size})
+            if target.exists():
+                raise errors.ConflictError(msg='此插件已安装')
+            staging.rename(target)
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+
+    return plugin_dir_name
 
 
 async def install_git_plugin(repo_url: str) -> str:
@@ -179,7 +242,7 @@ async def parse_sql_script(filepath: str) -> list[str]:
         while additional_contents := await f.read(1024):
             contents += additional_contents
 
-    statements = split(contents)
+    statements = sqlparse.split(contents)
     for statement in statements:
         if not any(statement.lower().startswith(_) for _ in ['select', 'insert']):
             raise errors.RequestError(msg='SQL 脚本文件中存在非法操作，仅允许 SELECT 和 INSERT')
@@ -11,7 +11,9 @@ from fastapi.routing import APIRoute
 
 from backend.common.exception import errors
 from backend.common.log import log
+from backend.common.metrics import FUNCTION_DURATION
 from backend.common.response.response_code import StandardResponseCode
+from backend.core.conf import settings
 
 
 def ensure_unique_route_names(app: FastAPI) -> None:
@@ -73,5 +75,7 @@ def timer(func) -> Callable:  # noqa: ANN001
             unit, factor = 'ms', 1e3
 
         log.info(f'{func.__module__}.{func.__name__} | {elapsed * factor:.3f} {unit}')
+        if settings.METRICS_ENABLED:
+            FUNCTION_DURATION.labels(f'{func.__module__}.{func.__name__}').observe(elapsed)
 
     return async_wrapper if asyncio.iscoroutinefunction(func) else sync_wrapper
@@ -1,7 +1,10 @@
 import importlib
+import importlib.util
 import inspect
+import sys
 
 from functools import lru_cache
+from types import ModuleType
 from typing import Any, TypeVar
 
 from backend.common.exception import errors
@@ -21,6 +24,29 @@ def import_module_cached(module_path: str) -> Any:
     return importlib.import_module(module_path)
 
 
+def lazy_import(module_path: str) -> ModuleType:
+    """
+    延迟导入模块，首次访问模块属性时才真正执行导入
+
+    用于体积较大且只在部分请求中使用的依赖，缩短进程启动时间并降低未使用时的内存占用
+
+    :param module_path: 模块路径
+    :return:
+    """
+    if module_path in sys.modules:
+        return sys.modules[module_path]
+
+    spec = importlib.util.find_spec(module_path)
+    if spec is None or spec.loader is None:
+        raise ModuleNotFoundError(f'No module named {module_path!r}', name=module_path)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_path] = module
+    loader.exec_module(module)
+    return module
+
+
 def dynamic_import_data_model(module_path: str) -> type[T]:
     """
     动态导入数据模型
@@ -0,0 +1,244 @@
+"""
+日志检索
+
+用户名与 IP 的模糊匹配改为可走索引的查询：
+
+- 用户名：精确匹配使用 (username, created_time) 联合索引；PostgreSQL 使用 pg_trgm GIN 索引支持任意位置匹配，
+  少于 3 个字符时 trigram 无法命中索引，退化为前缀匹配；MySQL 未分区时使用 ngram 全文索引，分区表不支持全文索引，
+  使用前缀匹配
+- IP：写入时将 IP 转为 16 字节定长二进制（IPv4 映射为 ::ffff:a.b.c.d），按地址、CIDR 或 IPv4 前缀转为范围查询
+- 时间：配置 LOG_SEARCH_DEFAULT_DAYS 后，存在文本条件且未指定时间范围时只检索最近若干天，优先按分区键裁剪
+"""
+
+import ipaddress
+import re
+
+from datetime import datetime, timedelta
+from typing import Any
+
+from sqlalchemy import DDL, ColumnElement, Index, Table, event, select
+from sqlalchemy.engine.default import DefaultExecutionContext
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.orm import InstrumentedAttribute
+
+from backend.core.conf import settings
+from backend.utils.timezone import timezone
+
+# pg_trgm 可使用索引的最短匹配长度
+_TRIGRAM_MIN_LENGTH = 3
+
+# MySQL ngram 全文解析器默认分词长度
+_NGRAM_TOKEN_SIZE = 2
+
+# 1 ~ 3 段的 IPv4 前缀，如 192.168.
+_IPV4_PREFIX = re.compile(r'^(\d{1,3})(?:\.(\d{1,3}))?(?:\.(\d{1,3}))?\.?$')
+
+
+def pack_ip(ip: str | None) -> bytes | None:
+    """
+    将 IP 转为 16 字节定长二进制，无法解析时返回空
+
+    :param ip: IP 地址
+    :return:
+    """
+    if not ip:
+        return None
+    try:
+        address = ipaddress.ip_address(ip.strip())
+    except ValueError:
+        return None
+    if isinstance(address, ipaddress.IPv4Address):
+        address = ipaddress.IPv6Address(f'::ffff:{address}')
+    return address.packed
+
+
+def default_ip_bin(context: DefaultExecutionContext) -> bytes | None:
+    """
+    插入日志时根据 ip 列生成二进制 IP 列
+
+    :param context: 执行上下文
+    :return:
+    """
+    return pack_ip(context.get_current_parameters().get('ip'))
+
+
+def _network_range(network: ipaddress.IPv4Network | ipaddress.IPv6Network) -> tuple[bytes, bytes]:
+    return pack_ip(str(network.network_address)), pack_ip(str(network.broadcast_address))
+
+
+def parse_ip_range(value: str) -> tuple[bytes, bytes] | None:
+    """
+    将检索条件解析为二进制 IP 范围，支持完整地址、CIDR 与 IPv4 前缀
+
+    :param value: 检索条件
+    :return:
+    """
+    value = value.strip()
+    packed = pack_ip(value)
+    if packed is not None:
+        return packed, packed
+    if '/' in value:
+        try:
+            return _network_range(ipaddress.ip_network(value, strict=False))
+        except ValueError:
+            return None
+    match = _IPV4_PREFIX.match(value)
+    if match:
+        octets = [int(octet) for octet in match.groups() if octet is not None]
+        if all(octet <= 255 for octet in octets):
+            prefix = '.'.join(str(octet) for octet in octets + [0] * (4 - len(octets)))
+            return _network_range(ipaddress.ip_network(f'{prefix}/{len(octets) * 8}'))
+    return None
+
+
+def username_clause(column: InstrumentedAttribute, value: str, *, exact: bool = False) -> ColumnElement[bool]:
+    """
+    获取用户名检索条件
+
+    :param column: 用户名列
+    :param value: 检索条件
+    :param exact: 是否精确匹配
+    :return:
+    """
+    if exact:
+        return column == value
+    if settings.DATABASE_TYPE == 'postgresql':
+        if len(value) >= _TRIGRAM_MIN_LENGTH:
+            return column.contains(value, autoescape=True)
+        return column.startswith(value, autoescape=True)
+    if not settings.LOG_RETENTION_PARTITION_ENABLED and len(value) >= _NGRAM_TOKEN_SIZE:
+        phrase = value.replace('"', ' ')
+        return column.match(f'"{phrase}"')
+    return column.startswith(value, autoescape=True)
+
+
+def ip_clause(
+    ip_column: InstrumentedAttribute, ip_bin_column: InstrumentedAttribute, value: str
+) -> ColumnElement[bool]:
+    """
+    获取 IP 检索条件，无法解析为地址范围时按前缀匹配
+
+    :param ip_column: IP 列
+    :param ip_bin_column: 二进制 IP 列
+    :param value: 检索条件
+    :return:
+    """
+    ip_range = parse_ip_range(value)
+    if ip_range is None:
+        return ip_column.startswith(value.strip(), autoescape=True)
+    low, high = ip_range
+    if low == high:
+        return ip_bin_column == low
+    return ip_bin_column.between(low, high)
+
+
+def log_search_clauses(
+    model: Any,
+    *,
+    username: str | None,
+    status: int | None,
+    ip: str | None,
+    start_time: datetime | None,
+    end_time: datetime | None,
+    exact: bool = False,
+) -> list[ColumnElement[bool]]:
+    """
+    获取日志检索条件，时间范围条件在前
+
+    :param model: 日志模型
+    :param username: 用户名
+    :param status: 状态
+    :param ip: IP 地址
+    :param start_time: 开始时间
+    :param end_time: 结束时间
+    :param exact: 用户名是否精确匹配
+    :return:
+    """
+    if (username or ip) and start_time is None and end_time is None and settings.LOG_SEARCH_DEFAULT_DAYS > 0:
+        start_time = timezone.now() - timedelta(days=settings.LOG_SEARCH_DEFAULT_DAYS)
+
+    clauses = []
+    if start_time is not None:
+        clauses.append(model.created_time >= start_time)
+    if end_time is not None:
+        clauses.append(model.created_time <= end_time)
+    if username:
+        clauses.append(username_clause(model.username, username, exact=exact))
+    if status is not None:
+        clauses.append(model.status == status)
+    if ip:
+        clauses.append(ip_clause(model.ip, model.ip_bin, ip))
+    return clauses
+
+
+def log_search_indexes(table: str) -> list[Index]:
+    """
+    获取日志检索索引
+
+    :param table: 表名
+    :return:
+    """
+    indexes = [
+        Index(f'ix_{table}_created_time', 'created_time'),
+        Index(
+            f'ix_{table}_username_created_time',
+            'username',
+            'created_time',
+            postgresql_ops={'username': 'varchar_pattern_ops'},
+        ),
+        Index(f'ix_{table}_ip_bin', 'ip_bin'),
+        Index(
+            f'ix_{table}_username_trgm',
+            'username',
+            postgresql_using='gin',
+            postgresql_ops={'username': 'gin_trgm_ops'},
+        ).ddl_if(dialect='postgresql'),
+    ]
+    # MySQL 分区表不支持全文索引
+    if not settings.LOG_RETENTION_PARTITION_ENABLED:
+        indexes.append(
+            Index(
+                f'ix_{table}_username_ngram',
+                'username',
+                mysql_prefix='FULLTEXT',
+                mysql_with_parser='ngram',
+            ).ddl_if(dialect='mysql')
+        )
+    return indexes
+
+
+def register_log_search(table: Table) -> None:
+    """
+    注册建表前启用 pg_trgm 扩展
+
+    :param table: 表
+    :return:
+    """
+    event.listen(table, 'before_create', DDL('CREATE EXTENSION IF NOT EXISTS pg_trgm').execute_if(dialect='postgresql'))
+
+
+async def check_log_search_columns(engine: AsyncEngine, *tables: Table) -> None:
+    """
+    检查日志表是否已包含二进制 IP 列
+
+    create_all 不会为已存在的表添加列，已有数据库升级后未执行 sql/<数据库>/upgrade_log_search.sql 时，
+    所有日志写入都会失败且只记录错误日志，因此直接终止启动
+
+    :param engine: 数据库引擎
+    :param tables: 日志表
+    :return:
+    """
+    missing = []
+    async with engine.connect() as conn:
+        for table in tables:
+            try:
+                await conn.execute(select(table.c.ip_bin).limit(0))
+            except DBAPIError:
+                await conn.rollback()
+                missing.append(table.name)
+    if missing:
+        raise RuntimeError(
+            f'日志表 {", ".join(missing)} 缺少 ip_bin 列，'
+            f'请先执行 backend/sql/{settings.DATABASE_TYPE}/upgrade_log_search.sql 升级数据库'
+        )
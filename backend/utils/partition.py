@@ -0,0 +1,186 @@
+"""
+日志表按月范围分区
+
+按 created_time 以自然月为单位划分分区，分区命名为 p{YYYYMM}（PostgreSQL 为 {表名}_p{YYYYMM}）。
+PostgreSQL 额外创建 {表名}_default 默认分区、MySQL 额外创建 pmax 分区兜底，避免分区未及时创建时写入失败
+"""
+
+import re
+
+from datetime import datetime
+
+from sqlalchemy import Connection, Table, event, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.core.conf import settings
+from backend.utils.timezone import timezone
+
+
+def partition_enabled() -> bool:
+    """是否启用日志表分区"""
+    return settings.LOG_RETENTION_PARTITION_ENABLED
+
+
+def partition_table_args() -> dict:
+    """
+    获取分区表配置
+
+    MySQL 的分区定义无法通过建表参数声明，在建表后由 :func:`register_partition` 补充
+
+    :return:
+    """
+    if not partition_enabled() or settings.DATABASE_TYPE != 'postgresql':
+        return {}
+    return {'postgresql_partition_by': 'RANGE (created_time)'}
+
+
+def month_start(t: datetime, months: int = 0) -> datetime:
+    """
+    获取指定时间偏移若干月后的月初时间
+
+    :param t: 时间
+    :param months: 偏移月数
+    :return:
+    """
+    total = t.year * 12 + t.month - 1 + months
+    return t.replace(year=total // 12, month=total % 12 + 1, day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def partition_name(table: str, month: datetime) -> str:
+    if settings.DATABASE_TYPE == 'postgresql':
+        return f'{table}_p{month:%Y%m}'
+    return f'p{month:%Y%m}'
+
+
+def parse_partition_month(table: str, name: str) -> datetime | None:
+    """
+    解析分区名对应的月份
+
+    :param table: 表名
+    :param name: 分区名
+    :return:
+    """
+    prefix = f'{table}_p' if settings.DATABASE_TYPE == 'postgresql' else 'p'
+    match = re.fullmatch(rf'{re.escape(prefix)}(\d{{4}})(\d{{2}})', name)
+    if not match:
+        return None
+    return datetime(int(match.group(1)), int(match.group(2)), 1, tzinfo=timezone.tz_info)
+
+
+def _bound(month: datetime) -> str:
+    if settings.DATABASE_TYPE == 'postgresql':
+        return month.isoformat(sep=' ')
+    return month.strftime('%Y-%m-%d %H:%M:%S')
+
+
+def _add_partition_ddl(table: str, month: datetime) -> str:
+    name = partition_name(table, month)
+    upper = _bound(month_start(month, 1))
+    if settings.DATABASE_TYPE == 'postgresql':
+        return (
+            f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {table} FOR VALUES FROM ('{_bound(month)}') TO ('{upper}')"
+        )
+    return (
+        f'ALTER TABLE {table} REORGANIZE PARTITION pmax INTO '
+        f"(PARTITION {name} VALUES LESS THAN ('{upper}'), PARTITION pmax VALUES LESS THAN (MAXVALUE))"
+    )
+
+
+def _drop_partition_ddl(table: str, name: str) -> str:
+    if settings.DATABASE_TYPE == 'postgresql':
+        return f'DROP TABLE IF EXISTS {name}'
+    return f'ALTER TABLE {table} DROP PARTITION {name}'
+
+
+def _create_partitions_ddl(table: str) -> list[str]:
+    months = [month_start(timezone.now(), i) for i in range(settings.LOG_RETENTION_PARTITION_AHEAD_MONTHS + 1)]
+    if settings.DATABASE_TYPE == 'postgresql':
+        return [f'CREATE TABLE IF NOT EXISTS {table}_default PARTITION OF {table} DEFAULT'] + [
+            _add_partition_ddl(table, month) for month in months
+        ]
+    definitions = [
+        f"PARTITION {partition_name(table, month)} VALUES LESS THAN ('{_bound(month_start(month, 1))}')"
+        for month in months
+    ]
+    definitions.append('PARTITION pmax VALUES LESS THAN (MAXVALUE)')
+    return [f'ALTER TABLE {table} PARTITION BY RANGE COLUMNS(created_time) ({", ".join(definitions)})']
+
+
+def register_partition(table: Table) -> None:
+    """
+    注册建表后创建初始分区
+
+    :param table: 表
+    :return:
+    """
+    if not partition_enabled():
+        return
+
+    def after_create(target: Table, connection: Connection, **kw) -> None:
+        for ddl in _create_partitions_ddl(target.name):
+            connection.execute(text(ddl))
+
+    event.listen(table, 'after_create', after_create)
+
+
+async def get_partitions(db: AsyncSession, table: str) -> list[str]:
+    """
+    获取表的所有分区名
+
+    :param db: 数据库会话
+    :param table: 表名
+    :return:
+    """
+    if settings.DATABASE_TYPE == 'postgresql':
+        stmt = text(
+            'SELECT c.relname FROM pg_inherits i '
+            'JOIN pg_class c ON c.oid = i.inhrelid '
+            'JOIN pg_class p ON p.oid = i.inhparent '
+            'WHERE p.relname = :table'
+        )
+    else:
+        stmt = text(
+            'SELECT partition_name FROM information_schema.partitions '
+            'WHERE table_schema = DATABASE() AND table_name = :table AND partition_name IS NOT NULL'
+        )
+    result = await db.execute(stmt, {'table': table})
+    return [row[0] for row in result]
+
+
+async def create_partitions(db: AsyncSession, table: str, partitions: list[str]) -> list[str]:
+    """
+    预先创建未来月份的分区
+
+    :param db: 数据库会话
+    :param table: 表名
+    :param partitions: 已有分区名
+    :return:
+    """
+    created = []
+    for i in range(settings.LOG_RETENTION_PARTITION_AHEAD_MONTHS + 1):
+        month = month_start(timezone.now(), i)
+        name = partition_name(table, month)
+        if name not in partitions:
+            await db.execute(text(_add_partition_ddl(table, month)))
+            created.append(name)
+    return created
+
+
+async def drop_expired_partitions(db: AsyncSession, table: str, partitions: list[str], before: datetime) -> list[str]:
+    """
+    删除数据全部早于指定时间的分区
+
+    :param db: 数据库会话
+    :param table: 表名
+    :param partitions: 已有分区名
+    :param before: 截止时间
+    :return:
+    """
+    dropped = []
+    for name in sorted(partitions):
+        month = parse_partition_month(table, name)
+        if month is None or month_start(month, 1) > before:
+            continue
+        await db.execute(text(_drop_partition_ddl(table, name)))
+        dropped.append(name)
+    return dropped
@@ -1,16 +1,28 @@
+import asyncio
+import os
+import time
+import uuid
+
+from typing import Any
+
+from msgspec import json
+
+from backend.common.log import log
+from backend.core.conf import settings
 from backend.database.redis import redis_client
 from backend.utils.server_info import server_info
 
 
 class RedisInfo:
     @staticmethod
-    async def get_info() -> dict[str, str]:
-        """获取 Redis 服务器信息"""
-
-        # 获取原始信息
-        info = await redis_client.info()
+    def format_info(info: dict[str, Any], db_size: int) -> dict[str, str]:
+        """
+        格式化 Redis 服务器信息
 
-        # 格式化信息
+        :param info: INFO 命令返回的信息
+        :param db_size: 键数量
+        :return:
+        """
         fmt_info: dict[str, str] = {}
         for key, value in info.items():
             if isinstance(value, dict):
@@ -20,7 +32,6 @@ class RedisInfo:
                 fmt_info[key] = str(value)
 
         # 添加数据库大小信息
-        db_size = await redis_client.dbsize()
         fmt_info['keys_num'] = str(db_size)
 
         # 格式化运行时间
@@ -30,13 +41,13 @@ class RedisInfo:
         return fmt_info
 
     @staticmethod
-    async def get_stats() -> list[dict[str, str]]:
-        """获取 Redis 命令统计信息"""
-
-        # 获取命令统计信息
-        command_stats = await redis_client.info('commandstats')
+    def format_stats(command_stats: dict[str, Any]) -> list[dict[str, str]]:
+        """
+        格式化 Redis 命令统计信息
 
-        # 格式化统计信息
+        :param command_stats: INFO commandstats 命令返回的信息
+        :return:
+        """
         stats_list: list[dict[str, str]] = []
         for key, value in command_stats.items():
             if not isinstance(value, dict):
@@ -48,5 +59,190 @@ class RedisInfo:
 
         return stats_list
 
+    async def get_info(self) -> dict[str, str]:
+        """获取 Redis 服务器信息"""
+        return self.format_info(await redis_client.info(), await redis_client.dbsize())
+
+    async def get_stats(self) -> list[dict[str, str]]:
+        """获取 Redis 命令统计信息"""
+        return self.format_stats(await redis_client.info('commandstats'))
+
+
+class RedisMonitor:
+    """
+    Redis 监控采样器
+
+    所有进程通过 Redis 锁选举出唯一的采样者，按固定间隔采集 INFO、命令统计、延迟与慢日志，
+    计算每秒操作数与命中率等增量指标后写入 Redis 中定长的历史序列；接口只读取采样结果并在进程内短暂缓存
+    """
+
+    # 获取或续期采样者锁
+    _leader_script = """
+    if redis.call('get', KEYS[1]) == ARGV[1] then
+        return redis.call('expire', KEYS[1], ARGV[2])
+    end
+    if redis.call('set', KEYS[1], ARGV[1], 'NX', 'EX', ARGV[2]) then
+        return 1
+    end
+    return 0
+    """
+
+    def __init__(self, prefix: str, interval: int, history_size: int, slowlog_size: int) -> None:
+        """
+        初始化采样器
+
+        :param prefix: Redis 键前缀
+        :param interval: 采样间隔（秒）
+        :param history_size: 历史采样点数量
+        :param slowlog_size: 慢日志条数
+        """
+        self.leader_key = f'{prefix}:leader'
+        self.latest_key = f'{prefix}:latest'
+        self.history_key = f'{prefix}:history'
+        self.interval = interval
+        self.history_size = history_size
+        self.slowlog_size = slowlog_size
+        self.token = f'{os.getpid()}:{uuid.uuid4().hex}'
+        self._cache: tuple[float, dict[str, Any]] | None = None
+        self._task: asyncio.Task | None = None
+
+    async def is_leader(self) -> bool:
+        """获取或续期采样者身份"""
+        ttl = self.interval * 3
+        return bool(await redis_client.eval(self._leader_script, 1, self.leader_key, self.token, ttl))
+
+    @staticmethod
+    def _counters(info: dict[str, Any]) -> dict[str, float]:
+        return {
+            'time': time.time(),
+            'commands': float(info.get('total_commands_processed', 0)),
+            'hits': float(info.get('keyspace_hits', 0)),
+            'misses': float(info.get('keyspace_misses', 0)),
+        }
+
+    async def _latency(self) -> list[dict[str, Any]]:
+        try:
+            events = await redis_client.execute_command('LATENCY', 'LATEST')
+        except Exception:
+            return []
+        return [{'event': e[0], 'time': int(e[1]), 'latest': int(e[2]), 'max': int(e[3])} for e in events or []]
+
+    async def _slowlog(self) -> list[dict[str, Any]]:
+        try:
+            entries = await redis_client.slowlog_get(self.slowlog_size)
+        except Exception:
+            return []
+        return [
+            {
+                'id': entry.get('id'),
+                'time': entry.get('start_time'),
+                'duration': entry.get('duration'),
+                'command': str(entry.get('command', '')),
+            }
+            for entry in entries
+        ]
+
+    async def sample(self, previous: dict[str, float] | None = None) -> dict[str, Any]:
+        """
+        采集一次 Redis 指标
+
+        :param previous: 上次采样的累计计数，用于计算增量
+        :return:
+        """
+        info = await redis_client.info()
+        command_stats = await redis_client.info('commandstats')
+        db_size = await redis_client.dbsize()
+        counters = self._counters(info)
+
+        ops_per_sec = float(info.get('instantaneous_ops_per_sec', 0))
+        hit_ratio = 0.0
+        if previous:
+            elapsed = counters['time'] - previous['time']
+            if elapsed > 0:
+                ops_per_sec = max(counters['commands'] - previous['commands'], 0) / elapsed
+            hits = counters['hits'] - previous['hits']
+            lookups = hits + counters['misses'] - previous['misses']
+            if lookups > 0:
+                hit_ratio = hits / lookups * 100
+        else:
+            lookups = counters['hits'] + counters['misses']
+            if lookups > 0:
+                hit_ratio = counters['hits'] / lookups * 100
+
+        point = {
+            'time': int(counters['time']),
+            'ops_per_sec': round(ops_per_sec, 2),
+            'hit_ratio': round(hit_ratio, 2),
+            'used_memory': int(info.get('used_memory', 0)),
+            'connected_clients': int(info.get('connected_clients', 0)),
+            'input_kbps': float(info.get('instantaneous_input_kbps', 0)),
+            'output_kbps': float(info.get('instantaneous_output_kbps', 0)),
+        }
+        return {
+            'info': redis_info.format_info(info, db_size),
+            'stats': redis_info.format_stats(command_stats),
+            'latency': await self._latency(),
+            'slowlog': await self._slowlog(),
+            'point': point,
+            'counters': counters,
+        }
+
+    async def poll(self) -> None:
+        """作为采样者时采集一次并写入 Redis"""
+        if not await self.is_leader():
+            return
+        latest = await redis_client.get(self.latest_key)
+        previous = json.decode(latest)['counters'] if latest else None
+        data = await self.sample(previous)
+        pipe = redis_client.pipeline(transaction=True)
+        pipe.set(self.latest_key, json.encode(data), ex=self.interval * 3)
+        pipe.lpush(self.history_key, json.encode(data['point']))
+        pipe.ltrim(self.history_key, 0, self.history_size - 1)
+        await pipe.execute()
+
+    async def run(self) -> None:
+        """后台采样任务"""
+        while True:
+            try:
+                await self.poll()
+            except Exception as e:
+                log.error(f'Redis 监控采样失败：{e}')
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        """启动后台采样任务"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run())
+
+    async def snapshot(self) -> dict[str, Any]:
+        """获取最新的采样结果及历史"""
+        if self._cache and time.monotonic() < self._cache[0]:
+            return self._cache[1]
+
+        self.start()
+        pipe = redis_client.pipeline(transaction=False)
+        pipe.get(self.latest_key)
+        pipe.lrange(self.history_key, 0, -1)
+        latest, history = await pipe.execute()
+        data = json.decode(latest) if latest else await self.sample()
+        points = [json.decode(point) for point in reversed(history)] or [data['point']]
+
+        result = {
+            'info': data['info'],
+            'stats': data['stats'],
+            'latency': data['latency'],
+            'slowlog': data['slowlog'],
+            'history': {key: [point[key] for point in points] for key in data['point']},
+        }
+        self._cache = (time.monotonic() + self.interval, result)
+        return result
+
 
 redis_info: RedisInfo = RedisInfo()
+
+redis_monitor: RedisMonitor = RedisMonitor(
+    settings.REDIS_MONITOR_REDIS_PREFIX,
+    settings.REDIS_MONITOR_SAMPLE_INTERVAL,
+    settings.REDIS_MONITOR_HISTORY_SIZE,
+    settings.REDIS_MONITOR_SLOWLOG_SIZE,
+)
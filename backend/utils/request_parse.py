@@ -1,14 +1,19 @@
+from functools import cache
+from typing import Any
+
 import httpx
 
 from fastapi import Request
-from ip2loc import XdbSearcher
-from user_agents import parse
 
 from backend.common.dataclasses import IpInfo, UserAgentInfo
 from backend.common.log import log
 from backend.core.conf import settings
 from backend.core.path_conf import STATIC_DIR
 from backend.database.redis import redis_client
+from backend.utils.import_parse import lazy_import
+
+ip2loc = lazy_import('ip2loc')
+user_agents = lazy_import('user_agents')
 
 
 def get_request_ip(request: Request) -> str:
@@ -52,8 +57,11 @@ async def get_location_online(ip: str, user_agent: str) -> dict | None:
             return None
 
 
-# 离线 IP 搜索器单例（数据将缓存到内存，缓存大小取决于 IP 数据文件大小）
-__xdb_searcher = XdbSearcher(contentBuff=XdbSearcher.loadContentFromFile(dbfile=STATIC_DIR / 'ip2region_v4.xdb'))
+@cache
+def get_xdb_searcher() -> Any:
+    """获取离线 IP 搜索器单例，首次使用时加载（数据将缓存到内存，缓存大小取决于 IP 数据文件大小）"""
+    searcher = ip2loc.XdbSearcher
+    return searcher(contentBuff=searcher.loadContentFromFile(dbfile=STATIC_DIR / 'ip2region_v4.xdb'))
 
 
 def get_location_offline(ip: str) -> dict | None:
@@ -64,7 +72,7 @@ def get_location_offline(ip: str) -> dict | None:
     :return:
     """
     try:
-        data = __xdb_searcher.search(ip)
+        data = get_xdb_searcher().search(ip)
         data = data.split('|')
         return {
             'country': data[0] if data[0] != '0' else None,
@@ -116,7 +124,7 @@ def parse_user_agent_info(request: Request) -> UserAgentInfo:
     :return:
     """
     user_agent = request.headers.get('User-Agent')
-    user_agent_ = parse(user_agent)
+    user_agent_ = user_agents.parse(user_agent)
     os = user_agent_.get_os()
     browser = user_agent_.get_browser()
     device = user_agent_.get_device()
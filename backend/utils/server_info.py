@@ -1,15 +1,55 @@
+import asyncio
 import os
 import platform
 import socket
 import sys
+import time
 
+from array import array
 from datetime import datetime, timedelta
 from datetime import timezone as tz
+from functools import cache
+from typing import Any
 
-import psutil
+from starlette.concurrency import run_in_threadpool
 
+from backend.common.log import log
+from backend.core.conf import settings
+from backend.utils.import_parse import lazy_import
 from backend.utils.timezone import timezone
 
+psutil = lazy_import('psutil')
+
+
+class MetricSeries:
+    """定长环形缓冲区，按时间顺序保存最近的采样值"""
+
+    __slots__ = ('_count', '_data', '_index')
+
+    def __init__(self, size: int) -> None:
+        self._data = array('d', bytes(8 * size))
+        self._index = 0
+        self._count = 0
+
+    def append(self, value: float) -> None:
+        self._data[self._index] = value
+        self._index = (self._index + 1) % len(self._data)
+        self._count = min(self._count + 1, len(self._data))
+
+    def values(self, ndigits: int = 2) -> list[float]:
+        """
+        获取所有采样值
+
+        :param ndigits: 保留的小数位数
+        :return:
+        """
+        start = (self._index - self._count) % len(self._data)
+        ordered = self._data[start:] + self._data[:start]
+        return [round(v, ndigits) for v in ordered[: self._count]]
+
+    def __len__(self) -> int:
+        return self._count
+
 
 class ServerInfo:
     @staticmethod
@@ -63,9 +103,9 @@ class ServerInfo:
 
     @staticmethod
     def get_cpu_info() -> dict[str, float | int]:
-        """获取 CPU 信息"""
+        """获取 CPU 信息，使用率为距上次调用期间的平均值"""
         cpu_info = {
-            'usage': round(psutil.cpu_percent(interval=0.1), 2),  # %
+            'usage': round(psutil.cpu_percent(interval=None), 2),  # %
             'logical_num': psutil.cpu_count(logical=True) or 0,
             'physical_num': psutil.cpu_count(logical=False) or 0,
             'max_freq': 0.0,
@@ -100,8 +140,9 @@ class ServerInfo:
         }
 
     @staticmethod
+    @cache
     def get_sys_info() -> dict[str, str]:
-        """获取服务器信息"""
+        """获取服务器信息，进程内只探测一次"""
         hostname = socket.gethostname()
         ip = '127.0.0.1'
 
@@ -139,9 +180,14 @@ class ServerInfo:
         return disk_info
 
     @staticmethod
-    def get_service_info() -> dict[str, str | datetime]:
-        """获取服务信息"""
-        process = psutil.Process(os.getpid())
+    def get_service_info(process: 'psutil.Process | None' = None) -> dict[str, str | datetime]:
+        """
+        获取服务信息
+
+        :param process: 当前进程，复用同一对象时 CPU 使用率为距上次调用期间的平均值
+        :return:
+        """
+        process = process or psutil.Process(os.getpid())
         mem_info = process.memory_info()
 
         try:
@@ -156,7 +202,7 @@ class ServerInfo:
             'name': 'Python3',
             'version': platform.python_version(),
             'home': sys.executable,
-            'cpu_usage': f'{process.cpu_percent(interval=0.1):.2f}%',
+            'cpu_usage': f'{process.cpu_percent(interval=None):.2f}%',
             'mem_vms': ServerInfo.format_bytes(mem_info.vms),
             'mem_rss': ServerInfo.format_bytes(mem_info.rss),
             'mem_free': ServerInfo.format_bytes(mem_info.vms - mem_info.rss),
@@ -165,4 +211,135 @@ class ServerInfo:
         }
 
 
+class ServerMonitor:
+    """
+    服务器监控采样器
+
+    后台按固定间隔采集 CPU、内存、磁盘、进程与网络指标，最新值作为即时快照，数值指标写入环形缓冲区作为历史。
+    接口只读取已采集的数据，不会阻塞请求处理
+    """
+
+    # 历史指标：CPU 使用率（%）、内存使用率（%）、进程 CPU 使用率（%）、进程常驻内存（MB）、网络与磁盘速率（KB/s）
+    METRICS = ('cpu', 'mem', 'process_cpu', 'process_rss', 'net_sent', 'net_recv', 'disk_read', 'disk_write')
+
+    def __init__(self, size: int, interval: int, disk_interval: int) -> None:
+        """
+        初始化采样器
+
+        :param size: 历史采样点数量
+        :param interval: 采样间隔（秒）
+        :param disk_interval: 磁盘分区采样间隔（秒）
+        """
+        self.interval = interval
+        self.disk_interval = disk_interval
+        self.times = MetricSeries(size)
+        self.series = {name: MetricSeries(size) for name in self.METRICS}
+        self.cpu: dict[str, float | int] = {}
+        self.mem: dict[str, float] = {}
+        self.disk: list[dict[str, str]] = []
+        self.service: dict[str, Any] = {}
+        self._process: psutil.Process | None = None
+        self._counters: tuple[float, Any, Any] | None = None
+        self._disk_sampled_at = 0.0
+        self._task: asyncio.Task | None = None
+
+    @property
+    def process(self) -> 'psutil.Process':
+        """当前进程，首次使用时创建"""
+        if self._process is None:
+            self._process = psutil.Process(os.getpid())
+        return self._process
+
+    @staticmethod
+    def _io_counters() -> tuple[Any, Any]:
+        try:
+            return psutil.net_io_counters(), psutil.disk_io_counters()
+        except Exception:
+            return None, None
+
+    def _rate(self, now: float, net: Any, disk: Any) -> tuple[float, float, float, float]:
+        rates = (0.0, 0.0, 0.0, 0.0)
+        if self._counters:
+            last, last_net, last_disk = self._counters
+            elapsed = (now - last) * 1024
+            if elapsed > 0:
+                rates = (
+                    (net.bytes_sent - last_net.bytes_sent) / elapsed if net and last_net else 0.0,
+                    (net.bytes_recv - last_net.bytes_recv) / elapsed if net and last_net else 0.0,
+                    (disk.read_bytes - last_disk.read_bytes) / elapsed if disk and last_disk else 0.0,
+                    (disk.write_bytes - last_disk.write_bytes) / elapsed if disk and last_disk else 0.0,
+                )
+        self._counters = (now, net, disk)
+        return rates
+
+    def sample(self) -> None:
+        """采集一次指标"""
+        now = time.time()
+        self.cpu = server_info.get_cpu_info()
+        self.mem = server_info.get_mem_info()
+        self.service = server_info.get_service_info(self.process)
+        if now - self._disk_sampled_at >= self.disk_interval:
+            self.disk = server_info.get_disk_info()
+            self._disk_sampled_at = now
+
+        net_sent, net_recv, disk_read, disk_write = self._rate(now, *self._io_counters())
+        values = {
+            'cpu': self.cpu['usage'],
+            'mem': self.mem['usage'],
+            'process_cpu': float(self.service['cpu_usage'].rstrip('%')),
+            'process_rss': self.process.memory_info().rss / 1024**2,
+            'net_sent': net_sent,
+            'net_recv': net_recv,
+            'disk_read': disk_read,
+            'disk_write': disk_write,
+        }
+        self.times.append(now)
+        for name, value in values.items():
+            self.series[name].append(value)
+
+    async def run(self) -> None:
+        """后台采样任务"""
+        # CPU 使用率为两次调用之间的平均值，首次调用仅用于初始化
+        await run_in_threadpool(psutil.cpu_percent, None)
+        await run_in_threadpool(self.process.cpu_percent, None)
+        await run_in_threadpool(server_info.get_sys_info)
+        await asyncio.sleep(min(self.interval, 1))
+        while True:
+            try:
+                await run_in_threadpool(self.sample)
+            except Exception as e:
+                log.error(f'服务器监控采样失败：{e}')
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        """启动后台采样任务"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run())
+
+    async def snapshot(self) -> dict[str, Any]:
+        """获取最新的指标快照及历史"""
+        self.start()
+        if not len(self.times):
+            await run_in_threadpool(self.sample)
+        service = dict(self.service)
+        service['elapsed'] = server_info.fmt_timedelta(timezone.now() - timezone.from_str(service['startup']))
+        return {
+            'cpu': self.cpu,
+            'mem': self.mem,
+            'sys': server_info.get_sys_info(),
+            'disk': self.disk,
+            'service': service,
+            'history': {
+                'time': [int(t) for t in self.times.values(0)],
+                **{name: series.values() for name, series in self.series.items()},
+            },
+        }
+
+
 server_info: ServerInfo = ServerInfo()
+
+server_monitor: ServerMonitor = ServerMonitor(
+    settings.SERVER_MONITOR_HISTORY_SIZE,
+    settings.SERVER_MONITOR_SAMPLE_INTERVAL,
+    settings.SERVER_MONITOR_DISK_SAMPLE_INTERVAL,
+)
@@ -1,9 +1,17 @@
+import atexit
+import os
+import socket
+import threading
 import time
 
 from dataclasses import dataclass
+from uuid import uuid4
+
+from redis import Redis
 
 from backend.common.dataclasses import SnowflakeInfo
 from backend.common.exception import errors
+from backend.common.log import log
 from backend.core.conf import settings
 
 
@@ -35,6 +43,142 @@ class SnowflakeConfig:
     DEFAULT_SEQUENCE: int = 0
 
 
+class SnowflakeNodeLease:
+    """
+    基于 Redis 的雪花算法节点租约
+
+    每个进程独占一组（集群 ID，节点 ID），通过后台线程心跳续期，进程退出或心跳中断后租约过期，节点可被其他进程回收使用
+    """
+
+    # 按偏移顺序扫描节点，原子地占用第一个空闲节点
+    _acquire_script = """
+    local prefix, token, ttl = ARGV[1], ARGV[2], tonumber(ARGV[3])
+    local cluster_start, cluster_end = tonumber(ARGV[4]), tonumber(ARGV[5])
+    local max_node, offset = tonumber(ARGV[6]), tonumber(ARGV[7])
+    for cluster = cluster_start, cluster_end do
+        for i = 0, max_node do
+            local node = (i + offset) % (max_node + 1)
+            if redis.call('SET', prefix .. ':' .. cluster .. ':' .. node, token, 'NX', 'PX', ttl) then
+                return {cluster, node}
+            end
+        end
+    end
+    return nil
+    """
+    _renew_script = """
+    if redis.call('GET', KEYS[1]) == ARGV[1] then
+        return redis.call('PEXPIRE', KEYS[1], ARGV[2])
+    end
+    return 0
+    """
+    _release_script = """
+    if redis.call('GET', KEYS[1]) == ARGV[1] then
+        return redis.call('DEL', KEYS[1])
+    end
+    return 0
+    """
+
+    def __init__(self, cluster_id: int | None = None) -> None:
+        """
+        初始化节点租约
+
+        :param cluster_id: 固定集群 ID，为空时在所有集群中租用
+        """
+        self.cluster_id = cluster_id
+        self.token = f'{socket.gethostname()}:{os.getpid()}:{uuid4().hex}'
+        self.key: str | None = None
+        self.pid: int | None = None
+        self.renewed_at = 0.0
+        self._lost = threading.Event()
+        self._stop = threading.Event()
+        self._client: Redis | None = None
+        self._heartbeat_thread: threading.Thread | None = None
+
+    @property
+    def client(self) -> Redis:
+        if self._client is None:
+            self._client = Redis(
+                host=settings.REDIS_HOST,
+                port=settings.REDIS_PORT,
+                password=settings.REDIS_PASSWORD,
+                db=settings.REDIS_DATABASE,
+                socket_timeout=settings.REDIS_TIMEOUT,
+                socket_connect_timeout=settings.REDIS_TIMEOUT,
+                decode_responses=True,
+            )
+        return self._client
+
+    @property
+    def expired(self) -> bool:
+        """租约是否已失效（被回收或超过有效期未成功续期）"""
+        if self.key is None or self._lost.is_set():
+            return True
+        return time.monotonic() - self.renewed_at >= settings.SNOWFLAKE_LEASE_EXPIRE_SECONDS
+
+    def acquire(self) -> tuple[int, int]:
+        """租用一个空闲节点"""
+        if self.cluster_id is None:
+            cluster_start, cluster_end = 0, SnowflakeConfig.MAX_DATACENTER_ID
+        else:
+            cluster_start = cluster_end = self.cluster_id
+        result = self.client.eval(
+            self._acquire_script,
+            0,
+            f'{settings.SNOWFLAKE_REDIS_PREFIX}:node',
+            self.token,
+            settings.SNOWFLAKE_LEASE_EXPIRE_SECONDS * 1000,
+            cluster_start,
+            cluster_end,
+            SnowflakeConfig.MAX_WORKER_ID,
+            os.getpid() % (SnowflakeConfig.MAX_WORKER_ID + 1),
+        )
+        if not result:
+            raise errors.ServerError(msg='雪花算法节点已全部被占用')
+
+        cluster_id, node_id = int(result[0]), int(result[1])
+        self.key = f'{settings.SNOWFLAKE_REDIS_PREFIX}:node:{cluster_id}:{node_id}'
+        self.pid = os.getpid()
+        self.renewed_at = time.monotonic()
+        self._lost.clear()
+        if self._heartbeat_thread is None:
+            self._heartbeat_thread = threading.Thread(target=self._heartbeat, daemon=True, name='fba-snowflake-lease')
+            self._heartbeat_thread.start()
+            atexit.register(self.release)
+        return cluster_id, node_id
+
+    def _heartbeat(self) -> None:
+        while not self._stop.wait(settings.SNOWFLAKE_HEARTBEAT_INTERVAL_SECONDS):
+            key = self.key
+            if key is None:
+                continue
+            try:
+                renewed = self.client.eval(
+                    self._renew_script, 1, key, self.token, settings.SNOWFLAKE_LEASE_EXPIRE_SECONDS * 1000
+                )
+            except Exception as e:
+                # 租约在有效期内仍可使用，超过有效期后由 expired 判定失效
+                log.warning(f'雪花算法节点租约 {key} 续期失败：{e}')
+                continue
+            if renewed:
+                self.renewed_at = time.monotonic()
+            else:
+                log.warning(f'雪花算法节点租约 {key} 已被回收')
+                self._lost.set()
+
+    def release(self) -> None:
+        """释放节点租约，fork 出的子进程继承了退出处理函数，不能释放父进程的租约"""
+        if self.pid != os.getpid():
+            return
+        self._stop.set()
+        if self.key is None:
+            return
+        try:
+            self.client.eval(self._release_script, 1, self.key, self.token)
+        except Exception as e:
+            log.warning(f'雪花算法节点租约 {self.key} 释放失败：{e}')
+        self.key = None
+
+
 class Snowflake:
     """雪花算法类"""
 
@@ -43,6 +187,8 @@ class Snowflake:
         cluster_id: int = SnowflakeConfig.DEFAULT_DATACENTER_ID,
         node_id: int = SnowflakeConfig.DEFAULT_WORKER_ID,
         sequence: int = SnowflakeConfig.DEFAULT_SEQUENCE,
+        *,
+        lease: SnowflakeNodeLease | None = None,
     ) -> None:
         """
         初始化雪花算法生成器
@@ -50,6 +196,7 @@ class Snowflake:
         :param cluster_id: 集群 ID (0-31)
         :param node_id: 节点 ID (0-31)
         :param sequence: 起始序列号
+        :param lease: 节点租约，指定后集群 ID 和节点 ID 在首次生成时从 Redis 租用
         """
         if cluster_id < 0 or cluster_id > SnowflakeConfig.MAX_DATACENTER_ID:
             raise errors.RequestError(msg=f'集群编号必须在 0-{SnowflakeConfig.MAX_DATACENTER_ID} 之间')
@@ -60,48 +207,84 @@ class Snowflake:
         self.cluster_id = cluster_id
         self.sequence = sequence
         self.last_timestamp = -1
+        self._lease = lease
+        self._lease_pid: int | None = None
+        self._lock = threading.Lock()
 
     @staticmethod
     def _current_millis() -> int:
         """返回当前毫秒时间戳"""
         return int(time.time() * 1000)
 
-    def _next_millis(self, last_timestamp: int) -> int:
-        """
-        等待至下一毫秒
+    def _ensure_node(self) -> None:
+        """确保当前进程持有有效的节点租约"""
+        if self._lease is None:
+            return
+        pid = os.getpid()
+        if self._lease_pid == pid and not self._lease.expired:
+            return
+        if self._lease_pid is not None and self._lease_pid != pid:
+            # fork 后的子进程不能沿用父进程的租约
+            self._lease = SnowflakeNodeLease(self._lease.cluster_id)
+        self.cluster_id, self.node_id = self._lease.acquire()
+        self._lease_pid = pid
+        log.info(f'雪花算法租用节点：cluster_id={self.cluster_id}, node_id={self.node_id}')
 
-        :param last_timestamp: 上次生成 ID 的时间戳
-        :return:
+    def _reserve(self, count: int) -> tuple[int, int, int]:
         """
-        timestamp = self._current_millis()
-        while timestamp <= last_timestamp:
-            time.sleep((last_timestamp - timestamp + 1) / 1000.0)
-            timestamp = self._current_millis()
-        return timestamp
-
-    def generate(self) -> int:
-        """生成雪花 ID"""
-        timestamp = self._current_millis()
+        在同一毫秒内预留连续的序列号
 
-        if timestamp < self.last_timestamp:
-            raise errors.ServerError(msg=f'系统时间倒退，拒绝生成 ID 直到 {self.last_timestamp}')
+        时钟回拨或序列号耗尽时不等待，而是沿用或借用后续毫秒，超过最大漂移时拒绝生成
 
-        if timestamp == self.last_timestamp:
-            self.sequence = (self.sequence + 1) & SnowflakeConfig.SEQUENCE_MASK
-            if self.sequence == 0:
-                timestamp = self._next_millis(self.last_timestamp)
-        else:
+        :param count: 期望数量
+        :return: 时间戳、起始序列号、实际数量
+        """
+        timestamp = self._current_millis()
+        if timestamp > self.last_timestamp:
+            self.last_timestamp = timestamp
             self.sequence = 0
+        elif self.sequence > SnowflakeConfig.SEQUENCE_MASK:
+            self.last_timestamp += 1
+            self.sequence = 0
+            if self.last_timestamp - timestamp > settings.SNOWFLAKE_MAX_CLOCK_DRIFT_MS:
+                raise errors.ServerError(msg=f'系统时间倒退，拒绝生成 ID 直到 {self.last_timestamp}')
 
-        self.last_timestamp = timestamp
+        start = self.sequence
+        size = min(count, SnowflakeConfig.SEQUENCE_MASK + 1 - start)
+        self.sequence += size
+        return self.last_timestamp, start, size
 
+    def _compose(self, timestamp: int, sequence: int) -> int:
         return (
             ((timestamp - SnowflakeConfig.EPOCH) << SnowflakeConfig.TIMESTAMP_LEFT_SHIFT)
             | (self.cluster_id << SnowflakeConfig.DATACENTER_ID_SHIFT)
             | (self.node_id << SnowflakeConfig.WORKER_ID_SHIFT)
-            | self.sequence
+            | sequence
         )
 
+    def generate(self) -> int:
+        """生成雪花 ID"""
+        with self._lock:
+            self._ensure_node()
+            timestamp, sequence, _ = self._reserve(1)
+            return self._compose(timestamp, sequence)
+
+    def generate_batch(self, n: int) -> list[int]:
+        """
+        批量生成雪花 ID
+
+        :param n: 数量
+        :return:
+        """
+        ids = []
+        with self._lock:
+            self._ensure_node()
+            while len(ids) < n:
+                timestamp, start, size = self._reserve(n - len(ids))
+                base = self._compose(timestamp, start)
+                ids.extend(range(base, base + size))
+        return ids
+
     @staticmethod
     def parse_id(snowflake_id: int) -> SnowflakeInfo:
         """
@@ -124,4 +307,15 @@ class Snowflake:
         )
 
 
-snowflake = Snowflake()
+def create_snowflake() -> Snowflake:
+    """根据配置创建雪花算法生成器，未指定节点 ID 时从 Redis 租用"""
+    cluster_id = settings.SNOWFLAKE_CLUSTER_ID
+    if settings.SNOWFLAKE_NODE_ID is not None:
+        return Snowflake(
+            cluster_id=SnowflakeConfig.DEFAULT_DATACENTER_ID if cluster_id is None else cluster_id,
+            node_id=settings.SNOWFLAKE_NODE_ID,
+        )
+    return Snowflake(lease=SnowflakeNodeLease(cluster_id))
+
+
+snowflake: Snowflake = create_snowflake()
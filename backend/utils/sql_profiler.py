@@ -0,0 +1,189 @@
+"""
+SQL 性能分析
+
+在数据库引擎上挂载游标执行事件，按请求统计查询次数、数据库总耗时、最慢语句，并将参数归一化后的相同语句聚合，
+重复次数达到阈值时视为 N+1 查询。分析结果写入响应头 Server-Timing，按采样率（及所有发现 N+1 的请求）
+写入 Redis 中的定长列表供监控接口查看
+"""
+
+import random
+import re
+import time
+
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any
+
+from msgspec import json
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from backend.common.log import log
+from backend.core.conf import settings
+from backend.database.redis import redis_client
+from backend.utils.timezone import timezone
+
+# 参数占位符，兼容 asyncpg（$1）、asyncmy（%s / %(name)s）及 qmark（?）风格
+_PLACEHOLDER = re.compile(r'\$\d+|%\(\w+\)s|%s|\?')
+
+# 展开后的 IN 参数列表
+_PLACEHOLDER_LIST = re.compile(r'\?(\s*,\s*\?)+')
+
+_WHITESPACE = re.compile(r'\s+')
+
+# 记录的语句最大长度
+_STATEMENT_MAX_LENGTH = 1000
+
+
+def normalize_statement(statement: str) -> str:
+    """
+    归一化 SQL 语句，仅参数个数不同的语句视为同一种语句
+
+    :param statement: SQL 语句
+    :return:
+    """
+    statement = _WHITESPACE.sub(' ', statement).strip()
+    statement = _PLACEHOLDER.sub('?', statement)
+    return _PLACEHOLDER_LIST.sub('?', statement)[:_STATEMENT_MAX_LENGTH]
+
+
+@dataclass(slots=True)
+class SQLProfile:
+    """单个请求的 SQL 执行统计"""
+
+    count: int = 0
+    duration: float = 0.0
+    # 语句 -> [执行次数, 总耗时]
+    statements: dict[str, list[float]] = field(default_factory=dict)
+    # [(耗时, 语句)]
+    slowest: list[tuple[float, str]] = field(default_factory=list)
+
+    def record(self, statement: str, elapsed: float) -> None:
+        """
+        记录一次语句执行
+
+        :param statement: SQL 语句
+        :param elapsed: 耗时（秒）
+        :return:
+        """
+        self.count += 1
+        self.duration += elapsed
+        shape = normalize_statement(statement)
+        stats = self.statements.setdefault(shape, [0, 0.0])
+        stats[0] += 1
+        stats[1] += elapsed
+
+        size = settings.SQL_PROFILER_SLOWEST_SIZE
+        if len(self.slowest) < size or elapsed > self.slowest[-1][0]:
+            self.slowest.append((elapsed, shape))
+            self.slowest.sort(key=lambda item: item[0], reverse=True)
+            del self.slowest[size:]
+
+    @property
+    def repeated(self) -> list[dict[str, Any]]:
+        """重复执行次数达到阈值的语句"""
+        return sorted(
+            (
+                {'statement': shape, 'count': int(count), 'duration': round(duration * 1000, 3)}
+                for shape, (count, duration) in self.statements.items()
+                if count >= settings.SQL_PROFILER_REPEAT_THRESHOLD
+            ),
+            key=lambda item: item['count'],
+            reverse=True,
+        )
+
+    def server_timing(self) -> str:
+        """生成 Server-Timing 响应头"""
+        return f'db;dur={self.duration * 1000:.3f};desc="{self.count} queries"'
+
+    def to_dict(self) -> dict[str, Any]:
+        """转换为可序列化的字典"""
+        return {
+            'count': self.count,
+            'duration': round(self.duration * 1000, 3),
+            'slowest': [{'statement': shape, 'duration': round(elapsed * 1000, 3)} for elapsed, shape in self.slowest],
+            'repeated': self.repeated,
+        }
+
+
+class SQLProfiler:
+    """按请求统计 SQL 执行情况"""
+
+    def __init__(self, prefix: str, history_size: int, sample_rate: float) -> None:
+        """
+        初始化分析器
+
+        :param prefix: Redis 键前缀
+        :param history_size: 保留的分析结果数量
+        :param sample_rate: 采样率
+        :return:
+        """
+        self.history_key = f'{prefix}:history'
+        self.history_size = history_size
+        self.sample_rate = sample_rate
+        self.current: ContextVar[SQLProfile | None] = ContextVar('sql_profile', default=None)
+
+    def instrument(self, engine: AsyncEngine) -> None:
+        """
+        在数据库引擎上挂载游标执行事件
+
+        :param engine: 数据库引擎
+        :return:
+        """
+
+        @event.listens_for(engine.sync_engine, 'before_cursor_execute')
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:  # noqa: ANN001
+            if self.current.get() is not None:
+                conn.info.setdefault('sql_profiler_start', []).append(time.perf_counter())
+
+        @event.listens_for(engine.sync_engine, 'after_cursor_execute')
+        def after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:  # noqa: ANN001
+            profile = self.current.get()
+            starts = conn.info.get('sql_profiler_start')
+            if profile is not None and starts:
+                profile.record(statement, time.perf_counter() - starts.pop())
+
+    async def save(self, method: str, path: str, status: int, profile: SQLProfile) -> None:
+        """
+        按采样率保存分析结果，发现 N+1 查询时总是保存并记录日志
+
+        :param method: 请求方法
+        :param path: 请求路径
+        :param status: 响应状态码
+        :param profile: 分析结果
+        :return:
+        """
+        if not profile.count:
+            return
+        data = {
+            'time': timezone.to_str(timezone.now()),
+            'method': method,
+            'path': path,
+            'status': status,
+            **profile.to_dict(),
+        }
+        if data['repeated']:
+            top = data['repeated'][0]
+            log.warning(f'疑似 N+1 查询：{method} {path} | 重复 {top["count"]} 次 | {top["statement"]}')
+        elif random.random() >= self.sample_rate:
+            return
+
+        pipe = redis_client.pipeline(transaction=True)
+        pipe.lpush(self.history_key, json.encode(data))
+        pipe.ltrim(self.history_key, 0, self.history_size - 1)
+        await pipe.execute()
+
+    async def get_history(self) -> list[dict[str, Any]]:
+        """获取最近保存的分析结果"""
+        return [json.decode(item) for item in await redis_client.lrange(self.history_key, 0, -1)]
+
+    async def clear(self) -> None:
+        """清空分析结果"""
+        await redis_client.delete(self.history_key)
+
+
+sql_profiler: SQLProfiler = SQLProfiler(
+    settings.SQL_PROFILER_REDIS_PREFIX,
+    settings.SQL_PROFILER_HISTORY_SIZE,
+    settings.SQL_PROFILER_SAMPLE_RATE,
+)
@@ -0,0 +1,167 @@
+"""
+上传文件存储
+
+文件按内容的 SHA-256 寻址保存为 {哈希前两位}/{哈希}.{扩展名}，相同内容只保存一份，并在 Redis 中记录引用计数。
+上传时边接收边计算哈希并校验大小，写入临时文件后原子重命名，避免并发上传同名文件互相覆盖
+"""
+
+import hashlib
+import os
+import re
+
+from collections.abc import AsyncIterator
+from pathlib import Path
+from uuid import uuid4
+
+import anyio
+
+from anyio import open_file
+from fastapi import HTTPException, UploadFile
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import Scope
+
+from backend.common.exception import errors
+from backend.common.log import log
+from backend.core.conf import settings
+from backend.core.path_conf import UPLOAD_DIR
+from backend.database.redis import redis_client
+
+# 内容寻址的文件名
+CONTENT_ADDRESSED_NAME = re.compile(r'^[0-9a-f]{2}/(?P<hash>[0-9a-f]{64})(\.[0-9a-z]+)?$')
+
+
+class UploadStore:
+    """内容寻址的上传文件存储"""
+
+    def __init__(self, root: Path) -> None:
+        """
+        初始化存储
+
+        :param root: 存储根目录
+        """
+        self.root = root
+        self.temp_dir = root / '.tmp'
+        self.refs_key = f'{settings.UPLOAD_REDIS_PREFIX}:refs'
+
+    def path(self, name: str) -> Path:
+        """
+        获取文件路径
+
+        :param name: 文件名
+        :return:
+        """
+        return self.root / name
+
+    async def save(self, file: UploadFile, max_size: int | None = None) -> str:
+        """
+        保存上传文件
+
+        :param file: FastAPI 上传文件对象
+        :param max_size: 最大字节数，为空时不限制
+        :return: 文件名
+        """
+        filename = file.filename or ''
+        file_ext = filename.split('.')[-1].lower() if '.' in filename else ''
+
+        async def read_chunks() -> AsyncIterator[bytes]:
+            while content := await file.read(settings.UPLOAD_READ_SIZE):
+                yield content
+
+        try:
+            return await self.save_stream(read_chunks(), file_ext, max_size)
+        finally:
+            await file.close()
+
+    async def save_stream(self, chunks: AsyncIterator[bytes], file_ext: str = '', max_size: int | None = None) -> str:
+        """
+        保存分块生成的文件内容
+
+        :param chunks: 文件内容分块
+        :param file_ext: 文件扩展名
+        :param max_size: 最大字节数，为空时不限制
+        :return: 文件名
+        """
+        if not re.fullmatch(r'[0-9a-z]{1,16}', file_ext):
+            file_ext = ''
+        await anyio.Path(self.temp_dir).mkdir(parents=True, exist_ok=True)
+        temp_path = self.temp_dir / uuid4().hex
+        sha256 = hashlib.sha256()
+        size = 0
+        try:
+            async with await open_file(temp_path, mode='wb') as fb:
+                async for content in chunks:
+                    size += len(content)
+                    if max_size is not None and size > max_size:
+                        raise errors.RequestError(msg='文件超出最大限制，请重新选择')
+                    sha256.update(content)
+                    await fb.write(content)
+
+            digest = sha256.hexdigest()
+            name = f'{digest[:2]}/{digest}.{file_ext}' if file_ext else f'{digest[:2]}/{digest}'
+            target = anyio.Path(self.path(name))
+            if await target.exists():
+                await anyio.Path(temp_path).unlink()
+            else:
+                await target.parent.mkdir(parents=True, exist_ok=True)
+                await anyio.Path(temp_path).replace(target)
+        except errors.RequestError:
+            await anyio.Path(temp_path).unlink(missing_ok=True)
+            raise
+        except Exception as e:
+            await anyio.Path(temp_path).unlink(missing_ok=True)
+            log.error(f'保存文件失败：{e!s}')
+            raise errors.RequestError(msg='上传文件失败')
+
+        await redis_client.hincrby(self.refs_key, name, 1)
+        return name
+
+    async def release(self, name: str) -> bool:
+        """
+        释放文件引用，引用全部释放后删除文件
+
+        :param name: 文件名
+        :return: 文件是否已删除
+        """
+        if not CONTENT_ADDRESSED_NAME.match(name):
+            return False
+        refs = await redis_client.hincrby(self.refs_key, name, -1)
+        if refs > 0:
+            return False
+        await redis_client.hdel(self.refs_key, name)
+        await anyio.Path(self.path(name)).unlink(missing_ok=True)
+        return True
+
+
+class UploadStaticFiles(StaticFiles):
+    """
+    上传文件静态资源服务
+
+    内容寻址的文件内容不可变，使用内容哈希作为 ETag 并设置长期缓存；支持 Range 请求，服务器支持时使用 sendfile 发送
+    """
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        if any(part.startswith('.') for part in Path(path).parts):
+            raise HTTPException(status_code=404)
+        return await super().get_response(path, scope)
+
+    def file_response(
+        self,
+        full_path: str | os.PathLike[str],
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200,
+    ) -> Response:
+        response = FileResponse(full_path, status_code=status_code, stat_result=stat_result)
+        path = Path(full_path)
+        match = CONTENT_ADDRESSED_NAME.match(f'{path.parent.name}/{path.name}')
+        if match:
+            response.headers['etag'] = f'"{match.group("hash")}"'
+            response.headers['cache-control'] = f'public, max-age={settings.UPLOAD_CACHE_MAX_AGE}, immutable'
+        if self.is_not_modified(response.headers, Headers(scope=scope)):
+            return NotModifiedResponse(response.headers)
+        return response
+
+
+upload_store: UploadStore = UploadStore(UPLOAD_DIR)
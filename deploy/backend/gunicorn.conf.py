@@ -42,3 +42,10 @@ loglevel = 'debug'
 pythonpath = '/usr/local/lib/python3.10/site-packages'
 
 # 启动 gunicorn -c gunicorn.conf.py main:app
+
+
+def on_starting(server):  # noqa: ANN001, ANN201
+    """主进程派生工作进程之前清理已退出进程遗留的指标文件"""
+    from backend.common.metrics import clean_dead_process_metrics
+
+    clean_dead_process_metrics()